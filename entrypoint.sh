@@ -8,8 +8,13 @@
 # ulimit -n 8192
 
 set -e
+set -o pipefail
 set +x
 
+# boot profile origin, see boot_event
+BOOT_START=`cut -d' ' -f1 /proc/uptime`
+BOOT_ID=`date -u +%Y-%m-%dT%H:%M:%SZ`
+
 PASS=`< /dev/urandom tr -dc _A-Za-z0-9~\&\(\)\^$%,?\;. | head -c 32;echo`
 SSHA_PASS=`slappasswd -ns $PASS`
 
@@ -23,11 +28,70 @@ LDAP_SUB_DOMAIN=${LDAP_SUB_DOMAIN:-ldap}
 LDAP_CA_CERTIFICATE_PATH=${LDAP_CA_CERTIFICATE_PATH:-false}
 LDAP_CERTIFICATE_PATH=${LDAP_CERTIFICATE_PATH:-/ssl/$LDAP_SUB_DOMAIN.$DOMAIN.crt}
 LDAP_CERTIFICATE_KEY_PATH=${LDAP_CERTIFICATE_KEY_PATH:-/ssl/$SUB_DOMAIN.$DOMAIN.key}
+LDAP_DEMO=${LDAP_DEMO:-false}
+LDAP_BULK_PEOPLE=${LDAP_BULK_PEOPLE:-0}
+LDAP_BULK_GROUPS=${LDAP_BULK_GROUPS:-0}
+LDAP_BULK_APPLICATIONS=${LDAP_BULK_APPLICATIONS:-0}
+LDAP_BULK_DISTRIBUTION=${LDAP_BULK_DISTRIBUTION:-round-robin}
+LDAP_BULK_SEED=${LDAP_BULK_SEED:-0}
+LDAP_BULK_LARGEST_GROUP=${LDAP_BULK_LARGEST_GROUP:-100000}
+LDAP_BULK_LOAD=${LDAP_BULK_LOAD:-false}
+LDAP_TOOL_THREADS=${LDAP_TOOL_THREADS:-`nproc 2>/dev/null || echo 1`}
+LDAP_DATA_MIGRATIONS=${LDAP_DATA_MIGRATIONS:-true}
+LDAP_DB_INDEXES=${LDAP_DB_INDEXES:-"objectClass eq;uid eq,sub;memberOf eq"}
+LDAP_MEMBEROF_MODE=${LDAP_MEMBEROF_MODE:-overlay}
+LDAP_PASSWORD_HASH=${LDAP_PASSWORD_HASH:-"{SSHA}"}
+LDAP_ARGON2_ITERATIONS=${LDAP_ARGON2_ITERATIONS:-2}
+LDAP_ARGON2_MEMORY=${LDAP_ARGON2_MEMORY:-19456}
+LDAP_ARGON2_PARALLELISM=${LDAP_ARGON2_PARALLELISM:-1}
+LDAP_CRYPT_ROUNDS=${LDAP_CRYPT_ROUNDS:-5000}
+LDAP_PPOLICY_PROFILE=${LDAP_PPOLICY_PROFILE:-lockout}
+LDAP_LASTBIND_PRECISION=${LDAP_LASTBIND_PRECISION:-3600}
+LDAP_TLS_CIPHER_SUITE=${LDAP_TLS_CIPHER_SUITE:-DEFAULT}
+LDAP_TLS_PROTOCOL_MIN=${LDAP_TLS_PROTOCOL_MIN:-1.2}
+LDAP_TLS_EC_CURVES=${LDAP_TLS_EC_CURVES:-""}
+LDAP_TLS_DH_PARAMS=${LDAP_TLS_DH_PARAMS:-""}
+LDAP_THREADS=${LDAP_THREADS:-16}
+LDAP_LISTENER_THREADS=${LDAP_LISTENER_THREADS:-1}
+LDAP_DB_MAX_SIZE=${LDAP_DB_MAX_SIZE:-1073741824}
+LDAP_DB_CHECKPOINT=${LDAP_DB_CHECKPOINT:-""}
+LDAP_DB_NO_SYNC=${LDAP_DB_NO_SYNC:-FALSE}
+LDAP_DB_MAX_READERS=${LDAP_DB_MAX_READERS:-126}
+LDAP_DB_SEARCH_STACK=${LDAP_DB_SEARCH_STACK:-16}
+LDAP_DB_RTXN_SIZE=${LDAP_DB_RTXN_SIZE:-10000}
+LDAP_METRICS_PORT=${LDAP_METRICS_PORT:-""}
+LDAP_LDAPI_SOCKET=${LDAP_LDAPI_SOCKET:-""}
+LDAP_CERTIFICATE_WATCH=${LDAP_CERTIFICATE_WATCH:-""}
+LDAP_BOOT_PROFILE=${LDAP_BOOT_PROFILE:-"-"}
+LDAP_DEBUG_CONFIG=${LDAP_DEBUG_CONFIG:-false}
+LDAP_BUILD_SKELETON=false
+# cn=config pre-rendered with placeholders while building the image
+SKELETON_DIR=/usr/share/openldap/slapd.d.skeleton
+SKELETON_ROOT_DC="dc=skeleton,dc=invalid"
+SKELETON_ADMIN_UID=skeleton-admin
+LDAP_REPLICATION_ROLE=${LDAP_REPLICATION_ROLE:-standalone}
+LDAP_SERVER_ID=${LDAP_SERVER_ID:-1}
+LDAP_REPLICATION_PROVIDERS=${LDAP_REPLICATION_PROVIDERS:-""}
+LDAP_REPLICATION_PASSWORD=${LDAP_REPLICATION_PASSWORD:-""}
+LDAP_METRICS_BIND_DN=${LDAP_METRICS_BIND_DN:-""}
+LDAP_METRICS_PASSWORD=${LDAP_METRICS_PASSWORD:-""}
 
 USAGE="Usage: $0 [-C COMMAND [params [params [...]]] [-P Root Password] [-h]
                  [-u Default administrator uid] [-p Default admin password]
                  [-L LOG_LEVEL] [-a CA_FILE_PATH] [-D Domain] [-d sub-domain]
-                 [-O Organization]
+                 [-O Organization] [-E] [-N Bulk people] [-G Bulk groups]
+                 [-A Bulk applications] [-Z Bulk distribution]
+                 [-B] [-T Tool threads] [-M] [-I Indexes]
+                 [-g memberOf mode] [-H Password hash]
+                 [-y Password policy profile] [-q TLS cipher suite]
+                 [-v TLS protocol min]
+                 [-t Threads] [-l Listener threads] [-m DB max size]
+                 [-w DB checkpoint] [-n] [-r DB max readers]
+                 [-s DB search stack] [-x DB read txn size]
+                 [-X Metrics port] [-R Replication role] [-i Server id]
+                 [-U Provider urls] [-S ldapi socket]
+                 [-W Certificate watch interval] [-b Boot profile]
+                 [-V] [-K]
 Wrapper entry point script to setup and run OpenLdap
 
 Options:
@@ -64,11 +128,190 @@ Options:
                     Can also be set through environement variable
                     LDAP_CERTIFICATE_KEY_PATH
                     (default: $LDAP_CERTIFICATE_KEY_PATH)
+    -E              Import demo entries used by the test suite on new data
+                    volume. Can also be set through environement variable
+                    LDAP_DEMO=true (default: $LDAP_DEMO)
+    -N PEOPLE       Number of bulk generated users imported on new data
+                    volume. Can also be set through environement variable
+                    LDAP_BULK_PEOPLE (default: $LDAP_BULK_PEOPLE)
+    -G GROUPS       Number of bulk generated groups (bulk users are spread
+                    over them). Can also be set through environement variable
+                    LDAP_BULK_GROUPS (default: $LDAP_BULK_GROUPS)
+    -A APPS         Number of bulk generated applications (members of bulk
+                    groups). Can also be set through environement variable
+                    LDAP_BULK_APPLICATIONS (default: $LDAP_BULK_APPLICATIONS)
+    -Z DISTRIBUTION How bulk users are spread over bulk groups: round-robin
+                    (one group per user) or zipf (production like: a few
+                    groups of LDAP_BULK_LARGEST_GROUP members then Zipfian
+                    group sizes, deterministic from LDAP_BULK_SEED
+                    environment variable). Can also be set through
+                    environement variable LDAP_BULK_DISTRIBUTION
+                    (default: $LDAP_BULK_DISTRIBUTION)
+    -B              Bulk load: import all initial data (generated, init and
+                    demo files) as one parent first sorted stream in a single
+                    quick mode (slapadd -q) run, memberOf values are computed
+                    from groups. Can also be set through environement
+                    variable LDAP_BULK_LOAD=true (default: $LDAP_BULK_LOAD)
+    -T THREADS      Threads used by slapadd to build indexes (olcToolThreads)
+                    only used while setting up the ldap config volume.
+                    Can also be set through environement variable
+                    LDAP_TOOL_THREADS (default: $LDAP_TOOL_THREADS)
+    -M              Do not apply data migrations on existing data volume.
+                    By default generated, init and demo sources that changed
+                    since last start are compared to the directory and the
+                    differences applied (see ldaptools/migrate.py), bulk
+                    generated entries are not migrated.
+                    Can also be set through environement variable
+                    LDAP_DATA_MIGRATIONS=false (default: $LDAP_DATA_MIGRATIONS)
+    -I INDEXES      Database indexes (olcDbIndex values) separated by ';'
+                    only used while setting up the ldap config volume, use
+                    python3 -m ldaptools.indexadvisor to get a recommended
+                    value from slapd stats logs. Existing config volumes
+                    need an olcDbIndex modify then slapindex (see README).
+                    Can also be set through environement variable
+                    LDAP_DB_INDEXES (default: $LDAP_DB_INDEXES)
+    -g MODE         How memberOf is provided: overlay (the memberof overlay
+                    writes memberOf on each member entry when a group
+                    changes) or dynlist (the dynlist overlay computes it
+                    from groups while reading, cheap writes on large groups,
+                    memberOf is not indexed). Switching an existing volume
+                    strips or computes stored memberOf values on start.
+                    Can also be set through environement variable
+                    LDAP_MEMBEROF_MODE (default: $LDAP_MEMBEROF_MODE)
+
+    Tunables below are set on config volume setup and applied to cn=config
+    of an existing config volume on each start.
+
+    -t THREADS      slapd operation thread pool size (olcThreads).
+                    Can also be set through environement variable
+                    LDAP_THREADS (default: $LDAP_THREADS)
+    -l THREADS      Threads handling incoming connections, a power of 2
+                    (olcListenerThreads). Can also be set through
+                    environement variable LDAP_LISTENER_THREADS
+                    (default: $LDAP_LISTENER_THREADS)
+    -m BYTES        Maximum database size, LMDB map size (olcDbMaxSize).
+                    Can also be set through environement variable
+                    LDAP_DB_MAX_SIZE (default: $LDAP_DB_MAX_SIZE)
+    -w CHECKPOINT   \`\`kbyte min\`\` checkpoint the database when kbyte have
+                    been written or min minutes elapsed (olcDbCheckpoint),
+                    mostly useful with -n. Can also be set through
+                    environement variable LDAP_DB_CHECKPOINT
+                    (default: $LDAP_DB_CHECKPOINT)
+    -n              Do not flush to disk on each commit (olcDbNoSync), a crash
+                    may lose last transactions. Can also be set through
+                    environement variable LDAP_DB_NO_SYNC=TRUE
+                    (default: $LDAP_DB_NO_SYNC)
+    -r READERS      Maximum LMDB reader slots, at least the number of
+                    threads (olcDbMaxReaders). Can also be set through
+                    environement variable LDAP_DB_MAX_READERS
+                    (default: $LDAP_DB_MAX_READERS)
+    -s DEPTH        Search stack depth (olcDbSearchStack).
+                    Can also be set through environement variable
+                    LDAP_DB_SEARCH_STACK (default: $LDAP_DB_SEARCH_STACK)
+    -x ENTRIES      Entries read before a search renews its read transaction
+                    (olcDbRtxnSize). Can also be set through environement
+                    variable LDAP_DB_RTXN_SIZE (default: $LDAP_DB_RTXN_SIZE)
+    -H SCHEME       Scheme of passwords hashed by slapd (olcPasswordHash):
+                    {SSHA}, {SSHA256}, {SSHA512} (pw-sha2), {PBKDF2-SHA256},
+                    {PBKDF2-SHA512} (pw-pbkdf2, 10000 iterations), {ARGON2}
+                    (argon2, cost from LDAP_ARGON2_ITERATIONS,
+                    LDAP_ARGON2_MEMORY in KiB and LDAP_ARGON2_PARALLELISM
+                    environment variables, default to $LDAP_ARGON2_ITERATIONS,
+                    $LDAP_ARGON2_MEMORY and $LDAP_ARGON2_PARALLELISM) or
+                    {CRYPT} (sha512-crypt, LDAP_CRYPT_ROUNDS rounds, default
+                    to $LDAP_CRYPT_ROUNDS). Existing hashes keep working,
+                    passwords are hashed with the new scheme when changed.
+                    Can also be set through environement variable
+                    LDAP_PASSWORD_HASH (default: $LDAP_PASSWORD_HASH)
+    -y PROFILE      What ppolicy writes on binds: lockout (failed binds are
+                    recorded, accounts locked after pwdMaxFailure
+                    failures), lastbind (lockout and the last successful
+                    bind time, pwdLastSuccess, written at most every
+                    LDAP_LASTBIND_PRECISION seconds, 0 for every bind,
+                    default to $LDAP_LASTBIND_PRECISION) or no-write (binds
+                    never write, no lockout). Can also be set through
+                    environement variable LDAP_PPOLICY_PROFILE
+                    (default: $LDAP_PPOLICY_PROFILE)
+    -q CIPHERS      OpenSSL cipher list negotiated with clients, TLS 1.3
+                    suites (TLS_AES_128_GCM_SHA256...) can be mixed in
+                    (olcTLSCipherSuite). Key exchange curves are set with
+                    LDAP_TLS_EC_CURVES (colon separated, ie: X25519:P-256,
+                    olcTLSECName) and Diffie-Hellman parameters of DHE
+                    ciphers with LDAP_TLS_DH_PARAMS (file path,
+                    olcTLSDHParamFile) environment variables, both default
+                    to OpenSSL defaults (no DHE). Can also be set through
+                    environement variable LDAP_TLS_CIPHER_SUITE
+                    (default: $LDAP_TLS_CIPHER_SUITE)
+    -v VERSION      Lowest TLS version accepted: 1.0, 1.1, 1.2 or 1.3
+                    (olcTLSProtocolMin). Can also be set through
+                    environement variable LDAP_TLS_PROTOCOL_MIN
+                    (default: $LDAP_TLS_PROTOCOL_MIN)
+
+    -X PORT         Serve cn=monitor counters in Prometheus text format on
+                    http://0.0.0.0:PORT/metrics (ldaptools.exporter), the
+                    exporter binds with LDAP_METRICS_BIND_DN and
+                    LDAP_METRICS_PASSWORD environment variables, a member of
+                    cn=ldap_monitor,ou=groups, or over the ldapi socket
+                    (/run/openldap/ldapi if -S is not set) without bind DN.
+                    Can also be set through
+                    environement variable LDAP_METRICS_PORT
+                    (default: $LDAP_METRICS_PORT, no exporter)
+    -S SOCKET       Also listen on a local unix socket (ie:
+                    /run/openldap/ldapi) for tools running in the container
+                    or sharing the socket directory: no TLS nor TCP, SASL
+                    EXTERNAL maps the local root user to the root DN. The
+                    exporter uses it if LDAP_METRICS_BIND_DN is not set.
+                    Can also be set through environement variable
+                    LDAP_LDAPI_SOCKET (default: $LDAP_LDAPI_SOCKET, disabled)
+    -W SECONDS      Check certificate, key and CA files every SECONDS and
+                    make slapd load renewed ones without restart
+                    (ldaptools.certwatch): cn=config is modified over the
+                    ldapi socket (/run/openldap/ldapi if -S is not set) so
+                    slapd.d is left writable by the ldap user, the root DN
+                    manages cn=config over ldapi only while it is set.
+                    Can also be set through environement variable
+                    LDAP_CERTIFICATE_WATCH
+                    (default: $LDAP_CERTIFICATE_WATCH, disabled)
+    -b PROFILE      Where json lines timing startup phases and imported
+                    files (entries and bytes) are written: - for stdout, a
+                    file path, or empty to disable. Compare profiles of
+                    several image versions with ldaptools.bootprofile.
+                    Can also be set through environement variable
+                    LDAP_BOOT_PROFILE (default: $LDAP_BOOT_PROFILE)
+    -V              Print the cn=config of a new config volume.
+                    Can also be set through environement variable
+                    LDAP_DEBUG_CONFIG=true (default: $LDAP_DEBUG_CONFIG)
+    -K              Build the cn=config skeleton copied and patched (root
+                    DC, admin uid, root password, certificate paths) on new
+                    config volumes instead of rendering templates, then
+                    exit. Run while building the image, the skeleton is
+                    only used if LDAP_DB_INDEXES (with replication and
+                    memberOf mode changes) are the ones it was built with.
+
+    -R ROLE         Replication role: standalone, provider (syncprov
+                    overlay), consumer (read only copy of providers, writes
+                    are referred to the first provider) or mirror (multi
+                    provider). Consumers and mirrors read providers with
+                    LDAP_REPLICATION_BIND_DN (default: cn=admin,<root dc>)
+                    and LDAP_REPLICATION_PASSWORD (clear text) environment
+                    variables. Only the provider or the first mirror
+                    (server id 1) imports initial data and applies data
+                    migrations. Can also be set through environement variable
+                    LDAP_REPLICATION_ROLE (default: $LDAP_REPLICATION_ROLE)
+    -i ID           Unique server id (1 to 4095) of a provider or mirror.
+                    Can also be set through environement variable
+                    LDAP_SERVER_ID (default: $LDAP_SERVER_ID)
+    -U URLS         Space separated provider urls read by consumers and
+                    mirrors, mirrors list all of them in the same order (a
+                    mirror skips the url at its server id position).
+                    Can also be set through environement variable
+                    LDAP_REPLICATION_PROVIDERS
+                    (default: $LDAP_REPLICATION_PROVIDERS)
     -h              Show this help.
 "
 
 
-while getopts "C:P:L:a:c:k:d:D:O:p:u:h" OPTION
+while getopts "C:P:L:a:c:k:d:D:O:p:u:EN:G:A:Z:BT:MI:g:t:l:m:w:nr:s:x:X:R:i:U:S:W:b:VKH:y:q:v:h" OPTION
 do
     case $OPTION in
         C) if [[ $1 == "-C" ]]; then
@@ -89,6 +332,37 @@ do
         a) LDAP_CA_CERTIFICATE_PATH=$OPTARG;;
         c) LDAP_CERTIFICATE_PATH=$OPTARG;;
         k) LDAP_CERTIFICATE_KEY_PATH=$OPTARG;;
+        E) LDAP_DEMO=true;;
+        N) LDAP_BULK_PEOPLE=$OPTARG;;
+        G) LDAP_BULK_GROUPS=$OPTARG;;
+        A) LDAP_BULK_APPLICATIONS=$OPTARG;;
+        Z) LDAP_BULK_DISTRIBUTION=$OPTARG;;
+        B) LDAP_BULK_LOAD=true;;
+        T) LDAP_TOOL_THREADS=$OPTARG;;
+        M) LDAP_DATA_MIGRATIONS=false;;
+        I) LDAP_DB_INDEXES=$OPTARG;;
+        g) LDAP_MEMBEROF_MODE=$OPTARG;;
+        t) LDAP_THREADS=$OPTARG;;
+        l) LDAP_LISTENER_THREADS=$OPTARG;;
+        m) LDAP_DB_MAX_SIZE=$OPTARG;;
+        w) LDAP_DB_CHECKPOINT=$OPTARG;;
+        n) LDAP_DB_NO_SYNC=TRUE;;
+        r) LDAP_DB_MAX_READERS=$OPTARG;;
+        s) LDAP_DB_SEARCH_STACK=$OPTARG;;
+        x) LDAP_DB_RTXN_SIZE=$OPTARG;;
+        X) LDAP_METRICS_PORT=$OPTARG;;
+        R) LDAP_REPLICATION_ROLE=$OPTARG;;
+        i) LDAP_SERVER_ID=$OPTARG;;
+        U) LDAP_REPLICATION_PROVIDERS=$OPTARG;;
+        S) LDAP_LDAPI_SOCKET=$OPTARG;;
+        W) LDAP_CERTIFICATE_WATCH=$OPTARG;;
+        b) LDAP_BOOT_PROFILE=$OPTARG;;
+        V) LDAP_DEBUG_CONFIG=true;;
+        K) LDAP_BUILD_SKELETON=true;;
+        H) LDAP_PASSWORD_HASH=$OPTARG;;
+        y) LDAP_PPOLICY_PROFILE=$OPTARG;;
+        q) LDAP_TLS_CIPHER_SUITE=$OPTARG;;
+        v) LDAP_TLS_PROTOCOL_MIN=$OPTARG;;
         h) echo "$USAGE";
            exit;;
         *) echo "Unknown parameter... ";
@@ -97,29 +371,260 @@ do
     esac
 done
 
+if [ "$LDAP_BUILD_SKELETON" = true ]; then
+    # placeholders patched by install_skeleton
+    DOMAIN=`echo "$SKELETON_ROOT_DC" | sed -e 's/^dc=//' -e 's/,dc=/./g'`
+    LDAP_DEFAULT_ADMIN_UID=$SKELETON_ADMIN_UID
+    LDAP_BOOT_PROFILE=""
+fi
 LDAP_ROOT_DC="dc=$(echo "$DOMAIN" | sed -e 's/\./,dc=/g')"
+LDAP_REPLICATION_BIND_DN=${LDAP_REPLICATION_BIND_DN:-"cn=admin,$LDAP_ROOT_DC"}
+
+function uptime_seconds {
+    # Seconds since boot with hundredths, to time startup steps
+    cut -d' ' -f1 /proc/uptime
+}
+
+BOOT_COUNTS=/tmp/boot_profile_counts
+
+function boot_event {
+    # Write a boot profile json line (see ldaptools.bootprofile) to
+    # LDAP_BOOT_PROFILE
+    # $1: event type: phase or import
+    # $2: phase name or imported source
+    # $3: uptime_seconds when it started
+    # $4: file holding "entries bytes" written by measure_stream (optional)
+    if [ -z "$LDAP_BOOT_PROFILE" ]; then
+        return
+    fi
+    end=`uptime_seconds`
+    counts=""
+    if [ -n "$4" ]; then
+        counts=`cat "$4"`
+        rm -f "$4"
+    fi
+    line=$(echo "$counts" | awk \
+        -v event="$1" -v name="$2" -v start="$3" -v end="$end" \
+        -v origin="$BOOT_START" -v boot="$BOOT_ID" \
+        -v version="$OPENLDAP_VERSION" '{
+            printf "{\"event\": \"%s\", \"name\": \"%s\", \"boot\": \"%s\", ", \
+                event, name, boot
+            printf "\"version\": \"%s\", \"at\": %.2f, \"seconds\": %.2f", \
+                version, end - origin, end - start
+            if (NF == 2)
+                printf ", \"entries\": %d, \"bytes\": %d", $1, $2
+            print "}"
+        }')
+    if [ "$LDAP_BOOT_PROFILE" = "-" ]; then
+        echo "$line"
+    else
+        echo "$line" >> "$LDAP_BOOT_PROFILE"
+    fi
+}
+
+function measure_stream {
+    # Copy an ldif stream from stdin to stdout and write its entries and
+    # bytes count to a file for boot_event
+    # $1: file to write counts to
+    if [ -z "$LDAP_BOOT_PROFILE" ]; then
+        cat
+        return
+    fi
+    awk -v counts="$1" '
+        { print; bytes += length($0) + 1 }
+        /^dn:/ { entries++ }
+        END { print entries + 0, bytes + 0 > counts }'
+}
+
+function validate_integer {
+    # Exit if a tunable is not a positive integer
+    # $1: tunable name
+    # $2: value
+    case "$2" in
+        ''|*[!0-9]*|0)
+            echo "$1 must be a positive integer, got: '$2'" >&2
+            exit 1;;
+    esac
+}
+
+function password_hash_module {
+    # Write the module (and its parameters) providing LDAP_PASSWORD_HASH
+    # to stdout, nothing for built-in schemes
+    case "$LDAP_PASSWORD_HASH" in
+        "{SSHA}"|"{CRYPT}") ;;
+        "{SSHA256}"|"{SSHA384}"|"{SSHA512}") echo "pw-sha2.so";;
+        "{PBKDF2}"|"{PBKDF2-SHA1}"|"{PBKDF2-SHA256}"|"{PBKDF2-SHA512}")
+            echo "pw-pbkdf2.so";;
+        "{ARGON2}")
+            echo "argon2.so iterations=$LDAP_ARGON2_ITERATIONS" \
+                 "memory=$LDAP_ARGON2_MEMORY" \
+                 "parallelism=$LDAP_ARGON2_PARALLELISM";;
+        *) echo "Unsupported LDAP_PASSWORD_HASH: '$LDAP_PASSWORD_HASH'" >&2
+           exit 1;;
+    esac
+}
+
+function validate_tunables {
+    validate_integer LDAP_THREADS "$LDAP_THREADS"
+    validate_integer LDAP_LISTENER_THREADS "$LDAP_LISTENER_THREADS"
+    case "$LDAP_LISTENER_THREADS" in
+        1|2|4|8|16|32|64|128|256) ;;
+        *) echo "LDAP_LISTENER_THREADS must be a power of 2 (max 256)" >&2
+           exit 1;;
+    esac
+    validate_integer LDAP_DB_MAX_SIZE "$LDAP_DB_MAX_SIZE"
+    case "$LDAP_BULK_DISTRIBUTION" in
+        round-robin|zipf) ;;
+        *) echo "LDAP_BULK_DISTRIBUTION must be round-robin or zipf" >&2
+           exit 1;;
+    esac
+    case "$LDAP_MEMBEROF_MODE" in
+        overlay|dynlist) ;;
+        *) echo "LDAP_MEMBEROF_MODE must be overlay or dynlist" >&2
+           exit 1;;
+    esac
+    if [ -n "$LDAP_DB_CHECKPOINT" ]; then
+        case "$LDAP_DB_CHECKPOINT" in
+            *" "*) ;;
+            *) echo "LDAP_DB_CHECKPOINT must looks like 'kbyte min'" >&2
+               exit 1;;
+        esac
+        validate_integer "LDAP_DB_CHECKPOINT kbyte" \
+                         "${LDAP_DB_CHECKPOINT%% *}"
+        validate_integer "LDAP_DB_CHECKPOINT min" \
+                         "${LDAP_DB_CHECKPOINT#* }"
+    fi
+    LDAP_DB_NO_SYNC=`echo "$LDAP_DB_NO_SYNC" | tr a-z A-Z`
+    case "$LDAP_DB_NO_SYNC" in
+        TRUE|FALSE) ;;
+        *) echo "LDAP_DB_NO_SYNC must be TRUE or FALSE" >&2
+           exit 1;;
+    esac
+    validate_integer LDAP_DB_MAX_READERS "$LDAP_DB_MAX_READERS"
+    validate_integer LDAP_DB_SEARCH_STACK "$LDAP_DB_SEARCH_STACK"
+    validate_integer LDAP_DB_RTXN_SIZE "$LDAP_DB_RTXN_SIZE"
+    validate_integer LDAP_ARGON2_ITERATIONS "$LDAP_ARGON2_ITERATIONS"
+    validate_integer LDAP_ARGON2_MEMORY "$LDAP_ARGON2_MEMORY"
+    validate_integer LDAP_ARGON2_PARALLELISM "$LDAP_ARGON2_PARALLELISM"
+    validate_integer LDAP_CRYPT_ROUNDS "$LDAP_CRYPT_ROUNDS"
+    PASSWORD_HASH_MODULE=`password_hash_module`
+    case "$LDAP_PPOLICY_PROFILE" in
+        lockout) PPOLICY_DISABLE_WRITE=FALSE; LAST_BIND=FALSE;;
+        lastbind) PPOLICY_DISABLE_WRITE=FALSE; LAST_BIND=TRUE;;
+        no-write) PPOLICY_DISABLE_WRITE=TRUE; LAST_BIND=FALSE;;
+        *) echo "LDAP_PPOLICY_PROFILE must be lockout, lastbind or" \
+                "no-write" >&2
+           exit 1;;
+    esac
+    # olcPPolicyForwardUpdates needs the chain overlay (and its
+    # credentials on the provider) which is not configured
+    case "`echo "$LDAP_PPOLICY_FORWARD_UPDATES" | tr a-z A-Z`" in
+        ''|FALSE) ;;
+        *) echo "LDAP_PPOLICY_FORWARD_UPDATES is not supported: forwarding" \
+                "ppolicy writes to the provider needs the chain overlay" >&2
+           exit 1;;
+    esac
+    # 0 writes pwdLastSuccess on every bind
+    if [ "$LDAP_LASTBIND_PRECISION" != 0 ]; then
+        validate_integer LDAP_LASTBIND_PRECISION "$LDAP_LASTBIND_PRECISION"
+    fi
+    # olcTLSProtocolMin uses SSL wire versions: TLS 1.2 is 3.3
+    case "$LDAP_TLS_PROTOCOL_MIN" in
+        1.0) TLS_PROTOCOL_MIN=3.1;;
+        1.1) TLS_PROTOCOL_MIN=3.2;;
+        1.2) TLS_PROTOCOL_MIN=3.3;;
+        1.3) TLS_PROTOCOL_MIN=3.4;;
+        *) echo "LDAP_TLS_PROTOCOL_MIN must be 1.0, 1.1, 1.2 or 1.3" >&2
+           exit 1;;
+    esac
+    if [ -n "$LDAP_TLS_DH_PARAMS" ] && [ ! -f "$LDAP_TLS_DH_PARAMS" ]; then
+        echo "LDAP_TLS_DH_PARAMS file not found: $LDAP_TLS_DH_PARAMS" >&2
+        exit 1
+    fi
+    if [ -n "$LDAP_METRICS_PORT" ]; then
+        validate_integer LDAP_METRICS_PORT "$LDAP_METRICS_PORT"
+    fi
+    if [ -n "$LDAP_CERTIFICATE_WATCH" ]; then
+        validate_integer LDAP_CERTIFICATE_WATCH "$LDAP_CERTIFICATE_WATCH"
+    fi
+    if [ "$LDAP_DB_MAX_READERS" -lt "$LDAP_THREADS" ]; then
+        echo "LDAP_DB_MAX_READERS ($LDAP_DB_MAX_READERS) should be greater" \
+             "than LDAP_THREADS ($LDAP_THREADS)" >&2
+        exit 1
+    fi
+}
+
+function validate_replication {
+    case "$LDAP_REPLICATION_ROLE" in
+        standalone|provider) ;;
+        consumer|mirror)
+            if [ -z "$LDAP_REPLICATION_PROVIDERS" ] || \
+                    [ -z "$LDAP_REPLICATION_PASSWORD" ]; then
+                echo "LDAP_REPLICATION_PROVIDERS and" \
+                     "LDAP_REPLICATION_PASSWORD are required by" \
+                     "$LDAP_REPLICATION_ROLE role" >&2
+                exit 1
+            fi;;
+        *) echo "Unknown replication role: '$LDAP_REPLICATION_ROLE'" >&2
+           exit 1;;
+    esac
+    validate_integer LDAP_SERVER_ID "$LDAP_SERVER_ID"
+    if [ "$LDAP_SERVER_ID" -gt 4095 ]; then
+        echo "LDAP_SERVER_ID must be lower than 4096" >&2
+        exit 1
+    fi
+}
+
+validate_tunables
+validate_replication
+boot_event phase settings $BOOT_START
+
+# Consumers and secondary mirrors get their data from providers
+SEED_DATA=true
+if [ "$LDAP_REPLICATION_ROLE" = consumer ] || { \
+        [ "$LDAP_REPLICATION_ROLE" = mirror ] && \
+        [ "$LDAP_SERVER_ID" != 1 ]; }; then
+    SEED_DATA=false
+fi
+
+function render_file {
+    # Write an ldif file or the output of a *.ldif.template.sh file to stdout
+    # $1: file to render
+    case "$1" in
+        *.ldif.template.sh)
+            $1 -D "$LDAP_ROOT_DC" \
+               -d "$DOMAIN" \
+               -o "$ORGANIZATION" \
+               -u "$LDAP_DEFAULT_ADMIN_UID" \
+               -p "$LDAP_DEFAULT_ADMIN_PASSWORD";;
+        *)
+            cat "$1";;
+    esac
+}
+
+function list_files {
+    # List ldif files or *.ldif.template.sh files found in a directory
+    # in an alphabetic order (based on ``ls``)
+    # $1: directory to use
+    ls $1*.ldif.template.sh $1*.ldif 2>/dev/null | sort
+}
 
 function import_files {
     # Import ldif files or *.ldif.template.sh files found in a directory
-    # import in an alphabetic order (based on ``ls``)
+    # import in an alphabetic order (based on ``ls``), templates output are
+    # streamed to slapadd without intermediate file
     # $1: directory to use
     # $2: remove directory after import, if value equals "Yes" then
     directory=$1
     dir_to_remove=$2
     if [[ -d "$directory" ]]; then
 
-        for file in `ls $directory*.ldif.template.sh`; do
-            output=${file%.template.sh}
-            echo "generate $output from template: $file"
-            $file -D "$LDAP_ROOT_DC" \
-                  -d "$DOMAIN" \
-                  -o "$ORGANIZATION" \
-                  -u "$LDAP_DEFAULT_ADMIN_UID" \
-                  -p "$LDAP_DEFAULT_ADMIN_PASSWORD" > $output
-        done
-        for file in `ls $directory*.ldif`; do
+        for file in `list_files $directory`; do
             echo "Import init data: $file"
-            slapadd -d $LDAP_LOG_LEVEL -F /etc/openldap/slapd.d/ -l "$file"
+            import_start=`uptime_seconds`
+            render_file "$file" | measure_stream $BOOT_COUNTS | \
+                slapadd -d $LDAP_LOG_LEVEL -F /etc/openldap/slapd.d/
+            boot_event import "$file" $import_start $BOOT_COUNTS
         done
         if [ "$dir_to_remove" = true ]; then
             rm -r "$directory"
@@ -127,42 +632,827 @@ function import_files {
     fi
 }
 
-if [[ -d "/etc/openldap/slapd.d/cn=config" ]]; then
-    echo "LDAP Config volumes already setup!"
-else
-    echo "Génerate slapd.ldif from templates"
+function stream_files {
+    # Write ldif files and *.ldif.template.sh outputs found in a directory
+    # to stdout, in an alphabetic order (based on ``ls``)
+    # $1: directory to use
+    directory=$1
+    if [[ -d "$directory" ]]; then
+        for file in `list_files $directory`; do
+            echo "Stream init data: $file" >&2
+            render_file "$file"
+            # make sure last entry of a file is ended
+            echo
+        done
+    fi
+}
+
+function generate {
+    # Write entries generated by ldaptools.generate to stdout
+    # $@: ldaptools.generate tree options (--base, --demo, --people...)
+    python3 -m ldaptools.generate \
+        -D "$LDAP_ROOT_DC" \
+        -d "$DOMAIN" \
+        -o "$ORGANIZATION" \
+        -u "$LDAP_DEFAULT_ADMIN_UID" \
+        -p "$LDAP_DEFAULT_ADMIN_PASSWORD" \
+        "$@"
+}
+
+function has_bulk {
+    # Succeed if bulk generated entries are asked
+    [ "$LDAP_BULK_PEOPLE" -gt 0 ] || [ "$LDAP_BULK_GROUPS" -gt 0 ] || \
+        [ "$LDAP_BULK_APPLICATIONS" -gt 0 ]
+}
+
+function generate_bulk {
+    # Write bulk generated people, applications and groups to stdout
+    # $@: extra ldaptools.generate options
+    generate --people "$LDAP_BULK_PEOPLE" \
+             --groups "$LDAP_BULK_GROUPS" \
+             --applications "$LDAP_BULK_APPLICATIONS" \
+             --distribution "$LDAP_BULK_DISTRIBUTION" \
+             --seed "$LDAP_BULK_SEED" \
+             --largest-group "$LDAP_BULK_LARGEST_GROUP" \
+             "$@"
+}
+
+function bulk_stream {
+    # Write all initial data to stdout
+    generate --base
+    stream_files /srv/ldap/init/
+    if [ "$LDAP_DEMO" = true ]; then
+        generate --demo
+    fi
+    stream_files /srv/ldap/demo/
+    if has_bulk; then
+        generate_bulk
+    fi
+}
+
+function migration_sources {
+    # Write ldif files and *.ldif.template.sh outputs found in a directory
+    # to stdout, each one preceded by its "# source: <name>" line
+    # $1: directory to use
+    # $2: source name prefix
+    if [[ -d "$1" ]]; then
+        for file in `list_files $1`; do
+            echo "# source: $2/`basename $file`"
+            render_file "$file"
+            echo
+        done
+    fi
+}
+
+function migration_stream {
+    # Write initial data sources to stdout, each one preceded by a
+    # "# source: <name>" line used by ldaptools.migrate ledger. Bulk
+    # generated entries are load test data, they are not migrated.
+    echo "# source: base"
+    generate --base
+    migration_sources /srv/ldap/init/ init
+    if [ "$LDAP_DEMO" = true ]; then
+        echo "# source: demo"
+        generate --demo
+    fi
+    migration_sources /srv/ldap/demo/ demo
+}
+
+function ensure_local_root_mapping {
+    # Config volumes created by previous versions do not map local root
+    # to the root DN (SASL EXTERNAL over ldapi://) required by migrations
+    if ! grep -q "cn=peercred" "/etc/openldap/slapd.d/cn=config.ldif"; then
+        echo "Map local root user to cn=admin,$LDAP_ROOT_DC"
+        slapmodify -n0 -F /etc/openldap/slapd.d/ << EOF
+dn: cn=config
+changetype: modify
+add: olcAuthzRegexp
+olcAuthzRegexp: {0}"gidNumber=0\\+uidNumber=0,cn=peercred,cn=external,cn=auth" "cn=admin,$LDAP_ROOT_DC"
+EOF
+    fi
+}
+
+function unfold_ldif {
+    # Write a back-ldif file with its long lines unfolded
+    # $1: ldif file
+    sed -e ':a' -e 'N' -e '$!ba' -e 's/\n //g' "$1"
+}
+
+function ensure_config_access {
+    # Let the local root user manage cn=config over ldapi:// only while the
+    # certificate watcher needs it: any uid 0 peer of a shared socket
+    # directory is mapped to the root DN
+    config_config=`ls /etc/openldap/slapd.d/cn=config/olcDatabase=*config.ldif`
+    access=`unfold_ldif "$config_config" | grep "^olcAccess: .*sockurl" | \
+            sed -e 's/^[^:]*: //' || true`
+    if [ -n "$LDAP_CERTIFICATE_WATCH" ] && [ -z "$access" ]; then
+        echo "Let local root manage cn=config over ldapi://"
+        slapmodify -d $LDAP_LOG_LEVEL -n0 -F /etc/openldap/slapd.d/ << EOF
+dn: `basename "$config_config" .ldif`,cn=config
+changetype: modify
+add: olcAccess
+olcAccess: {0}to * by dn.exact="cn=admin,$LDAP_ROOT_DC" sockurl.regex="^ldapi://" manage by * none
+EOF
+    elif [ -z "$LDAP_CERTIFICATE_WATCH" ] && [ -n "$access" ]; then
+        echo "Remove local root management of cn=config over ldapi://"
+        slapmodify -d $LDAP_LOG_LEVEL -n0 -F /etc/openldap/slapd.d/ << EOF
+dn: `basename "$config_config" .ldif`,cn=config
+changetype: modify
+delete: olcAccess
+olcAccess: $access
+EOF
+    fi
+}
+
+function apply_tunables {
+    # Replace threading, TLS and LMDB tunables of an existing config volume
+    # through cn=config so changed settings are used by this start
+    mdb_config=`ls /etc/openldap/slapd.d/cn=config/olcDatabase=*mdb.ldif | \
+                head -n 1`
+    mdb_dn="`basename "$mdb_config" .ldif`,cn=config"
+    echo "Apply tunables to cn=config and $mdb_dn"
+    {
+        cat << EOF
+dn: cn=config
+changetype: modify
+replace: olcThreads
+olcThreads: $LDAP_THREADS
+-
+replace: olcListenerThreads
+olcListenerThreads: $LDAP_LISTENER_THREADS
+-
+replace: olcTLSCipherSuite
+olcTLSCipherSuite: $LDAP_TLS_CIPHER_SUITE
+-
+replace: olcTLSProtocolMin
+olcTLSProtocolMin: $TLS_PROTOCOL_MIN
+-
+EOF
+        # a replace without value removes the setting (OpenSSL default)
+        echo "replace: olcTLSECName"
+        if [ -n "$LDAP_TLS_EC_CURVES" ]; then
+            echo "olcTLSECName: $LDAP_TLS_EC_CURVES"
+        fi
+        echo "-"
+        echo "replace: olcTLSDHParamFile"
+        if [ -n "$LDAP_TLS_DH_PARAMS" ]; then
+            echo "olcTLSDHParamFile: $LDAP_TLS_DH_PARAMS"
+        fi
+        cat << EOF
+
+dn: $mdb_dn
+changetype: modify
+replace: olcDbMaxSize
+olcDbMaxSize: $LDAP_DB_MAX_SIZE
+-
+replace: olcDbNoSync
+olcDbNoSync: $LDAP_DB_NO_SYNC
+-
+replace: olcDbMaxReaders
+olcDbMaxReaders: $LDAP_DB_MAX_READERS
+-
+replace: olcDbSearchStack
+olcDbSearchStack: $LDAP_DB_SEARCH_STACK
+-
+replace: olcDbRtxnSize
+olcDbRtxnSize: $LDAP_DB_RTXN_SIZE
+-
+replace: olcLastBind
+olcLastBind: $LAST_BIND
+-
+replace: olcLastBindPrecision
+olcLastBindPrecision: $LDAP_LASTBIND_PRECISION
+EOF
+        echo "-"
+        echo "replace: olcDbCheckpoint"
+        if [ -n "$LDAP_DB_CHECKPOINT" ]; then
+            echo "olcDbCheckpoint: $LDAP_DB_CHECKPOINT"
+        fi
+        ppolicy_config=`ls ${mdb_config%.ldif}/olcOverlay=*ppolicy.ldif`
+        cat << EOF
+
+dn: `basename "$ppolicy_config" .ldif`,$mdb_dn
+changetype: modify
+replace: olcPPolicyDisableWrite
+olcPPolicyDisableWrite: $PPOLICY_DISABLE_WRITE
+-
+replace: olcPPolicyForwardUpdates
+EOF
+    } | slapmodify -d $LDAP_LOG_LEVEL -n0 -F /etc/openldap/slapd.d/
+}
+
+function apply_password_hash {
+    # Replace the password hash scheme of an existing config volume, the
+    # module providing it is added (or its cost parameters replaced)
+    module_config="/etc/openldap/slapd.d/cn=config/cn=module{0}.ldif"
+    frontend_config=`ls /etc/openldap/slapd.d/cn=config/olcDatabase=*frontend.ldif`
+    echo "Apply password hash $LDAP_PASSWORD_HASH"
+    {
+        if [ -n "$PASSWORD_HASH_MODULE" ]; then
+            # loaded module values look like: {5}argon2.so memory=19456
+            loaded=`grep -i "^olcModuleLoad: {[0-9]*}${PASSWORD_HASH_MODULE%% *}" \
+                    "$module_config" | sed -e 's/^[^:]*: //' || true`
+            if [ "${loaded#\{*\}}" != "$PASSWORD_HASH_MODULE" ]; then
+                echo "dn: cn=module{0},cn=config"
+                echo "changetype: modify"
+                if [ -n "$loaded" ]; then
+                    echo "delete: olcModuleLoad"
+                    echo "olcModuleLoad: $loaded"
+                    echo "-"
+                fi
+                echo "add: olcModuleLoad"
+                echo "olcModuleLoad: $PASSWORD_HASH_MODULE"
+                echo
+            fi
+        fi
+        cat << EOF
+dn: cn=config
+changetype: modify
+replace: olcPasswordCryptSaltFormat
+olcPasswordCryptSaltFormat: \$6\$rounds=$LDAP_CRYPT_ROUNDS\$%.16s
+
+dn: `basename "$frontend_config" .ldif`,cn=config
+changetype: modify
+replace: olcPasswordHash
+olcPasswordHash: $LDAP_PASSWORD_HASH
+EOF
+    } | slapmodify -d $LDAP_LOG_LEVEL -n0 -F /etc/openldap/slapd.d/
+}
+
+function ensure_monitor_database {
+    # Config volumes created by previous versions have no monitor database
+    if ! ls /etc/openldap/slapd.d/cn=config/olcDatabase=*monitor.ldif \
+            > /dev/null 2>&1; then
+        echo "Add monitor database to cn=config"
+        {
+            cat << EOF
+dn: cn=module{0},cn=config
+changetype: modify
+add: olcModuleLoad
+olcModuleLoad: back_monitor.so
+
+EOF
+            /etc/openldap/monitor.ldif.template.sh -D $LDAP_ROOT_DC | \
+                sed -e 's/^\(dn: .*\)$/\1\nchangetype: add/'
+        } | slapmodify -d $LDAP_LOG_LEVEL -n0 -F /etc/openldap/slapd.d/
+    fi
+}
+
+function ensure_dynlist_overlay {
+    # Config volumes created by previous versions have no dynlist overlay
+    # (nor its module and dyngroup schema), it is added disabled
+    mdb_config=`ls /etc/openldap/slapd.d/cn=config/olcDatabase=*mdb.ldif | \
+                head -n 1`
+    if ls ${mdb_config%.ldif}/olcOverlay=*dynlist.ldif > /dev/null 2>&1; then
+        return
+    fi
+    echo "Add dynlist overlay to cn=config"
+    {
+        cat << EOF
+dn: cn=module{0},cn=config
+changetype: modify
+add: olcModuleLoad
+olcModuleLoad: dynlist.so
+
+EOF
+        if ! ls /etc/openldap/slapd.d/cn=config/cn=schema/cn=*dyngroup.ldif \
+                > /dev/null 2>&1; then
+            sed -e 's/^\(dn: .*\)$/\1\nchangetype: add/' \
+                /etc/openldap/schema/dyngroup.ldif
+            echo
+        fi
+        /etc/openldap/overlay_settings.ldif.template.sh \
+            -D $LDAP_ROOT_DC \
+            -u "$LDAP_DEFAULT_ADMIN_UID" \
+            -O dynlist | \
+            sed -e 's/^\(dn: .*\)$/\1\nchangetype: add/'
+    } | slapmodify -d $LDAP_LOG_LEVEL -n0 -F /etc/openldap/slapd.d/
+}
+
+function apply_memberof_mode {
+    # Enable the overlay of LDAP_MEMBEROF_MODE and disable the other one on
+    # an existing config volume, MEMBEROF_SWITCHED is set to true if the
+    # mode changed so stored memberOf values get rewritten
+    mdb_config=`ls /etc/openldap/slapd.d/cn=config/olcDatabase=*mdb.ldif | \
+                head -n 1`
+    mdb_dn="`basename "$mdb_config" .ldif`,cn=config"
+    memberof_config=`ls ${mdb_config%.ldif}/olcOverlay=*memberof.ldif`
+    current_mode=overlay
+    if grep -qi "^olcDisabled: TRUE" "$memberof_config"; then
+        current_mode=dynlist
+    fi
+    if [ "$current_mode" = "$LDAP_MEMBEROF_MODE" ]; then
+        return
+    fi
+    MEMBEROF_SWITCHED=true
+    echo "Switch memberOf mode from $current_mode to $LDAP_MEMBEROF_MODE"
+    memberof_disabled=TRUE
+    dynlist_disabled=FALSE
+    if [ "$LDAP_MEMBEROF_MODE" = overlay ]; then
+        memberof_disabled=FALSE
+        dynlist_disabled=TRUE
+    fi
+    {
+        for overlay in memberof dynlist refint; do
+            overlay_config=`ls ${mdb_config%.ldif}/olcOverlay=*$overlay.ldif`
+            echo "dn: `basename "$overlay_config" .ldif`,$mdb_dn"
+            echo "changetype: modify"
+            case $overlay in
+                memberof)
+                    echo "replace: olcDisabled"
+                    echo "olcDisabled: $memberof_disabled";;
+                dynlist)
+                    echo "replace: olcDisabled"
+                    echo "olcDisabled: $dynlist_disabled";;
+                refint)
+                    echo "replace: olcRefintAttribute"
+                    if [ "$LDAP_MEMBEROF_MODE" = overlay ]; then
+                        echo "olcRefintAttribute: memberOf"
+                    fi
+                    echo "olcRefintAttribute: member";;
+            esac
+            echo
+        done
+        # volumes set up in dynlist mode have no memberOf index
+        if [ "$LDAP_MEMBEROF_MODE" = overlay ] && \
+                ! grep -qi "^olcDbIndex: memberOf " "$mdb_config"; then
+            cat << EOF
+dn: $mdb_dn
+changetype: modify
+add: olcDbIndex
+olcDbIndex: memberOf eq
+
+EOF
+        fi
+    } | slapmodify -d $LDAP_LOG_LEVEL -n0 -F /etc/openldap/slapd.d/
+}
+
+function rewrite_memberof_values {
+    # Strip or compute stored memberOf values of the data volume offline
+    # $1: ldaptools.memberof action (--strip or --materialize)
+    echo "Rewrite stored memberOf values ($1)"
+    DATA_CHANGED=true
+    slapcat -F /etc/openldap/slapd.d/ -b "$LDAP_ROOT_DC" | \
+        python3 -m ldaptools.memberof $1 | \
+        slapmodify -d $LDAP_LOG_LEVEL -F /etc/openldap/slapd.d/ \
+                   -b "$LDAP_ROOT_DC"
+}
+
+function fix_ownership {
+    # Give ldap user files of a directory it does not own yet (and set
+    # their mode), only differing files are changed by parallel workers
+    # $1: directory
+    # $2: mode (optional)
+    find "$1" \( ! -user ldap -o ! -group ldap \) -print0 | \
+        xargs -0 -r -n 256 -P `nproc` chown -h ldap:ldap
+    if [ -n "$2" ]; then
+        find "$1" ! -perm "$2" -print0 | \
+            xargs -0 -r -n 256 -P `nproc` chmod "$2"
+    fi
+}
+
+function ownership_marker {
+    # Write what data volume ownership was last fixed for to stdout
+    echo "`id -u ldap`:`id -g ldap`:$OPENLDAP_VERSION"
+}
+
+function replication_limit {
+    # Write the stored olcLimits value (with its {n} index) of the
+    # replication bind DN, nothing if missing
+    # $1: mdb config file
+    unfold_ldif "$1" | \
+        grep -iF "dn.exact=\"$LDAP_REPLICATION_BIND_DN\" " | \
+        grep -i "^olcLimits: " | sed -e 's/^[^:]*: //' || true
+}
+
+function configure_replication {
+    # Render replication settings of LDAP_REPLICATION_ROLE as slapmodify
+    # changes, applied on setup and on each start of an existing volume
+    mdb_config=`ls /etc/openldap/slapd.d/cn=config/olcDatabase=*mdb.ldif | \
+                head -n 1`
+    mdb_dn="`basename "$mdb_config" .ldif`,cn=config"
+    limit=`replication_limit "$mdb_config"`
+    syncprov_config=`ls ${mdb_config%.ldif}/olcOverlay=*syncprov.ldif \
+                     2> /dev/null || true`
+    syncprov_dn="`basename "$syncprov_config" .ldif`,$mdb_dn"
+    if [ "$LDAP_REPLICATION_ROLE" = standalone ]; then
+        # a former consumer or mirror would keep reading its providers, a
+        # former provider or mirror keeps its overlay and server id
+        removed=""
+        for attribute in olcSyncrepl olcUpdateRef olcMultiProvider; do
+            if grep -qi "^$attribute:" "$mdb_config"; then
+                removed="$removed $attribute"
+            fi
+        done
+        if [ -n "$syncprov_config" ] && \
+                grep -qi "^olcDisabled: TRUE" "$syncprov_config"; then
+            syncprov_config=""
+        fi
+        server_id=`grep -i "^olcServerID:" \
+                   /etc/openldap/slapd.d/cn=config.ldif || true`
+        if [ -z "$removed$limit$syncprov_config$server_id" ]; then
+            return
+        fi
+        echo "Remove replication settings of $mdb_dn"
+        {
+            if [ -n "$removed$limit" ]; then
+                echo "dn: $mdb_dn"
+                echo "changetype: modify"
+                separator=""
+                for attribute in $removed; do
+                    if [ -n "$separator" ]; then
+                        echo "$separator"
+                    fi
+                    echo "delete: $attribute"
+                    separator="-"
+                done
+                if [ -n "$limit" ]; then
+                    if [ -n "$separator" ]; then
+                        echo "$separator"
+                    fi
+                    echo "delete: olcLimits"
+                    echo "olcLimits: $limit"
+                fi
+                echo
+            fi
+            if [ -n "$syncprov_config" ]; then
+                cat << EOF
+dn: $syncprov_dn
+changetype: modify
+replace: olcDisabled
+olcDisabled: TRUE
+
+EOF
+            fi
+            if [ -n "$server_id" ]; then
+                cat << EOF
+dn: cn=config
+changetype: modify
+delete: olcServerID
+
+EOF
+            fi
+        } | slapmodify -d $LDAP_LOG_LEVEL -n0 -F /etc/openldap/slapd.d/
+        return
+    fi
+    options=""
+    if [ -z "$syncprov_config" ]; then
+        options="-S"
+    fi
+    if [ -z "$limit" ]; then
+        options="$options -L"
+    fi
+    echo "Configure $LDAP_REPLICATION_ROLE replication of $mdb_dn"
+    {
+        if [ "$LDAP_REPLICATION_ROLE" != consumer ] && ! grep -q syncprov \
+                "/etc/openldap/slapd.d/cn=config/cn=module{0}.ldif"; then
+            cat << EOF
+dn: cn=module{0},cn=config
+changetype: modify
+add: olcModuleLoad
+olcModuleLoad: syncprov.so
+
+EOF
+        fi
+        # disabled by a former standalone start
+        if [ "$LDAP_REPLICATION_ROLE" != consumer ] && \
+                [ -n "$syncprov_config" ] && \
+                grep -qi "^olcDisabled: TRUE" "$syncprov_config"; then
+            cat << EOF
+dn: $syncprov_dn
+changetype: modify
+replace: olcDisabled
+olcDisabled: FALSE
+
+EOF
+        fi
+        /etc/openldap/replication.ldif.template.sh \
+            -D "$LDAP_ROOT_DC" \
+            -r "$LDAP_REPLICATION_ROLE" \
+            -M "$mdb_dn" \
+            -i "$LDAP_SERVER_ID" \
+            -U "$LDAP_REPLICATION_PROVIDERS" \
+            -B "$LDAP_REPLICATION_BIND_DN" \
+            -W "$LDAP_REPLICATION_PASSWORD" \
+            -A "$LDAP_CA_CERTIFICATE_PATH" \
+            $options
+    } | slapmodify -d $LDAP_LOG_LEVEL -n0 -F /etc/openldap/slapd.d/
+}
+
+function update_config {
+    # Apply settings to an existing (or skeleton) config volume
+    apply_tunables
+    apply_password_hash
+    ensure_monitor_database
+    ensure_local_root_mapping
+    ensure_config_access
+    ensure_dynlist_overlay
+    apply_memberof_mode
+}
+
+function setup_indexes {
+    # Add indexes required by the replication role (or remove those useless
+    # with the memberOf mode) of a new config volume to LDAP_DB_INDEXES
+    if [ "$LDAP_REPLICATION_ROLE" != standalone ]; then
+        # syncrepl looks up entries by entryUUID and contextCSN changes
+        LDAP_DB_INDEXES="$LDAP_DB_INDEXES;entryCSN,entryUUID eq"
+    fi
+    if [ "$LDAP_MEMBEROF_MODE" = dynlist ]; then
+        # memberOf is computed on read, there is no stored value to index
+        LDAP_DB_INDEXES=`echo "$LDAP_DB_INDEXES" | tr ';' '\n' | \
+                         grep -vi "^ *memberOf " | tr '\n' ';'`
+        LDAP_DB_INDEXES=${LDAP_DB_INDEXES%;}
+    fi
+}
+
+function render_config {
+    # Render cn=config templates to /etc/openldap/slapd.ldif
+    manage_config=""
+    if [ -n "$LDAP_CERTIFICATE_WATCH" ]; then
+        manage_config="-m"
+    fi
     /etc/openldap/slapd.ldif.template.sh \
         -C $LDAP_CERTIFICATE_PATH \
         -K $LDAP_CERTIFICATE_KEY_PATH \
-        -A $LDAP_CA_CERTIFICATE_PATH > /etc/openldap/slapd.ldif
+        -A $LDAP_CA_CERTIFICATE_PATH \
+        -S "$LDAP_TLS_CIPHER_SUITE" \
+        -P $TLS_PROTOCOL_MIN \
+        -e "$LDAP_TLS_EC_CURVES" \
+        -d "$LDAP_TLS_DH_PARAMS" \
+        -T $LDAP_TOOL_THREADS \
+        -t $LDAP_THREADS \
+        -l $LDAP_LISTENER_THREADS \
+        -H "$LDAP_PASSWORD_HASH" \
+        -M "$PASSWORD_HASH_MODULE" \
+        -c "\$6\$rounds=$LDAP_CRYPT_ROUNDS\$%.16s" \
+        -R "cn=admin,$LDAP_ROOT_DC" \
+        $manage_config > /etc/openldap/slapd.ldif
     /etc/openldap/lmdb.ldif.template.sh \
         -P $LDAP_ROOT_PASSWORD \
+        -I "$LDAP_DB_INDEXES" \
+        -m $LDAP_DB_MAX_SIZE \
+        -c "$LDAP_DB_CHECKPOINT" \
+        -n $LDAP_DB_NO_SYNC \
+        -r $LDAP_DB_MAX_READERS \
+        -s $LDAP_DB_SEARCH_STACK \
+        -x $LDAP_DB_RTXN_SIZE \
+        -b $LAST_BIND \
+        -B $LDAP_LASTBIND_PRECISION \
         -D $LDAP_ROOT_DC >> /etc/openldap/slapd.ldif
     /etc/openldap/overlay_settings.ldif.template.sh \
         -D $LDAP_ROOT_DC  \
-        -u "$LDAP_DEFAULT_ADMIN_UID" >> /etc/openldap/slapd.ldif
+        -u "$LDAP_DEFAULT_ADMIN_UID" \
+        -m $LDAP_MEMBEROF_MODE \
+        -W $PPOLICY_DISABLE_WRITE >> /etc/openldap/slapd.ldif
+    /etc/openldap/monitor.ldif.template.sh \
+        -D $LDAP_ROOT_DC >> /etc/openldap/slapd.ldif
+}
 
-    echo "import slapd.ldif"
-    cat /etc/openldap/slapd.ldif
-    slapadd -d $LDAP_LOG_LEVEL -n0 -F /etc/openldap/slapd.d/ \
+function skeleton_matches {
+    # Succeed if the cn=config skeleton was built with the indexes of this
+    # setup, other settings are applied by update_config
+    [[ -f "$SKELETON_DIR.indexes" ]] && \
+        [ "`cat $SKELETON_DIR.indexes`" = "$LDAP_DB_INDEXES" ]
+}
+
+function install_skeleton {
+    # Copy the cn=config skeleton and patch its placeholders and setup only
+    # values (ldaptools.skeleton)
+    cp -a $SKELETON_DIR/. /etc/openldap/slapd.d/
+    mdb_config=`ls /etc/openldap/slapd.d/cn=config/olcDatabase=*mdb.ldif | \
+                head -n 1`
+    ca_path=""
+    if [[ -f "$LDAP_CA_CERTIFICATE_PATH" ]]; then
+        ca_path=$LDAP_CA_CERTIFICATE_PATH
+    fi
+    python3 -m ldaptools.skeleton /etc/openldap/slapd.d/ \
+        --replace "$SKELETON_ROOT_DC" "$LDAP_ROOT_DC" \
+        --replace "uid=$SKELETON_ADMIN_UID," "uid=$LDAP_DEFAULT_ADMIN_UID," \
+        --set cn=config olcTLSCertificateFile "$LDAP_CERTIFICATE_PATH" \
+        --set cn=config olcTLSCertificateKeyFile "$LDAP_CERTIFICATE_KEY_PATH" \
+        --set cn=config olcTLSCACertificateFile "$ca_path" \
+        --set cn=config olcToolThreads "$LDAP_TOOL_THREADS" \
+        --set "`basename "$mdb_config" .ldif`" olcRootPW "$LDAP_ROOT_PASSWORD"
+}
+
+function import_generated {
+    # Stream entries generated by ldaptools.generate to slapadd
+    # $@: ldaptools.generate tree options (--base, --demo, --people...)
+    echo "Import generated data: $@"
+    import_start=`uptime_seconds`
+    generate "$@" | measure_stream $BOOT_COUNTS | \
+        slapadd -d $LDAP_LOG_LEVEL -F /etc/openldap/slapd.d/
+    boot_event import "generated $*" $import_start $BOOT_COUNTS
+}
+
+if [ "$LDAP_BUILD_SKELETON" = true ]; then
+    echo "Build cn=config skeleton in $SKELETON_DIR"
+    setup_indexes
+    render_config
+    mkdir -p $SKELETON_DIR
+    slapadd -d $LDAP_LOG_LEVEL -n0 -F $SKELETON_DIR \
             -l /etc/openldap/slapd.ldif
+    rm /etc/openldap/slapd.ldif
+    echo "$LDAP_DB_INDEXES" > $SKELETON_DIR.indexes
+    exit
+fi
+
+PHASE_START=`uptime_seconds`
+MEMBEROF_SWITCHED=false
+# set when root wrote to the data volume, new files are owned by root
+DATA_CHANGED=false
+if [[ -d "/etc/openldap/slapd.d/cn=config" ]]; then
+    echo "LDAP Config volumes already setup!"
+    update_config
+    boot_event phase config_update $PHASE_START
+else
+    setup_indexes
+    if skeleton_matches; then
+        echo "Patch cn=config skeleton built with the image"
+        install_skeleton
+        boot_event phase config_skeleton $PHASE_START
+        if [ "$LDAP_DEBUG_CONFIG" = true ]; then
+            slapcat -n0 -F /etc/openldap/slapd.d/
+        fi
+        PHASE_START=`uptime_seconds`
+        update_config
+        boot_event phase config_update $PHASE_START
+    else
+        echo "Génerate slapd.ldif from templates"
+        render_config
+        boot_event phase config_render $PHASE_START
+
+        PHASE_START=`uptime_seconds`
+        echo "import slapd.ldif"
+        if [ "$LDAP_DEBUG_CONFIG" = true ]; then
+            cat /etc/openldap/slapd.ldif
+        fi
+        slapadd -d $LDAP_LOG_LEVEL -n0 -F /etc/openldap/slapd.d/ \
+                -l /etc/openldap/slapd.ldif
+        boot_event phase config_import $PHASE_START
+    fi
 fi
+PHASE_START=`uptime_seconds`
+configure_replication
+boot_event phase replication $PHASE_START
 
-if [[ -f "/var/lib/openldap/openldap-data/data.mdb" ]]; then
+if [ "$MEMBEROF_SWITCHED" = true ] && \
+        [[ -f "/var/lib/openldap/openldap-data/data.mdb" ]]; then
+    PHASE_START=`uptime_seconds`
+    if [ "$LDAP_MEMBEROF_MODE" = dynlist ]; then
+        rewrite_memberof_values --strip
+    else
+        rewrite_memberof_values --materialize
+    fi
+    boot_event phase memberof_rewrite $PHASE_START
+fi
+
+RUN_DATA_MIGRATIONS=false
+if [ "$SEED_DATA" = false ]; then
+    echo "Data replicated from $LDAP_REPLICATION_PROVIDERS"
+elif [[ -f "/var/lib/openldap/openldap-data/data.mdb" ]]; then
     echo "LDAP DATA volume already exists!"
-    # TODO: execute ldap modify according update version mecanism to define
-    # import_files /srv/ldap/init/
+    if [ "$LDAP_DATA_MIGRATIONS" = true ]; then
+        RUN_DATA_MIGRATIONS=true
+    fi
 else
-    import_files /etc/openldap/root_data/ true
-    import_files /srv/ldap/init/ false
-    import_files /srv/ldap/demo/ false
+    DATA_CHANGED=true
+    PHASE_START=`uptime_seconds`
+    if [ "$LDAP_BULK_LOAD" = true ]; then
+        echo "Bulk load initial data"
+        BULKLOAD_OPTIONS=""
+        if [ "$LDAP_MEMBEROF_MODE" = dynlist ]; then
+            BULKLOAD_OPTIONS="--drop-memberof"
+        fi
+        bulk_stream | measure_stream $BOOT_COUNTS | \
+            python3 -m ldaptools.bulkload \
+            -F /etc/openldap/slapd.d/ $BULKLOAD_OPTIONS
+        boot_event import "bulk load" $PHASE_START $BOOT_COUNTS
+    else
+        import_generated --base
+        import_files /srv/ldap/init/ false
+        if [ "$LDAP_DEMO" = true ]; then
+            import_generated --demo
+        fi
+        import_files /srv/ldap/demo/ false
+        if has_bulk; then
+            echo "Import bulk generated data"
+            import_start=`uptime_seconds`
+            # the default administrator, member of the groups left empty,
+            # is already imported: add its memberOf values afterwards
+            generate_bulk --admin-changes /tmp/bulk_admin_changes.ldif | \
+                measure_stream $BOOT_COUNTS | \
+                slapadd -d $LDAP_LOG_LEVEL -F /etc/openldap/slapd.d/
+            if [ -s /tmp/bulk_admin_changes.ldif ]; then
+                slapmodify -d $LDAP_LOG_LEVEL -F /etc/openldap/slapd.d/ \
+                           -b "$LDAP_ROOT_DC" -l /tmp/bulk_admin_changes.ldif
+            fi
+            rm -f /tmp/bulk_admin_changes.ldif
+            boot_event import "generated bulk" $import_start $BOOT_COUNTS
+        fi
+        if [ "$LDAP_MEMBEROF_MODE" = dynlist ]; then
+            # generated and init files come with memberOf values
+            rewrite_memberof_values --strip
+        fi
+    fi
+    boot_event phase data_import $PHASE_START
+    PHASE_START=`uptime_seconds`
+    echo "Record imported sources in data migrations ledger"
+    migration_stream | \
+        python3 -m ldaptools.migrate -b "$LDAP_ROOT_DC" --record | \
+        slapadd -d $LDAP_LOG_LEVEL -F /etc/openldap/slapd.d/
+    boot_event phase migration_ledger $PHASE_START
 fi
 
+SLAPD_D_MODE=500
+if [ -n "$LDAP_CERTIFICATE_WATCH" ]; then
+    # cn=config modifications are written to slapd.d
+    SLAPD_D_MODE=700
+fi
+OWNERSHIP_START=`uptime_seconds`
+# slapd.d is small and rewritten by slapmodify on each start
 echo "Make slapd.d own and only usable by ldap user"
-chown -R ldap:ldap /etc/openldap/slapd.d/
-chmod -R 500 /etc/openldap/slapd.d/
-chown ldap:ldap -R /var/lib/openldap
+fix_ownership /etc/openldap/slapd.d/ $SLAPD_D_MODE
+OWNERSHIP_MARKER=/var/lib/openldap/.ownership
+if [ "$DATA_CHANGED" = false ] && \
+        [ "`cat $OWNERSHIP_MARKER 2>/dev/null`" = "`ownership_marker`" ]; then
+    echo "Data volume ownership unchanged since last start"
+else
+    echo "Make data volume own by ldap user"
+    fix_ownership /var/lib/openldap
+    ownership_marker > $OWNERSHIP_MARKER
+    chown ldap:ldap $OWNERSHIP_MARKER
+fi
+OWNERSHIP_END=`uptime_seconds`
+echo "Ownership fixed in $(awk -v start=$OWNERSHIP_START \
+    -v end=$OWNERSHIP_END 'BEGIN { printf "%.2f", end - start }')s"
+boot_event phase ownership $OWNERSHIP_START
+
+if [ "$RUN_DATA_MIGRATIONS" = true ]; then
+    PHASE_START=`uptime_seconds`
+    echo "Apply data migrations"
+    migration_stream | \
+        python3 -m ldaptools.migrate -F /etc/openldap/slapd.d/ \
+                                     -b "$LDAP_ROOT_DC"
+    boot_event phase data_migrations $PHASE_START
+fi
+
+if [ -n "$LDAP_CERTIFICATE_WATCH" ] && [ -z "$LDAP_LDAPI_SOCKET" ]; then
+    LDAP_LDAPI_SOCKET=/run/openldap/ldapi
+fi
+if [ -n "$LDAP_METRICS_PORT" ] && [ -z "$LDAP_METRICS_BIND_DN" ] && \
+        [ -z "$LDAP_LDAPI_SOCKET" ]; then
+    # anonymous can not read cn=monitor, use SASL EXTERNAL over ldapi
+    LDAP_LDAPI_SOCKET=/run/openldap/ldapi
+fi
+LDAP_URLS="ldaps://"
+LDAP_LOCAL_URL="ldaps://localhost"
+if [ -n "$LDAP_LDAPI_SOCKET" ]; then
+    # the socket directory may be a volume shared with other containers
+    mkdir -p `dirname "$LDAP_LDAPI_SOCKET"`
+    chown ldap:ldap `dirname "$LDAP_LDAPI_SOCKET"`
+    LDAP_LDAPI_URL="ldapi://`echo "$LDAP_LDAPI_SOCKET" | sed -e 's|/|%2F|g'`"
+    LDAP_URLS="$LDAP_URLS $LDAP_LDAPI_URL"
+    if [ -z "$LDAP_METRICS_BIND_DN" ]; then
+        LDAP_LOCAL_URL=$LDAP_LDAPI_URL
+    fi
+fi
+
+if [ -n "$LDAP_METRICS_PORT" ]; then
+    echo "Run cn=monitor exporter on port $LDAP_METRICS_PORT"
+    python3 -m ldaptools.exporter \
+        -H "$LDAP_LOCAL_URL" \
+        -D "$LDAP_METRICS_BIND_DN" \
+        -w "$LDAP_METRICS_PASSWORD" \
+        --port "$LDAP_METRICS_PORT" &
+fi
+
+if [ -n "$LDAP_CERTIFICATE_WATCH" ]; then
+    echo "Watch certificate files every $LDAP_CERTIFICATE_WATCH seconds"
+    CERTWATCH_OPTIONS=""
+    if [[ -f "$LDAP_CA_CERTIFICATE_PATH" ]]; then
+        CERTWATCH_OPTIONS="--ca $LDAP_CA_CERTIFICATE_PATH"
+    fi
+    python3 -m ldaptools.certwatch \
+        -H "$LDAP_LDAPI_URL" \
+        --cert "$LDAP_CERTIFICATE_PATH" \
+        --key "$LDAP_CERTIFICATE_KEY_PATH" \
+        --interval "$LDAP_CERTIFICATE_WATCH" \
+        $CERTWATCH_OPTIONS &
+fi
+
+if [ -n "$LDAP_BOOT_PROFILE" ]; then
+    # slapd opens its databases once exec'ed, time it from outside
+    SLAPD_START=`uptime_seconds`
+    (
+        python3 -m ldaptools.probe -H "$LDAP_LOCAL_URL" --timeout 600 \
+            --quiet && \
+            boot_event phase slapd_start $SLAPD_START && \
+            boot_event phase boot $BOOT_START
+    ) &
+fi
 
 echo "Run slapd..."
 # exec slapd to give it PID 1 (otherwise signals are not sent properly)
-exec slapd -d $LDAP_LOG_LEVEL -F /etc/openldap/slapd.d -u ldap -g ldap -h "ldaps://"
+exec slapd -d $LDAP_LOG_LEVEL -F /etc/openldap/slapd.d -u ldap -g ldap \
+    -h "$LDAP_URLS"
@@ -2,21 +2,57 @@
 
 set -e
 
-USAGE="Usage: $0 -D Root LDAP DC -P Ldap root password [-h]
+DB_INDEXES="objectClass eq;uid eq,sub;memberOf eq"
+
+USAGE="Usage: $0 -D Root LDAP DC -P Ldap root password [-I Indexes]
+                 [-m Max size] [-c Checkpoint] [-n No sync] [-r Max readers]
+                 [-s Search stack] [-x Read txn size] [-b Last bind]
+                 [-B Last bind precision] [-h]
 
 Template to generate slapd config file
 
 Options:
     -D ROOT LDAP DC       The root ldap dc, should looks like dc=example,dc=com
     -P Ldap root password The ldap root admin password
+    -I Indexes            olcDbIndex values separated by ';' (see
+                          python3 -m ldaptools.indexadvisor)
+                          (default: $DB_INDEXES)
+    -m Max size           LMDB map size in bytes, the maximum database size
+                          (olcDbMaxSize) (default: 1073741824)
+    -c Checkpoint         \`\`kbyte min\`\` checkpoint the database when
+                          kbyte have been written or min minutes elapsed
+                          (olcDbCheckpoint) (default: None)
+    -n No sync            TRUE to not flush to disk on each commit
+                          (olcDbNoSync), a crash may lose last transactions
+                          (default: FALSE)
+    -r Max readers        Maximum reader slots (olcDbMaxReaders)
+                          (default: 126)
+    -s Search stack       Search stack depth (olcDbSearchStack)
+                          (default: 16)
+    -x Read txn size      Entries read before a search renews its read
+                          transaction (olcDbRtxnSize) (default: 10000)
+    -b Last bind          TRUE to record the last successful bind time in
+                          pwdLastSuccess (olcLastBind) (default: FALSE)
+    -B Last bind precision
+                          Seconds pwdLastSuccess is not updated again after
+                          a bind (olcLastBindPrecision) (default: 3600)
     -h                    Show this help.
 "
 
-while getopts "D:P:h" OPTION
+while getopts "D:P:I:m:c:n:r:s:x:b:B:h" OPTION
 do
     case $OPTION in
         D) ROOT_LDAP_DC=$OPTARG;;
         P) LDAP_PASSWORD=$OPTARG;;
+        I) DB_INDEXES=$OPTARG;;
+        m) MAX_SIZE=$OPTARG;;
+        c) CHECKPOINT=$OPTARG;;
+        n) NO_SYNC=$OPTARG;;
+        r) MAX_READERS=$OPTARG;;
+        s) SEARCH_STACK=$OPTARG;;
+        x) RTXN_SIZE=$OPTARG;;
+        b) LAST_BIND=$OPTARG;;
+        B) LAST_BIND_PRECISION=$OPTARG;;
         h) echo "$USAGE";
            exit;;
         *) echo "Unknown parameter while generating lmdb ldif template" >&2;
@@ -34,6 +70,23 @@ if [[ ! $LDAP_PASSWORD ]]; then
     exit 1
 fi
 
+MAX_SIZE=${MAX_SIZE:-1073741824}
+NO_SYNC=${NO_SYNC:-FALSE}
+MAX_READERS=${MAX_READERS:-126}
+SEARCH_STACK=${SEARCH_STACK:-16}
+RTXN_SIZE=${RTXN_SIZE:-10000}
+LAST_BIND=${LAST_BIND:-FALSE}
+LAST_BIND_PRECISION=${LAST_BIND_PRECISION:-3600}
+
+if [[ $CHECKPOINT ]]; then
+    CHECKPOINT="olcDbCheckpoint: $CHECKPOINT"
+else
+    CHECKPOINT="# olcDbCheckpoint: No checkpoint"
+fi
+
+INDEX_LINES=`echo "$DB_INDEXES" | tr ';' '\n' | \
+    sed -e 's/^ *//' -e '/^$/d' -e 's/^/olcDbIndex: /'`
+
 cat << EOF
 #######################################################################
 # LMDB database definitions
@@ -49,10 +102,17 @@ olcRootDN: cn=admin,$ROOT_LDAP_DC
 # should only be accessible by the slapd and slap tools.
 # Mode 700 recommended.
 olcDbDirectory: /var/lib/openldap/openldap-data
-# Indices to maintain
-olcDbIndex: objectClass eq
-olcDbIndex: uid         eq,sub
-#olcDbIndex: memberof    eq
+olcDbMaxSize: $MAX_SIZE
+$CHECKPOINT
+olcDbNoSync: $NO_SYNC
+olcDbMaxReaders: $MAX_READERS
+olcDbSearchStack: $SEARCH_STACK
+olcDbRtxnSize: $RTXN_SIZE
+olcLastBind: $LAST_BIND
+olcLastBindPrecision: $LAST_BIND_PRECISION
+# Indices to maintain, memberOf is used by applications to check group
+# membership (ie: Apache \`\`Require ldap-filter\`\`)
+$INDEX_LINES
 # Cleartext passwords, especially for the rootdn, should
 # be avoided.  See slappasswd(8) and slapd-config(5) for details.
 # Use of strong authentication encouraged.
@@ -0,0 +1,46 @@
+#!/bin/sh
+
+set -e
+
+USAGE="Usage: $0 -D Root LDAP DC [-h]
+
+Template to generate the monitor database (cn=monitor) ldif config, only
+readable by the ldap root account and ldap_monitor group members
+
+Options:
+    -D ROOT LDAP DC       The root ldap dc, should looks like dc=example,dc=com
+    -h                    Show this help.
+"
+
+while getopts "D:h" OPTION
+do
+    case $OPTION in
+        D) ROOT_LDAP_DC=$OPTARG;;
+        h) echo "$USAGE";
+           exit;;
+        *) echo "Unknown parameter while generating monitor ldif template" >&2;
+           echo "$USAGE" >&2;
+           exit 1;;
+    esac
+done
+
+if [[ ! $ROOT_LDAP_DC ]]; then
+    echo "Root LDAP DC is required while generating monitor ldif template" >&2
+    exit 1
+fi
+
+cat << EOF
+#######################################################################
+# Monitor database, operations/connections/threads counters used by
+# ldaptools.exporter
+#######################################################################
+dn: olcDatabase=monitor,cn=config
+objectClass: olcDatabaseConfig
+olcDatabase: monitor
+olcRootDN: cn=admin,$ROOT_LDAP_DC
+olcAccess: {0}
+  to dn.subtree="cn=monitor"
+    by group.exact="cn=ldap_monitor,ou=groups,$ROOT_LDAP_DC" read
+    by * none
+
+EOF
@@ -2,7 +2,12 @@
 
 set -e
 
-USAGE="Usage: $0 -D Root LDAP DC -u ldap admin uid [-h]
+MEMBEROF_MODE=overlay
+PPOLICY_DISABLE_WRITE=FALSE
+ONLY_OVERLAY=""
+
+USAGE="Usage: $0 -D Root LDAP DC -u ldap admin uid [-m mode] [-O overlay]
+                 [-W Disable write] [-h]
 
 Template to generate slapd config file
 
@@ -10,14 +15,26 @@ Options:
     -D ROOT LDAP DC     The root ldap dc, should looks like dc=example,dc=com
     -u ldap admin uid   Ldap default administrator (the one under ou=people)
                         use as default member in groupOfNames
+    -m MODE             How memberOf is provided: overlay (the memberof
+                        overlay stores it on member entries) or dynlist
+                        (computed on read), the overlay of the other mode is
+                        rendered disabled (default: $MEMBEROF_MODE)
+    -O OVERLAY          Only render this overlay entry (memberof, refint,
+                        ppolicy or dynlist)
+    -W Disable write    TRUE so ppolicy never writes on binds (no failure
+                        counter, lockout disabled) (olcPPolicyDisableWrite)
+                        (default: $PPOLICY_DISABLE_WRITE)
     -h                  Show this help.
 "
 
-while getopts "D:u:h" OPTION
+while getopts "D:u:m:O:W:h" OPTION
 do
     case $OPTION in
         D) ROOT_LDAP_DC=$OPTARG;;
         u) ADMIN_UID=$OPTARG;;
+        m) MEMBEROF_MODE=$OPTARG;;
+        O) ONLY_OVERLAY=$OPTARG;;
+        W) PPOLICY_DISABLE_WRITE=$OPTARG;;
         h) echo "$USAGE";
            exit;;
         *) echo "Unknown parameter while generating overlay ldif template" >&2;
@@ -36,6 +53,22 @@ if [[ ! $ADMIN_UID ]]; then
     exit 1
 fi
 
+case "$MEMBEROF_MODE" in
+    overlay)
+        MEMBEROF_DISABLED=FALSE
+        DYNLIST_DISABLED=TRUE
+        REFINT_ATTRIBUTES="memberOf member";;
+    dynlist)
+        MEMBEROF_DISABLED=TRUE
+        DYNLIST_DISABLED=FALSE
+        # memberOf is not stored, only member values need to be kept
+        REFINT_ATTRIBUTES="member";;
+    *)
+        echo "Unknown memberOf mode $MEMBEROF_MODE (overlay or dynlist)" >&2
+        exit 1;;
+esac
+
+if [[ ! $ONLY_OVERLAY || $ONLY_OVERLAY == memberof ]]; then
 cat << EOF
 dn: olcOverlay=memberof,olcDatabase={1}mdb,cn=config
 objectClass: olcConfig
@@ -43,22 +76,32 @@ objectClass: olcMemberOf
 objectClass: olcOverlayConfig
 objectClass: top
 olcOverlay: memberof
+olcDisabled: $MEMBEROF_DISABLED
 olcMemberOfDangling: drop
 olcMemberOfRefInt: TRUE
 olcMemberOfGroupOC: groupOfNames
 olcMemberOfMemberAD: member
 olcMemberOfMemberOfAD: memberOf
 
+EOF
+fi
+
+if [[ ! $ONLY_OVERLAY || $ONLY_OVERLAY == refint ]]; then
+cat << EOF
 dn: olcOverlay=refint,olcDatabase={1}mdb,cn=config
 objectClass: olcConfig
 objectClass: olcOverlayConfig
 objectClass: olcRefintConfig
 objectClass: top
 olcOverlay: refint
-olcRefintAttribute: memberOf
-olcRefintAttribute: member
+$(for attribute in $REFINT_ATTRIBUTES; do echo "olcRefintAttribute: $attribute"; done)
 olcRefintNothing: uid=$ADMIN_UID,ou=people,$ROOT_LDAP_DC
 
+EOF
+fi
+
+if [[ ! $ONLY_OVERLAY || $ONLY_OVERLAY == ppolicy ]]; then
+cat << EOF
 dn: olcOverlay=ppolicy,olcDatabase={1}mdb,cn=config
 objectClass: olcConfig
 objectClass: olcOverlayConfig
@@ -68,6 +111,23 @@ olcOverlay: ppolicy
 olcPPolicyDefault: cn=default,ou=policies,$ROOT_LDAP_DC
 olcPPolicyHashCleartext: TRUE
 olcPPolicyUseLockout: TRUE
-olcPPolicyForwardUpdates: FALSE
+olcPPolicyDisableWrite: $PPOLICY_DISABLE_WRITE
 
 EOF
+fi
+
+# dynlist computes memberOf of groupOfNames members while reading entries
+# (and filters), group changes do not rewrite member entries
+if [[ ! $ONLY_OVERLAY || $ONLY_OVERLAY == dynlist ]]; then
+cat << EOF
+dn: olcOverlay=dynlist,olcDatabase={1}mdb,cn=config
+objectClass: olcConfig
+objectClass: olcOverlayConfig
+objectClass: olcDynListConfig
+objectClass: top
+olcOverlay: dynlist
+olcDisabled: $DYNLIST_DISABLED
+olcDynListAttrSet: groupOfURLs memberURL member+memberOf@groupOfNames
+
+EOF
+fi
@@ -0,0 +1,181 @@
+#!/bin/sh
+
+set -e
+
+USAGE="Usage: $0 -D Root LDAP DC -r Role -M Database DN [-i Server ID]
+                 [-U Provider urls] [-B Bind DN] [-W Bind password]
+                 [-A CA path] [-S] [-L] [-h]
+
+Template to generate the replication ldif, as slapmodify changes of an
+existing cn=config, for the given role:
+
+* provider: syncprov overlay, consumers read from this server
+* consumer: read only copy of the providers (olcSyncrepl), writes are
+  referred to the first provider (olcUpdateRef)
+* mirror: multi provider, syncprov overlay and olcSyncrepl of all other
+  providers (olcMultiProvider)
+
+Settings of the other roles are removed from the database.
+
+Options:
+    -D ROOT LDAP DC       The root ldap dc, should looks like dc=example,dc=com
+    -r Role               provider, consumer or mirror
+    -M Database DN        Replicated database config DN
+                          (ie: olcDatabase={1}mdb,cn=config)
+    -i Server ID          Unique server id, required by mirror (default: 1)
+    -U Provider urls      Space separated provider urls (ldaps://host), a
+                          mirror can list itself, its own url is ignored
+                          while it matches -i position (1 based)
+    -B Bind DN            DN used by consumers to read providers
+                          (default: cn=admin,ROOT LDAP DC)
+    -W Bind password      Clear text password of the bind DN
+    -A CA path            Certificate authority used to check providers
+                          certificates (default: system CA)
+    -S                    Add the syncprov overlay entry (not present yet)
+    -L                    Add the bind DN limits (not present yet)
+    -h                    Show this help.
+"
+
+while getopts "D:r:M:i:U:B:W:A:SLh" OPTION
+do
+    case $OPTION in
+        D) ROOT_LDAP_DC=$OPTARG;;
+        r) ROLE=$OPTARG;;
+        M) DATABASE_DN=$OPTARG;;
+        i) SERVER_ID=$OPTARG;;
+        U) PROVIDERS=$OPTARG;;
+        B) BIND_DN=$OPTARG;;
+        W) BIND_PASSWORD=$OPTARG;;
+        A) CA_PATH=$OPTARG;;
+        S) ADD_SYNCPROV=true;;
+        L) ADD_LIMITS=true;;
+        h) echo "$USAGE";
+           exit;;
+        *) echo "Unknown parameter while generating replication ldif template" >&2;
+           echo "$USAGE" >&2;
+           exit 1;;
+    esac
+done
+
+if [[ ! $ROOT_LDAP_DC ]]; then
+    echo "Root LDAP DC is required while generating replication ldif template" >&2
+    exit 1
+fi
+if [[ ! $DATABASE_DN ]]; then
+    echo "Database DN is required while generating replication ldif template" >&2
+    exit 1
+fi
+case "$ROLE" in
+    provider|consumer|mirror) ;;
+    *) echo "Unknown replication role: '$ROLE'" >&2
+       exit 1;;
+esac
+if [[ $ROLE != provider ]] && [[ ! $PROVIDERS ]]; then
+    echo "Provider urls are required by $ROLE role" >&2
+    exit 1
+fi
+if [[ $ROLE != provider ]] && [[ ! $BIND_PASSWORD ]]; then
+    echo "Bind password is required by $ROLE role" >&2
+    exit 1
+fi
+
+SERVER_ID=${SERVER_ID:-1}
+BIND_DN=${BIND_DN:-"cn=admin,$ROOT_LDAP_DC"}
+
+if [[ -f $CA_PATH ]]; then
+    TLS_CA=" tls_cacert=$CA_PATH"
+else
+    TLS_CA=""
+fi
+
+if [[ $ROLE != consumer ]]; then
+    cat << EOF
+dn: cn=config
+changetype: modify
+replace: olcServerID
+olcServerID: $SERVER_ID
+
+EOF
+fi
+
+if [[ $ADD_SYNCPROV ]] && [[ $ROLE != consumer ]]; then
+    cat << EOF
+dn: olcOverlay=syncprov,$DATABASE_DN
+changetype: add
+objectClass: olcOverlayConfig
+objectClass: olcSyncProvConfig
+olcOverlay: syncprov
+# checkpoint the contextCSN every 100 operations or 10 minutes
+olcSpCheckpoint: 100 10
+# keep the last operations to answer consumers with a delta instead of
+# a full refresh after a short disconnection
+olcSpSessionLog: 10000
+
+EOF
+fi
+
+# other olcLimits values may have been set by the operator, only the
+# bind DN one is added
+echo "dn: $DATABASE_DN"
+echo "changetype: modify"
+if [[ $ADD_LIMITS ]]; then
+    cat << EOF
+add: olcLimits
+olcLimits: dn.exact="$BIND_DN" time=unlimited size=unlimited
+-
+EOF
+fi
+
+# replace without value removes the attribute if present
+if [[ $ROLE = provider ]]; then
+    cat << EOF
+replace: olcSyncrepl
+-
+replace: olcUpdateRef
+-
+replace: olcMultiProvider
+
+EOF
+    exit
+fi
+
+echo "replace: olcSyncrepl"
+RID=0
+for PROVIDER in $PROVIDERS; do
+    RID=$((RID + 1))
+    if [[ $ROLE = mirror ]] && [[ $RID = $SERVER_ID ]]; then
+        continue
+    fi
+    cat << EOF
+olcSyncrepl: rid=`printf "%03d" $RID`
+  provider=$PROVIDER
+  bindmethod=simple
+  binddn="$BIND_DN"
+  credentials="$BIND_PASSWORD"
+  searchbase="$ROOT_LDAP_DC"
+  type=refreshAndPersist
+  retry="5 5 60 +"
+  timeout=5
+  tls_reqcert=demand$TLS_CA
+EOF
+done
+
+if [[ $ROLE = mirror ]]; then
+    cat << EOF
+-
+replace: olcMultiProvider
+olcMultiProvider: TRUE
+-
+replace: olcUpdateRef
+
+EOF
+else
+    cat << EOF
+-
+replace: olcUpdateRef
+olcUpdateRef: ${PROVIDERS%% *}
+-
+replace: olcMultiProvider
+
+EOF
+fi
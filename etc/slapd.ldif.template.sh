@@ -4,7 +4,12 @@ set -e
 
 USAGE="Usage: $0 -C Certificate path -K Certificate key file
                  [-A CA path] [-V TLS Verify client]
-                 [-S CIPHER suite] [-h]
+                 [-S CIPHER suite] [-P TLS protocol min]
+                 [-e ECDH curves] [-d DH params file]
+                 [-T Tool threads] [-R Root DN] [-m]
+                 [-t Threads] [-l Listener threads]
+                 [-H Password hash] [-M Password hash module]
+                 [-c Crypt salt format] [-h]
 
 Template to generate slapd ldif config file
 
@@ -14,12 +19,42 @@ Options:
     -A CA path              Certificate authority in case of self signed
                             certificate (default: None)
     -V TLS Verify Client    (default: never)
-    -S CIPHER suite         (default: DEFAULT)
+    -S CIPHER suite         OpenSSL cipher list (olcTLSCipherSuite)
+                            (default: DEFAULT)
+    -P TLS protocol min     Lowest TLS version accepted, 3.3 for TLS 1.2,
+                            3.4 for TLS 1.3 (olcTLSProtocolMin)
+                            (default: 3.3)
+    -e ECDH curves          Colon separated curves offered for key exchange,
+                            ie: X25519:P-256 (olcTLSECName)
+                            (default: None, OpenSSL defaults)
+    -d DH params file       Diffie-Hellman parameters of DHE ciphers
+                            (olcTLSDHParamFile)
+                            (default: None, no DHE cipher)
+    -T Tool threads         Threads used by slap tools (slapadd, slapindex)
+                            to build indexes (default: 1)
+    -R Root DN              Database root DN the local root user is mapped
+                            to while using SASL EXTERNAL over ldapi://
+                            (default: None, no mapping)
+    -m                      Let the root DN manage cn=config over ldapi://
+                            only (certificate reload)
+    -t Threads              Size of the slapd operation thread pool
+                            (olcThreads) (default: 16)
+    -l Listener threads     Threads handling incoming connections
+                            (olcListenerThreads), a power of 2 (default: 1)
+    -H Password hash        Scheme of passwords hashed by slapd (ppolicy
+                            cleartext passwords, password modify extended
+                            operation) (olcPasswordHash) (default: {SSHA})
+    -M Hash module          Module (and its parameters) providing the
+                            password hash scheme, ie: argon2.so memory=19456
+                            (default: None, built-in scheme)
+    -c Crypt salt format    {CRYPT} salt format, select the crypt(3) algorithm
+                            and its cost (olcPasswordCryptSaltFormat)
+                            (default: \$6\$rounds=5000\$%.16s)
     -h
 "
 
 
-while getopts "C:K:A:V:h" OPTION
+while getopts "C:K:A:V:S:P:e:d:T:R:mt:l:H:M:c:h" OPTION
 do
     case $OPTION in
         C) CERTIF_PATH=$OPTARG;;
@@ -27,6 +62,17 @@ do
         A) CA_PATH=$OPTARG;;
         V) TLS_VERIF_CLIENT=$OPTARG;;
         S) CIPHER=$OPTARG;;
+        P) TLS_PROTOCOL_MIN=$OPTARG;;
+        e) TLS_EC_CURVES=$OPTARG;;
+        d) TLS_DH_PARAMS=$OPTARG;;
+        T) TOOL_THREADS=$OPTARG;;
+        R) ROOT_DN=$OPTARG;;
+        m) MANAGE_CONFIG=true;;
+        t) THREADS=$OPTARG;;
+        l) LISTENER_THREADS=$OPTARG;;
+        H) PASSWORD_HASH=$OPTARG;;
+        M) PASSWORD_HASH_MODULE=$OPTARG;;
+        c) CRYPT_SALT_FORMAT=$OPTARG;;
         h) echo "$USAGE";
            exit;;
         *) echo "Unknown parameter while generating slapd ldif template" >&2;
@@ -52,6 +98,44 @@ fi
 
 TLS_VERIF_CLIENT=${TLS_VERIF_CLIENT:-never}
 CIPHER=${CIPHER:-DEFAULT}
+TLS_PROTOCOL_MIN=${TLS_PROTOCOL_MIN:-3.3}
+TOOL_THREADS=${TOOL_THREADS:-1}
+THREADS=${THREADS:-16}
+LISTENER_THREADS=${LISTENER_THREADS:-1}
+PASSWORD_HASH=${PASSWORD_HASH:-"{SSHA}"}
+CRYPT_SALT_FORMAT=${CRYPT_SALT_FORMAT:-'$6$rounds=5000$%.16s'}
+
+if [[ $PASSWORD_HASH_MODULE ]]; then
+    PASSWORD_HASH_MODULE="olcModuleload: $PASSWORD_HASH_MODULE"
+else
+    PASSWORD_HASH_MODULE="# olcModuleload: built-in password hash scheme"
+fi
+
+if [[ $TLS_EC_CURVES ]]; then
+    TLS_EC_CURVES="olcTLSECName: $TLS_EC_CURVES"
+else
+    TLS_EC_CURVES="# olcTLSECName: OpenSSL default curves"
+fi
+
+if [[ $TLS_DH_PARAMS ]]; then
+    TLS_DH_PARAMS="olcTLSDHParamFile: $TLS_DH_PARAMS"
+else
+    TLS_DH_PARAMS="# olcTLSDHParamFile: No DH params provided"
+fi
+
+if [[ $ROOT_DN ]]; then
+    # local root (uid 0) connecting through ldapi:// with SASL EXTERNAL
+    AUTHZ_REGEXP="olcAuthzRegexp: {0}\"gidNumber=0\\+uidNumber=0,cn=peercred,cn=external,cn=auth\" \"$ROOT_DN\""
+else
+    AUTHZ_REGEXP="# olcAuthzRegexp: No local root mapping"
+fi
+
+if [[ $ROOT_DN ]] && [[ $MANAGE_CONFIG ]]; then
+    # cn=config changes at run time (ie: certificate reload) over ldapi://
+    CONFIG_ACCESS="olcAccess: {0}to * by dn.exact=\"$ROOT_DN\" sockurl.regex=\"^ldapi://\" manage by * none"
+else
+    CONFIG_ACCESS="olcAccess: {0}to * by * none"
+fi
 
 cat << EOF
 #
@@ -65,12 +149,20 @@ olcTLSCertificateFile: $CERTIF_PATH
 olcTLSCertificateKeyFile: $CERTIF_KEY_PATH
 olcTLSVerifyClient: $TLS_VERIF_CLIENT
 olcTLSCipherSuite: $CIPHER
+olcTLSProtocolMin: $TLS_PROTOCOL_MIN
+$TLS_EC_CURVES
+$TLS_DH_PARAMS
 $CA_PATH
 #
 # Define global ACLs to disable default read access.
 #
 olcPidFile: /run/openldap/slapd.pid
 olcArgsFile: /run/openldap/slapd.args
+olcToolThreads: $TOOL_THREADS
+olcThreads: $THREADS
+olcListenerThreads: $LISTENER_THREADS
+olcPasswordCryptSaltFormat: $CRYPT_SALT_FORMAT
+$AUTHZ_REGEXP
 #
 # Do not enable referrals until AFTER you have a working directory
 # service AND an understanding of referrals.
@@ -91,7 +183,10 @@ olcModulepath: /usr/lib/openldap
 olcModuleload: memberof.so
 olcModuleload: refint.so
 olcModuleload: ppolicy.so
+olcModuleload: dynlist.so
 olcModuleload: back_mdb.so
+olcModuleload: back_monitor.so
+$PASSWORD_HASH_MODULE
 
 dn: cn=schema,cn=config
 objectClass: olcSchemaConfig
@@ -101,6 +196,7 @@ include: file:///etc/openldap/schema/core.ldif
 include: file:///etc/openldap/schema/cosine.ldif
 include: file:///etc/openldap/schema/inetorgperson.ldif
 include: file:///etc/openldap/schema/nis.ldif
+include: file:///etc/openldap/schema/dyngroup.ldif
 
 # Frontend settings
 #
@@ -108,5 +204,11 @@ dn: olcDatabase=frontend,cn=config
 objectClass: olcDatabaseConfig
 objectClass: olcFrontendConfig
 olcDatabase: frontend
+olcPasswordHash: $PASSWORD_HASH
+
+dn: olcDatabase=config,cn=config
+objectClass: olcDatabaseConfig
+olcDatabase: config
+$CONFIG_ACCESS
 
 EOF
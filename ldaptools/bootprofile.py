@@ -0,0 +1,175 @@
+"""Compare container start time profiles written by entrypoint.sh::
+
+    docker logs ldap-2.6.5 > old.log; docker logs ldap-2.6.6 > new.log
+    python3 -m ldaptools.bootprofile old.log new.log
+
+With ``LDAP_BOOT_PROFILE`` set, entrypoint.sh writes one json line per
+startup phase (``"event": "phase"``) and per imported file or generated
+tree (``"event": "import"`` with ``entries`` and ``bytes``)::
+
+    {"event": "phase", "name": "config_import", "boot": "...",
+     "version": "2.6.6-r1", "at": 0.41, "seconds": 0.25}
+
+``at`` is the phase end since the start of the entrypoint, the last
+``boot`` phase ends when slapd answers. Other log lines are ignored, a
+file may hold several starts (distinct ``boot`` values): each profile
+reports the median duration of each event over its starts, next to the
+difference with the first profile.
+"""
+import argparse
+import json
+import sys
+
+from collections import OrderedDict
+
+
+def read_events(stream):
+    """Yield boot profile events found in a log stream"""
+    for line in stream:
+        line = line.strip()
+        if not line.startswith('{'):
+            continue
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(event, dict) and event.get('event') in (
+                'phase', 'import'
+        ):
+            yield event
+
+
+def median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2
+
+
+class Profile(object):
+    """Events of the starts of one image version (or log file)"""
+
+    def __init__(self, label):
+        self.label = label
+        self.boots = set()
+        self.versions = set()
+        # (event, name) -> [event, ...] in the order they were seen
+        self.events = OrderedDict()
+
+    def add(self, event):
+        self.boots.add(event.get('boot'))
+        if event.get('version'):
+            self.versions.add(event['version'])
+        self.events.setdefault(
+            (event['event'], event['name']), []
+        ).append(event)
+
+    def seconds(self, key):
+        events = self.events.get(key)
+        if not events:
+            return None
+        return median([event['seconds'] for event in events])
+
+    def entries(self, key):
+        events = self.events.get(key) or []
+        counts = [event['entries'] for event in events if 'entries' in event]
+        return median(counts) if counts else None
+
+
+def load_profiles(streams, labels, by_version=False):
+    """Return profiles of events read from ``streams``, one per stream or
+    one per image version"""
+    profiles = OrderedDict()
+    for stream, label in zip(streams, labels):
+        for event in read_events(stream):
+            key = event.get('version', '') if by_version else label
+            if key not in profiles:
+                profiles[key] = Profile(key)
+            profiles[key].add(event)
+    return list(profiles.values())
+
+
+def compare(profiles):
+    """Yield ``(event, name, [(seconds, entries), ...])`` rows, events of
+    all profiles in the order they were first seen"""
+    keys = OrderedDict()
+    for profile in profiles:
+        for key in profile.events:
+            keys[key] = True
+    for key in keys:
+        yield key[0], key[1], [
+            (profile.seconds(key), profile.entries(key))
+            for profile in profiles
+        ]
+
+
+def format_seconds(value):
+    return "-" if value is None else "%.2f" % value
+
+
+def report(profiles, stream):
+    if not profiles:
+        stream.write("No boot profile event found\n")
+        return
+    stream.write("%-40s" % "event")
+    for index, profile in enumerate(profiles):
+        stream.write(" %12s" % profile.label[-12:])
+        if index:
+            stream.write(" %8s" % "delta")
+    stream.write("\n%-40s" % "starts")
+    for index, profile in enumerate(profiles):
+        stream.write(" %12d" % len(profile.boots))
+        if index:
+            stream.write(" %8s" % "")
+    stream.write("\n")
+    for event, name, values in compare(profiles):
+        label = name if event == 'phase' else "  import %s" % name
+        stream.write("%-40s" % label[-40:])
+        first = values[0][0]
+        for index, (seconds, entries) in enumerate(values):
+            stream.write(" %12s" % format_seconds(seconds))
+            if index:
+                delta = None
+                if seconds is not None and first is not None:
+                    delta = seconds - first
+                stream.write(" %8s" % (
+                    "-" if delta is None else "%+.2f" % delta
+                ))
+        entries = [entries for _, entries in values if entries is not None]
+        if entries:
+            stream.write("  (%d entries)" % max(entries))
+        stream.write("\n")
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog="python3 -m ldaptools.bootprofile",
+        description="Compare container start time profiles written by "
+                    "entrypoint.sh (LDAP_BOOT_PROFILE)",
+    )
+    parser.add_argument(
+        "files", nargs="*", type=argparse.FileType('r'),
+        default=[sys.stdin],
+        help="Container logs or profile files, the first one is the "
+             "reference (default: stdin)",
+    )
+    parser.add_argument(
+        "--by-version", action="store_true",
+        help="One profile per image version found in events instead of "
+             "one per file",
+    )
+    return parser
+
+
+def main(argv=None):
+    args = get_parser().parse_args(argv)
+    profiles = load_profiles(
+        args.files, [stream.name for stream in args.files],
+        by_version=args.by_version
+    )
+    report(profiles, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Load a whole LDIF stream with a single quick mode ``slapadd`` run::
+
+    cat 00_base.ldif 10_people.ldif 20_groups.ldif | \\
+        python3 -m ldaptools.bulkload -F /etc/openldap/slapd.d/
+
+Entries are re-ordered parents first (by dn depth, keeping the original
+order otherwise) so files can be concatenated in any order, then written
+to ``slapadd -q``. As slapadd bypasses the memberof overlay, ``memberOf``
+values are computed once from the ``member`` values of the groups found in
+the stream instead of trusting hand written values, or dropped when
+memberOf is computed by the dynlist overlay (``--drop-memberof``).
+"""
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+
+from .ldif import dn_depth, normalize_dn, parse_line, read_records
+
+# keep up to 64MB of entries per dn depth in memory before using disk
+SPOOL_SIZE = 64 * 1024 * 1024
+
+
+class DepthSortedStream(object):
+    """Spool ldif records by dn depth and collect group memberships"""
+
+    def __init__(self, group_class='groupOfNames', member_attr='member',
+                 member_of_attr='memberOf', compute_member_of=True,
+                 drop_member_of=False):
+        self.group_class = group_class.lower()
+        self.member_attr = member_attr.lower()
+        self.member_of_attr = member_of_attr
+        self.compute_member_of = compute_member_of and not drop_member_of
+        self.drop_member_of = drop_member_of
+        self.buckets = {}
+        self.member_of = {}
+        self.count = 0
+
+    def add(self, record):
+        name, dn = parse_line(record[0])
+        if name.lower() != 'dn':
+            raise ValueError("ldif record must start with dn: %r" % record[0])
+        if self.compute_member_of or self.drop_member_of:
+            attributes = [parse_line(line) for line in record[1:]]
+            is_group = any(
+                name.lower() == 'objectclass' and
+                value.lower() == self.group_class
+                for name, value in attributes
+            )
+            if is_group and self.compute_member_of:
+                for name, value in attributes:
+                    if name.lower() == self.member_attr:
+                        self.member_of.setdefault(
+                            normalize_dn(value), []
+                        ).append(dn)
+            record = [record[0]] + [
+                line for line, (name, _) in zip(record[1:], attributes)
+                if name.lower() != self.member_of_attr.lower()
+            ]
+        depth = dn_depth(dn)
+        if depth not in self.buckets:
+            self.buckets[depth] = tempfile.SpooledTemporaryFile(
+                max_size=SPOOL_SIZE, mode='w+', encoding='utf-8'
+            )
+        self.buckets[depth].write('\n'.join(record) + '\n\n')
+        self.count += 1
+
+    def write(self, stream):
+        for depth in sorted(self.buckets):
+            bucket = self.buckets.pop(depth)
+            bucket.seek(0)
+            for record in read_records(bucket):
+                stream.write('\n'.join(record) + '\n')
+                if self.compute_member_of:
+                    _, dn = parse_line(record[0])
+                    for group_dn in self.member_of.get(normalize_dn(dn), []):
+                        stream.write(
+                            "%s: %s\n" % (self.member_of_attr, group_dn)
+                        )
+                stream.write('\n')
+            bucket.close()
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog="python3 -m ldaptools.bulkload",
+        description="Load ldif entries read on stdin in one slapadd -q run",
+    )
+    parser.add_argument(
+        "-F", dest="config_dir", default="/etc/openldap/slapd.d/",
+        help="slapd config directory (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-d", dest="debug_level",
+        help="slapadd debug level, no debug output if not set",
+    )
+    member_of = parser.add_mutually_exclusive_group()
+    member_of.add_argument(
+        "--keep-memberof", action="store_true",
+        help="Keep memberOf values found in the stream instead of computing "
+             "them from groups member attributes",
+    )
+    member_of.add_argument(
+        "--drop-memberof", action="store_true",
+        help="Drop memberOf values found in the stream, memberOf is "
+             "computed by the dynlist overlay",
+    )
+    parser.add_argument(
+        "--no-quick", action="store_true",
+        help="Do not use slapadd quick mode (-q), keep consistency checks",
+    )
+    return parser
+
+
+def main(argv=None):
+    args = get_parser().parse_args(argv)
+    start = time.time()
+    stream = DepthSortedStream(
+        compute_member_of=not args.keep_memberof,
+        drop_member_of=args.drop_memberof
+    )
+    for record in read_records(sys.stdin):
+        stream.add(record)
+    sorted_at = time.time()
+
+    command = ["slapadd", "-F", args.config_dir]
+    if not args.no_quick:
+        command.append("-q")
+    if args.debug_level:
+        command += ["-d", args.debug_level]
+    slapadd = subprocess.Popen(
+        command, stdin=subprocess.PIPE, universal_newlines=True,
+        encoding='utf-8'
+    )
+    stream.write(slapadd.stdin)
+    slapadd.stdin.close()
+    if slapadd.wait():
+        sys.exit("slapadd failed with exit code %d" % slapadd.returncode)
+
+    duration = time.time() - start
+    print(
+        "Bulk load: %d entries in %.2fs (sort %.2fs), %.0f entries/s" % (
+            stream.count, duration, sorted_at - start,
+            stream.count / duration if duration else 0
+        ),
+        file=sys.stderr
+    )
+
+
+if __name__ == "__main__":
+    main()
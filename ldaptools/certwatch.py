@@ -0,0 +1,164 @@
+"""Reload renewed TLS certificates without restarting slapd::
+
+    python3 -m ldaptools.certwatch -H ldapi://%2Frun%2Fopenldap%2Fldapi \\
+        --cert /ssl/ldap.example.com.crt --key /ssl/ldap.example.com.key
+
+The certificate, key and CA files are polled every ``--interval`` seconds
+(mtime, size and inode, so renewals replacing symlinks are seen too). A
+change is applied once files stayed unchanged for one interval (a renewal
+writes several files), after checking the key matches the certificate.
+Replacing ``olcTLSCertificateFile`` / ``olcTLSCertificateKeyFile`` (and
+``olcTLSCACertificateFile``) in ``cn=config``, even with the same paths,
+makes slapd build a new TLS context used by new connections: established
+connections are kept. ``cn=config`` is modified over ``ldapi://`` with
+SASL EXTERNAL, the local root user is granted ``manage`` on it.
+"""
+import argparse
+import os
+import ssl
+import sys
+import time
+
+from ldap3 import MODIFY_REPLACE
+from ldap3.core.exceptions import LDAPException
+
+from .connection import connect
+from .probe import default_url
+
+
+class InvalidCertificate(ValueError):
+    pass
+
+
+def fingerprint(paths):
+    """Return what identifies the content of ``paths`` without reading
+    them, ``None`` for missing files"""
+    result = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            result.append((path, None))
+            continue
+        result.append((path, stat.st_mtime_ns, stat.st_size, stat.st_ino))
+    return tuple(result)
+
+
+def validate(cert, key, ca=None):
+    """Raise ``InvalidCertificate`` unless ``key`` is the private key of
+    ``cert`` (and ``ca`` a readable certificate bundle)"""
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    try:
+        context.load_cert_chain(cert, key)
+        if ca:
+            context.load_verify_locations(ca)
+    except (OSError, ssl.SSLError) as err:
+        raise InvalidCertificate("%s / %s: %s" % (cert, key, err))
+
+
+def reload_tls(url, cert, key, ca=None):
+    """Replace the certificate settings of ``cn=config`` served at ``url``
+    """
+    changes = {
+        'olcTLSCertificateFile': [(MODIFY_REPLACE, [cert])],
+        'olcTLSCertificateKeyFile': [(MODIFY_REPLACE, [key])],
+    }
+    if ca:
+        changes['olcTLSCACertificateFile'] = [(MODIFY_REPLACE, [ca])]
+    con = connect(url)
+    try:
+        if not con.modify('cn=config', changes):
+            raise LDAPException("cn=config modify failed: %r" % con.result)
+    finally:
+        con.unbind()
+
+
+class CertificateWatcher(object):
+    """Apply certificate files changes once they settled"""
+
+    def __init__(self, cert, key, ca=None, reload=None, check=validate):
+        self.cert = cert
+        self.key = key
+        self.ca = ca
+        self.reload = reload
+        self.check = check
+        self.paths = [path for path in (cert, key, ca) if path]
+        # files read by slapd on start
+        self.applied = fingerprint(self.paths)
+        self.pending = self.applied
+        self.rejected = None
+
+    def poll(self):
+        """Return True if slapd was asked to reload the certificate"""
+        current = fingerprint(self.paths)
+        if current == self.applied or current == self.rejected:
+            return False
+        if current != self.pending:
+            # changed since last poll, wait for the renewal to complete
+            self.pending = current
+            return False
+        try:
+            self.check(self.cert, self.key, self.ca)
+        except InvalidCertificate as err:
+            print("Ignore certificate change: %s" % err, file=sys.stderr)
+            self.rejected = current
+            return False
+        try:
+            self.reload(self.cert, self.key, self.ca)
+        except LDAPException as err:
+            # slapd not started yet or restarting, retry on next poll
+            print("Can't reload certificate: %s" % err, file=sys.stderr)
+            return False
+        print("Certificate reloaded: %s" % self.cert, file=sys.stderr)
+        self.applied = current
+        return True
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog="python3 -m ldaptools.certwatch",
+        description="Reload renewed TLS certificates through cn=config",
+    )
+    parser.add_argument(
+        "-H", dest="url", default=default_url(),
+        help="ldapi:// url of slapd (default: %(default)s)",
+    )
+    parser.add_argument("--cert", required=True, help="Certificate file")
+    parser.add_argument("--key", required=True, help="Private key file")
+    parser.add_argument("--ca", help="Certificate authority file")
+    parser.add_argument(
+        "--interval", type=float, default=60,
+        help="Seconds between file checks (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--once", action="store_true",
+        help="Validate and reload the certificate now, then exit",
+    )
+    return parser
+
+
+def main(argv=None):
+    args = get_parser().parse_args(argv)
+
+    def reload(cert, key, ca):
+        reload_tls(args.url, cert, key, ca)
+
+    if args.once:
+        try:
+            validate(args.cert, args.key, args.ca)
+            reload(args.cert, args.key, args.ca)
+        except (InvalidCertificate, LDAPException) as err:
+            sys.exit("Can't reload certificate: %s" % err)
+        return
+    watcher = CertificateWatcher(args.cert, args.key, args.ca, reload=reload)
+    print(
+        "Watch %s every %ss" % (", ".join(watcher.paths), args.interval),
+        file=sys.stderr
+    )
+    while True:
+        time.sleep(args.interval)
+        watcher.poll()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""ldap3 connections shared by the ldaptools commands
+
+Inside the container slapd can listen on a unix socket
+(``LDAP_LDAPI_SOCKET``), local tools should prefer it: no TLS handshake,
+no TCP, and the connecting uid is mapped to an identity (SASL EXTERNAL,
+root is mapped to the root DN by ``olcAuthzRegexp``).
+"""
+from ldap3 import Server, Connection, EXTERNAL, NONE, SASL
+from urllib.parse import quote
+
+DEFAULT_LDAPI_SOCKET = "/run/openldap/ldapi"
+
+
+def ldapi_url(socket=DEFAULT_LDAPI_SOCKET):
+    """``/run/openldap/ldapi`` -> ``ldapi://%2Frun%2Fopenldap%2Fldapi``"""
+    return "ldapi://" + quote(socket, safe='')
+
+
+def is_ldapi(url):
+    return url.lower().startswith("ldapi://")
+
+
+def connection_params(url, dn=None, password=None):
+    """ldap3 ``Connection`` authentication params
+
+    Simple bind if ``dn`` is given, SASL EXTERNAL over ``ldapi://``
+    otherwise (anonymous over other urls).
+    """
+    if dn:
+        return {'user': dn, 'password': password}
+    if is_ldapi(url):
+        return {'authentication': SASL, 'sasl_mechanism': EXTERNAL}
+    return {}
+
+
+def connect(url, dn=None, password=None, **params):
+    """Return a bound connection, see ``connection_params``"""
+    params.update(connection_params(url, dn, password))
+    params.setdefault('auto_bind', True)
+    return Connection(Server(url, get_info=NONE), **params)
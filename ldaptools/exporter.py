@@ -0,0 +1,284 @@
+"""Expose slapd ``cn=monitor`` counters in Prometheus text format::
+
+    python3 -m ldaptools.exporter -H ldaps://localhost \\
+        -D uid=administrator,ou=people,dc=example,dc=com -w secret
+
+Every scrape of ``http://<address>:<port>/metrics`` reads the whole
+``cn=monitor`` tree through one persistent connection (bound again if the
+server closed it), so the bind DN must be the ldap root account or a
+member of ``cn=ldap_monitor,ou=groups``. Without bind DN over ``ldapi://``
+the exporter authenticates with SASL EXTERNAL (root is the root DN). The
+monitor backend does not record latencies,
+``ldap_monitor_scrape_duration_seconds`` (time taken by the monitor
+search) is exported as a server responsiveness probe.
+"""
+import argparse
+import sys
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from ldap3 import SUBTREE
+from ldap3.core.exceptions import LDAPException
+
+from .connection import connect, is_ldapi
+
+MONITOR_BASE = "cn=monitor"
+MONITOR_ATTRIBUTES = [
+    'monitorCounter',
+    'monitorOpInitiated',
+    'monitorOpCompleted',
+    'monitoredInfo',
+    'olmMDBPagesMax',
+    'olmMDBPagesUsed',
+    'olmMDBPagesFree',
+    'olmMDBReadersMax',
+    'olmMDBReadersUsed',
+    'olmMDBEntries',
+]
+# rdn path below cn=monitor: (metric name, type, help)
+COUNTERS = {
+    ('connections', 'total'): (
+        'ldap_connections_total', 'counter', "Connections accepted"
+    ),
+    ('connections', 'current'): (
+        'ldap_connections_current', 'gauge', "Opened connections"
+    ),
+    ('statistics', 'bytes'): (
+        'ldap_sent_bytes_total', 'counter', "Bytes sent"
+    ),
+    ('statistics', 'pdu'): (
+        'ldap_sent_pdu_total', 'counter', "PDUs sent"
+    ),
+    ('statistics', 'entries'): (
+        'ldap_sent_entries_total', 'counter', "Entries sent"
+    ),
+    ('statistics', 'referrals'): (
+        'ldap_sent_referrals_total', 'counter', "Referrals sent"
+    ),
+    ('waiters', 'read'): (
+        'ldap_waiters_read', 'gauge', "Connections waiting to read"
+    ),
+    ('waiters', 'write'): (
+        'ldap_waiters_write', 'gauge', "Connections waiting to write"
+    ),
+    ('time', 'uptime'): (
+        'ldap_uptime_seconds', 'gauge', "Seconds since slapd started"
+    ),
+}
+MDB_ATTRIBUTES = {
+    'olmmdbpagesmax': 'ldap_mdb_pages_max',
+    'olmmdbpagesused': 'ldap_mdb_pages_used',
+    'olmmdbpagesfree': 'ldap_mdb_pages_free',
+    'olmmdbreadersmax': 'ldap_mdb_readers_max',
+    'olmmdbreadersused': 'ldap_mdb_readers_used',
+    'olmmdbentries': 'ldap_mdb_entries',
+}
+
+
+def rdn_path(dn):
+    """``cn=Bind,cn=Operations,cn=Monitor`` -> ``('operations', 'bind')``"""
+    values = [
+        rdn.split('=', 1)[1].strip().lower()
+        for rdn in dn.split(',') if '=' in rdn
+    ]
+    return tuple(reversed(values[:-1]))
+
+
+def first_number(attributes, name):
+    for key, values in attributes.items():
+        if key.lower() != name.lower():
+            continue
+        if not isinstance(values, (list, tuple)):
+            values = [values]
+        for value in values:
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+    return None
+
+
+def collect(entries):
+    """Turn ``(dn, attributes)`` monitor entries into metric samples
+
+    Yield ``(name, type, help, labels, value)`` tuples.
+    """
+    for dn, attributes in entries:
+        path = rdn_path(dn)
+        if len(path) == 2 and path[0] == 'operations':
+            for attribute, state in [
+                ('monitorOpInitiated', 'initiated'),
+                ('monitorOpCompleted', 'completed'),
+            ]:
+                value = first_number(attributes, attribute)
+                if value is not None:
+                    yield (
+                        'ldap_operations_%s_total' % state, 'counter',
+                        "Operations %s per type" % state,
+                        {'operation': path[1]}, value
+                    )
+        elif len(path) == 2 and path[0] == 'threads':
+            value = first_number(attributes, 'monitoredInfo')
+            if value is not None:
+                yield (
+                    'ldap_threads', 'gauge', "Thread pool state",
+                    {'state': path[1].replace(' ', '_')}, value
+                )
+        elif path in COUNTERS:
+            name, metric_type, help_text = COUNTERS[path]
+            value = first_number(attributes, 'monitorCounter')
+            if value is None:
+                value = first_number(attributes, 'monitoredInfo')
+            if value is not None:
+                yield name, metric_type, help_text, {}, value
+        elif len(path) == 2 and path[0] == 'databases':
+            for attribute, name in MDB_ATTRIBUTES.items():
+                value = first_number(attributes, attribute)
+                if value is not None:
+                    yield (
+                        name, 'gauge', "LMDB %s" % attribute[6:],
+                        {'database': path[1]}, value
+                    )
+
+
+def format_samples(samples):
+    lines = []
+    described = set()
+    for name, metric_type, help_text, labels, value in samples:
+        if name not in described:
+            described.add(name)
+            lines.append("# HELP %s %s" % (name, help_text))
+            lines.append("# TYPE %s %s" % (name, metric_type))
+        label_text = ",".join(
+            '%s="%s"' % (key, str(label).replace('"', '\\"'))
+            for key, label in sorted(labels.items())
+        )
+        lines.append("%s%s %s" % (
+            name, "{%s}" % label_text if label_text else "", repr(value)
+        ))
+    return "\n".join(lines) + "\n"
+
+
+class MonitorClient(object):
+    """One persistent bound connection reading ``cn=monitor``"""
+
+    def __init__(self, url, dn=None, password=None):
+        self.url = url
+        self.dn = dn
+        self.password = password
+        self.connection = None
+        self.lock = threading.Lock()
+
+    def connect(self):
+        self.connection = connect(
+            self.url, self.dn, self.password, raise_exceptions=True
+        )
+
+    def entries(self):
+        if self.connection is None or self.connection.closed:
+            self.connect()
+        self.connection.search(
+            MONITOR_BASE, '(objectClass=*)', SUBTREE,
+            attributes=MONITOR_ATTRIBUTES
+        )
+        return [
+            (item['dn'], item['attributes'])
+            for item in self.connection.response
+            if item.get('type') == 'searchResEntry'
+        ]
+
+    def scrape(self):
+        with self.lock:
+            start = time.time()
+            try:
+                entries = self.entries()
+            except LDAPException:
+                # server restarted or closed an idle connection, retry once
+                self.connection = None
+                try:
+                    entries = self.entries()
+                except LDAPException as err:
+                    print("Can't read %s: %s" % (MONITOR_BASE, err),
+                          file=sys.stderr)
+                    return format_samples([(
+                        'ldap_up', 'gauge', "cn=monitor readable", {}, 0
+                    )])
+            duration = time.time() - start
+        samples = list(collect(entries))
+        samples.append(('ldap_up', 'gauge', "cn=monitor readable", {}, 1))
+        samples.append((
+            'ldap_monitor_scrape_duration_seconds', 'gauge',
+            "Time to read cn=monitor", {}, duration
+        ))
+        return format_samples(samples)
+
+
+def get_handler(client):
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = client.scrape().encode('utf-8')
+            self.send_response(200)
+            self.send_header(
+                'Content-Type', 'text/plain; version=0.0.4; charset=utf-8'
+            )
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return MetricsHandler
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog="python3 -m ldaptools.exporter",
+        description="Expose cn=monitor counters in Prometheus text format",
+    )
+    parser.add_argument(
+        "-H", dest="url", default="ldaps://localhost",
+        help="ldap server url (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-D", dest="bind_dn",
+        help="Bind DN, ldap root account or ldap_monitor group member, "
+             "SASL EXTERNAL is used over ldapi:// if not set",
+    )
+    parser.add_argument("-w", dest="password", help="Bind password")
+    parser.add_argument(
+        "--address", default="0.0.0.0",
+        help="HTTP listen address (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--port", type=int, default=9330,
+        help="HTTP listen port (default: %(default)s)",
+    )
+    return parser
+
+
+def main(argv=None):
+    parser = get_parser()
+    args = parser.parse_args(argv)
+    if not args.bind_dn and not is_ldapi(args.url):
+        # an anonymous bind can not read cn=monitor: ldap_up would stay 0
+        parser.error("-D is required unless -H is an ldapi:// url")
+    client = MonitorClient(args.url, args.bind_dn, args.password)
+    httpd = HTTPServer((args.address, args.port), get_handler(client))
+    print(
+        "Serve %s metrics on %s:%d/metrics" % (
+            MONITOR_BASE, args.address, args.port
+        ),
+        file=sys.stderr
+    )
+    httpd.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
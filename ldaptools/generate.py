@@ -0,0 +1,169 @@
+"""Stream generated LDIF entries to stdout, usually piped to slapadd::
+
+    python3 -m ldaptools.generate -D dc=example,dc=com -d example.com \\
+        -o "Example corporation" -u administrator -p "{SSHA}..." \\
+        --base | slapadd -F /etc/openldap/slapd.d/
+
+Production size directories (Zipfian group sizes, deterministic from
+``--seed``) can be streamed to the bulk loader::
+
+    python3 -m ldaptools.generate -D dc=example,dc=com -d example.com \\
+        -o "Example corporation" -u administrator -p "{SSHA}..." --base \\
+        --people 1000000 --groups 50000 --applications 500 \\
+        --distribution zipf | python3 -m ldaptools.bulkload --keep-memberof
+
+Bulk groups without members get the default administrator as member,
+imported apart from the base tree its ``memberOf`` values are written to
+``--admin-changes`` for slapmodify::
+
+    python3 -m ldaptools.generate ... --people 10 --groups 20 \\
+        --admin-changes /tmp/admin.ldif | slapadd -F /etc/openldap/slapd.d/
+    slapmodify -F /etc/openldap/slapd.d/ -l /tmp/admin.ldif
+"""
+import argparse
+import sys
+
+from . import trees
+from .ldif import format_value, write_entries
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog="python3 -m ldaptools.generate",
+        description="Generate LDIF entries of the organization trees",
+    )
+    parser.add_argument(
+        "-D", dest="root_dc", required=True,
+        help="The root ldap dc, should looks like dc=example,dc=com",
+    )
+    parser.add_argument("-d", dest="domain", required=True, help="Domain")
+    parser.add_argument(
+        "-o", dest="organization", required=True,
+        help="Name of the organization",
+    )
+    parser.add_argument(
+        "-u", dest="admin_uid", required=True,
+        help="Ldap default administrator (the one under ou=people)",
+    )
+    parser.add_argument(
+        "-p", dest="admin_password",
+        help="Ldap administrator password (required by --base)",
+    )
+    parser.add_argument(
+        "--base", action="store_true",
+        help="Organization, people/groups/applications/policies entries",
+    )
+    parser.add_argument(
+        "--demo", action="store_true",
+        help="Demo people, applications and groups used by the tests",
+    )
+    parser.add_argument(
+        "--people", type=int, default=0,
+        help="Number of generated bulk users",
+    )
+    parser.add_argument(
+        "--groups", type=int, default=0,
+        help="Number of generated bulk groups (users are spread over them)",
+    )
+    parser.add_argument(
+        "--applications", type=int, default=0,
+        help="Number of generated bulk applications (members of bulk "
+             "groups)",
+    )
+    parser.add_argument(
+        "--password", help="userPassword of generated bulk users",
+    )
+    parser.add_argument(
+        "--distribution", choices=["round-robin", "zipf"],
+        default="round-robin",
+        help="How bulk users are spread over groups: one group per user "
+             "or Zipfian group sizes, a few groups of --largest-group "
+             "members then sizes decreasing with the group rank "
+             "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0,
+        help="Random seed of the zipf distribution, the same seed always "
+             "generates the same entries (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--largest-group", type=int, default=100000,
+        help="Members of the largest zipf groups (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--large-groups", type=int, default=3,
+        help="Number of zipf groups of --largest-group members "
+             "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--zipf-exponent", type=float, default=1.1,
+        help="Zipf exponent of the group sizes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--admin-changes", metavar="FILE",
+        help="Write the slapmodify changes adding memberOf values of the "
+             "bulk groups filled with the default administrator to FILE "
+             "(empty if none)",
+    )
+    return parser
+
+
+def admin_changes(args, admin_groups):
+    """``changetype: modify`` record adding ``admin_groups`` to the
+    ``memberOf`` values of the default administrator"""
+    if not admin_groups:
+        return ""
+    return (
+        format_value(
+            'dn', "uid=%s,ou=people,%s" % (args.admin_uid, args.root_dc)
+        ) +
+        "changetype: modify\n" +
+        "add: memberOf\n" +
+        ''.join(format_value('memberOf', dn) for dn in admin_groups) +
+        "-\n\n"
+    )
+
+
+def entries(args, admin_groups=None):
+    if args.base:
+        yield from trees.base(
+            args.root_dc, args.domain, args.organization, args.admin_uid,
+            args.admin_password
+        )
+    if args.demo:
+        yield from trees.demo(args.root_dc, args.domain, args.organization)
+    if args.people or args.groups or args.applications:
+        if args.distribution == "zipf":
+            yield from trees.bulk_zipf(
+                args.root_dc, args.domain, args.organization, args.admin_uid,
+                people=args.people, groups=args.groups,
+                password=args.password, applications=args.applications,
+                seed=args.seed, exponent=args.zipf_exponent,
+                largest=args.largest_group, large_groups=args.large_groups,
+                admin_groups=admin_groups
+            )
+        else:
+            yield from trees.bulk(
+                args.root_dc, args.domain, args.organization, args.admin_uid,
+                people=args.people, groups=args.groups,
+                password=args.password, applications=args.applications,
+                admin_groups=admin_groups
+            )
+
+
+def main(argv=None):
+    parser = get_parser()
+    args = parser.parse_args(argv)
+    if args.base and not args.admin_password:
+        parser.error("-p is required with --base")
+    admin_groups = []
+    count = write_entries(entries(args, admin_groups), sys.stdout)
+    sys.stdout.flush()
+    print("%d entries generated" % count, file=sys.stderr)
+    if args.admin_changes:
+        with open(args.admin_changes, 'w') as changes:
+            changes.write(admin_changes(args, admin_groups))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,414 @@
+"""Recommend ``olcDbIndex`` values from the searches really sent to slapd
+
+Read slapd ``stats`` logs (loglevel 256, ``SRCH ... filter=`` and
+``SEARCH RESULT ... etime=`` lines) or accesslog entries (``reqFilter``)
+dumped as ldif::
+
+    docker logs ldap 2>&1 | python3 -m ldaptools.indexadvisor
+    slapcat -b cn=accesslog | python3 -m ldaptools.indexadvisor --accesslog
+
+Each search filter is evaluated against the current indexes the way
+back-mdb builds candidate sets: an AND is indexed as soon as one of its
+components is, an OR only if all of them are and a NOT never is. Searches
+that fall back to scanning the whole scope blame their unindexed
+components. The cost of a component is the number of entries its scans
+examined for nothing: the scope size (1 for a base search, the directory
+size ``--entries`` otherwise, the largest result seen by default) minus
+the entries returned (``nentries`` or ``reqEntries``), an index does not
+help a search returning most of its scope. ``<= mdb_*_candidates: (attr)
+not indexed`` lines cost a directory scan each, the observed elapsed time
+breaks ties. Components whose cost is below ``--min-cost`` are not
+recommended.
+
+The recommended set is written to stdout in the ``LDAP_DB_INDEXES``
+format accepted by entrypoint.sh (``-I``) and lmdb.ldif.template.sh,
+a report is written to stderr. ``-I`` only sets up new config volumes,
+``--ldif`` lines are meant to be added to existing ones with
+``slapmodify`` before running ``slapindex``.
+"""
+import argparse
+import re
+import sys
+
+from .ldif import parse_line, read_records
+
+DEFAULT_INDEXES = "objectClass eq;uid eq,sub;memberOf eq"
+
+SEARCH_LINE = re.compile(
+    r'conn=(?P<conn>\d+) op=(?P<op>\d+) SRCH base="(?P<base>.*?)" '
+    r'scope=(?P<scope>\d) deref=\d+ filter="(?P<filter>.*)"\s*$'
+)
+RESULT_LINE = re.compile(
+    r'conn=(?P<conn>\d+) op=(?P<op>\d+) SEARCH RESULT .*?'
+    r'etime=(?P<etime>[\d.]+)(?: nentries=(?P<nentries>\d+))?'
+)
+NOT_INDEXED_LINE = re.compile(
+    r'mdb_(?P<kind>equality|substring|presence|approx|inequality)'
+    r'_candidates: \((?P<attr>[^)]+)\) not indexed'
+)
+NOT_INDEXED_TYPES = {
+    'equality': 'eq',
+    'inequality': 'eq',
+    'substring': 'sub',
+    'presence': 'pres',
+    'approx': 'approx',
+}
+# objectClass=* is answered from the whole id range without any index
+ALWAYS_INDEXED = {('objectclass', 'pres')}
+# stats log scope numbers of accesslog reqScope values
+SCOPES = {'base': 0, 'one': 1, 'sub': 2, 'subord': 3}
+
+
+class FilterSyntaxError(ValueError):
+    pass
+
+
+def parse_filter(text):
+    """Parse a rfc4515 string filter into nested tuples
+
+    ``('&', [children])``, ``('|', [children])``, ``('!', child)`` or
+    ``(attribute, index_type)`` leaves where ``index_type`` is the
+    olcDbIndex type used to answer it (eq, sub, pres, approx) or None
+    (extensible match).
+    """
+    node, position = _parse(text.strip(), 0)
+    if position != len(text.strip()):
+        raise FilterSyntaxError("Trailing characters in %r" % text)
+    return node
+
+
+def _parse(text, position):
+    if position >= len(text) or text[position] != '(':
+        raise FilterSyntaxError("Expected '(' at %d in %r" % (position, text))
+    position += 1
+    operator = text[position:position + 1]
+    if operator in ('&', '|'):
+        children = []
+        position += 1
+        while position < len(text) and text[position] == '(':
+            child, position = _parse(text, position)
+            children.append(child)
+        node = (operator, children)
+    elif operator == '!':
+        child, position = _parse(text, position + 1)
+        node = ('!', child)
+    else:
+        end = position
+        while end < len(text) and text[end] != ')':
+            end += 1
+        node = _leaf(text[position:end])
+        position = end
+    if position >= len(text) or text[position] != ')':
+        raise FilterSyntaxError("Expected ')' at %d in %r" % (position, text))
+    return node, position + 1
+
+
+def _leaf(item):
+    match = re.match(r'^([^=<>~:]+|[^=<>~]*:[^=]*)(~=|>=|<=|:=|=)(.*)$', item)
+    if not match:
+        raise FilterSyntaxError("Invalid filter item %r" % item)
+    attribute, operator, value = match.groups()
+    attribute = attribute.split(';', 1)[0].strip()
+    if operator == ':=' or ':' in attribute:
+        return attribute.split(':', 1)[0], None
+    if operator == '~=':
+        return attribute, 'approx'
+    if operator in ('>=', '<='):
+        return attribute, 'eq'
+    if value == '*':
+        return attribute, 'pres'
+    if '*' in value:
+        return attribute, 'sub'
+    return attribute, 'eq'
+
+
+def parse_indexes(value):
+    """``"uid eq,sub;memberOf eq"`` -> ``{'uid': {'eq', 'sub'}, ...}``"""
+    indexes = {}
+    for item in value.split(';'):
+        if not item.strip():
+            continue
+        attributes, _, types = item.strip().partition(' ')
+        types = {
+            index_type.strip().lower() for index_type in types.split(',')
+            if index_type.strip()
+        } or {'eq'}
+        for attribute in attributes.split(','):
+            indexes.setdefault(attribute.strip(), set()).update(types)
+    return indexes
+
+
+def format_indexes(indexes):
+    return ";".join(
+        "%s %s" % (attribute, ",".join(sorted(types)))
+        for attribute, types in indexes.items()
+    )
+
+
+def is_indexed(indexes, attribute, index_type):
+    attribute = attribute.lower()
+    if (attribute, index_type) in ALWAYS_INDEXED:
+        return True
+    return any(
+        name.lower() == attribute and index_type in types
+        for name, types in indexes.items()
+    )
+
+
+def unindexed_components(node, indexes):
+    """Return ``(full_scan, components)`` for a parsed filter
+
+    ``components`` lists the ``(attribute, index_type)`` leaves that would
+    avoid the full scan once indexed.
+    """
+    operator = node[0]
+    if operator == '&':
+        results = [unindexed_components(child, indexes) for child in node[1]]
+        if not results or any(not full_scan for full_scan, _ in results):
+            return False, []
+        return True, [leaf for _, leaves in results for leaf in leaves]
+    if operator == '|':
+        results = [unindexed_components(child, indexes) for child in node[1]]
+        leaves = [leaf for _, leaves in results for leaf in leaves]
+        return any(full_scan for full_scan, _ in results), leaves
+    if operator == '!':
+        # back-mdb does not use indexes to answer NOT
+        return True, []
+    attribute, index_type = node
+    if index_type is None or is_indexed(indexes, attribute, index_type):
+        return False, []
+    return True, [(attribute, index_type)]
+
+
+class Workload(object):
+    """Searches seen in a log and their cost against ``indexes``"""
+
+    def __init__(self, indexes, entries=None):
+        self.indexes = indexes
+        self.entries = entries
+        self.largest_result = 1
+        self.searches = 0
+        self.full_scans = 0
+        self.invalid = 0
+        self.components = {}
+        self.pending = {}
+
+    def component(self, attribute, index_type):
+        key = (attribute.lower(), index_type)
+        if key not in self.components:
+            self.components[key] = {
+                'attribute': attribute,
+                'index_type': index_type,
+                'scans': 0,
+                'base_scans': 0,
+                'returned': 0,
+                'not_indexed': 0,
+                'etime': 0.0,
+            }
+        return self.components[key]
+
+    def add_search(self, filter_text, key=None, scope=2, nentries=None):
+        """Count a search, its result is given by ``nentries`` or later
+        through ``add_result(key, ...)``"""
+        self.searches += 1
+        try:
+            full_scan, leaves = unindexed_components(
+                parse_filter(filter_text), self.indexes
+            )
+        except FilterSyntaxError:
+            self.invalid += 1
+            return
+        if not full_scan:
+            return
+        self.full_scans += 1
+        components = [self.component(*leaf) for leaf in set(leaves)]
+        for component in components:
+            component['scans'] += 1
+            if scope == 0:
+                component['base_scans'] += 1
+        if nentries is not None:
+            self.add_returned(components, nentries)
+        elif key is not None:
+            self.pending[key] = components
+
+    def add_returned(self, components, nentries):
+        self.largest_result = max(self.largest_result, nentries)
+        for component in components:
+            component['returned'] += nentries
+
+    def add_result(self, key, etime, nentries=None):
+        components = self.pending.pop(key, [])
+        for component in components:
+            component['etime'] += etime
+        if nentries is not None:
+            self.add_returned(components, nentries)
+
+    def add_not_indexed(self, attribute, index_type):
+        self.component(attribute, index_type)['not_indexed'] += 1
+
+    def read_stats_log(self, stream):
+        for line in stream:
+            match = SEARCH_LINE.search(line)
+            if match:
+                self.add_search(
+                    match.group('filter'),
+                    (match.group('conn'), match.group('op')),
+                    scope=int(match.group('scope'))
+                )
+                continue
+            match = RESULT_LINE.search(line)
+            if match:
+                nentries = match.group('nentries')
+                self.add_result(
+                    (match.group('conn'), match.group('op')),
+                    float(match.group('etime')),
+                    int(nentries) if nentries is not None else None
+                )
+                continue
+            match = NOT_INDEXED_LINE.search(line)
+            if match:
+                self.add_not_indexed(
+                    match.group('attr'), NOT_INDEXED_TYPES[match.group('kind')]
+                )
+
+    def read_accesslog(self, stream):
+        for record in read_records(stream):
+            values = {}
+            for line in record[1:]:
+                name, value = parse_line(line)
+                values[name.lower()] = value
+            if 'reqfilter' not in values:
+                continue
+            entries = values.get('reqentries')
+            self.add_search(
+                values['reqfilter'],
+                scope=SCOPES.get(values.get('reqscope', 'sub').lower(), 2),
+                nentries=int(entries) if entries else None
+            )
+
+    def directory_size(self):
+        if self.entries:
+            return self.entries
+        return self.largest_result
+
+    def cost(self, component):
+        """Entries examined by full scans without being returned"""
+        size = self.directory_size()
+        examined = (
+            component['base_scans'] +
+            (component['scans'] - component['base_scans']) * size
+        )
+        return (
+            max(0, examined - component['returned']) +
+            component['not_indexed'] * size
+        )
+
+    def ranking(self):
+        return sorted(
+            self.components.values(),
+            key=lambda component: (
+                self.cost(component), component['etime']
+            ),
+            reverse=True
+        )
+
+    def recommend(self, min_count=1, min_cost=1):
+        indexes = dict(
+            (attribute, set(types))
+            for attribute, types in self.indexes.items()
+        )
+        names = dict((name.lower(), name) for name in indexes)
+        for component in self.ranking():
+            if component['scans'] + component['not_indexed'] < min_count:
+                continue
+            if self.cost(component) < min_cost:
+                continue
+            attribute = names.setdefault(
+                component['attribute'].lower(), component['attribute']
+            )
+            indexes.setdefault(attribute, set()).add(component['index_type'])
+        return indexes
+
+    def report(self, stream):
+        stream.write(
+            "%d searches, %d full scans, %d unparsable filters\n" % (
+                self.searches, self.full_scans, self.invalid
+            )
+        )
+        for component in self.ranking():
+            stream.write(
+                "  %-20s %-6s scans=%-8d not_indexed=%-8d etime=%.3fs "
+                "cost=%d\n" % (
+                    component['attribute'], component['index_type'],
+                    component['scans'], component['not_indexed'],
+                    component['etime'], self.cost(component),
+                )
+            )
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog="python3 -m ldaptools.indexadvisor",
+        description="Recommend olcDbIndex values from slapd stats logs or "
+                    "accesslog entries",
+    )
+    parser.add_argument(
+        "files", nargs="*", type=argparse.FileType('r'),
+        default=[sys.stdin],
+        help="Log files to analyse (default: stdin)",
+    )
+    parser.add_argument(
+        "--accesslog", action="store_true",
+        help="Inputs are accesslog database ldif (reqFilter values) instead "
+             "of slapd stats logs",
+    )
+    parser.add_argument(
+        "-I", dest="indexes", default=DEFAULT_INDEXES,
+        help="Current indexes, LDAP_DB_INDEXES format "
+             "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--entries", type=int,
+        help="Number of entries in the directory: entries examined by "
+             "one level and subtree full scans (default: the largest "
+             "search result seen)",
+    )
+    parser.add_argument(
+        "--min-count", type=int, default=1,
+        help="Minimum full scans blamed on a filter component to recommend "
+             "its index (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--min-cost", type=int, default=1,
+        help="Minimum entries examined for nothing by the scans blamed on "
+             "a filter component to recommend its index "
+             "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--ldif", action="store_true",
+        help="Write olcDbIndex ldif lines instead of LDAP_DB_INDEXES value",
+    )
+    return parser
+
+
+def main(argv=None):
+    args = get_parser().parse_args(argv)
+    workload = Workload(parse_indexes(args.indexes), entries=args.entries)
+    for stream in args.files:
+        if args.accesslog:
+            workload.read_accesslog(stream)
+        else:
+            workload.read_stats_log(stream)
+    workload.report(sys.stderr)
+    indexes = workload.recommend(
+        min_count=args.min_count, min_cost=args.min_cost
+    )
+    if args.ldif:
+        for attribute, types in indexes.items():
+            print("olcDbIndex: %s %s" % (attribute, ",".join(sorted(types))))
+    else:
+        print(format_indexes(indexes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Minimal LDIF writer, entries are ``(dn, attributes)`` tuples where
+attributes is an ordered list of ``(name, value)`` pairs so attribute
+order and repeated attributes (objectClass, member...) are kept.
+
+See https://www.rfc-editor.org/rfc/rfc2849
+"""
+import base64
+import re
+
+# SAFE-STRING from rfc2849, anything else is base64 encoded
+SAFE_STRING = re.compile(r'^(?![ :<])[\x01-\x09\x0b-\x0c\x0e-\x7f]*(?<! )$')
+
+
+def normalize_dn(dn):
+    """Case and spaces insensitive form of a dn, good enough to compare dns
+    written by hand in ldif files"""
+    return ','.join(
+        '='.join(part.strip() for part in rdn.split('=', 1))
+        for rdn in re.split(r'(?<!\\),', dn.lower())
+    )
+
+
+def dn_depth(dn):
+    return len(re.split(r'(?<!\\),', dn))
+
+
+def format_value(name, value):
+    value = str(value)
+    if SAFE_STRING.match(value):
+        return "%s: %s\n" % (name, value)
+    return "%s:: %s\n" % (
+        name, base64.b64encode(value.encode('utf-8')).decode('ascii')
+    )
+
+
+def format_entry(dn, attributes):
+    return (
+        format_value('dn', dn) +
+        ''.join(format_value(name, value) for name, value in attributes) +
+        "\n"
+    )
+
+
+def write_entries(entries, stream):
+    """Write entries to a text stream, return the number of entries"""
+    count = 0
+    for dn, attributes in entries:
+        stream.write(format_entry(dn, attributes))
+        count += 1
+    return count
+
+
+def parse_line(line):
+    """Split an unfolded ldif line into (name, decoded value)"""
+    name, value = line.split(':', 1)
+    if value.startswith(':'):
+        return name, base64.b64decode(value[1:].strip()).decode('utf-8')
+    return name, value.strip()
+
+
+def read_records(stream):
+    """Yield each ldif record of a text stream as a list of unfolded lines,
+    comments and ``version:`` lines are dropped"""
+    record = []
+    for line in stream:
+        line = line.rstrip('\n').rstrip('\r')
+        if line.startswith('#'):
+            continue
+        if line.startswith(' ') and record:
+            record[-1] += line[1:]
+            continue
+        if not line.strip():
+            if record:
+                yield record
+            record = []
+            continue
+        if not record and line.lower().startswith('version:'):
+            continue
+        record.append(line)
+    if record:
+        yield record
@@ -0,0 +1,123 @@
+"""Rewrite stored ``memberOf`` values when switching the memberOf mode::
+
+    slapcat -F /etc/openldap/slapd.d/ -b dc=example,dc=com | \\
+        python3 -m ldaptools.memberof --strip | \\
+        slapmodify -F /etc/openldap/slapd.d/ -b dc=example,dc=com
+
+The memberof overlay stores ``memberOf`` on member entries, the dynlist
+overlay computes it while reading. Read an ldif dump on stdin and write
+``changetype: modify`` records to stdout:
+
+* ``--strip`` deletes stored values (switching to dynlist, computed values
+  would otherwise be returned next to stale stored ones)
+* ``--materialize`` computes values from groups ``member`` attributes and
+  only rewrites entries whose stored values differ (switching back to the
+  memberof overlay, which only maintains values of later changes)
+"""
+import argparse
+import sys
+
+from .ldif import format_value, normalize_dn, parse_line, read_records
+
+
+def read_entries(records):
+    """Yield ``(dn, [(name, value), ...])`` of ldif records"""
+    for record in records:
+        name, dn = parse_line(record[0])
+        if name.lower() != 'dn':
+            raise ValueError("ldif record must start with dn: %r" % record[0])
+        yield dn, [parse_line(line) for line in record[1:]]
+
+
+def modify(dn, name, values):
+    """``changetype: modify`` record replacing (deleting if ``values`` is
+    empty) all ``name`` values"""
+    return (
+        format_value('dn', dn) +
+        "changetype: modify\n" +
+        ("replace: %s\n" % name if values else "delete: %s\n" % name) +
+        ''.join(format_value(name, value) for value in values) +
+        "-\n\n"
+    )
+
+
+def strip(entries, member_of_attr='memberOf'):
+    """Yield modify records deleting stored ``member_of_attr`` values"""
+    key = member_of_attr.lower()
+    for dn, attributes in entries:
+        if any(name.lower() == key for name, _ in attributes):
+            yield modify(dn, member_of_attr, [])
+
+
+def materialize(entries, group_class='groupOfNames', member_attr='member',
+                member_of_attr='memberOf'):
+    """Yield modify records setting ``member_of_attr`` computed from
+    ``group_class`` entries ``member_attr`` values, entries already holding
+    the expected values are skipped. Dangling members are ignored."""
+    group_class = group_class.lower()
+    member_attr = member_attr.lower()
+    member_of_key = member_of_attr.lower()
+    names = {}
+    stored = {}
+    member_of = {}
+    for dn, attributes in entries:
+        key = normalize_dn(dn)
+        names[key] = dn
+        values = [
+            value for name, value in attributes
+            if name.lower() == member_of_key
+        ]
+        if values:
+            stored[key] = values
+        if any(
+            name.lower() == 'objectclass' and value.lower() == group_class
+            for name, value in attributes
+        ):
+            for name, value in attributes:
+                if name.lower() == member_attr:
+                    member_of.setdefault(normalize_dn(value), []).append(dn)
+    for key, dn in names.items():
+        expected = member_of.get(key, [])
+        current = stored.get(key, [])
+        if {normalize_dn(value) for value in expected} != \
+                {normalize_dn(value) for value in current}:
+            yield modify(dn, member_of_attr, expected)
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog="python3 -m ldaptools.memberof",
+        description="Write ldif changes stripping or computing stored "
+                    "memberOf values of an ldif dump read on stdin",
+    )
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument(
+        "--strip", action="store_true",
+        help="Delete stored memberOf values (memberOf computed by dynlist)",
+    )
+    action.add_argument(
+        "--materialize", action="store_true",
+        help="Store memberOf values computed from groups member values "
+             "(memberOf maintained by the memberof overlay)",
+    )
+    return parser
+
+
+def main(argv=None):
+    args = get_parser().parse_args(argv)
+    entries = read_entries(read_records(sys.stdin))
+    changes = strip(entries) if args.strip else materialize(entries)
+    count = 0
+    for change in changes:
+        sys.stdout.write(change)
+        count += 1
+    print(
+        "memberOf %s: %d entries changed" % (
+            "strip" if args.strip else "materialize", count
+        ),
+        file=sys.stderr
+    )
+
+
+if __name__ == "__main__":
+    main()
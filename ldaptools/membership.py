@@ -0,0 +1,241 @@
+"""Synchronize group members from a desired membership map::
+
+    python3 -m ldaptools.membership -H ldaps://ldap.example.com \\
+        -D cn=admin,dc=example,dc=com -w secret memberships.json
+
+``memberships.json`` maps group dns to the list of their member dns. The
+current ``member`` values of each listed group are read, compared (dns are
+normalized) and only the difference is written: one modify per group
+adding and deleting values, split in ``--chunk-size`` values modifies for
+very large changes (adds first, so a group never gets empty on the way).
+Groups not listed are left untouched.
+
+Reads and modifies are pipelined (ldap3 ``ASYNC`` strategy): up to
+``--window`` requests are sent before waiting for the oldest response,
+the memberof overlay still updates ``memberOf`` of every added / deleted
+member but the client does not wait a round trip per value.
+"""
+import argparse
+import json
+import sys
+import time
+
+from collections import deque, OrderedDict
+from ldap3 import ASYNC, BASE, MODIFY_ADD, MODIFY_DELETE
+
+from .connection import connect
+from .ldif import normalize_dn
+
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_WINDOW = 32
+
+
+def diff(current, desired, remove=True):
+    """Return ``(add, delete)`` member dns turning ``current`` into
+    ``desired``, dns are compared normalized, values keep their spelling"""
+    current_keys = {normalize_dn(dn): dn for dn in current}
+    desired_keys = OrderedDict((normalize_dn(dn), dn) for dn in desired)
+    add = [dn for key, dn in desired_keys.items() if key not in current_keys]
+    delete = [
+        dn for key, dn in current_keys.items() if key not in desired_keys
+    ] if remove else []
+    return add, delete
+
+
+def modifications(add, delete, chunk_size=DEFAULT_CHUNK_SIZE):
+    """``modify`` changes writing ``add`` / ``delete``, at most
+    ``chunk_size`` values each, adds first"""
+    values = [(MODIFY_ADD, dn) for dn in add] + [
+        (MODIFY_DELETE, dn) for dn in delete
+    ]
+    changes = []
+    for start in range(0, len(values), chunk_size):
+        operations = OrderedDict()
+        for operation, dn in values[start:start + chunk_size]:
+            operations.setdefault(operation, []).append(dn)
+        changes.append({'member': list(operations.items())})
+    return changes
+
+
+def pipeline(connection, requests, window=DEFAULT_WINDOW):
+    """Send ``(key, send)`` requests, yield ``(key, response, result)``
+
+    ``send()`` issues one operation on ``connection``, with an asynchronous
+    connection up to ``window`` operations are outstanding, responses are
+    yielded in the sending order.
+    """
+    if connection.strategy.sync:
+        for key, send in requests:
+            send()
+            yield key, connection.response, connection.result
+        return
+    pending = deque()
+    for key, send in requests:
+        pending.append((key, send()))
+        if len(pending) >= window:
+            key, message_id = pending.popleft()
+            yield (key,) + connection.get_response(message_id)
+    while pending:
+        key, message_id = pending.popleft()
+        yield (key,) + connection.get_response(message_id)
+
+
+def read_members(connection, group_dns, window=DEFAULT_WINDOW):
+    """Return ``{group dn: member dns}``, ``None`` for missing groups"""
+    members = {}
+
+    def send(dn):
+        return lambda: connection.search(
+            dn, '(objectClass=*)', BASE, attributes=['member']
+        )
+
+    for dn, response, result in pipeline(
+        connection, ((dn, send(dn)) for dn in group_dns), window
+    ):
+        if result['description'] == 'success' and response:
+            members[dn] = list(
+                response[0]['attributes'].get('member') or []
+            )
+        else:
+            members[dn] = None
+    return members
+
+
+def sync(connection, desired, remove=True, chunk_size=DEFAULT_CHUNK_SIZE,
+         window=DEFAULT_WINDOW, empty_member=None, dry_run=False):
+    """Apply ``desired`` (``{group dn: member dns}``) memberships
+
+    Return one report per group: added / deleted values count, number of
+    modifies, seconds from the first request sent to the last response and
+    the first failing result (``success`` otherwise). ``empty_member`` is
+    set as only member of groups desired empty (groupOfNames requires a
+    member), like ``olcRefintNothing``.
+    """
+    start = time.monotonic()
+    current = read_members(connection, list(desired), window)
+    read_seconds = time.monotonic() - start
+    reports = OrderedDict()
+    requests = []
+    for dn, members in desired.items():
+        members = list(members)
+        if not members and empty_member:
+            members = [empty_member]
+        report = reports[dn] = OrderedDict([
+            ('group', dn), ('added', 0), ('deleted', 0), ('modifies', 0),
+            ('seconds', 0.0), ('result', 'success'),
+        ])
+        if current[dn] is None:
+            report['result'] = 'noSuchObject'
+            continue
+        add, delete = diff(current[dn], members, remove)
+        report['added'], report['deleted'] = len(add), len(delete)
+        changes = modifications(add, delete, chunk_size)
+        report['modifies'] = len(changes)
+        if dry_run:
+            continue
+        for change in changes:
+            requests.append((dn, change))
+
+    started = {}
+
+    def send(dn, change):
+        def request():
+            started.setdefault(dn, time.monotonic())
+            return connection.modify(dn, change)
+        return request
+
+    for dn, response, result in pipeline(
+        connection, ((dn, send(dn, change)) for dn, change in requests),
+        window
+    ):
+        report = reports[dn]
+        report['seconds'] = round(time.monotonic() - started[dn], 6)
+        if result['description'] != 'success' and \
+                report['result'] == 'success':
+            report['result'] = result['description']
+    return list(reports.values()), read_seconds
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog="python3 -m ldaptools.membership",
+        description="Synchronize groups member values from a json map of "
+                    "group dns to member dns",
+    )
+    parser.add_argument(
+        "memberships", type=argparse.FileType('r'),
+        help="json file ({group dn: [member dn, ...]}), - for stdin",
+    )
+    parser.add_argument(
+        "-H", dest="url", default="ldaps://localhost",
+        help="ldap server url (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-D", dest="bind_dn",
+        help="Bind DN, SASL EXTERNAL is used over ldapi:// if not set",
+    )
+    parser.add_argument("-w", dest="password", help="Bind password")
+    parser.add_argument(
+        "--add-only", action="store_true",
+        help="Only add missing members, never delete",
+    )
+    parser.add_argument(
+        "--empty-member",
+        help="Member dn set on groups desired without member",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+        help="Maximum values per modify (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--window", type=int, default=DEFAULT_WINDOW,
+        help="Maximum outstanding requests (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="Only report the changes",
+    )
+    parser.add_argument(
+        "--report", help="Write the per group json report to this file",
+    )
+    return parser
+
+
+def main(argv=None):
+    args = get_parser().parse_args(argv)
+    desired = json.load(args.memberships, object_pairs_hook=OrderedDict)
+    connection = connect(
+        args.url, args.bind_dn, args.password, client_strategy=ASYNC
+    )
+    start = time.monotonic()
+    reports, read_seconds = sync(
+        connection, desired, remove=not args.add_only,
+        chunk_size=args.chunk_size, window=args.window,
+        empty_member=args.empty_member, dry_run=args.dry_run
+    )
+    duration = time.monotonic() - start
+    connection.unbind()
+    if args.report:
+        with open(args.report, 'w') as output:
+            json.dump(reports, output, indent=2)
+    for report in reports:
+        print(
+            "%(group)s: +%(added)d -%(deleted)d in %(modifies)d modify(s) "
+            "%(seconds).3fs %(result)s" % report,
+            file=sys.stderr
+        )
+    failed = [report for report in reports if report['result'] != 'success']
+    print(
+        "%d groups, +%d -%d members in %.2fs (read %.2fs)%s, %d failed" % (
+            len(reports), sum(report['added'] for report in reports),
+            sum(report['deleted'] for report in reports), duration,
+            read_seconds, " (dry run)" if args.dry_run else "", len(failed)
+        ),
+        file=sys.stderr
+    )
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
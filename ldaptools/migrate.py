@@ -0,0 +1,313 @@
+"""Incremental data migrations of an existing data volume
+
+Read an ldif stream on stdin made of named sources, each one starting
+with a ``# source: <name>`` comment line (see ``migration_stream`` in
+entrypoint.sh). Applied sources are recorded in a ledger stored in the
+directory itself (``cn=<name>,ou=migrations,<suffix>`` entries whose
+``description`` holds the source checksum). On start only sources whose
+checksum changed are compared to the live tree and the delta is applied
+through a temporary slapd listening on a local ``ldapi://`` socket, so
+overlays (memberof, refint) and ppolicy keep the tree consistent.
+
+Migration semantics, per entry of a changed source:
+
+* missing entries are added
+* attributes present in the source and different in the directory are
+  replaced, other live attributes are kept
+* multi-valued ``member`` and ``objectClass`` only get missing values
+  added: members added at run time are kept
+* ``memberOf`` is left to the memberof overlay and ``userPassword`` is
+  only set while adding an entry so people changes are not reverted.
+  ``userPassword`` values are excluded from checksums for the same reason
+* entries removed from a source are not deleted
+"""
+import argparse
+import hashlib
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from ldap3 import BASE, MODIFY_ADD, MODIFY_REPLACE
+
+from .connection import connect, ldapi_url
+from .ldif import format_entry, normalize_dn, parse_line, read_records
+from .probe import NotReady, check, wait_ready
+
+SOURCE_MARKER = "# source:"
+LEDGER_RDN = "ou=migrations"
+LDAPI_SOCKET = "/run/openldap/ldapi-migrate"
+# Not compared nor replaced on existing entries, see module docstring
+ADD_ONLY_ATTRIBUTES = {'userpassword'}
+IGNORED_ATTRIBUTES = {'memberof'}
+# Source values are added to live ones, never replaced
+MERGED_ATTRIBUTES = {'member': normalize_dn, 'objectclass': str.lower}
+
+
+class Source(object):
+
+    def __init__(self, name):
+        self.name = name
+        self.hash = hashlib.sha256()
+        self.records = tempfile.SpooledTemporaryFile(
+            max_size=16 * 1024 * 1024, mode='w+', encoding='utf-8'
+        )
+        self.count = 0
+
+    @property
+    def checksum(self):
+        return "sha256:" + self.hash.hexdigest()
+
+    def add(self, record):
+        for line in record:
+            name = line.split(':', 1)[0].lower()
+            if name not in ADD_ONLY_ATTRIBUTES:
+                self.hash.update(line.encode('utf-8') + b'\n')
+        self.hash.update(b'\n')
+        self.records.write('\n'.join(record) + '\n\n')
+        self.count += 1
+
+    def entries(self):
+        self.records.seek(0)
+        for record in read_records(self.records):
+            _, dn = parse_line(record[0])
+            attributes = {}
+            for line in record[1:]:
+                name, value = parse_line(line)
+                attributes.setdefault(name, []).append(value)
+            yield dn, attributes
+
+
+def read_sources(stream):
+    """Split the stdin stream into ``Source`` objects"""
+    sources = []
+    lines = []
+
+    def flush():
+        if lines and sources:
+            for record in read_records(lines):
+                sources[-1].add(record)
+        del lines[:]
+
+    for line in stream:
+        if line.startswith(SOURCE_MARKER):
+            flush()
+            sources.append(Source(line[len(SOURCE_MARKER):].strip()))
+        elif sources:
+            lines.append(line)
+        elif line.strip() and not line.startswith('#'):
+            raise ValueError("ldif stream must start with a source marker")
+        if len(lines) > 10000 and not line.strip():
+            # keep memory bounded, records never span a blank line
+            flush()
+    flush()
+    return sources
+
+
+def ledger_dn(name, suffix):
+    return "cn=%s,%s,%s" % (
+        name.replace(',', '\\,').replace('+', '\\+'), LEDGER_RDN, suffix
+    )
+
+
+def ledger_entries(sources, suffix):
+    yield "%s,%s" % (LEDGER_RDN, suffix), [
+        ('objectClass', 'organizationalUnit'),
+        ('ou', LEDGER_RDN.split('=', 1)[1]),
+        ('description', 'Applied data migrations (see ldaptools.migrate)'),
+    ]
+    for source in sources:
+        yield ledger_dn(source.name, suffix), [
+            ('objectClass', 'applicationProcess'),
+            ('cn', source.name),
+            ('description', source.checksum),
+        ]
+
+
+def read_ledger(config_dir, suffix):
+    """Return applied {source name: checksum} read offline with slapcat"""
+    process = subprocess.run(
+        [
+            "slapcat", "-F", config_dir, "-b", suffix,
+            "-s", "%s,%s" % (LEDGER_RDN, suffix),
+        ],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        universal_newlines=True,
+    )
+    if process.returncode:
+        return {}
+    ledger = {}
+    for record in read_records(process.stdout.splitlines()):
+        attributes = dict(
+            (name.lower(), value)
+            for name, value in (parse_line(line) for line in record[1:])
+        )
+        if 'cn' in attributes and 'description' in attributes:
+            ledger[attributes['cn']] = attributes['description']
+    return ledger
+
+
+class TemporarySlapd(object):
+    """slapd only listening on a local socket while migrations run"""
+
+    def __init__(self, config_dir, socket=LDAPI_SOCKET, timeout=30):
+        self.config_dir = config_dir
+        self.socket = socket
+        self.timeout = timeout
+        self.url = ldapi_url(socket)
+
+    def __enter__(self):
+        # A socket left by a killed slapd would look ready
+        if os.path.exists(self.socket):
+            os.unlink(self.socket)
+        self.process = subprocess.Popen([
+            "slapd", "-d", "0", "-F", self.config_dir,
+            "-u", "ldap", "-g", "ldap", "-h", self.url,
+        ])
+        try:
+            wait_ready(self.attempt, timeout=self.timeout)
+        except NotReady:
+            self.__exit__()
+            raise RuntimeError("Temporary slapd did not start")
+        return self
+
+    def attempt(self):
+        if self.process.poll() is not None:
+            raise RuntimeError("Temporary slapd exited with %d" % (
+                self.process.returncode
+            ))
+        return check(self.url, 1, whoami=True)
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        self.process.wait()
+
+    def connection(self):
+        return connect(self.url)
+
+
+def entry_changes(attributes, live):
+    """Return ldap3 modify changes to apply ``attributes`` on ``live``"""
+    live = dict((name.lower(), values) for name, values in live.items())
+    changes = {}
+    for name, values in attributes.items():
+        key = name.lower()
+        if key in ADD_ONLY_ATTRIBUTES or key in IGNORED_ATTRIBUTES:
+            continue
+        current = [str(value) for value in live.get(key, [])]
+        if key in MERGED_ATTRIBUTES:
+            normalize = MERGED_ATTRIBUTES[key]
+            present = {normalize(value) for value in current}
+            missing = [
+                value for value in values if normalize(value) not in present
+            ]
+            if missing:
+                changes[name] = [(MODIFY_ADD, missing)]
+        elif set(values) != set(current):
+            changes[name] = [(MODIFY_REPLACE, values)]
+    return changes
+
+
+def apply_source(con, source):
+    added = modified = 0
+    for dn, attributes in source.entries():
+        if not con.search(dn, '(objectClass=*)', BASE,
+                          attributes=list(attributes)):
+            if con.result['description'] not in ('noSuchObject', 'success'):
+                raise RuntimeError("Can't read %s: %r" % (dn, con.result))
+            attributes = dict(
+                (name, values) for name, values in attributes.items()
+                if name.lower() not in IGNORED_ATTRIBUTES
+            )
+            if not con.add(dn, attributes=attributes):
+                raise RuntimeError("Can't add %s: %r" % (dn, con.result))
+            added += 1
+            continue
+        changes = entry_changes(
+            attributes, con.entries[0].entry_attributes_as_dict
+        )
+        if changes:
+            if not con.modify(dn, changes):
+                raise RuntimeError("Can't modify %s: %r" % (dn, con.result))
+            modified += 1
+    return added, modified
+
+
+def record_ledger(con, source, suffix):
+    for dn, attributes in ledger_entries([source], suffix):
+        values = {}
+        for name, value in attributes:
+            values.setdefault(name, []).append(value)
+        if con.add(dn, attributes=values):
+            continue
+        if con.result['description'] != 'entryAlreadyExists':
+            raise RuntimeError("Can't record %s: %r" % (dn, con.result))
+        if dn.startswith('cn='):
+            con.modify(
+                dn, {'description': [(MODIFY_REPLACE, [source.checksum])]}
+            )
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog="python3 -m ldaptools.migrate",
+        description="Apply changed ldif sources read on stdin to the "
+                    "existing directory",
+    )
+    parser.add_argument(
+        "-F", dest="config_dir", default="/etc/openldap/slapd.d/",
+        help="slapd config directory (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-b", dest="suffix", required=True,
+        help="Database suffix, should looks like dc=example,dc=com",
+    )
+    parser.add_argument(
+        "--record", action="store_true",
+        help="Only write the ledger ldif of given sources to stdout (to be "
+             "imported with slapadd on a new data volume)",
+    )
+    return parser
+
+
+def main(argv=None):
+    args = get_parser().parse_args(argv)
+    sources = read_sources(sys.stdin)
+    if args.record:
+        for dn, attributes in ledger_entries(sources, args.suffix):
+            sys.stdout.write(format_entry(dn, attributes))
+        return
+
+    ledger = read_ledger(args.config_dir, args.suffix)
+    pending = [
+        source for source in sources
+        if ledger.get(source.name) != source.checksum
+    ]
+    if not pending:
+        print("No pending data migration", file=sys.stderr)
+        return
+
+    start = time.time()
+    with TemporarySlapd(args.config_dir) as slapd:
+        con = slapd.connection()
+        for source in pending:
+            added, modified = apply_source(con, source)
+            record_ledger(con, source, args.suffix)
+            print(
+                "Migration %s: %d entries, %d added, %d modified" % (
+                    source.name, source.count, added, modified
+                ),
+                file=sys.stderr
+            )
+        con.unbind()
+    print(
+        "%d data migrations applied in %.2fs" % (
+            len(pending), time.time() - start
+        ),
+        file=sys.stderr
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Readiness probe, exit 0 once slapd serves requests within a budget::
+
+    python3 -m ldaptools.probe --timeout 120
+
+Each attempt reads the RootDSE anonymously (or runs a whoami, SASL
+EXTERNAL over ``ldapi://``) on a new connection, slapd is ready when it
+answers within ``--budget`` seconds. Attempts are retried with an
+exponential backoff until ``--timeout`` elapsed, the default timeout of 0
+makes a single attempt as expected by the Docker ``HEALTHCHECK``.
+
+The default url is the ``LDAP_LDAPI_SOCKET`` socket if set, otherwise
+``ldaps://localhost``.
+"""
+import argparse
+import os
+import sys
+import time
+
+from ldap3 import BASE
+from ldap3.core.exceptions import LDAPException
+
+from .connection import connect, is_ldapi, ldapi_url
+
+
+class NotReady(Exception):
+    pass
+
+
+def default_url():
+    socket = os.getenv("LDAP_LDAPI_SOCKET")
+    if socket:
+        return ldapi_url(socket)
+    return "ldaps://localhost"
+
+
+def check(url, budget, whoami=False):
+    """Return the attempt duration, raise ``NotReady`` otherwise"""
+    start = time.monotonic()
+    try:
+        con = connect(url, receive_timeout=budget)
+        if whoami:
+            answered = con.extend.standard.who_am_i() is not None
+        else:
+            answered = con.search(
+                '', '(objectClass=*)', BASE, attributes=['namingContexts']
+            )
+        result = con.result
+        con.unbind()
+    except LDAPException as err:
+        raise NotReady("%s: %s" % (url, err))
+    duration = time.monotonic() - start
+    if not answered:
+        raise NotReady("%s: %r" % (url, result))
+    if duration > budget:
+        raise NotReady(
+            "%s answered in %.3fs, over the %.3fs budget" % (
+                url, duration, budget
+            )
+        )
+    return duration
+
+
+def wait_ready(attempt, timeout=0, initial_delay=0.05, max_delay=2,
+               sleep=time.sleep, clock=time.monotonic):
+    """Call ``attempt`` until it succeeds or ``timeout`` elapsed
+
+    Return ``(duration, attempts)`` of the successful attempt, raise the
+    last ``NotReady`` on timeout.
+    """
+    deadline = clock() + timeout
+    delay = initial_delay
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            return attempt(), attempts
+        except NotReady:
+            remaining = deadline - clock()
+            if remaining <= 0:
+                raise
+        sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog="python3 -m ldaptools.probe",
+        description="Wait until slapd answers within a latency budget",
+    )
+    parser.add_argument(
+        "-H", dest="url", default=default_url(),
+        help="ldap server url (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=0,
+        help="Seconds to keep retrying, 0 for a single attempt "
+             "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--budget", type=float, default=1.0,
+        help="Maximum seconds an attempt may take (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-delay", type=float, default=2.0,
+        help="Maximum seconds between attempts (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--whoami", action="store_true",
+        help="Run a whoami extended operation instead of reading the "
+             "RootDSE (default over ldapi://)",
+    )
+    parser.add_argument("-q", "--quiet", action="store_true")
+    return parser
+
+
+def main(argv=None):
+    args = get_parser().parse_args(argv)
+    whoami = args.whoami or is_ldapi(args.url)
+    try:
+        duration, attempts = wait_ready(
+            lambda: check(args.url, args.budget, whoami=whoami),
+            timeout=args.timeout, max_delay=args.max_delay,
+        )
+    except NotReady as err:
+        sys.exit("slapd not ready: %s" % err)
+    if not args.quiet:
+        print(
+            "slapd ready: %s answered in %.3fs after %d attempt(s)" % (
+                args.url, duration, attempts
+            ),
+            file=sys.stderr
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Patch a cn=config directory pre-rendered at image build time::
+
+    python3 -m ldaptools.skeleton /etc/openldap/slapd.d/ \\
+        --replace dc=skeleton,dc=invalid dc=example,dc=com \\
+        --set cn=config olcTLSCertificateFile /ssl/ldap.example.com.crt \\
+        --set cn=config olcTLSCACertificateFile ""
+
+The skeleton (see ``entrypoint.sh -K``) is imported with placeholder
+values, its ``*.ldif`` files are rewritten instead of rendering templates
+and running ``slapadd -n0`` on first start:
+
+* ``--replace`` substitutes a placeholder in every dn and value (root DC,
+  admin uid)
+* ``--set`` replaces all values of an attribute of an entry (added if
+  missing, deleted if the value is empty), entries are found by the dn
+  written in their file: back-ldif only writes the rdn of entries below
+  ``cn=config`` (ie: ``olcDatabase={1}mdb``)
+
+Rewritten files get a new ``# CRC32`` header so slapd does not report
+them as corrupted. Patching is deterministic: the same skeleton and
+options always give the same files.
+"""
+import argparse
+import os
+import sys
+import zlib
+
+from .ldif import format_entry, normalize_dn, parse_line, read_records
+
+HEADER = "# AUTO-GENERATED FILE - DO NOT EDIT!! Use ldapmodify.\n"
+
+
+def checksum_header(content):
+    """back-ldif header of a file holding ``content``"""
+    return HEADER + "# CRC32 %08x\n" % (
+        zlib.crc32(content.encode('utf-8')) & 0xffffffff
+    )
+
+
+def replace_all(text, replacements):
+    for old, new in replacements:
+        text = text.replace(old, new)
+    return text
+
+
+def patch_entry(dn, attributes, replacements=(), changes=()):
+    """Return ``(dn, attributes)`` with placeholders replaced and
+    ``(name, value)`` changes applied"""
+    dn = replace_all(dn, replacements)
+    attributes = [
+        (name, replace_all(value, replacements))
+        for name, value in attributes
+    ]
+    for name, value in changes:
+        positions = [
+            index for index, (current, _) in enumerate(attributes)
+            if current.lower() == name.lower()
+        ]
+        position = positions[0] if positions else len(attributes)
+        attributes = [
+            item for item in attributes if item[0].lower() != name.lower()
+        ]
+        if value:
+            attributes.insert(position, (name, value))
+    return dn, attributes
+
+
+def patch(directory, replacements=(), changes=()):
+    """Patch ``*.ldif`` files of a back-ldif ``directory``, ``changes`` are
+    ``(dn, name, value)``. Return the number of rewritten files."""
+    pending = {}
+    for dn, name, value in changes:
+        pending.setdefault(normalize_dn(dn), []).append((name, value))
+    rewritten = 0
+    for root, _, files in sorted(os.walk(directory)):
+        for file_name in sorted(files):
+            if not file_name.endswith('.ldif'):
+                continue
+            path = os.path.join(root, file_name)
+            with open(path, encoding='utf-8') as stream:
+                original = stream.read()
+                stream.seek(0)
+                record = next(read_records(stream))
+            dn = parse_line(record[0])[1]
+            attributes = [parse_line(line) for line in record[1:]]
+            dn, attributes = patch_entry(
+                dn, attributes, replacements,
+                pending.pop(normalize_dn(replace_all(dn, replacements)), [])
+            )
+            content = format_entry(dn, attributes)
+            content = checksum_header(content) + content
+            if content == original:
+                continue
+            with open(path, 'w', encoding='utf-8') as stream:
+                stream.write(content)
+            rewritten += 1
+    if pending:
+        raise ValueError(
+            "No entry to set %s" % ", ".join(sorted(pending))
+        )
+    return rewritten
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog="python3 -m ldaptools.skeleton",
+        description="Patch placeholders and values of a pre-rendered "
+                    "cn=config directory",
+    )
+    parser.add_argument("directory", help="slapd.d directory")
+    parser.add_argument(
+        "--replace", nargs=2, action="append", default=[],
+        metavar=("PLACEHOLDER", "VALUE"),
+        help="Replace PLACEHOLDER in every dn and value",
+    )
+    parser.add_argument(
+        "--set", nargs=3, action="append", default=[], dest="changes",
+        metavar=("DN", "ATTRIBUTE", "VALUE"),
+        help="Replace values of ATTRIBUTE of the entry whose file holds "
+             "DN (after placeholders replacement), an empty VALUE "
+             "deletes it",
+    )
+    return parser
+
+
+def main(argv=None):
+    args = get_parser().parse_args(argv)
+    try:
+        count = patch(args.directory, args.replace, args.changes)
+    except ValueError as err:
+        sys.exit(str(err))
+    print("cn=config skeleton: %d files patched" % count, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
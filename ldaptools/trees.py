@@ -0,0 +1,378 @@
+"""Lazy generators of the directory trees imported on first boot
+
+Each generator yields ``(dn, attributes)`` entries (see ``ldif.py``) in an
+order slapadd accepts (parents first). ``base`` is imported on every new
+data volume, ``demo`` and ``bulk`` are optional test data.
+
+As slapadd bypasses overlays, ``memberOf`` values are written alongside
+the ``member`` values of the groups.
+"""
+import random
+
+from array import array
+
+PERSON_CLASSES = [
+    ('objectClass', 'person'),
+    ('objectClass', 'organizationalPerson'),
+    ('objectClass', 'inetOrgPerson'),
+]
+
+
+def first_dc(domain):
+    return domain.split('.', 1)[0]
+
+
+def organization(root_dc, domain, organization, admin_uid, admin_password):
+    admin_dn = "uid=%s,ou=people,%s" % (admin_uid, root_dc)
+    yield root_dc, [
+        ('objectclass', 'dcObject'),
+        ('objectclass', 'organization'),
+        ('o', organization),
+        ('dc', first_dc(domain)),
+    ]
+    yield "ou=people," + root_dc, [
+        ('objectClass', 'organizationalUnit'),
+        ('ou', 'people'),
+        ('description', 'Physical people that require an account in LDAP'),
+    ]
+    yield admin_dn, PERSON_CLASSES + [
+        ('cn', 'Admin ' + admin_uid),
+        ('displayName', 'Admin ' + admin_uid),
+        ('sn', 'Admin ' + admin_uid),
+        ('givenName', 'Admin ' + admin_uid),
+        ('o', organization),
+        ('uid', admin_uid),
+        ('userPassword', admin_password),
+        ('pwdReset', 'FALSE'),
+        ('memberof', 'cn=ldap_people_admin,ou=groups,' + root_dc),
+        ('memberof', 'cn=ldap_apps_admin,ou=groups,' + root_dc),
+        ('memberof', 'cn=ldap_monitor,ou=groups,' + root_dc),
+    ]
+    yield "ou=groups," + root_dc, [
+        ('objectClass', 'organizationalUnit'),
+        ('ou', 'groups'),
+        ('description', 'Group list to create group of people'),
+    ]
+    yield "cn=ldap_people_admin,ou=groups," + root_dc, [
+        ('objectclass', 'groupOfNames'),
+        ('cn', 'ldap_people_admin'),
+        ('description', 'Ldap user administrators (ou=groups and ou=people)'),
+        ('member', admin_dn),
+    ]
+    yield "cn=ldap_apps_admin,ou=groups," + root_dc, [
+        ('objectclass', 'groupOfNames'),
+        ('cn', 'ldap_apps_admin'),
+        ('description',
+         'Ldap application user administrators(ou=applications)'),
+        ('member', admin_dn),
+    ]
+    yield "cn=ldap_monitor,ou=groups," + root_dc, [
+        ('objectclass', 'groupOfNames'),
+        ('cn', 'ldap_monitor'),
+        ('description',
+         'Operators allowed to read slapd metrics (cn=monitor)'),
+        ('member', admin_dn),
+    ]
+    # Technical account required by applications
+    yield "ou=applications," + root_dc, [
+        ('objectClass', 'organizationalUnit'),
+        ('ou', 'applications'),
+        ('description',
+         "liste des applications ayant un compte LDAP pour effectuer des "
+         "requêtes. Par défaut ces utilisateurs ont accès en lecture et "
+         "search tout les inetOrgPerson lié aux groupes dont l'entrée "
+         "InetOrgPerson de l'application elle même fait partie."),
+    ]
+    yield "ou=policies," + root_dc, [
+        ('objectClass', 'organizationalUnit'),
+        ('objectClass', 'top'),
+        ('ou', 'policies'),
+    ]
+
+
+def policies(root_dc):
+    # https://linux.die.net/man/5/slapo-ppolicy
+    # https://www.openldap.org/doc/admin26/overlays.html#Password%20Policies
+    yield "cn=default,ou=policies," + root_dc, [
+        ('objectClass', 'pwdPolicy'),
+        ('objectClass', 'person'),
+        ('objectClass', 'top'),
+        ('cn', 'default'),
+        ('sn', 'Default password policy'),
+        ('pwdAllowUserChange', 'TRUE'),
+        ('pwdAttribute', 'userPassword'),
+        ('pwdCheckQuality', '1'),
+        ('pwdExpireWarning', '600'),
+        ('pwdFailureCountInterval', '30'),
+        ('pwdGraceAuthNLimit', '5'),
+        ('pwdInHistory', '5'),
+        ('pwdLockout', 'TRUE'),
+        ('pwdLockoutDuration', '60'),
+        # number of seconds after which a modified password will expire,
+        # 0: passwords will not expire.
+        ('pwdMaxAge', '0'),
+        ('pwdMaxFailure', '5'),
+        ('pwdMinAge', '0'),
+        ('pwdMinLength', '5'),
+        # If set to TRUE this make possible to ask user to change password
+        # while they connect the first time the matter is to make sure we
+        # have tool that can handle this behaviour
+        ('pwdMustChange', 'FALSE'),
+        # If set to TRUE users must supply old password while changeing
+        # password, this is sucks for people that administrate other people
+        # that needs to reset password.
+        ('pwdSafeModify', 'FALSE'),
+    ]
+
+
+def base(root_dc, domain, organization_name, admin_uid, admin_password):
+    """Tree imported on every new data volume"""
+    yield from organization(
+        root_dc, domain, organization_name, admin_uid, admin_password
+    )
+    yield from policies(root_dc)
+
+
+def demo_people(root_dc, domain, organization):
+
+    def person(uid, cn, sn, given_name, mail, password=None, extra=None):
+        attributes = PERSON_CLASSES + [
+            ('cn', cn),
+            ('sn', sn),
+            ('givenName', given_name),
+            ('mail', "%s@%s" % (mail, domain)),
+            ('mobile', '+33600000000'),
+            ('o', organization),
+            ('uid', uid),
+        ]
+        if password:
+            attributes.append(('userPassword', password))
+        return "uid=%s,ou=people,%s" % (uid, root_dc), attributes + (
+            extra or []
+        )
+
+    yield person(
+        'tadmin-people', 'Test People Administrator',
+        'Test People Administrator', 'Test People Administrator',
+        'tadmin-people', 'tadmin-peoplePASS'
+    )
+    yield person(
+        'tadmin-apps', 'Test Applications Administrator',
+        'Test Applications Administrator', 'Test admin apps',
+        'tadmin-apps', 'tadmin-appsPASS'
+    )
+    yield person(
+        'tuser', 'Test User', 'User', 'Test User', 'tuser', 'tuserPASS',
+        [('memberOf', 'cn=fakeapp,ou=groups,' + root_dc)]
+    )
+    yield person(
+        'tuser2', 'Test User 2', 'User 2', 'Test User 2', 'tuser',
+        'tuser2PASS'
+    )
+    yield person(
+        'tdisableduser', 'Test Disabled User', 'Disabled User',
+        'Test disabled user', 'tdisableduser', 'tdisableduserPASS',
+        [('pwdAccountLockedTime', '000001010000Z')]
+    )
+    yield person(
+        'tnopassuser', 'Test No Password User', 'No Password User',
+        'Test no password', 'tdisableduser'
+    )
+
+
+def demo_applications(root_dc):
+    for uid, description in [
+        ('fakeapp', 'fakeapp technical user'),
+        ('fakeapp2', 'fakeapp2 technical user'),
+        ('tapp-people-admin', 'technical people admin'),
+        ('tapp-apps-admin', 'technical apps admin'),
+        ('tapp-admin', 'technical full admin'),
+    ]:
+        yield "uid=%s,ou=applications,%s" % (uid, root_dc), PERSON_CLASSES + [
+            ('sn', description),
+            ('cn', description),
+            ('uid', uid),
+            ('userPassword', uid + 'PASS'),
+        ]
+
+
+def demo_groups(root_dc):
+    yield "cn=fakeapp,ou=groups," + root_dc, [
+        ('cn', 'fakeapp'),
+        ('description', 'Utilisateur de fakeapp'),
+        ('objectclass', 'groupOfNames'),
+        ('member', 'uid=tadministrator,ou=people,' + root_dc),
+        ('member', 'uid=tuser,ou=people,' + root_dc),
+    ]
+
+
+def demo(root_dc, domain, organization):
+    """Entries used by the test suite"""
+    yield from demo_people(root_dc, domain, organization)
+    yield from demo_applications(root_dc)
+    yield from demo_groups(root_dc)
+
+
+def bulk_person(root_dc, domain, organization, index, password=None):
+    uid = "bulk-user-%06d" % index
+    attributes = PERSON_CLASSES + [
+        ('cn', 'Bulk User %06d' % index),
+        ('sn', 'User %06d' % index),
+        ('mail', "%s@%s" % (uid, domain)),
+        ('o', organization),
+        ('uid', uid),
+    ]
+    if password:
+        attributes.append(('userPassword', password))
+    return "uid=%s,ou=people,%s" % (uid, root_dc), attributes
+
+
+def bulk_application(root_dc, index, password=None):
+    uid = "bulk-app-%06d" % index
+    attributes = PERSON_CLASSES + [
+        ('sn', 'Bulk application %06d' % index),
+        ('cn', 'Bulk application %06d' % index),
+        ('uid', uid),
+    ]
+    if password:
+        attributes.append(('userPassword', password))
+    return "uid=%s,ou=applications,%s" % (uid, root_dc), attributes
+
+
+def bulk_group(root_dc, index, members):
+    return "cn=bulk-group-%06d,ou=groups,%s" % (index, root_dc), [
+        ('objectclass', 'groupOfNames'),
+        ('cn', 'bulk-group-%06d' % index),
+        ('description', 'Bulk generated group'),
+    ] + [('member', member) for member in members]
+
+
+def bulk(root_dc, domain, organization, admin_uid, people=0, groups=0,
+         password=None, applications=0, admin_groups=None):
+    """``people`` users and ``applications`` spread round robin over
+    ``groups`` groups
+
+    Group without any member gets the default administrator as member
+    (groupOfNames requires one) like refint does. The administrator entry
+    belongs to the base tree, the dns of those groups are appended to the
+    ``admin_groups`` list so its ``memberOf`` values can be added.
+    """
+    group_dns = [
+        "cn=bulk-group-%06d,ou=groups,%s" % (index, root_dc)
+        for index in range(groups)
+    ]
+    for index in range(people):
+        dn, attributes = bulk_person(
+            root_dc, domain, organization, index, password
+        )
+        if group_dns:
+            attributes.append(('memberOf', group_dns[index % groups]))
+        yield dn, attributes
+    for index in range(applications):
+        dn, attributes = bulk_application(root_dc, index, password)
+        if group_dns:
+            attributes.append(('memberOf', group_dns[index % groups]))
+        yield dn, attributes
+    for index in range(groups):
+        members = [
+            "uid=bulk-user-%06d,ou=people,%s" % (member, root_dc)
+            for member in range(index, people, groups)
+        ] + [
+            "uid=bulk-app-%06d,ou=applications,%s" % (member, root_dc)
+            for member in range(index, applications, groups)
+        ]
+        if not members:
+            members = ["uid=%s,ou=people,%s" % (admin_uid, root_dc)]
+            if admin_groups is not None:
+                admin_groups.append(group_dns[index])
+        yield bulk_group(root_dc, index, members)
+
+
+def zipf_sizes(groups, largest, exponent=1.1, large_groups=3):
+    """Group sizes: ``large_groups`` groups of ``largest`` members then
+    sizes decreasing as ``largest / rank ** exponent`` (at least 1)"""
+    return [
+        largest if rank < large_groups else
+        max(1, int(largest / (rank - large_groups + 2) ** exponent))
+        for rank in range(groups)
+    ]
+
+
+def bulk_zipf(root_dc, domain, organization, admin_uid, people=0, groups=0,
+              password=None, applications=0, seed=0, exponent=1.1,
+              largest=100000, large_groups=3, admin_groups=None):
+    """Same entries as ``bulk`` with realistic group memberships
+
+    Group sizes follow ``zipf_sizes`` (``largest`` is capped to
+    ``people``), members of each group are drawn at random, so people
+    belong to any number of groups. Application ``n`` is member of a group
+    drawn with the same Zipfian weights (popular groups get more
+    applications, all groups weigh the same without people), applications
+    are not member of any group without groups. The output only depends
+    on the parameters and ``seed``. Groups filled with the default
+    administrator are appended to ``admin_groups`` as in ``bulk``.
+
+    Memberships are kept as arrays of indexes (4 bytes per membership and
+    per person) to write ``memberOf`` values, entries are streamed.
+    """
+    rand = random.Random(seed)
+    largest = min(largest, people)
+    sizes = zipf_sizes(groups, largest, exponent, large_groups) if people \
+        else [0] * groups
+    members = [
+        array('I', sorted(rand.sample(range(people), size)))
+        for size in sizes
+    ]
+    app_groups = rand.choices(
+        range(groups), weights=sizes if people else None, k=applications
+    ) if groups else [None] * applications
+
+    # person index -> group indexes, as offsets in a flat array
+    offsets = array('I', [0]) * (people + 1)
+    for group in members:
+        for person in group:
+            offsets[person + 1] += 1
+    for index in range(people):
+        offsets[index + 1] += offsets[index]
+    filled = offsets[:-1]
+    person_groups = array('I', [0]) * offsets[-1]
+    for group_index, group in enumerate(members):
+        for person in group:
+            person_groups[filled[person]] = group_index
+            filled[person] += 1
+    del filled
+
+    def group_dn(index):
+        return "cn=bulk-group-%06d,ou=groups,%s" % (index, root_dc)
+
+    for index in range(people):
+        dn, attributes = bulk_person(
+            root_dc, domain, organization, index, password
+        )
+        yield dn, attributes + [
+            ('memberOf', group_dn(group))
+            for group in person_groups[offsets[index]:offsets[index + 1]]
+        ]
+    del person_groups, offsets
+    for index, group in enumerate(app_groups):
+        dn, attributes = bulk_application(root_dc, index, password)
+        if group is not None:
+            attributes.append(('memberOf', group_dn(group)))
+        yield dn, attributes
+    app_members = {}
+    for index, group in enumerate(app_groups):
+        app_members.setdefault(group, []).append(
+            "uid=bulk-app-%06d,ou=applications,%s" % (index, root_dc)
+        )
+    for index, group in enumerate(members):
+        group_members = [
+            "uid=bulk-user-%06d,ou=people,%s" % (member, root_dc)
+            for member in group
+        ] + app_members.get(index, [])
+        if not group_members:
+            group_members = ["uid=%s,ou=people,%s" % (admin_uid, root_dc)]
+            if admin_groups is not None:
+                admin_groups.append(group_dn(index))
+        yield bulk_group(root_dc, index, group_members)
+        # large groups are only needed once
+        members[index] = None
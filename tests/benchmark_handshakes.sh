@@ -0,0 +1,69 @@
+#!/bin/bash
+
+# Exist in case of error
+set -e
+
+HARNESS="CI_bench_handshakes"
+SUBNET=144.25
+source `dirname $0`/lib/harness.sh
+
+BENCH_KEY_ALGORITHMS=${BENCH_KEY_ALGORITHMS:-"ecdsa-p256 ed25519 rsa-2048 rsa-4096"}
+BENCH_TLS_VERSIONS=${BENCH_TLS_VERSIONS:-"1.2 1.3"}
+BENCH_HANDSHAKE_MODES=${BENCH_HANDSHAKE_MODES:-"full resumed"}
+BENCH_DURATION=${BENCH_DURATION:-20}
+BENCH_WORKERS=${BENCH_WORKERS:-32}
+RESULTS=${RESULTS:-"benchmark_handshakes_$DATETIME.jsonl"}
+
+USAGE="Usage: $0 [-h]
+
+Start ldap.example.com image once per certificate key algorithm listed in
+BENCH_KEY_ALGORITHMS (tests/certificate KEY_ALGORITHM) and measure TLS
+handshakes per second with BENCH_WORKERS concurrent clients for each TLS
+version of BENCH_TLS_VERSIONS and each mode of BENCH_HANDSHAKE_MODES: full
+handshakes or handshakes resuming an earlier session (benchmarks.handshakes
+--resume), json results are written to RESULTS ($RESULTS).
+
+Options:
+    -h           Show this help.
+"
+
+
+while getopts "h" OPTION
+do
+    case $OPTION in
+        h) echo "$USAGE";
+           exit;;
+        *) echo "Unknown parameter... ";
+           echo "$USAGE";
+           exit 1;;
+    esac
+done
+
+
+cleanup_env
+build_images
+create_network
+for algorithm in $BENCH_KEY_ALGORITHMS; do
+    echo "Benchmark $algorithm certificate"
+    prepare_certificates "$algorithm"
+    run_ldap $BENCH_LDAP_CT $LDAP_SERVER_IP
+    for version in $BENCH_TLS_VERSIONS; do
+        for mode in $BENCH_HANDSHAKE_MODES; do
+            resume=""
+            if [ "$mode" = resumed ]; then
+                resume="--resume"
+            fi
+            run_client -- python -m benchmarks.handshakes \
+                --label "$algorithm" \
+                --tls-version "$version" \
+                --ca-file /ssl/ca.crt \
+                --workers $BENCH_WORKERS \
+                --duration $BENCH_DURATION \
+                $resume | tee -a "$RESULTS"
+        done
+    done
+    docker rm -v -f $BENCH_LDAP_CT > /dev/null
+    docker volume rm $CERTIFICAT_VOLUME_NAME > /dev/null
+done
+cleanup_env
+echo "Results written to $RESULTS"
@@ -0,0 +1,81 @@
+#!/bin/bash
+
+# Exist in case of error
+set -e
+
+HARNESS="CI_load"
+SUBNET=144.21
+READY_TIMEOUT=${READY_TIMEOUT:-120}
+# the images to compare are built elsewhere unless -b is given
+BUILD_LDAP_IMAGE=false
+source `dirname $0`/lib/harness.sh
+
+# space separated images to compare, the first one is the baseline
+IMAGES=${IMAGES:-"$LDAP_IMAGE:latest"}
+LOAD_WORKERS=${LOAD_WORKERS:-40}
+LOAD_RATE=${LOAD_RATE:-0}
+LOAD_DURATION=${LOAD_DURATION:-60}
+LOAD_MIX=${LOAD_MIX:-"bind=1,base=4,one=1,subtree=4,password=1,member=1"}
+RESULTS_DIR=${RESULTS_DIR:-"$CURRENT_DIR/benchmark_load_$DATETIME"}
+
+USAGE="Usage: $0 [-h] [-b]
+
+Start each image of IMAGES ($IMAGES) with the demo data and the test
+personas, load it with benchmarks.load and write one json result per image
+in RESULTS_DIR ($RESULTS_DIR). Results of the following images are then
+compared to the first one.
+
+Options:
+    -h           Show this help.
+    -b           Build $LDAP_IMAGE:latest from the current tree first
+"
+
+
+while getopts "hb" OPTION
+do
+    case $OPTION in
+        h) echo "$USAGE";
+           exit;;
+        b) BUILD_LDAP_IMAGE=true;;
+        *) echo "Unknown parameter... ";
+           echo "$USAGE";
+           exit 1;;
+    esac
+done
+
+
+cleanup_env
+build_images
+prepare_certificates
+mkdir -p $RESULTS_DIR
+create_network
+RESULTS=""
+for image in $IMAGES; do
+    result="`echo "$image" | tr '/:' '__'`.json"
+    echo "Load $image"
+    LDAP_RUN_IMAGE=$image
+    run_ldap $BENCH_LDAP_CT $LDAP_SERVER_IP \
+        -v $CURRENT_DIR/init/:/srv/ldap/init \
+        -e LDAP_DEFAULT_ADMIN_UID="$ADMIN_UID" \
+        -e LDAP_DEFAULT_ADMIN_PASSWORD="$ADMIN_SSHA" \
+        -e LDAP_DEMO=true
+    run_client -v $RESULTS_DIR:/results -- python -m benchmarks.load \
+        --label "$image" \
+        --workers $LOAD_WORKERS \
+        --rate $LOAD_RATE \
+        --duration $LOAD_DURATION \
+        --mix "$LOAD_MIX" \
+        --output "/results/$result"
+    docker rm -v -f $BENCH_LDAP_CT > /dev/null
+    RESULTS="$RESULTS $result"
+done
+set -- $RESULTS
+baseline=$1
+shift
+for result in "$@"; do
+    echo "Compare $baseline (baseline) with $result"
+    run_client -v $RESULTS_DIR:/results -- python -m benchmarks.load \
+        --compare "/results/$baseline" "/results/$result"
+done
+cleanup_env
+echo "Results written to $RESULTS_DIR"
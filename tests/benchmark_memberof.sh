@@ -0,0 +1,68 @@
+#!/bin/bash
+
+# Exist in case of error
+set -e
+
+HARNESS="CI_bench_memberof"
+SUBNET=144.22
+source `dirname $0`/lib/harness.sh
+
+BENCH_PEOPLE=${BENCH_PEOPLE:-100000}
+BENCH_GROUP_SIZES=${BENCH_GROUP_SIZES:-"10 100 1000 10000 100000"}
+BENCH_MEMBERSHIPS=${BENCH_MEMBERSHIPS:-"1 10 100 1000"}
+BENCH_REPEAT=${BENCH_REPEAT:-5}
+RESULTS=${RESULTS:-"benchmark_memberof_$DATETIME.jsonl"}
+
+# label|environment variables separated by ';', one group membership
+# stack per line
+VARIANTS=${VARIANTS:-"memberof|
+dynlist|LDAP_MEMBEROF_MODE=dynlist"}
+
+USAGE="Usage: $0 [-h]
+
+Start ldap.example.com image once per group membership stack listed in
+VARIANTS (loaded with BENCH_PEOPLE bulk users) and measure with
+benchmarks.memberof member add / delete, user rename / delete and memberOf
+read latencies against group sizes (BENCH_GROUP_SIZES) and the number of
+groups of a user (BENCH_MEMBERSHIPS), json results are written to
+RESULTS ($RESULTS).
+
+Options:
+    -h           Show this help.
+"
+
+
+while getopts "h" OPTION
+do
+    case $OPTION in
+        h) echo "$USAGE";
+           exit;;
+        *) echo "Unknown parameter... ";
+           echo "$USAGE";
+           exit 1;;
+    esac
+done
+
+
+cleanup_env
+build_images
+prepare_certificates
+create_network
+echo "$VARIANTS" | while IFS="|" read -r label variables; do
+    [[ -z "$label" ]] && continue
+    echo "Benchmark $label ($variables)"
+    write_env_file "$variables"
+    run_ldap $BENCH_LDAP_CT $LDAP_SERVER_IP \
+        -e LDAP_BULK_PEOPLE=$BENCH_PEOPLE \
+        -e LDAP_BULK_LOAD=true \
+        --env-file $ENV_FILE
+    run_client -- python -m benchmarks.memberof \
+        --label "$label" \
+        --people $BENCH_PEOPLE \
+        --group-sizes $BENCH_GROUP_SIZES \
+        --memberships $BENCH_MEMBERSHIPS \
+        --repeat $BENCH_REPEAT < /dev/null | tee -a "$RESULTS"
+    docker rm -v -f $BENCH_LDAP_CT > /dev/null
+done
+cleanup_env
+echo "Results written to $RESULTS"
@@ -0,0 +1,69 @@
+#!/bin/bash
+
+# Exist in case of error
+set -e
+
+HARNESS="CI_bench_passwords"
+SUBNET=144.23
+source `dirname $0`/lib/harness.sh
+
+BENCH_ACCOUNTS=${BENCH_ACCOUNTS:-200}
+BENCH_DURATION=${BENCH_DURATION:-20}
+BENCH_WORKERS=${BENCH_WORKERS:-"1 16 64"}
+RESULTS=${RESULTS:-"benchmark_passwords_$DATETIME.jsonl"}
+
+# label|environment variables separated by ';', one password hash scheme
+# and cost setting per line
+VARIANTS=${VARIANTS:-"ssha|LDAP_PASSWORD_HASH={SSHA}
+ssha512|LDAP_PASSWORD_HASH={SSHA512}
+pbkdf2-sha512|LDAP_PASSWORD_HASH={PBKDF2-SHA512}
+crypt-sha512-5000|LDAP_PASSWORD_HASH={CRYPT};LDAP_CRYPT_ROUNDS=5000
+crypt-sha512-50000|LDAP_PASSWORD_HASH={CRYPT};LDAP_CRYPT_ROUNDS=50000
+argon2-m19456-t2|LDAP_PASSWORD_HASH={ARGON2}
+argon2-m65536-t3|LDAP_PASSWORD_HASH={ARGON2};LDAP_ARGON2_MEMORY=65536;LDAP_ARGON2_ITERATIONS=3
+argon2-m262144-t1|LDAP_PASSWORD_HASH={ARGON2};LDAP_ARGON2_MEMORY=262144;LDAP_ARGON2_ITERATIONS=1"}
+
+USAGE="Usage: $0 [-h]
+
+Start ldap.example.com image once per password hash scheme and cost listed
+in VARIANTS and measure simple bind throughput of BENCH_ACCOUNTS accounts
+with BENCH_WORKERS concurrent connections (benchmarks.passwords), json
+results are written to RESULTS ($RESULTS).
+
+Options:
+    -h           Show this help.
+"
+
+
+while getopts "h" OPTION
+do
+    case $OPTION in
+        h) echo "$USAGE";
+           exit;;
+        *) echo "Unknown parameter... ";
+           echo "$USAGE";
+           exit 1;;
+    esac
+done
+
+
+cleanup_env
+build_images
+prepare_certificates
+create_network
+echo "$VARIANTS" | while IFS="|" read -r label variables; do
+    [[ -z "$label" ]] && continue
+    echo "Benchmark $label ($variables)"
+    write_env_file "$variables"
+    run_ldap $BENCH_LDAP_CT $LDAP_SERVER_IP --env-file $ENV_FILE
+    for workers in $BENCH_WORKERS; do
+        run_client -- python -m benchmarks.passwords \
+            --label "$label" \
+            --workers "$workers" \
+            --accounts $BENCH_ACCOUNTS \
+            --duration $BENCH_DURATION < /dev/null | tee -a "$RESULTS"
+    done
+    docker rm -v -f $BENCH_LDAP_CT > /dev/null
+done
+cleanup_env
+echo "Results written to $RESULTS"
@@ -0,0 +1,68 @@
+#!/bin/bash
+
+# Exist in case of error
+set -e
+
+HARNESS="CI_bench_ppolicy"
+SUBNET=144.24
+source `dirname $0`/lib/harness.sh
+
+BENCH_ACCOUNTS=${BENCH_ACCOUNTS:-200}
+BENCH_DURATION=${BENCH_DURATION:-20}
+BENCH_WORKERS=${BENCH_WORKERS:-32}
+BENCH_FAILURE_RATIOS=${BENCH_FAILURE_RATIOS:-"0 0.1 0.5"}
+RESULTS=${RESULTS:-"benchmark_ppolicy_$DATETIME.jsonl"}
+
+# label|environment variables separated by ';', one password policy
+# profile per line
+VARIANTS=${VARIANTS:-"lockout|LDAP_PPOLICY_PROFILE=lockout
+lastbind|LDAP_PPOLICY_PROFILE=lastbind
+lastbind-precision-0|LDAP_PPOLICY_PROFILE=lastbind;LDAP_LASTBIND_PRECISION=0
+no-write|LDAP_PPOLICY_PROFILE=no-write"}
+
+USAGE="Usage: $0 [-h]
+
+Start ldap.example.com image once per password policy profile listed in
+VARIANTS and measure simple bind throughput of BENCH_ACCOUNTS accounts
+with BENCH_WORKERS concurrent connections, for each ratio of failed binds
+listed in BENCH_FAILURE_RATIOS (benchmarks.passwords --failure-ratio),
+json results are written to RESULTS ($RESULTS).
+
+Options:
+    -h           Show this help.
+"
+
+
+while getopts "h" OPTION
+do
+    case $OPTION in
+        h) echo "$USAGE";
+           exit;;
+        *) echo "Unknown parameter... ";
+           echo "$USAGE";
+           exit 1;;
+    esac
+done
+
+
+cleanup_env
+build_images
+prepare_certificates
+create_network
+echo "$VARIANTS" | while IFS="|" read -r label variables; do
+    [[ -z "$label" ]] && continue
+    echo "Benchmark $label ($variables)"
+    write_env_file "$variables"
+    run_ldap $BENCH_LDAP_CT $LDAP_SERVER_IP --env-file $ENV_FILE
+    for ratio in $BENCH_FAILURE_RATIOS; do
+        run_client -- python -m benchmarks.passwords \
+            --label "$label" \
+            --workers $BENCH_WORKERS \
+            --failure-ratio "$ratio" \
+            --accounts $BENCH_ACCOUNTS \
+            --duration $BENCH_DURATION < /dev/null | tee -a "$RESULTS"
+    done
+    docker rm -v -f $BENCH_LDAP_CT > /dev/null
+done
+cleanup_env
+echo "Results written to $RESULTS"
@@ -0,0 +1,77 @@
+#!/bin/bash
+
+# Exist in case of error
+set -e
+
+HARNESS="CI_bench"
+SUBNET=144.19
+source `dirname $0`/lib/harness.sh
+
+BENCH_PEOPLE=${BENCH_PEOPLE:-10000}
+BENCH_GROUPS=${BENCH_GROUPS:-20}
+BENCH_DURATION=${BENCH_DURATION:-20}
+BENCH_WORKERS=${BENCH_WORKERS:-32}
+BENCH_OPERATIONS=${BENCH_OPERATIONS:-"search read modify"}
+RESULTS=${RESULTS:-"benchmark_tunables_$DATETIME.jsonl"}
+
+# label|environment variables separated by ';', one server setting change
+# per line compared to the "defaults" reference line
+VARIANTS=${VARIANTS:-"defaults|
+threads-4|LDAP_THREADS=4
+threads-64|LDAP_THREADS=64;LDAP_DB_MAX_READERS=128
+listener-threads-4|LDAP_LISTENER_THREADS=4
+no-sync|LDAP_DB_NO_SYNC=TRUE;LDAP_DB_CHECKPOINT=1024 5
+checkpoint|LDAP_DB_CHECKPOINT=1024 5
+search-stack-4|LDAP_DB_SEARCH_STACK=4
+rtxn-size-100|LDAP_DB_RTXN_SIZE=100"}
+
+USAGE="Usage: $0 [-h]
+
+Start ldap.example.com image once per server setting listed in VARIANTS
+(loaded with BENCH_PEOPLE bulk users) and measure BENCH_OPERATIONS
+throughput with benchmarks.throughput, json results are written to
+RESULTS ($RESULTS).
+
+Options:
+    -h           Show this help.
+"
+
+
+while getopts "h" OPTION
+do
+    case $OPTION in
+        h) echo "$USAGE";
+           exit;;
+        *) echo "Unknown parameter... ";
+           echo "$USAGE";
+           exit 1;;
+    esac
+done
+
+
+cleanup_env
+build_images
+prepare_certificates
+create_network
+echo "$VARIANTS" | while IFS="|" read -r label variables; do
+    [[ -z "$label" ]] && continue
+    echo "Benchmark $label ($variables)"
+    write_env_file "$variables"
+    run_ldap $BENCH_LDAP_CT $LDAP_SERVER_IP \
+        -e LDAP_BULK_PEOPLE=$BENCH_PEOPLE \
+        -e LDAP_BULK_GROUPS=$BENCH_GROUPS \
+        -e LDAP_BULK_LOAD=true \
+        --env-file $ENV_FILE
+    for operation in $BENCH_OPERATIONS; do
+        run_client -- python -m benchmarks.throughput \
+            --label "$label" \
+            --operation "$operation" \
+            --workers $BENCH_WORKERS \
+            --duration $BENCH_DURATION \
+            --people $BENCH_PEOPLE \
+            --groups $BENCH_GROUPS < /dev/null | tee -a "$RESULTS"
+    done
+    docker rm -v -f $BENCH_LDAP_CT > /dev/null
+done
+cleanup_env
+echo "Results written to $RESULTS"
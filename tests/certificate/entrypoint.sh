@@ -8,9 +8,13 @@ CERT_SUB_DOMAIN=${CERT_SUB_DOMAIN:-ldap}
 OUTPUT_DIR=${OUTPUT_DIR:-/certificate}
 GID=${GID:-0}
 UID=${UID:-0}
+KEY_ALGORITHM=${KEY_ALGORITHM:-ecdsa-p256}
+CA_CACHE_DIR=${CA_CACHE_DIR:-""}
+CA_DAYS=${CA_DAYS:-365}
 
 USAGE="Usage: $0 [-D CA DOMAIN] [-S CERT_SUB_DOMAIN] [-o OUTPUT DIR]
-                 [-G GROUP ID] [-U UID] [-h]
+                 [-G GROUP ID] [-U UID] [-a KEY ALGORITHM]
+                 [-c CA CACHE DIR] [-h]
 
 Script to generate CA and certificate for testing purpose.
 
@@ -37,18 +41,34 @@ Options:
     -U UID                  generated files User ID owner mumber
                             can be set using env var UID
                             (default: $UID)
+    -a KEY_ALGORITHM        CA and certificate key algorithm: ecdsa-p256,
+                            ed25519, rsa-2048 or rsa-4096. ECDSA and Ed25519
+                            keys are generated and sign TLS handshakes much
+                            faster than RSA ones.
+                            can be set using env var KEY_ALGORITHM
+                            (default: $KEY_ALGORITHM)
+    -c CA_CACHE_DIR         Persistent directory (ie: a volume) keeping the
+                            CA, one per domain, key algorithm and ca-config
+                            content, it is reused by next runs while valid
+                            ($CA_DAYS days, CA_DAYS env var), as well as the
+                            certificate (while valid more than a day).
+                            can be set using env var CA_CACHE_DIR
+                            (default: $CA_CACHE_DIR, no cache)
     -h                      Show this help.
 "
 
 
 
-while getopts "D:S:G:U:o:h" OPTION
+while getopts "D:S:G:U:o:a:c:h" OPTION
 do
     case $OPTION in
         D) CA_DOMAIN=$OPTARG;;
         S) CERT_SUB_DOMAIN=$OPTARG;;
         G) GID=$OPTARG;;
         U) UID=$OPTARG;;
+        o) OUTPUT_DIR=$OPTARG;;
+        a) KEY_ALGORITHM=$OPTARG;;
+        c) CA_CACHE_DIR=$OPTARG;;
         h) echo "$USAGE";
            exit;;
         *) echo "Unknown parameter... ";
@@ -59,29 +79,73 @@ done
 
 DOMAIN="$CERT_SUB_DOMAIN.$CA_DOMAIN"
 
-# generate CA
-openssl req -new -x509 -extensions v3_ca -newkey rsa:4096 \
-    -sha256 \
-    -keyout private/ca.key \
-    -out certs/ca.crt -nodes \
-    -subj "/CN=$CA_DOMAIN" \
-    -config ca-config
-
-# geneerate CSR
-openssl req -new -nodes -newkey rsa:4096 \
-    -sha256 \
-    -keyout "private/$DOMAIN.key" \
-    -out "$DOMAIN.csr" \
-    -subj "/CN=$DOMAIN" \
-    -config ca-config
-
-openssl ca -config ca-config -policy policy_anything \
-    -extensions server_cert \
-    -md sha256 \
-    -batch \
-    -out "certs/$DOMAIN.crt" \
-    -infiles "$DOMAIN.csr"
+case "$KEY_ALGORITHM" in
+    ecdsa-p256)
+        KEY_OPTIONS="-algorithm EC -pkeyopt ec_paramgen_curve:P-256";;
+    ed25519)
+        KEY_OPTIONS="-algorithm ED25519";;
+    rsa-2048|rsa-4096)
+        KEY_OPTIONS="-algorithm RSA -pkeyopt rsa_keygen_bits:${KEY_ALGORITHM#rsa-}";;
+    *) echo "Unknown key algorithm $KEY_ALGORITHM" >&2
+       exit 1;;
+esac
+# Ed25519 signatures have no separate digest
+REQ_DIGEST="-sha256"
+CA_DIGEST="-md sha256"
+if [ "$KEY_ALGORITHM" = ed25519 ]; then
+    REQ_DIGEST=""
+    CA_DIGEST=""
+fi
 
+if [ -n "$CA_CACHE_DIR" ]; then
+    # content addressed: a changed ca-config or algorithm gets a new CA
+    CACHE_KEY=`{ echo "$CA_DOMAIN $KEY_ALGORITHM"; cat ca-config; } | \
+               sha256sum | cut -c 1-16`
+    CA_DIR="$CA_CACHE_DIR/$CA_DOMAIN-$KEY_ALGORITHM-$CACHE_KEY"
+    if [ ! -d "$CA_DIR" ]; then
+        mkdir -p "$CA_DIR"
+        cp -r private certs newcerts crl csr index.txt serial "$CA_DIR/"
+    fi
+    cp ca-config "$CA_DIR/"
+    cd "$CA_DIR"
+fi
+# certificates of a cached CA are renewed before they expire
+echo "unique_subject = no" > index.txt.attr
+
+if [ -f private/ca.key ] && \
+        openssl x509 -checkend 86400 -noout -in certs/ca.crt; then
+    echo "Reuse cached CA `pwd`/certs/ca.crt"
+else
+    # generate CA
+    openssl genpkey $KEY_OPTIONS -out private/ca.key
+    openssl req -new -x509 -extensions v3_ca -key private/ca.key \
+        $REQ_DIGEST \
+        -days $CA_DAYS \
+        -out certs/ca.crt \
+        -subj "/CN=$CA_DOMAIN" \
+        -config ca-config
+    rm -f "certs/$DOMAIN.crt"
+fi
+
+if [ -f "private/$DOMAIN.key" ] && [ -f "certs/$DOMAIN.crt" ] && \
+        openssl x509 -checkend 86400 -noout -in "certs/$DOMAIN.crt"; then
+    echo "Reuse cached certificate `pwd`/certs/$DOMAIN.crt"
+else
+    # geneerate CSR
+    openssl genpkey $KEY_OPTIONS -out "private/$DOMAIN.key"
+    openssl req -new -key "private/$DOMAIN.key" \
+        $REQ_DIGEST \
+        -out "$DOMAIN.csr" \
+        -subj "/CN=$DOMAIN" \
+        -config ca-config
+
+    openssl ca -config ca-config -policy policy_anything \
+        -extensions server_cert \
+        $CA_DIGEST \
+        -batch \
+        -out "certs/$DOMAIN.crt" \
+        -infiles "$DOMAIN.csr"
+fi
 
 mkdir -p "$OUTPUT_DIR"
 cp "certs/ca.crt" "$OUTPUT_DIR/"
@@ -0,0 +1,138 @@
+# Shared by tests/run_replication_test.sh and tests/benchmark_*.sh, sourced
+# from the root project directory once the harness set:
+#
+# HARNESS   prefix of its containers, certificate volume and network names
+#           (ie: CI_bench)
+# SUBNET    first two bytes of its network, distinct per harness so they
+#           can run side by side (ie: 144.19)
+
+DATETIME=`date "+%Y%m%d_%H%M%S"`
+SELF_CA_IMAGE="self-certif"
+SELF_CA_IMAGE_TAG=latest
+CURRENT_DIR=`pwd`
+BENCH_LDAP_CT="${HARNESS}_ldap"
+CERTIFICAT_VOLUME_NAME="${HARNESS}_ldap_certificat"
+# CA kept between runs (see tests/certificate), not removed by cleanup
+CA_CACHE_VOLUME_NAME=${CA_CACHE_VOLUME_NAME:-"CI_ldap_ca_cache"}
+KEY_ALGORITHM=${KEY_ALGORITHM:-ecdsa-p256}
+DOMAIN="ci.example.org"
+SUB_DOMAIN="ldap"
+LDAP_HOST="$SUB_DOMAIN.$DOMAIN"
+ROOT_DC="dc=$(echo "$DOMAIN" | sed -e 's/\./,dc=/g')"
+LDAP_IMAGE=${LDAP_IMAGE:-"$LDAP_HOST"}
+# image started by run_ldap
+LDAP_RUN_IMAGE=${LDAP_RUN_IMAGE:-"$LDAP_IMAGE:latest"}
+# build LDAP_IMAGE from the current tree in build_images
+BUILD_LDAP_IMAGE=${BUILD_LDAP_IMAGE:-true}
+TEST_LDAP_IMAGE="test_ldap"
+LDAP_NETWORK="net_`echo "${HARNESS}_ldap" | tr 'A-Z' 'a-z'`"
+LDAP_NETWORK_MASK=$SUBNET.0.0/16
+LDAP_IP_PREFIX=$SUBNET.0
+LDAP_SERVER_IP=${LDAP_SERVER_IP:-"$LDAP_IP_PREFIX.23"}
+READY_TIMEOUT=${READY_TIMEOUT:-300}
+ROOT_SECRET="secret"
+ROOT_SSHA="{SSHA}vvcG8bTEFKggJ8J2wRu/JN9x/4jhRuZF"
+ADMIN_UID="test_default_admin"
+ADMIN_SSHA="{SSHA}dPnmfOhPSY3QrdJ73YH9gQM4Ws2vhuDx"
+ENV_FILE=`mktemp`
+
+
+function cleanup_env {
+    # Remove containers started by run_ldap and run_client
+    set +e
+    rm -f $ENV_FILE
+    docker ps -aq --filter "label=harness=$HARNESS" | \
+        xargs -r docker rm -v -f
+    docker volume rm $CERTIFICAT_VOLUME_NAME
+    docker network rm $LDAP_NETWORK
+    set -e
+}
+
+function build_images {
+    if $BUILD_LDAP_IMAGE; then
+        docker build -t $LDAP_IMAGE:latest .
+    fi
+    docker build -t $TEST_LDAP_IMAGE:latest -f tests/Dockerfile .
+}
+
+function prepare_certificates {
+    # $1: key algorithm (default: KEY_ALGORITHM)
+    docker volume create $CERTIFICAT_VOLUME_NAME
+    docker build \
+        -t $SELF_CA_IMAGE:$SELF_CA_IMAGE_TAG \
+        -f tests/certificate/Dockerfile \
+        ./tests/certificate/
+    docker run \
+        --rm \
+        -v $CERTIFICAT_VOLUME_NAME:/certificate \
+        -e UID=666 \
+        -e GID=666 \
+        -e CA_DOMAIN=$DOMAIN \
+        -e CERT_SUB_DOMAIN=$SUB_DOMAIN \
+        -e KEY_ALGORITHM=${1:-$KEY_ALGORITHM} \
+        -e CA_CACHE_DIR=/ca-cache \
+        -v $CA_CACHE_VOLUME_NAME:/ca-cache \
+        $SELF_CA_IMAGE:$SELF_CA_IMAGE_TAG
+}
+
+function create_network {
+    docker network create --subnet=$LDAP_NETWORK_MASK $LDAP_NETWORK
+}
+
+function write_env_file {
+    # $1: environment variables of a variant separated by ';'
+    echo "$1" | tr ';' '\n' > $ENV_FILE
+}
+
+function run_ldap {
+    # $1: container name
+    # $2: ip address
+    # $@: extra docker run params
+    name=$1
+    ip=$2
+    shift 2
+    # every server uses the $LDAP_HOST certificate, $LDAP_HOST resolves to
+    # LDAP_SERVER_IP (ie: the replication provider)
+    docker run -d \
+        --label harness=$HARNESS \
+        --network $LDAP_NETWORK \
+        --ip $ip \
+        --add-host $LDAP_HOST:$LDAP_SERVER_IP \
+        -v $CERTIFICAT_VOLUME_NAME:/ssl \
+        -e LDAP_CA_CERTIFICATE_PATH="/ssl/ca.crt" \
+        -e LDAP_ROOT_PASSWORD="$ROOT_SSHA" \
+        -e LDAP_CERTIFICATE_PATH="/ssl/$LDAP_HOST.crt" \
+        -e LDAP_CERTIFICATE_KEY_PATH="/ssl/$LDAP_HOST.key" \
+        -e DOMAIN="$DOMAIN" \
+        -e LDAP_SUB_DOMAIN="$SUB_DOMAIN" \
+        "$@" \
+        --name $name $LDAP_RUN_IMAGE
+    if ! docker exec $name python3 -m ldaptools.probe \
+            --timeout $READY_TIMEOUT; then
+        docker logs $name
+        echo "Ldap server $name is not ready, read above logs"
+        exit 1
+    fi
+}
+
+function run_client {
+    # $@: extra docker run params, then -- and the command to run in the
+    #     test image
+    options=()
+    while [ $# -gt 0 ] && [ "$1" != "--" ]; do
+        options+=("$1")
+        shift
+    done
+    shift
+    docker run \
+        --label harness=$HARNESS \
+        --network $LDAP_NETWORK \
+        --add-host $LDAP_HOST:$LDAP_SERVER_IP \
+        -e LDAP_HOST="ldaps://$LDAP_HOST" \
+        -e ROOT_DC="$ROOT_DC" \
+        -v $CERTIFICAT_VOLUME_NAME:/ssl:ro \
+        "${options[@]}" \
+        --rm \
+        $TEST_LDAP_IMAGE:latest \
+        "$@"
+}
@@ -0,0 +1,91 @@
+#!/bin/bash
+
+# Exist in case of error
+set -e
+
+# Display running commands
+set -x
+
+HARNESS="CI_repl"
+SUBNET=144.20
+# provider uses .10, consumer N uses .(10 + N), mirror N uses .(30 + N)
+LDAP_SERVER_IP=$SUBNET.0.10
+source `dirname $0`/lib/harness.sh
+
+CONSUMERS=${CONSUMERS:-2}
+BULK_PEOPLE=${BULK_PEOPLE:-10000}
+PROVIDER_CT="${HARNESS}_provider"
+CONSUMER_CT="${HARNESS}_consumer"
+MIRROR_CT="${HARNESS}_mirror"
+
+USAGE="Usage: $0 [-h] [-n consumers]
+
+Start a replication provider and CONSUMERS consumers of ldap.example.com
+image then run tests/test_ldap_replication.py (replication lag, read
+throughput scaling across consumers), then two mirrors and check writes
+on each of them converge.
+
+Options:
+    -h           Show this help.
+    -n           Number of consumers (default: $CONSUMERS)
+"
+
+
+while getopts "hn:" OPTION
+do
+    case $OPTION in
+        h) echo "$USAGE";
+           exit;;
+        n) CONSUMERS=$OPTARG;;
+        *) echo "Unknown parameter... ";
+           echo "$USAGE";
+           exit 1;;
+    esac
+done
+
+
+cleanup_env
+build_images
+prepare_certificates
+create_network
+# consumers resolve $LDAP_HOST to the provider to check its certificate
+run_ldap $PROVIDER_CT $LDAP_SERVER_IP \
+    -e LDAP_DEFAULT_ADMIN_UID="$ADMIN_UID" \
+    -e LDAP_DEFAULT_ADMIN_PASSWORD="$ADMIN_SSHA" \
+    -e LDAP_REPLICATION_ROLE=provider \
+    -e LDAP_DEMO=true \
+    -e LDAP_BULK_PEOPLE=$BULK_PEOPLE \
+    -e LDAP_BULK_LOAD=true
+CONSUMER_HOSTS=""
+for index in `seq 1 $CONSUMERS`; do
+    run_ldap $CONSUMER_CT$index $LDAP_IP_PREFIX.$((10 + index)) \
+        -e LDAP_DEFAULT_ADMIN_UID="$ADMIN_UID" \
+        -e LDAP_DEFAULT_ADMIN_PASSWORD="$ADMIN_SSHA" \
+        -e LDAP_REPLICATION_ROLE=consumer \
+        -e LDAP_REPLICATION_PROVIDERS="ldaps://$LDAP_HOST" \
+        -e LDAP_REPLICATION_PASSWORD="$ROOT_SECRET"
+    CONSUMER_HOSTS="$CONSUMER_HOSTS ldaps://$LDAP_IP_PREFIX.$((10 + index))"
+done
+run_client \
+    -e LDAP_CONSUMER_HOSTS="$CONSUMER_HOSTS" \
+    -e LDAP_BULK_PEOPLE=$BULK_PEOPLE \
+    -- /usr/src/app/entrypoint.sh -k test_ldap_replication
+# each mirror lists both urls and skips its own position (LDAP_SERVER_ID),
+# $LDAP_HOST resolves to the other mirror
+MIRROR_HOSTS=""
+for index in 1 2; do
+    LDAP_SERVER_IP=$LDAP_IP_PREFIX.$((33 - index)) run_ldap \
+        $MIRROR_CT$index $LDAP_IP_PREFIX.$((30 + index)) \
+        -e LDAP_DEFAULT_ADMIN_UID="$ADMIN_UID" \
+        -e LDAP_DEFAULT_ADMIN_PASSWORD="$ADMIN_SSHA" \
+        -e LDAP_REPLICATION_ROLE=mirror \
+        -e LDAP_SERVER_ID=$index \
+        -e LDAP_REPLICATION_PROVIDERS="ldaps://$LDAP_HOST ldaps://$LDAP_HOST" \
+        -e LDAP_REPLICATION_PASSWORD="$ROOT_SECRET" \
+        -e LDAP_DEMO=true
+    MIRROR_HOSTS="$MIRROR_HOSTS ldaps://$LDAP_IP_PREFIX.$((30 + index))"
+done
+run_client \
+    -e LDAP_MIRROR_HOSTS="$MIRROR_HOSTS" \
+    -- /usr/src/app/entrypoint.sh -k test_mirror
+cleanup_env
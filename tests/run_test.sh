@@ -16,19 +16,28 @@ SELF_CA_IMAGE="self-certif"
 SELF_CA_IMAGE_TAG=latest
 CURRENT_DIR=`pwd`
 KEEP_RUNNING=${KEEP_RUNNING:-false}
+READY_TIMEOUT=${READY_TIMEOUT:-120}
+LDAP_MEMBEROF_MODE=${LDAP_MEMBEROF_MODE:-overlay}
 LDAP_PORTS=${LDAP_PORTS:-"-p 636:636"}
 CERTIFICAT_VOLUME_NAME="CI_ldap_certificat"
+# CA kept between runs (see tests/certificate), not removed by cleanup
+CA_CACHE_VOLUME_NAME=${CA_CACHE_VOLUME_NAME:-"CI_ldap_ca_cache"}
+KEY_ALGORITHM=${KEY_ALGORITHM:-ecdsa-p256}
+LDAPI_VOLUME_NAME="CI_ldap_ldapi"
 DOMAIN="ci.example.org"
 SUB_DOMAIN="ldap"
 LDAP_HOST="$SUB_DOMAIN.$DOMAIN"
 LDAP_IMAGE=${LDAP_IMAGE:-"$LDAP_HOST"}
 LDAP_CT="CI_ldap"
+# Started on the volumes of LDAP_CT with another password hash scheme
+SWITCH_LDAP_CT="CI_ldap_switch"
+SWITCH_PASSWORD_HASH=${SWITCH_PASSWORD_HASH:-"{ARGON2}"}
 TEST_LDAP_IMAGE="test_ldap"
 LDAP_NETWORK=net_ci_ldap
 LDAP_NETWORK_MASK=144.18.0.0/16
 LDAP_SERVER_IP=144.18.0.23
 
-USAGE="Usage: $0 [-h] [-k]
+USAGE="Usage: $0 [-h] [-k] [-g memberOf mode]
 
 Script to test and validate ldap.example.com image
 before deploy it on production.
@@ -36,15 +45,19 @@ before deploy it on production.
 Options:
     -h           Show this help.
     -k           Keep ldap running and map 636 port
+    -g MODE      memberOf mode of the tested server: overlay or dynlist,
+                 can also be set through LDAP_MEMBEROF_MODE environment
+                 variable (default: $LDAP_MEMBEROF_MODE)
 "
 
 
-while getopts "hk" OPTION
+while getopts "hkg:" OPTION
 do
     case $OPTION in
         h) echo "$USAGE";
            exit;;
         k) KEEP_RUNNING=true;;
+        g) LDAP_MEMBEROF_MODE=$OPTARG;;
         *) echo "Unknown parameter... ";
            echo "$USAGE";
            exit 1;;
@@ -55,8 +68,10 @@ done
 function cleanup_env {
     set +e
     docker rm -v -f $TEST_LDAP_CT
+    docker rm -v -f $SWITCH_LDAP_CT
     docker rm -v -f $LDAP_CT
     docker volume rm $CERTIFICAT_VOLUME_NAME
+    docker volume rm $LDAPI_VOLUME_NAME
     docker network rm $LDAP_NETWORK
     set -e
 }
@@ -69,7 +84,7 @@ function build_test_ldap_image {
     docker build \
         -t $TEST_LDAP_IMAGE:$CURRENT_BUILD_TEST_LDAP_TAG \
         -f tests/Dockerfile \
-        ./tests/
+        .
 }
 
 function prepare_certificates {
@@ -87,21 +102,23 @@ function prepare_certificates {
         -e GID=666 \
         -e CA_DOMAIN=$DOMAIN \
         -e CERT_SUB_DOMAIN=$SUB_DOMAIN \
+        -e KEY_ALGORITHM=$KEY_ALGORITHM \
+        -e CA_CACHE_DIR=/ca-cache \
+        -v $CA_CACHE_VOLUME_NAME:/ca-cache \
         $SELF_CA_IMAGE:$SELF_CA_IMAGE_TAG
 }
 
-function run_ldap {
-    docker network create --subnet=$LDAP_NETWORK_MASK  $LDAP_NETWORK
-    PORTS=""
-    if $KEEP_RUNNING; then
-        PORTS=$LDAP_PORTS
-    fi
+function start_ldap {
+    # $1: container name, other arguments are given to docker run
+    name=$1
+    shift
     docker run -d \
         --network $LDAP_NETWORK \
         --ip $LDAP_SERVER_IP \
         -v $CURRENT_DIR/init/:/srv/ldap/init \
-        -v $CURRENT_DIR/demo:/srv/ldap/demo \
         -v $CERTIFICAT_VOLUME_NAME:/ssl \
+        -v $LDAPI_VOLUME_NAME:/run/ldapi \
+        -e LDAP_LDAPI_SOCKET="/run/ldapi/ldapi" \
         -e LDAP_CA_CERTIFICATE_PATH="/ssl/ca.crt" \
         -e LDAP_ROOT_PASSWORD="{SSHA}vvcG8bTEFKggJ8J2wRu/JN9x/4jhRuZF" \
         -e LDAP_DEFAULT_ADMIN_UID="test_default_admin" \
@@ -109,34 +126,59 @@ function run_ldap {
         -e LDAP_CERTIFICATE_PATH="/ssl/$LDAP_HOST.crt" \
         -e LDAP_CERTIFICATE_KEY_PATH="/ssl/$LDAP_HOST.key" \
         -e DOMAIN="$DOMAIN" \
+        -e LDAP_DEMO=true \
+        -e LDAP_MEMBEROF_MODE="$LDAP_MEMBEROF_MODE" \
         -e LDAP_SUB_DOMAIN="$SUB_DOMAIN" \
-        $PORTS \
-        --name $LDAP_CT $LDAP_IMAGE:$CURRENT_BUILD_LDAP_TAG
-
-    # Make sure ldap is ready
-    sleep 2
-    # Make sure ldap is running
-    if [[ `docker inspect -f {{.State.Running}} $LDAP_CT` != "true" ]]; then
-        docker logs $LDAP_CT
-        echo "Ldap server is not running, something goes wrong,
-              read above Docker container $LDAP_CT logs"
+        "$@" \
+        --name $name $LDAP_IMAGE:$CURRENT_BUILD_LDAP_TAG
+
+    # Make sure ldap is ready: serving searches within the probe budget
+    if ! docker exec $name python3 -m ldaptools.probe \
+            --timeout $READY_TIMEOUT; then
+        docker logs $name
+        echo "Ldap server is not ready, something goes wrong,
+              read above Docker container $name logs"
         exit 1
     fi
 }
 
+function run_ldap {
+    docker network create --subnet=$LDAP_NETWORK_MASK  $LDAP_NETWORK
+    PORTS=""
+    if $KEEP_RUNNING; then
+        PORTS=$LDAP_PORTS
+    fi
+    start_ldap $LDAP_CT $PORTS
+}
+
+function switch_password_hash {
+    # Restart on the existing config volume with another hash scheme, the
+    # module providing it was not loaded by the previous start
+    docker stop $LDAP_CT
+    start_ldap $SWITCH_LDAP_CT \
+        --volumes-from $LDAP_CT \
+        -e LDAP_PASSWORD_HASH="$SWITCH_PASSWORD_HASH"
+    docker exec $SWITCH_LDAP_CT slapcat -n0 -a "(olcPasswordHash=*)" | \
+        grep -F "olcPasswordHash: $SWITCH_PASSWORD_HASH"
+    docker stop $SWITCH_LDAP_CT
+}
+
 function run_tests {
     docker run \
         --network $LDAP_NETWORK \
         --add-host $LDAP_HOST:$LDAP_SERVER_IP \
         -e LDAP_HOST="ldaps://$LDAP_HOST" \
         -e ROOT_DC="dc=$(echo "$DOMAIN" | sed -e 's/\./,dc=/g')" \
+        -e LDAP_ETC_DIR="/usr/src/app/etc" \
+        -e LDAP_LDAPI_HOST="ldapi://%2Frun%2Fldapi%2Fldapi" \
         -v $CERTIFICAT_VOLUME_NAME:/ssl \
+        -v $LDAPI_VOLUME_NAME:/run/ldapi \
+        -v $CURRENT_DIR/etc:/usr/src/app/etc:ro \
         -it --rm \
         $TEST_LDAP_IMAGE:$CURRENT_BUILD_TEST_LDAP_TAG
 }
 
 function stop_ldap {
-    docker stop $LDAP_CT
     docker network rm $LDAP_NETWORK
 }
 
@@ -147,5 +189,6 @@ prepare_certificates
 run_ldap
 run_tests
 if ! $KEEP_RUNNING; then
+    switch_password_hash
     stop_ldap
 fi
@@ -0,0 +1,171 @@
+"""Measure TLS handshakes per second against a running slapd::
+
+    python -m benchmarks.handshakes --workers 32 --ca-file /ssl/ca.crt \\
+        --label ecdsa-p256
+
+Each worker loops on a new TCP connection to the ``ldaps://`` port of
+``--host`` (default to ``LDAP_HOST``), a full TLS handshake and a close
+until ``--duration`` seconds elapsed: nothing else than the handshake is
+measured, the server cost is mostly the signature of its certificate key.
+One json line is printed per run with the negotiated protocol and cipher
+so certificate key algorithms can be compared, see
+benchmark_handshakes.sh.
+
+With ``--resume`` each worker offers the TLS session (ticket) of an
+earlier connection: resumed handshakes skip the certificate signature and
+the key exchange verification, connections the server did not resume are
+counted as ``full`` and the worker fetches a new session (not measured).
+"""
+import argparse
+import json
+import socket
+import ssl
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from tests.features import LDAP_HOST
+
+from .throughput import percentile
+
+# anonymous simple bind request (message id 1), its response is read so
+# TLS 1.3 tickets sent after the handshake are received
+ANONYMOUS_BIND = bytes.fromhex('300c020101600702010304008000')
+
+TLS_VERSIONS = {
+    '1.2': ssl.TLSVersion.TLSv1_2,
+    '1.3': ssl.TLSVersion.TLSv1_3,
+}
+
+
+def tls_context(ca_file=None, tls_version=None):
+    context = ssl.create_default_context(cafile=ca_file)
+    if not ca_file:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    if tls_version:
+        context.minimum_version = TLS_VERSIONS[tls_version]
+        context.maximum_version = TLS_VERSIONS[tls_version]
+    return context
+
+
+def handshake(context, host, port, session=None, timeout=10):
+    """Return ``(protocol, cipher, resumed)`` of a new TLS connection
+    offering ``session`` to resume"""
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        with context.wrap_socket(
+                sock, server_hostname=host, session=session
+        ) as tls:
+            return tls.version(), tls.cipher()[0], tls.session_reused
+
+
+def fetch_session(context, host, port, timeout=10):
+    """Return a resumable TLS session of a new connection"""
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        with context.wrap_socket(sock, server_hostname=host) as tls:
+            tls.sendall(ANONYMOUS_BIND)
+            tls.recv(4096)
+            return tls.session
+
+
+def run(args):
+    url = urlparse(args.host or LDAP_HOST)
+    host, port = url.hostname, url.port or 636
+    context = tls_context(args.ca_file, args.tls_version)
+    deadline = []
+    lock = threading.Lock()
+    latencies = []
+    errors = [0]
+    resumed = [0]
+    negotiated = set()
+
+    def worker(seed):
+        local, failed, reused, seen = [], 0, 0, set()
+        session = None
+        while time.time() < deadline[0]:
+            if args.resume and session is None:
+                try:
+                    session = fetch_session(context, host, port)
+                except (OSError, ssl.SSLError):
+                    failed += 1
+                    continue
+            start = time.time()
+            try:
+                protocol, cipher, was_reused = handshake(
+                    context, host, port, session
+                )
+                seen.add((protocol, cipher))
+                if was_reused:
+                    reused += 1
+                else:
+                    session = None
+            except (OSError, ssl.SSLError):
+                failed += 1
+            local.append(time.time() - start)
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+            resumed[0] += reused
+            negotiated.update(seen)
+
+    deadline.append(time.time() + args.duration)
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        list(executor.map(worker, range(args.workers)))
+    elapsed = time.time() - start
+    latencies.sort()
+    return {
+        'label': args.label,
+        'mode': 'resumed' if args.resume else 'full',
+        'workers': args.workers,
+        'handshakes': len(latencies),
+        'resumed': resumed[0],
+        'errors': errors[0],
+        'handshakes_per_second': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'negotiated': sorted("%s %s" % pair for pair in negotiated),
+    }
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.handshakes",
+        description="Measure TLS handshakes throughput",
+    )
+    parser.add_argument(
+        "--host", help="ldaps url (default: LDAP_HOST)",
+    )
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument(
+        "--duration", type=float, default=20,
+        help="Seconds to run handshakes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--ca-file",
+        help="Verify the server certificate against this CA (default: no "
+             "verification)",
+    )
+    parser.add_argument(
+        "--tls-version", choices=sorted(TLS_VERSIONS),
+        help="Only negotiate this TLS version (default: the best one)",
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="Resume the TLS session of an earlier connection (default: "
+             "full handshakes)",
+    )
+    parser.add_argument(
+        "--label", default="", help="Server settings label to report",
+    )
+    return parser
+
+
+def main(argv=None):
+    print(json.dumps(run(get_parser().parse_args(argv))), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,433 @@
+"""Load the server with the ``get_users`` personas and report latencies::
+
+    python -m benchmarks.load --workers 40 --rate 500 --duration 60 \\
+        --mix bind=1,base=4,one=1,subtree=4,password=1,member=1 \\
+        --output load.json
+
+Workers are spread over the personas (round robin), each keeps its own
+connection bound as its persona and draws operations from ``--mix``:
+
+* ``bind``: bind again as the persona,
+* ``base`` / ``one`` / ``subtree``: read a persona entry, list
+  ``ou=people``, look up a persona by uid,
+* ``password``: ``ModifyPassword`` of a benchmark account owned by the
+  worker,
+* ``member``: add / remove a member of a benchmark group owned by the
+  worker.
+
+Access rules are not bypassed: a persona not allowed to do an operation
+gets it ``refused`` (the latency is still recorded), ``errors`` are
+exceptions (socket, timeout...). With ``--rate`` each worker starts its
+operations on a fixed schedule and latencies are measured from the
+scheduled start, so a slow server is not hidden by workers waiting on it.
+
+Throughput and p50/p95/p99 latencies are reported per operation, per
+persona and per persona and operation. Use ``--output`` to keep the json
+result and ``--compare baseline.json candidate.json`` to diff two runs
+(ie: two image builds, see benchmark_load.sh).
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from ldap3 import (
+    Server, Connection, BASE, LEVEL, NONE, MODIFY_ADD, MODIFY_DELETE, SUBTREE
+)
+from ldap3.core.exceptions import LDAPException
+from ldap3.extend.standard.modifyPassword import ModifyPassword
+
+from tests.features import (
+    add_persona_memberships, get_users, ldap_connection, LDAP_HOST, ROOT_DC,
+    ROOT_LDAP_DN, ROOT_LDAP_SECRET
+)
+
+from .throughput import percentile
+
+DEFAULT_MIX = "bind=1,base=4,one=1,subtree=4,password=1,member=1"
+# searches ending with those results did their work
+SEARCH_LIMITS = ('sizeLimitExceeded', 'timeLimitExceeded')
+
+
+def account_dn(worker):
+    return "uid=bench-load-%03d,ou=people,%s" % (worker, ROOT_DC)
+
+
+def group_dn(worker):
+    return "cn=bench-load-%03d,ou=groups,%s" % (worker, ROOT_DC)
+
+
+def entry_dns(users):
+    """Persona entries stored in the directory (not anonymous/root)"""
+    return [
+        infos['user_dn'] for infos in users.values()
+        if infos['user_dn'].endswith(ROOT_DC) and
+        infos['user_dn'] != ROOT_LDAP_DN
+    ]
+
+
+class Worker(object):
+    """Operations of one client, they return True if the server did the
+    operation, False if it refused it"""
+
+    def __init__(self, index, persona, infos, args, users):
+        self.index = index
+        self.persona = persona
+        self.infos = infos
+        self.args = args
+        self.rand = random.Random(index)
+        self.targets = entry_dns(users)
+        self.uids = [
+            dn.split(',')[0].split('=', 1)[1] for dn in self.targets
+        ]
+        self.member_dn = users['user']['user_dn']
+        self.is_member = False
+        self.passwords = 0
+        self.con = None
+
+    def connect(self, server):
+        if self.con is not None:
+            self.con.unbind()
+        self.con = Connection(
+            server, user=self.infos['user_dn'] or None,
+            password=self.infos['password'] or None,
+            receive_timeout=self.args.timeout, auto_bind=True
+        )
+
+    def bind(self):
+        return self.con.rebind()
+
+    def base(self):
+        return self.con.search(
+            self.rand.choice(self.targets), '(objectClass=*)', BASE,
+            attributes=['cn', 'mail']
+        )
+
+    def one(self):
+        return self.con.search(
+            "ou=people," + ROOT_DC, '(objectClass=inetOrgPerson)', LEVEL,
+            attributes=['cn'], size_limit=self.args.size_limit
+        ) or self.con.result['description'] in SEARCH_LIMITS
+
+    def subtree(self):
+        return self.con.search(
+            ROOT_DC, '(uid=%s)' % self.rand.choice(self.uids), SUBTREE,
+            attributes=['cn', 'memberOf']
+        ) or self.con.result['description'] in SEARCH_LIMITS
+
+    def password(self):
+        self.passwords += 1
+        ModifyPassword(
+            self.con, user=account_dn(self.index),
+            new_password="bench-%03d-%d" % (self.index, self.passwords)
+        ).send()
+        return self.con.result['description'] == 'success'
+
+    def member(self):
+        done = self.con.modify(group_dn(self.index), {'member': [(
+            MODIFY_DELETE if self.is_member else MODIFY_ADD, [self.member_dn]
+        )]})
+        if done:
+            self.is_member = not self.is_member
+        return done
+
+
+OPERATIONS = ['bind', 'base', 'one', 'subtree', 'password', 'member']
+
+
+def parse_mix(value):
+    """``bind=1,base=4`` -> ``{'bind': 1.0, 'base': 4.0}``"""
+    mix = OrderedDict()
+    for item in value.split(','):
+        name, _, weight = item.strip().partition('=')
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(
+                "unknown operation %r (expected one of %s)" % (
+                    name, ", ".join(OPERATIONS)
+                )
+            )
+        try:
+            mix[name] = float(weight or 1)
+        except ValueError:
+            raise argparse.ArgumentTypeError(
+                "invalid weight %r for %s" % (weight, name)
+            )
+        if mix[name] < 0:
+            raise argparse.ArgumentTypeError(
+                "negative weight for %s" % name
+            )
+    if not sum(mix.values()):
+        raise argparse.ArgumentTypeError("operation mix is empty")
+    return mix
+
+
+def summarize(samples, elapsed):
+    """Stats of ``(latency, outcome)`` samples, outcome is one of ``ok``,
+    ``refused``, ``error``"""
+    latencies = sorted(latency for latency, _ in samples)
+    outcomes = [outcome for _, outcome in samples]
+    return OrderedDict([
+        ('count', len(samples)),
+        ('ok', outcomes.count('ok')),
+        ('refused', outcomes.count('refused')),
+        ('errors', outcomes.count('error')),
+        ('ops_per_second', round(len(samples) / elapsed, 1)),
+        ('p50_ms', round(percentile(latencies, 0.50) * 1000, 3)),
+        ('p95_ms', round(percentile(latencies, 0.95) * 1000, 3)),
+        ('p99_ms', round(percentile(latencies, 0.99) * 1000, 3)),
+    ])
+
+
+def report(samples, elapsed):
+    """Group ``(persona, operation, latency, outcome)`` samples"""
+    operations, personas, matrix = {}, {}, {}
+    for persona, operation, latency, outcome in samples:
+        operations.setdefault(operation, []).append((latency, outcome))
+        personas.setdefault(persona, []).append((latency, outcome))
+        matrix.setdefault(persona, {}).setdefault(operation, []).append(
+            (latency, outcome)
+        )
+    return OrderedDict([
+        ('total', summarize(
+            [(latency, outcome) for _, _, latency, outcome in samples],
+            elapsed
+        )),
+        ('operations', OrderedDict(
+            (name, summarize(operations[name], elapsed))
+            for name in sorted(operations)
+        )),
+        ('by_persona', OrderedDict(
+            (name, summarize(personas[name], elapsed))
+            for name in sorted(personas)
+        )),
+        ('matrix', OrderedDict(
+            (name, OrderedDict(
+                (operation, summarize(values, elapsed))
+                for operation, values in sorted(matrix[name].items())
+            )) for name in sorted(matrix)
+        )),
+    ])
+
+
+def setup(workers):
+    """Create the accounts and groups owned by the workers"""
+    with ldap_connection(dn=ROOT_LDAP_DN, password=ROOT_LDAP_SECRET) as con:
+        for index in range(workers):
+            con.add(account_dn(index), 'inetOrgPerson', {
+                'cn': 'Benchmark account %03d' % index,
+                'sn': 'Benchmark',
+                'uid': 'bench-load-%03d' % index,
+                'userPassword': 'bench-%03d-0' % index,
+            })
+            con.add(group_dn(index), 'groupOfNames', {
+                'cn': 'bench-load-%03d' % index,
+                'description': 'benchmark group',
+                'member': [account_dn(index)],
+            })
+
+
+def teardown(workers):
+    with ldap_connection(dn=ROOT_LDAP_DN, password=ROOT_LDAP_SECRET) as con:
+        for index in range(workers):
+            con.delete(group_dn(index))
+            con.delete(account_dn(index))
+
+
+def run(args):
+    users = get_users()
+    personas = args.personas or list(users)
+    names = list(args.mix)
+    weights = [args.mix[name] for name in names]
+    server = Server(args.host or LDAP_HOST, get_info=NONE)
+    # one operation every `interval` seconds per worker, 0: as fast as
+    # possible
+    interval = args.workers / args.rate if args.rate else 0
+    lock = threading.Lock()
+    samples = []
+    deadline = []
+
+    def work(index):
+        persona = personas[index % len(personas)]
+        worker = Worker(index, persona, users[persona], args, users)
+        local = []
+        worker.connect(server)
+        # spread workers start over the first interval
+        scheduled = time.time() + interval * index / args.workers
+        while scheduled < deadline[0]:
+            if interval:
+                time.sleep(max(0, scheduled - time.time()))
+            else:
+                scheduled = time.time()
+            operation = worker.rand.choices(names, weights)[0]
+            try:
+                outcome = 'ok' if getattr(worker, operation)() else 'refused'
+            except LDAPException:
+                outcome = 'error'
+                try:
+                    worker.connect(server)
+                except LDAPException:
+                    pass
+            local.append(
+                (persona, operation, time.time() - scheduled, outcome)
+            )
+            scheduled += interval
+        if worker.con is not None:
+            worker.con.unbind()
+        with lock:
+            samples.extend(local)
+
+    add_persona_memberships(users)
+    setup(args.workers)
+    try:
+        deadline.append(time.time() + args.duration)
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            list(executor.map(work, range(args.workers)))
+        elapsed = time.time() - start
+    finally:
+        teardown(args.workers)
+    result = OrderedDict([
+        ('label', args.label),
+        ('host', server.name),
+        ('workers', args.workers),
+        ('rate', args.rate),
+        ('duration', args.duration),
+        ('mix', args.mix),
+        ('personas', personas),
+    ])
+    result.update(report(samples, elapsed))
+    return result
+
+
+def compare(baseline, candidate):
+    """Rows comparing per operation throughput and p99 of two results"""
+    rows = []
+    for name in ['total'] + sorted(
+        set(baseline['operations']) | set(candidate['operations'])
+    ):
+        if name == 'total':
+            before, after = baseline['total'], candidate['total']
+        else:
+            before = baseline['operations'].get(name)
+            after = candidate['operations'].get(name)
+            if not before or not after:
+                continue
+        rows.append(OrderedDict([
+            ('operation', name),
+            ('baseline_ops', before['ops_per_second']),
+            ('candidate_ops', after['ops_per_second']),
+            ('ops_ratio', round(
+                after['ops_per_second'] / before['ops_per_second'], 3
+            ) if before['ops_per_second'] else None),
+            ('baseline_p99_ms', before['p99_ms']),
+            ('candidate_p99_ms', after['p99_ms']),
+            ('p99_ratio', round(
+                after['p99_ms'] / before['p99_ms'], 3
+            ) if before['p99_ms'] else None),
+        ]))
+    return rows
+
+
+def format_table(stats):
+    lines = ["%-20s %8s %8s %8s %10s %9s %9s %9s" % (
+        "", "count", "refused", "errors", "ops/s", "p50 ms", "p95 ms",
+        "p99 ms"
+    )]
+    for name, values in stats.items():
+        lines.append("%-20s %8d %8d %8d %10.1f %9.3f %9.3f %9.3f" % (
+            name, values['count'], values['refused'], values['errors'],
+            values['ops_per_second'], values['p50_ms'], values['p95_ms'],
+            values['p99_ms']
+        ))
+    return "\n".join(lines)
+
+
+def format_comparison(rows):
+    lines = ["%-12s %12s %12s %8s %12s %12s %8s" % (
+        "", "base ops/s", "cand ops/s", "ratio", "base p99", "cand p99",
+        "ratio"
+    )]
+    for row in rows:
+        lines.append("%-12s %12.1f %12.1f %8s %12.3f %12.3f %8s" % (
+            row['operation'], row['baseline_ops'], row['candidate_ops'],
+            row['ops_ratio'], row['baseline_p99_ms'],
+            row['candidate_p99_ms'], row['p99_ratio']
+        ))
+    return "\n".join(lines)
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.load",
+        description="Load the ldap server with the test personas",
+    )
+    parser.add_argument(
+        "--host", help="ldap url (default: LDAP_HOST)",
+    )
+    parser.add_argument("--workers", type=int, default=20)
+    parser.add_argument(
+        "--rate", type=float, default=0,
+        help="Target operations per second for all workers, 0 to run "
+             "unthrottled (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=30,
+        help="Seconds to run the load (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+        help="Operations weights (default: %s)" % DEFAULT_MIX,
+    )
+    parser.add_argument(
+        "--personas", nargs="*", choices=sorted(get_users()),
+        help="Personas workers are spread over (default: all)",
+    )
+    parser.add_argument(
+        "--size-limit", type=int, default=50,
+        help="One level search size limit (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=10,
+        help="Operation timeout in seconds (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--label", default="", help="Image or settings label to report",
+    )
+    parser.add_argument(
+        "--output", help="Write the json result to this file",
+    )
+    parser.add_argument(
+        "--compare", nargs=2, metavar=("BASELINE", "CANDIDATE"),
+        help="Compare two json results instead of running the load",
+    )
+    return parser
+
+
+def main(argv=None):
+    args = get_parser().parse_args(argv)
+    if args.compare:
+        baseline, candidate = [
+            json.load(open(path)) for path in args.compare
+        ]
+        print(format_comparison(compare(baseline, candidate)))
+        return
+    result = run(args)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(result, output, indent=2)
+    print(format_table(result['operations']))
+    print()
+    print(format_table(result['by_persona']))
+    if result['total']['errors']:
+        print(
+            "%d operations failed" % result['total']['errors'],
+            file=sys.stderr
+        )
+
+
+if __name__ == "__main__":
+    main()
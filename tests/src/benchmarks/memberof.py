@@ -0,0 +1,253 @@
+"""Measure the memberof / refint overlays cost against group sizes::
+
+    python -m benchmarks.memberof --people 100000 \\
+        --group-sizes 100 1000 10000 100000 --memberships 1 10 100 1000 \\
+        --label memberof
+
+Two dimensions are measured with the root account (no ACL cost):
+
+* ``group_size``: a group of N bulk users (``LDAP_BULK_PEOPLE``) is
+  populated, then a probe user is added to it (``member_add``), its
+  ``memberOf`` read (``memberof_read``), the group searched through
+  ``(memberOf=<group>)`` (``memberof_search``), the probe removed
+  (``member_delete``), added back, renamed (``user_rename``: refint
+  rewrites the N values group) and deleted (``user_delete``). The group
+  deletion is measured once (``group_delete``: memberof cleans N entries).
+* ``memberships``: a probe user member of M groups is added to one more
+  group, read, renamed and deleted.
+
+One json line is printed per dimension, size and operation (median, p95
+and max latency over ``--repeat`` probes) so several server settings can
+be compared, see benchmark_memberof.sh.
+"""
+import argparse
+import json
+import time
+
+from ldap3 import ASYNC, BASE, MODIFY_ADD, MODIFY_DELETE, SUBTREE
+
+from ldaptools.connection import connect
+from ldaptools.membership import sync
+
+from tests.features import (
+    ldap_connection, LDAP_HOST, ROOT_DC, ROOT_LDAP_DN, ROOT_LDAP_SECRET
+)
+
+from .throughput import percentile, user_dn
+
+
+def group_dn(name):
+    return "cn=bench-memberof-%s,ou=groups,%s" % (name, ROOT_DC)
+
+
+class MemberOfBenchmark(object):
+
+    def __init__(self, con, async_con, args):
+        self.con = con
+        self.async_con = async_con
+        self.args = args
+        self.probes = 0
+        self.placeholder = self.create_user("placeholder")
+
+    def emit(self, dimension, size, operation, latencies):
+        latencies = sorted(latencies)
+        print(json.dumps({
+            'label': self.args.label,
+            'dimension': dimension,
+            'size': size,
+            'operation': operation,
+            'count': len(latencies),
+            'median_ms': round(percentile(latencies, 0.5) * 1000, 3),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+            'max_ms': round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        }), flush=True)
+
+    def timed(self, operation, *args, **kwargs):
+        start = time.perf_counter()
+        done = operation(*args, **kwargs)
+        duration = time.perf_counter() - start
+        assert done, self.con.result
+        return duration
+
+    def create_user(self, name):
+        dn = "uid=bench-memberof-%s,ou=people,%s" % (name, ROOT_DC)
+        self.con.delete(dn)
+        assert self.con.add(dn, 'inetOrgPerson', {
+            'cn': 'Benchmark %s' % name, 'sn': 'Benchmark',
+            'uid': 'bench-memberof-%s' % name,
+        }), self.con.result
+        return dn
+
+    def create_probe(self):
+        self.probes += 1
+        return self.create_user("probe-%06d" % self.probes)
+
+    def create_group(self, dn, members):
+        self.con.delete(dn)
+        assert self.con.add(dn, 'groupOfNames', {
+            'cn': dn.split(',')[0][3:], 'member': members[:1],
+        }), self.con.result
+        start = time.perf_counter()
+        reports, _ = sync(self.async_con, {dn: members})
+        assert reports[0]['result'] == 'success', reports
+        return time.perf_counter() - start
+
+    def add_member(self, group, dn):
+        return self.con.modify(group, {'member': [(MODIFY_ADD, [dn])]})
+
+    def delete_member(self, group, dn):
+        return self.con.modify(group, {'member': [(MODIFY_DELETE, [dn])]})
+
+    def read_memberof(self, dn):
+        return self.con.search(
+            dn, '(objectClass=*)', BASE, attributes=['memberOf']
+        )
+
+    def search_memberof(self, group):
+        return self.con.search(
+            "ou=people," + ROOT_DC, '(memberOf=%s)' % group, SUBTREE,
+            attributes=['1.1'], size_limit=self.args.size_limit
+        ) or self.con.result['description'] == 'sizeLimitExceeded'
+
+    def rename(self, dn):
+        rdn = dn.split(',')[0] + "-renamed"
+        assert self.con.modify_dn(dn, rdn), self.con.result
+        return "%s,%s" % (rdn, dn.split(',', 1)[1])
+
+    def group_size(self, size):
+        group = group_dn("size-%d" % size)
+        populate = self.create_group(
+            group, [user_dn(index) for index in range(size)]
+        )
+        self.emit('group_size', size, 'populate', [populate])
+        latencies = {}
+
+        def record(operation, duration):
+            latencies.setdefault(operation, []).append(duration)
+
+        for _ in range(self.args.repeat):
+            probe = self.create_probe()
+            record('member_add', self.timed(self.add_member, group, probe))
+            record('memberof_read', self.timed(self.read_memberof, probe))
+            record('memberof_search', self.timed(self.search_memberof, group))
+            record(
+                'member_delete', self.timed(self.delete_member, group, probe)
+            )
+            self.add_member(group, probe)
+            start = time.perf_counter()
+            probe = self.rename(probe)
+            record('user_rename', time.perf_counter() - start)
+            record('user_delete', self.timed(self.con.delete, probe))
+        for operation, values in latencies.items():
+            self.emit('group_size', size, operation, values)
+        self.emit(
+            'group_size', size, 'group_delete',
+            [self.timed(self.con.delete, group)]
+        )
+
+    def memberships(self, count, groups):
+        extra = groups[-1]
+        latencies = {}
+
+        def record(operation, duration):
+            latencies.setdefault(operation, []).append(duration)
+
+        for _ in range(self.args.repeat):
+            probe = self.create_probe()
+            reports, _ = sync(self.async_con, {
+                group: [self.placeholder, probe] for group in groups[:count]
+            })
+            assert all(
+                report['result'] == 'success' for report in reports
+            ), reports
+            record('member_add', self.timed(self.add_member, extra, probe))
+            self.delete_member(extra, probe)
+            record('memberof_read', self.timed(self.read_memberof, probe))
+            start = time.perf_counter()
+            probe = self.rename(probe)
+            record('user_rename', time.perf_counter() - start)
+            record('user_delete', self.timed(self.con.delete, probe))
+        for operation, values in latencies.items():
+            self.emit('memberships', count, operation, values)
+
+    def run(self):
+        for size in self.args.group_sizes:
+            if size > self.args.people:
+                print(json.dumps({
+                    'label': self.args.label, 'dimension': 'group_size',
+                    'size': size, 'skipped': "only %d bulk people" % (
+                        self.args.people
+                    ),
+                }), flush=True)
+                continue
+            self.group_size(size)
+        if self.args.memberships:
+            # the last one is the extra group probes are added to
+            groups = [
+                group_dn("memberships-%06d" % index)
+                for index in range(max(self.args.memberships) + 1)
+            ]
+            for group in groups:
+                self.con.delete(group)
+                assert self.con.add(group, 'groupOfNames', {
+                    'cn': group.split(',')[0][3:],
+                    'member': [self.placeholder],
+                }), self.con.result
+            try:
+                for count in self.args.memberships:
+                    self.memberships(count, groups)
+            finally:
+                for group in groups:
+                    self.con.delete(group)
+        self.con.delete(self.placeholder)
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.memberof",
+        description="Measure memberof / refint overlays cost against group "
+                    "sizes and memberships count",
+    )
+    parser.add_argument(
+        "--group-sizes", type=int, nargs="*", default=[10, 100, 1000, 10000],
+        help="Group sizes to measure (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--memberships", type=int, nargs="*", default=[1, 10, 100, 1000],
+        help="Number of groups of the probe users (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--people", type=int, default=10000,
+        help="Bulk users available in the directory, larger group sizes are "
+             "skipped (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5,
+        help="Probe users per measurement (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--size-limit", type=int, default=10,
+        help="memberOf search size limit (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--label", default="", help="Server settings label to report",
+    )
+    return parser
+
+
+def main(argv=None):
+    args = get_parser().parse_args(argv)
+    async_con = connect(
+        LDAP_HOST, ROOT_LDAP_DN, ROOT_LDAP_SECRET, client_strategy=ASYNC
+    )
+    try:
+        with ldap_connection(
+                dn=ROOT_LDAP_DN, password=ROOT_LDAP_SECRET
+        ) as con:
+            MemberOfBenchmark(con, async_con, args).run()
+    finally:
+        async_con.unbind()
+
+
+if __name__ == "__main__":
+    main()
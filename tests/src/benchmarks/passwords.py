@@ -0,0 +1,183 @@
+"""Measure simple bind throughput against the server password hash::
+
+    python -m benchmarks.passwords --accounts 200 --workers 32 \\
+        --label argon2-m19456-t2
+
+``--accounts`` users are added with a clear text password, hashed by the
+ppolicy overlay with the server ``olcPasswordHash`` (the stored scheme is
+read back and reported). Each worker keeps one TLS connection and loops on
+simple binds as random accounts until ``--duration`` seconds elapsed, so
+the password verification dominates the bind latency (no TLS handshake).
+One json line is printed per run so schemes and cost settings can be
+compared, see benchmark_passwords.sh.
+
+``--failure-ratio`` mixes binds with a wrong password (brute force, or
+applications retrying with a stale secret): ppolicy records failures on
+the account, so failed binds become database writes, and locks accounts
+whose good binds are then ``rejected``. Latencies are reported per bind
+outcome with the number of locked accounts, see benchmark_ppolicy.sh.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from ldap3 import Server, Connection, BASE, NONE, SUBTREE
+
+from tests.features import (
+    ldap_connection, LDAP_HOST, ROOT_DC, ROOT_LDAP_DN, ROOT_LDAP_SECRET
+)
+
+from .throughput import percentile
+
+
+def account_dn(index):
+    return "uid=bench-password-%04d,ou=people,%s" % (index, ROOT_DC)
+
+
+def account_password(index):
+    return "Bench-Passw0rd-%04d" % index
+
+
+def stored_scheme(con, dn):
+    """Return the ``{SCHEME}`` prefix of the stored ``userPassword``"""
+    assert con.search(
+        dn, '(objectClass=*)', BASE, attributes=['userPassword']
+    ), con.result
+    value = con.entries[0].userPassword.value
+    if isinstance(value, bytes):
+        value = value.decode('utf-8')
+    return value.split('}', 1)[0] + '}' if value.startswith('{') else ''
+
+
+def create_accounts(con, count):
+    for index in range(count):
+        dn = account_dn(index)
+        con.delete(dn)
+        assert con.add(dn, 'inetOrgPerson', {
+            'cn': 'Benchmark password %d' % index, 'sn': 'Benchmark',
+            'uid': 'bench-password-%04d' % index,
+            'userPassword': account_password(index),
+        }), con.result
+    return stored_scheme(con, account_dn(0))
+
+
+def locked_accounts(con):
+    con.search(
+        "ou=people," + ROOT_DC,
+        "(&(uid=bench-password-*)(pwdAccountLockedTime=*))", SUBTREE,
+        attributes=['1.1']
+    )
+    return len(con.entries)
+
+
+def delete_accounts(con, count):
+    for index in range(count):
+        con.delete(account_dn(index))
+
+
+def run(args):
+    server = Server(args.host or LDAP_HOST, get_info=NONE)
+    deadline = []
+    lock = threading.Lock()
+    latencies = {'success': [], 'failure': []}
+    errors = [0]
+
+    def worker(seed):
+        rand = random.Random(seed)
+        con = Connection(server)
+        con.open()
+        local, failed = {'success': [], 'failure': []}, 0
+        while time.time() < deadline[0]:
+            index = rand.randrange(args.accounts)
+            good = rand.random() >= args.failure_ratio
+            password = account_password(index) if good else "wrong"
+            start = time.time()
+            bound = con.rebind(user=account_dn(index), password=password)
+            local['success' if good else 'failure'].append(
+                time.time() - start
+            )
+            if bound != good:
+                failed += 1
+        con.unbind()
+        with lock:
+            for outcome, values in local.items():
+                latencies[outcome].extend(values)
+            errors[0] += failed
+
+    deadline.append(time.time() + args.duration)
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        list(executor.map(worker, range(args.workers)))
+    elapsed = time.time() - start
+    binds = sorted(latencies['success'] + latencies['failure'])
+    result = {
+        'label': args.label,
+        'workers': args.workers,
+        'failure_ratio': args.failure_ratio,
+        'binds': len(binds),
+        'rejected': errors[0],
+        'binds_per_second': round(len(binds) / elapsed, 1),
+        'p50_ms': round(percentile(binds, 0.5) * 1000, 3),
+        'p99_ms': round(percentile(binds, 0.99) * 1000, 3),
+    }
+    for outcome, values in latencies.items():
+        values.sort()
+        result['%s_p50_ms' % outcome] = round(
+            percentile(values, 0.5) * 1000, 3
+        )
+        result['%s_p99_ms' % outcome] = round(
+            percentile(values, 0.99) * 1000, 3
+        )
+    return result
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.passwords",
+        description="Measure simple bind throughput of the server password "
+                    "hash scheme",
+    )
+    parser.add_argument(
+        "--host", help="ldap url (default: LDAP_HOST)",
+    )
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument(
+        "--accounts", type=int, default=100,
+        help="Accounts created and bound as (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=20,
+        help="Seconds to run binds (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--failure-ratio", type=float, default=0.0,
+        help="Ratio of binds with a wrong password (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--label", default="", help="Server settings label to report",
+    )
+    return parser
+
+
+def main(argv=None):
+    args = get_parser().parse_args(argv)
+    with ldap_connection(dn=ROOT_LDAP_DN, password=ROOT_LDAP_SECRET) as con:
+        scheme = create_accounts(con, args.accounts)
+    try:
+        result = run(args)
+    finally:
+        with ldap_connection(
+                dn=ROOT_LDAP_DN, password=ROOT_LDAP_SECRET
+        ) as con:
+            locked = locked_accounts(con)
+            delete_accounts(con, args.accounts)
+    result['scheme'] = scheme
+    result['locked'] = locked
+    print(json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Measure operations per second against a running slapd::
+
+    python -m benchmarks.throughput --operation search --workers 32 \\
+        --people 10000 --label threads-32
+
+Each worker keeps its own bound connection, to one of ``--hosts`` (round
+robin, default to ``LDAP_HOST``), and loops on the operation until
+``--duration`` seconds elapsed. Operations read or write the bulk
+users generated by the entrypoint (``LDAP_BULK_PEOPLE`` /
+``LDAP_BULK_GROUPS``). One json line is printed per run so results of
+several server settings can be compared (see benchmark_tunables.sh).
+"""
+import argparse
+import json
+import random
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from ldap3 import Server, Connection, BASE, NONE, MODIFY_REPLACE, SUBTREE
+
+from tests.features import LDAP_HOST, ROOT_DC, ROOT_LDAP_DN, ROOT_LDAP_SECRET
+
+
+def user_dn(index):
+    return "uid=bulk-user-%06d,ou=people,%s" % (index, ROOT_DC)
+
+
+def search(con, args, rand):
+    return con.search(
+        "ou=people," + ROOT_DC,
+        "(uid=bulk-user-%06d)" % rand.randrange(args.people),
+        SUBTREE, attributes=['cn', 'mail']
+    )
+
+
+def search_memberof(con, args, rand):
+    return con.search(
+        "ou=people," + ROOT_DC,
+        "(memberOf=cn=bulk-group-%06d,ou=groups,%s)" % (
+            rand.randrange(args.groups), ROOT_DC
+        ),
+        SUBTREE, attributes=['uid'], size_limit=args.size_limit
+    ) or con.result['description'] == 'sizeLimitExceeded'
+
+
+def read(con, args, rand):
+    return con.search(
+        user_dn(rand.randrange(args.people)), "(objectClass=*)", BASE,
+        attributes=['cn', 'mail']
+    )
+
+
+def modify(con, args, rand):
+    return con.modify(
+        user_dn(rand.randrange(args.people)),
+        {'description': [(MODIFY_REPLACE, ["benchmark %f" % time.time()])]}
+    )
+
+
+def bind(con, args, rand):
+    return con.rebind(user=ROOT_LDAP_DN, password=ROOT_LDAP_SECRET)
+
+
+OPERATIONS = {
+    'search': search,
+    'memberof': search_memberof,
+    'read': read,
+    'modify': modify,
+    'bind': bind,
+}
+
+
+def percentile(values, ratio):
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * ratio))]
+
+
+def run(args):
+    operation = OPERATIONS[args.operation]
+    servers = [
+        Server(host, get_info=NONE) for host in args.hosts or [LDAP_HOST]
+    ]
+    deadline = []
+    lock = threading.Lock()
+    latencies = []
+    errors = [0]
+
+    def worker(seed):
+        rand = random.Random(seed)
+        con = Connection(
+            servers[seed % len(servers)], user=ROOT_LDAP_DN,
+            password=ROOT_LDAP_SECRET, auto_bind=True
+        )
+        local, failed = [], 0
+        while time.time() < deadline[0]:
+            start = time.time()
+            if not operation(con, args, rand):
+                failed += 1
+            local.append(time.time() - start)
+        con.unbind()
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    deadline.append(time.time() + args.duration)
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        list(executor.map(worker, range(args.workers)))
+    elapsed = time.time() - start
+    latencies.sort()
+    return {
+        'label': args.label,
+        'operation': args.operation,
+        'workers': args.workers,
+        'hosts': len(servers),
+        'operations': len(latencies),
+        'errors': errors[0],
+        'ops_per_second': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.throughput",
+        description="Measure ldap operations throughput",
+    )
+    parser.add_argument(
+        "--operation", choices=sorted(OPERATIONS), default='search',
+    )
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument(
+        "--hosts", nargs="*",
+        help="ldap urls workers are spread over (default: LDAP_HOST)",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=20,
+        help="Seconds to run the operation (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--people", type=int, default=1000,
+        help="Bulk users available in the directory (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--groups", type=int, default=10,
+        help="Bulk groups available in the directory (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--size-limit", type=int, default=100,
+        help="memberof search size limit (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--label", default="", help="Server settings label to report",
+    )
+    return parser
+
+
+def main(argv=None):
+    print(json.dumps(run(get_parser().parse_args(argv))), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""Offline evaluator of the ``olcAccess`` rules rendered by
+etc/lmdb.ldif.template.sh
+
+It aims to answer "can DN X do operation Y on entry Z / attribute A"
+without a running slapd so the access matrix can be checked thousands of
+times faster, slapd remains the reference. Only the subset of the
+slapd.access(5) grammar used by our templates is supported, anything else
+raises a ``ValueError`` rather than silently give a wrong answer.
+
+See http://www.openldap.org/doc/admin24/access-control.html
+"""
+import os
+import shlex
+import shutil
+import subprocess
+
+from functools import lru_cache
+
+
+LEVELS = {
+    'none': 0,
+    'disclose': 1,
+    'auth': 2,
+    'compare': 3,
+    'search': 4,
+    'read': 5,
+    'write': 6,
+    'add': 6,
+    'delete': 6,
+    'manage': 7,
+}
+
+ETC_DIR = os.getenv(
+    "LDAP_ETC_DIR",
+    os.path.join(os.path.dirname(__file__), '..', '..', '..', 'etc')
+)
+
+
+def normalize_dn(dn):
+    if not dn:
+        return ''
+    return ','.join(
+        '='.join(part.strip() for part in rdn.split('=', 1))
+        for rdn in dn.lower().split(',')
+    )
+
+
+def parent_dn(dn):
+    return dn.split(',', 1)[1] if ',' in dn else ''
+
+
+def dn_match(style, pattern, dn):
+    if style in ('base', 'exact'):
+        return dn == pattern
+    if style == 'one':
+        return parent_dn(dn) == pattern
+    if style == 'subtree':
+        return dn == pattern or dn.endswith(',' + pattern)
+    if style == 'children':
+        return dn.endswith(',' + pattern)
+    raise ValueError("Unsupported dn style %r" % style)
+
+
+def parse_ldif(ldif):
+    """Yield (attribute, value) of an ldif stream, once lines are unfolded
+    and comments removed, an empty line yields (None, None)"""
+    current = None
+    for line in ldif.splitlines() + ['']:
+        if line.startswith('#'):
+            continue
+        if line.startswith(' ') and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            attribute, value = current.split(':', 1)
+            yield attribute.strip(), value.strip()
+            current = None
+        if not line.strip():
+            yield None, None
+        else:
+            current = line
+
+
+def render_template(root_dc, password='secret', etc_dir=ETC_DIR):
+    """Render lmdb.ldif.template.sh as entrypoint.sh does"""
+    return subprocess.check_output([
+        shutil.which('bash') or 'sh',
+        os.path.join(etc_dir, 'lmdb.ldif.template.sh'),
+        '-D', root_dc, '-P', password,
+    ]).decode('utf-8')
+
+
+class Rule(object):
+
+    def __init__(self, directive):
+        tokens = shlex.split(directive)
+        if tokens and tokens[0].startswith('{'):
+            tokens = tokens[1:]
+        if not tokens or tokens[0] != 'to':
+            raise ValueError("Access directive must start with 'to'")
+        tokens = tokens[1:]
+        self.dn_style = self.dn_pattern = None
+        self.attrs = None
+        while tokens and tokens[0] != 'by':
+            token = tokens.pop(0)
+            if token == '*':
+                continue
+            key, value = token.split('=', 1)
+            if key.startswith('dn'):
+                self.dn_style = key.split('.', 1)[1] if '.' in key else 'base'
+                self.dn_pattern = normalize_dn(value)
+            elif key == 'attrs':
+                self.attrs = frozenset(
+                    attr.strip().lower() for attr in value.split(',')
+                )
+            else:
+                raise ValueError("Unsupported access target %r" % token)
+        self.clauses = []
+        while tokens:
+            tokens.pop(0)  # by
+            who = tokens.pop(0)
+            level = 'none'
+            if tokens and tokens[0] != 'by':
+                level = tokens.pop(0)
+            if level not in LEVELS:
+                raise ValueError("Unsupported access level %r" % level)
+            if tokens and tokens[0] in ('stop', 'continue', 'break'):
+                if tokens.pop(0) != 'stop':
+                    raise ValueError("Only 'stop' control is supported")
+            self.clauses.append((self.compile_who(who), LEVELS[level]))
+
+    @staticmethod
+    def compile_who(who):
+        if who == '*':
+            return lambda acl, requester, target: True
+        if who == 'anonymous':
+            return lambda acl, requester, target: not requester
+        if who == 'users':
+            return lambda acl, requester, target: bool(requester)
+        if who == 'self':
+            return lambda acl, requester, target: (
+                bool(requester) and requester == target
+            )
+        key, value = who.split('=', 1)
+        value = normalize_dn(value)
+        if key.startswith('dn'):
+            style = key.split('.', 1)[1] if '.' in key else 'base'
+            return lambda acl, requester, target: (
+                bool(requester) and dn_match(style, value, requester)
+            )
+        if key in ('group', 'group.exact'):
+            return lambda acl, requester, target: (
+                requester in acl.groups.get(value, ())
+            )
+        raise ValueError("Unsupported access subject %r" % who)
+
+    def match(self, target, attr):
+        if self.dn_style and not dn_match(
+                self.dn_style, self.dn_pattern, target
+        ):
+            return False
+        return self.attrs is None or attr in self.attrs
+
+
+class AccessControl(object):
+    """Compiled ``olcAccess`` rules of a database
+
+    ``groups`` maps a group dn to its member dns, that's what slapd reads
+    from the directory while evaluating ``group.exact`` clauses.
+    """
+
+    def __init__(self, directives, root_dn=None, suffix=None, groups=None):
+        self.rules = [Rule(directive) for directive in directives]
+        self.root_dn = normalize_dn(root_dn)
+        self.suffix = normalize_dn(suffix)
+        self.groups = {
+            normalize_dn(group): frozenset(normalize_dn(m) for m in members)
+            for group, members in (groups or {}).items()
+        }
+        self.access = lru_cache(maxsize=None)(self._access)
+
+    @classmethod
+    def from_ldif(cls, ldif, groups=None):
+        """Load the first database entry that defines olcAccess"""
+        directives, root_dn, suffix = [], None, None
+        for attribute, value in parse_ldif(ldif):
+            if attribute is None:
+                if directives:
+                    break
+                root_dn = suffix = None
+            elif attribute == 'olcAccess':
+                directives.append(value)
+            elif attribute == 'olcRootDN':
+                root_dn = value
+            elif attribute == 'olcSuffix':
+                suffix = value
+        return cls(directives, root_dn=root_dn, suffix=suffix, groups=groups)
+
+    def _access(self, requester, target, attr):
+        # the root dn of the database has no rights on other databases
+        # (ie: cn=config)
+        if self.suffix and not dn_match('subtree', self.suffix, target):
+            return LEVELS['none']
+        if self.root_dn and requester == self.root_dn:
+            return LEVELS['manage']
+        for rule in self.rules:
+            if not rule.match(target, attr):
+                continue
+            for who, level in rule.clauses:
+                if who(self, requester, target):
+                    return level
+            return LEVELS['none']
+        return LEVELS['none']
+
+    def level(self, requester, target, attr='entry'):
+        return self.access(
+            normalize_dn(requester), normalize_dn(target), attr.lower()
+        )
+
+    def can(self, requester, operation, target, attrs=None, new_dn=None):
+        """Tell whether ``requester`` (empty for anonymous) is allowed to
+        do ``operation`` on ``target``
+
+        operation: one of auth, compare, search, read, add, delete, modify
+        and rename. ``attrs`` are the involved attributes (modified, added,
+        compared or read), ``new_dn`` is required by rename.
+        """
+        attrs = attrs or ()
+
+        def has(level, dn, attr='entry'):
+            return self.level(requester, dn, attr) >= LEVELS[level]
+
+        if operation == 'auth':
+            return has('auth', target, 'userPassword')
+        if operation == 'compare':
+            return all(has('compare', target, attr) for attr in attrs)
+        if operation == 'search':
+            return has('search', target)
+        if operation == 'read':
+            return has('read', target) and all(
+                has('read', target, attr) for attr in attrs
+            )
+        if operation in ('add', 'delete'):
+            return (
+                has('write', parent_dn(normalize_dn(target)), 'children') and
+                has('write', target) and
+                all(has('write', target, attr) for attr in attrs)
+            )
+        if operation == 'modify':
+            return all(has('write', target, attr) for attr in attrs)
+        if operation == 'rename':
+            if not new_dn:
+                raise ValueError("rename requires new_dn")
+            old_rdn = normalize_dn(target).split(',', 1)[0].split('=')[0]
+            new_rdn = normalize_dn(new_dn).split(',', 1)[0].split('=')[0]
+            return (
+                has('write', target) and
+                has('write', parent_dn(normalize_dn(target)), 'children') and
+                has('write', parent_dn(normalize_dn(new_dn)), 'children') and
+                has('write', target, old_rdn) and
+                has('write', target, new_rdn)
+            )
+        raise ValueError("Unknown operation %r" % operation)
+
+    def search(self, requester, base, entries, filter_attrs=('objectClass',),
+               attrs=()):
+        """Return the dns of ``entries`` (under ``base``) a search would
+        return, empty if search base is not allowed"""
+        if not self.can(requester, 'search', base):
+            return []
+        return [
+            dn for dn in entries
+            if dn_match('subtree', normalize_dn(base), normalize_dn(dn)) and
+            all(
+                self.level(requester, dn, attr) >= LEVELS['search']
+                for attr in filter_attrs
+            ) and self.can(requester, 'read', dn, attrs)
+        ]
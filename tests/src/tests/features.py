@@ -1,151 +1,476 @@
+import atexit
 import os
+import ssl
+import threading
+import traceback
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from ldap3 import Server, Connection, ALL, MODIFY_ADD, MODIFY_REPLACE
+from ldap3 import (
+    Server, Connection, EXTERNAL, NONE, MODIFY_REPLACE, SASL
+)
+from ldap3.core.exceptions import LDAPBindError
+from ldap3.core.tls import Tls, check_hostname
 from ldap3.extend.standard.modifyPassword import ModifyPassword
 from unittest import TestCase
 
+from ldaptools.membership import sync as sync_memberships
+
 
 LDAP_HOST = os.getenv("LDAP_HOST", 'ldaps://ldap.ci.example.com')
 ROOT_DC = os.getenv("ROOT_DC", "dc=ci,dc=example,dc=com")
+# ldapi://%2Frun%2Fopenldap%2Fldapi like url of a socket shared with the
+# ldap container, empty if not shared
+LDAP_LDAPI_HOST = os.getenv("LDAP_LDAPI_HOST", "")
 ROOT_LDAP_SECRET = os.getenv("ROOT_LDAP_SECRET", "secret")
 ROOT_LDAP_DN = os.getenv("ROOT_LDAP_DN", "cn=admin,") + ROOT_DC
 ORGANIZATION = os.getenv("ORGANIZATION", "example corporate")
 NEW_PASSWORD = "sofdij%*/6548994"
+# run_case(concurrent=True) is opt-in per test, LDAP_TESTS_CONCURRENT=0
+# forces every case to run serially (ie: while debugging)
+CONCURRENT_TESTS = os.getenv("LDAP_TESTS_CONCURRENT", "1") != "0"
+TEST_WORKERS = int(os.getenv("LDAP_TESTS_WORKERS", "10"))
+# pooled ldaps:// connections resume the TLS session of previous ones,
+# LDAP_TLS_SESSION_RESUME=0 makes each connection pay a full handshake
+TLS_SESSION_RESUME = os.getenv("LDAP_TLS_SESSION_RESUME", "1") != "0"
+
+
+def _freeze(params):
+    """Turn a params dict into something usable as a dict key"""
+    frozen = []
+    for key, value in sorted(params.items()):
+        try:
+            hash(value)
+        except TypeError:
+            value = repr(value)
+        frozen.append((key, value))
+    return tuple(frozen)
+
+
+class SessionTls(Tls):
+    """ldap3 ``Tls`` resuming the TLS session (session ticket or session id)
+    of a previous connection: an abbreviated handshake skips the server
+    certificate signature and the key exchange verification.
+
+    ldap3 builds a new ``SSLContext`` per connection while a session can
+    only be reused by the context it was negotiated with, so the context is
+    built once. TLS 1.3 tickets are received after the handshake, call
+    ``remember`` once a response was read (ie: after the bind).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(SessionTls, self).__init__(*args, **kwargs)
+        self.session = None
+        self._context = None
+        self._lock = threading.Lock()
+
+    def get_context(self):
+        with self._lock:
+            if self._context is None:
+                if self.version is None:
+                    context = ssl.create_default_context(
+                        purpose=ssl.Purpose.SERVER_AUTH,
+                        cafile=self.ca_certs_file, capath=self.ca_certs_path,
+                        cadata=self.ca_certs_data
+                    )
+                else:
+                    context = ssl.SSLContext(self.version)
+                    if self.ca_certs_file or self.ca_certs_path or \
+                            self.ca_certs_data:
+                        context.load_verify_locations(
+                            self.ca_certs_file, self.ca_certs_path,
+                            self.ca_certs_data
+                        )
+                if self.certificate_file:
+                    context.load_cert_chain(
+                        self.certificate_file, keyfile=self.private_key_file,
+                        password=self.private_key_password
+                    )
+                context.check_hostname = False
+                context.verify_mode = self.validate
+                for option in self.ssl_options:
+                    context.options |= option
+                if self.ciphers:
+                    context.set_ciphers(self.ciphers)
+                self._context = context
+            return self._context
+
+    def wrap_socket(self, connection, do_handshake=False):
+        wrapped_socket = self.get_context().wrap_socket(
+            connection.socket, server_side=False,
+            do_handshake_on_connect=False, server_hostname=self.sni
+        )
+        session = self.session
+        if session is not None:
+            wrapped_socket.session = session
+        if do_handshake:
+            wrapped_socket.do_handshake()
+            if self.validate in (ssl.CERT_REQUIRED, ssl.CERT_OPTIONAL):
+                check_hostname(
+                    wrapped_socket, connection.server.host, self.valid_names
+                )
+        connection.socket = wrapped_socket
+
+    def remember(self, connection):
+        """Keep the session of ``connection`` for next connections"""
+        session = getattr(connection.socket, 'session', None)
+        if session is not None and (
+                session.has_ticket or session.id
+        ) and session is not self.session:
+            self.session = session
+
+
+class LdapConnectionPool(object):
+    """Keep connections around to avoid paying the TCP connection and the
+    TLS handshake on every ``ldap_connection`` call.
+
+    Idle connections are keyed by (dn, connection params, server params),
+    a connection checked out for a dn is bound again so each call still
+    reaches slapd with a bind (ppolicy lockout, pwdLastSuccess...). A
+    checked out connection is never shared, so the pool can be used from
+    many threads.
+    """
+
+    def __init__(self, host=LDAP_HOST):
+        # ldapi:// urls are supported, see ldap_connection
+        self.host = host
+        self._lock = threading.Lock()
+        self._servers = {}
+        self._idle = {}
+        self._checked_out = {}
+        self._stale = set()
+
+    def get_server(self, serv_params):
+        key = _freeze(serv_params)
+        with self._lock:
+            if key not in self._servers:
+                serv_params = dict(serv_params)
+                if TLS_SESSION_RESUME and 'tls' not in serv_params and \
+                        self.host.lower().startswith('ldaps://'):
+                    serv_params['tls'] = SessionTls()
+                self._servers[key] = Server(self.host, **serv_params)
+            return self._servers[key]
+
+    def acquire(self, dn=None, password=None, con_params=None,
+                serv_params=None):
+        con_params = dict(con_params or {'auto_bind': True})
+        # Server info (schema, DSE) is only read if explicitly asked
+        serv_params = dict(serv_params or {'get_info': NONE})
+        if dn:
+            con_params['user'] = dn
+        key = (dn or '', _freeze(con_params), _freeze(serv_params))
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                connection, _ = idle.pop()
+                if connection.closed:
+                    continue
+                self._checked_out[id(connection)] = (key, password)
+                break
+            else:
+                connection = None
+        if connection is None:
+            if password:
+                con_params['password'] = password
+            connection = Connection(self.get_server(serv_params), **con_params)
+            with self._lock:
+                self._checked_out[id(connection)] = (key, password)
+            tls = connection.server.tls
+            if isinstance(tls, SessionTls) and not connection.closed:
+                tls.remember(connection)
+        elif dn:
+            if not connection.rebind(user=dn, password=password):
+                self.discard(connection)
+                raise LDAPBindError(connection.result)
+        return connection
+
+    def release(self, connection):
+        with self._lock:
+            key, password = self._checked_out.pop(id(connection))
+            stale = id(connection) in self._stale
+            self._stale.discard(id(connection))
+            if not stale and connection.bound and not connection.closed:
+                self._idle.setdefault(key, []).append((connection, password))
+                return
+        connection.unbind()
+
+    def discard(self, connection):
+        with self._lock:
+            self._checked_out.pop(id(connection), None)
+            self._stale.discard(id(connection))
+        connection.unbind()
+
+    def invalidate(self, dn):
+        """Forget connections bound as ``dn``, next call will bind again.
+
+        Connections currently checked out are dropped once released.
+        """
+        with self._lock:
+            self._stale.update(
+                con_id for con_id, (key, _) in self._checked_out.items()
+                if key[0] == dn
+            )
+            keys = [key for key in self._idle if key[0] == dn]
+            connections = [
+                con for key in keys for con, _ in self._idle.pop(key)
+            ]
+        for connection in connections:
+            connection.unbind()
+
+    def clear(self):
+        with self._lock:
+            connections = [
+                con for idle in self._idle.values() for con, _ in idle
+            ]
+            self._idle = {}
+        for connection in connections:
+            connection.unbind()
+
+
+POOL = LdapConnectionPool()
+POOLS = {LDAP_HOST: POOL}
+atexit.register(lambda: [pool.clear() for pool in POOLS.values()])
+
+
+def get_pool(host=None):
+    """Connection pool of ``host`` (default: LDAP_HOST)"""
+    host = host or LDAP_HOST
+    if host not in POOLS:
+        POOLS[host] = LdapConnectionPool(host)
+    return POOLS[host]
+
+
+def invalidate_connections(dn):
+    """Forget connections bound as ``dn`` in every pool"""
+    for pool in list(POOLS.values()):
+        pool.invalidate(dn)
 
 
 @contextmanager
-def ldap_connection(dn=None, password=None, con_params=None, serv_params=None):
-    if not con_params:
-        con_params = {
-            'auto_bind': True
-        }
-    if dn:
-        con_params['user'] = dn
-    if password:
-        con_params['password'] = password
-    if not serv_params:
-        serv_params = {'get_info': ALL}
-    server = Server(LDAP_HOST, **serv_params)
-    connection = Connection(server, **con_params)
-    yield connection
-    connection.unbind()
+def ldap_connection(dn=None, password=None, con_params=None, serv_params=None,
+                    host=None):
+    """Bound connection to ``host`` (default: LDAP_HOST)
+
+    With an ``ldapi://`` host and no ``dn`` the connection authenticates
+    with SASL EXTERNAL (the local root user is mapped to the root DN).
+    """
+    host = host or LDAP_HOST
+    if not dn and host.lower().startswith('ldapi://'):
+        con_params = dict(con_params or {'auto_bind': True})
+        con_params.update(authentication=SASL, sasl_mechanism=EXTERNAL)
+    if con_params and not con_params.get('auto_bind'):
+        # caller wants to manage the bind itself, nothing to pool here
+        con_params = dict(con_params)
+        if dn:
+            con_params['user'] = dn
+        if password:
+            con_params['password'] = password
+        server = Server(host, **(serv_params or {'get_info': NONE}))
+        connection = Connection(server, **con_params)
+        yield connection
+        connection.unbind()
+        return
+    pool = get_pool(host)
+    connection = pool.acquire(
+        dn=dn, password=password, con_params=con_params,
+        serv_params=serv_params
+    )
+    try:
+        yield connection
+    except BaseException:
+        pool.discard(connection)
+        raise
+    pool.release(connection)
+
+
+def get_users():
+    """Personas used to check access rules, see LdapTestCase.run_case"""
+    return {
+        'anonymous': {
+            # used for error log message
+            'description': "Anonymous user, should'nt able to do anything",
+            'user_dn': '',
+            'password': ''
+        },
+        'user': {
+            'description': "Authentificated user, should be able to "
+                           "only read its own entry",
+            'user_dn': 'uid=tuser,ou=people,' + ROOT_DC,
+            'password': 'tuserPASS',
+        },
+        'user-people-admin': {
+            'description': "Authentificated user admin, should be able to "
+                           "edit people and groups (not apps)",
+            'user_dn': 'uid=tadmin-people,ou=people,' + ROOT_DC,
+            'password': 'tadmin-peoplePASS',
+        },
+        'user-apps-admin': {
+            'description': "Authentificated user admin, should be able to "
+                           "edit applications (not people/groups)",
+            'user_dn': 'uid=tadmin-apps,ou=people,' + ROOT_DC,
+            'password': 'tadmin-appsPASS',
+        },
+        'user-admin': {
+            'description': "Authentificated user admin, should be able to "
+                           "administrate people/groups/applications",
+            'user_dn': 'uid=test_default_admin,ou=people,' + ROOT_DC,
+            'password': 'test password',
+        },
+        'admin': {
+            'description': "Root LDAP admin",
+            'user_dn': ROOT_LDAP_DN,
+            'password': ROOT_LDAP_SECRET,
+        },
+        'app': {
+            'description': "Authentificated service, should be able read"
+                           "people/groups",
+            'user_dn': 'uid=fakeapp2,ou=applications,' + ROOT_DC,
+            'password': 'fakeapp2PASS',
+        },
+        'app-people-admin': {
+            'description': "Authentificated app admin, should be able to "
+                           "edit people and groups (not apps)",
+            'user_dn': 'uid=tapp-people-admin,ou=applications,' + ROOT_DC,
+            'password': 'tapp-people-adminPASS',
+        },
+        'app-apps-admin': {
+            'description': "Authentificated app admin, should be able to "
+                           "edit applications (not people/groups)",
+            'user_dn': 'uid=tapp-apps-admin,ou=applications,' + ROOT_DC,
+            'password': 'tapp-apps-adminPASS',
+        },
+        'app-admin': {
+            'description': "Authentificated app admin, should be able to "
+                           "edit applications (not people/groups)",
+            'user_dn': 'uid=tapp-admin,ou=applications,' + ROOT_DC,
+            'password': 'tapp-adminPASS',
+        },
+    }
+
+
+# Personas added as ldap_people_admin / ldap_apps_admin members by
+# LdapTestCase.setUpClass, user-admin is the default admin set through
+# 00_organization.ldif
+PEOPLE_ADMIN_USERS = ['user-people-admin', 'app-people-admin', 'app-admin']
+APPS_ADMIN_USERS = ['user-apps-admin', 'app-apps-admin', 'app-admin']
+
+
+def add_persona_memberships(users):
+    """Give admin personas their group membership (only missing members are
+    added)"""
+    with ldap_connection(
+            dn=ROOT_LDAP_DN, password=ROOT_LDAP_SECRET
+    ) as root_con:
+        sync_memberships(root_con, {
+            'cn=ldap_people_admin,ou=groups,' + ROOT_DC: [
+                users[code]['user_dn'] for code in PEOPLE_ADMIN_USERS
+            ],
+            'cn=ldap_apps_admin,ou=groups,' + ROOT_DC: [
+                users[code]['user_dn'] for code in APPS_ADMIN_USERS
+            ],
+        }, remove=False)
 
 
 class LdapTestCase(TestCase):
 
     @classmethod
     def setUpClass(cls):
-        cls.users = {
-            'anonymous': {
-                # used for error log message
-                'description': "Anonymous user, should'nt able to do anything",
-                'user_dn': '',
-                'password': ''
-            },
-            'user': {
-                'description': "Authentificated user, should be able to "
-                               "only read its own entry",
-                'user_dn': 'uid=tuser,ou=people,' + ROOT_DC,
-                'password': 'tuserPASS',
-            },
-            'user-people-admin': {
-                'description': "Authentificated user admin, should be able to "
-                               "edit people and groups (not apps)",
-                'user_dn': 'uid=tadmin-people,ou=people,' + ROOT_DC,
-                'password': 'tadmin-peoplePASS',
-            },
-            'user-apps-admin': {
-                'description': "Authentificated user admin, should be able to "
-                               "edit applications (not people/groups)",
-                'user_dn': 'uid=tadmin-apps,ou=people,' + ROOT_DC,
-                'password': 'tadmin-appsPASS',
-            },
-            'user-admin': {
-                'description': "Authentificated user admin, should be able to "
-                               "administrate people/groups/applications",
-                'user_dn': 'uid=test_default_admin,ou=people,' + ROOT_DC,
-                'password': 'test password',
-            },
-            'admin': {
-                'description': "Root LDAP admin",
-                'user_dn': ROOT_LDAP_DN,
-                'password': ROOT_LDAP_SECRET,
-            },
-            'app': {
-                'description': "Authentificated service, should be able read"
-                               "people/groups",
-                'user_dn': 'uid=fakeapp2,ou=applications,' + ROOT_DC,
-                'password': 'fakeapp2PASS',
-            },
-            'app-people-admin': {
-                'description': "Authentificated app admin, should be able to "
-                               "edit people and groups (not apps)",
-                'user_dn': 'uid=tapp-people-admin,ou=applications,' + ROOT_DC,
-                'password': 'tapp-people-adminPASS',
-            },
-            'app-apps-admin': {
-                'description': "Authentificated app admin, should be able to "
-                               "edit applications (not people/groups)",
-                'user_dn': 'uid=tapp-apps-admin,ou=applications,' + ROOT_DC,
-                'password': 'tapp-apps-adminPASS',
-            },
-            'app-admin': {
-                'description': "Authentificated app admin, should be able to "
-                               "edit applications (not people/groups)",
-                'user_dn': 'uid=tapp-admin,ou=applications,' + ROOT_DC,
-                'password': 'tapp-adminPASS',
-            },
-        }
+        cls.users = get_users()
+        add_persona_memberships(cls.users)
 
-        with ldap_connection(
-                dn=ROOT_LDAP_DN, password=ROOT_LDAP_SECRET
-        ) as root_con:
-            root_con.modify(
-                'cn=ldap_people_admin,ou=groups,' + ROOT_DC,
-                {'member': [(MODIFY_ADD, [
-                    cls.users['user-people-admin']['user_dn'],
-                    # already managed throught 00_organization.ldif
-                    # cls.users['user-admin']['user_dn'],
-                    cls.users['app-people-admin']['user_dn'],
-                    cls.users['app-admin']['user_dn'],
-                ])]}
+    def expect(self, matrix, data=None, allowed=None, refused=None):
+        """``run_case`` test suite of a ``matrices`` expectation
+
+        Personas expected to succeed get ``allowed`` (or ``data``) test
+        hooks, the others get ``refused`` (or ``data``) ones.
+        """
+        test_suite = {}
+        for user_code, expected in matrix.items():
+            if expected is None:
+                test_suite[user_code] = None
+                continue
+            # a copy per persona: tests store their fixtures in it
+            test_suite[user_code] = dict(
+                (allowed if expected else refused) or data or {}
             )
-            root_con.modify(
-                'cn=ldap_apps_admin,ou=groups,' + ROOT_DC,
-                {'member': [(MODIFY_ADD, [
-                    cls.users['user-apps-admin']['user_dn'],
-                    # already managed throught 00_organization.ldif
-                    # cls.users['user-admin']['user_dn'],
-                    cls.users['app-apps-admin']['user_dn'],
-                    cls.users['app-admin']['user_dn'],
-                ])]}
+            test_suite[user_code]['assert'] = (
+                self.assertTrue if expected else self.assertFalse
             )
+        return test_suite
+
+    def run_case(self, test, test_suite, error_msg, concurrent=False,
+                 fixture_dn=None):
+        """Run ``test`` with every persona of ``cls.users``
 
-    def run_case(self, test, test_suite, error_msg):
+        With ``concurrent=True`` persona chains (``run_before_test``, test,
+        ``assert``, ``run_after_test``) are run on a thread pool. Personas
+        sharing the same ``fixture_dn`` (per persona in ``test_suite`` or
+        for all of them through the ``fixture_dn`` parameter) are kept
+        serialized in the persona order. Failures are reported once every
+        chain is done, in persona order.
+        """
+        if not concurrent or not CONCURRENT_TESTS:
+            for user_code, infos in self.users.items():
+                data = test_suite[user_code]
+                if not data:
+                    continue
+                self.run_persona(test, data, error_msg, user_code, infos)
+            return
 
-        for user_code, infos in self.users.items():
+        chains = OrderedDict()
+        for user_code in self.users:
             data = test_suite[user_code]
             if not data:
                 continue
-            with ldap_connection(
-                dn=infos["user_dn"],
-                password=infos["password"]
-            ) as con:
-                if 'run_before_test' in data and data['run_before_test']:
-                    data['run_before_test'](con, infos, data)
-                result, obj = test(con, infos, data)
-                data['assert'](
-                    result,
-                    "Error while: %s\n"
-                    "With user: %s \n"
-                    "User description: %s\n"
-                    "Object: %r" % (
-                        error_msg, user_code, infos['description'], obj
+            chains.setdefault(
+                data.get('fixture_dn', fixture_dn) or user_code, []
+            ).append(user_code)
+
+        failures = {}
+
+        def run_chain(user_codes):
+            for user_code in user_codes:
+                try:
+                    self.run_persona(
+                        test, test_suite[user_code], error_msg, user_code,
+                        self.users[user_code]
                     )
+                except Exception:
+                    failures[user_code] = traceback.format_exc()
+                    # following personas may rely on a broken fixture
+                    break
+
+        with ThreadPoolExecutor(max_workers=TEST_WORKERS) as executor:
+            list(executor.map(run_chain, chains.values()))
+
+        if failures:
+            self.fail("\n".join(
+                "Persona %s (%s) failed:\n%s" % (
+                    user_code, self.users[user_code]['description'],
+                    failures[user_code]
+                ) for user_code in self.users if user_code in failures
+            ))
+
+    def run_persona(self, test, data, error_msg, user_code, infos):
+        with ldap_connection(
+            dn=infos["user_dn"],
+            password=infos["password"]
+        ) as con:
+            if 'run_before_test' in data and data['run_before_test']:
+                data['run_before_test'](con, infos, data)
+            result, obj = test(con, infos, data)
+            data['assert'](
+                result,
+                "Error while: %s\n"
+                "With user: %s \n"
+                "User description: %s\n"
+                "Object: %r" % (
+                    error_msg, user_code, infos['description'], obj
                 )
-                if 'run_after_test' in data and data['run_after_test']:
-                    data['run_after_test'](con, infos, data)
+            )
+            if 'run_after_test' in data and data['run_after_test']:
+                data['run_after_test'](con, infos, data)
 
     def assertEntryExists(self, dn, expected_attributes=None):
         if not expected_attributes:
@@ -167,6 +492,7 @@ class LdapTestCase(TestCase):
         ModifyPassword(
             con, user=user_dn,  old_password=old_pass, new_password=new_pass
         ).send()
+        invalidate_connections(user_dn)
         return (
             con.result['description'] == "success",
             con.result
@@ -181,6 +507,7 @@ class LdapTestCase(TestCase):
                 dn,
                 {'userPassword': [(MODIFY_REPLACE, [password])]}
             ), con.result
+        invalidate_connections(dn)
 
     @staticmethod
     def get_ldap_dn(
@@ -228,9 +555,9 @@ class LdapTestCase(TestCase):
             )
 
     @staticmethod
-    def create_user(user_uid, dn):
+    def create_user(user_uid, dn, host=None):
         with ldap_connection(
-                dn=ROOT_LDAP_DN, password=ROOT_LDAP_SECRET
+                dn=ROOT_LDAP_DN, password=ROOT_LDAP_SECRET, host=host
         ) as root_con:
             root_con.add(
                 dn,
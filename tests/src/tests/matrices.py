@@ -0,0 +1,407 @@
+"""Expected outcome of the access tests of ``test_ldap_*_entries.py`` per
+persona (see ``features.get_users``): True if the server must do the
+operation, False if it must refuse it, None if the case does not apply.
+
+They are run against slapd by the live tests (``LdapTestCase.expect``)
+and against the rendered access rules by ``test_acl_evaluator.py``.
+"""
+
+# test_ldap_search_entries.py
+
+SEARCH_ALL_IN_ROOT_DC = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': True,
+    'user-apps-admin': True,
+    'user-admin': True,
+    'admin': True,
+    'app': False,
+    'app-people-admin': True,
+    'app-apps-admin': True,
+    'app-admin': True,
+}
+
+SEARCH_ALL_USERS = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': True,
+    'user-apps-admin': False,
+    'user-admin': True,
+    'admin': True,
+    'app': True,
+    'app-people-admin': True,
+    'app-apps-admin': True,
+    'app-admin': True,
+}
+
+SEARCH_ALL_GROUPS = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': True,
+    'user-apps-admin': False,
+    'user-admin': True,
+    'admin': True,
+    'app': True,
+    'app-people-admin': True,
+    'app-apps-admin': True,
+    'app-admin': True,
+}
+
+SEARCH_ALL_APPLICATIONS = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': False,
+    'user-apps-admin': True,
+    'user-admin': True,
+    'admin': True,
+    'app': False,
+    'app-people-admin': False,
+    'app-apps-admin': True,
+    'app-admin': True,
+}
+
+SEARCH_ALL_POLICIES = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': True,
+    'user-apps-admin': False,
+    'user-admin': True,
+    'admin': True,
+    'app': False,
+    'app-people-admin': True,
+    'app-apps-admin': False,
+    'app-admin': True,
+}
+
+SEARCH_OWN_ENTRY = {
+    'anonymous': None,
+    'user': True,
+    'user-people-admin': True,
+    'user-apps-admin': True,
+    'user-admin': True,
+    'admin': None,
+    'app': True,
+    'app-people-admin': True,
+    'app-apps-admin': True,
+    'app-admin': True,
+}
+
+SEARCH_MEMBER_OF = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': True,
+    'user-apps-admin': False,
+    'user-admin': True,
+    'admin': True,
+    'app': True,
+    'app-people-admin': True,
+    'app-apps-admin': True,
+    'app-admin': True,
+}
+
+# test_ldap_create_entries.py
+
+CREATE_USER = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': True,
+    'user-apps-admin': False,
+    'user-admin': True,
+    'admin': True,
+    'app': False,
+    'app-people-admin': True,
+    'app-apps-admin': False,
+    'app-admin': True,
+}
+
+CREATE_GROUP = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': True,
+    'user-apps-admin': False,
+    'user-admin': True,
+    'admin': True,
+    'app': False,
+    'app-people-admin': True,
+    'app-apps-admin': False,
+    'app-admin': True,
+}
+
+CREATE_APPLICATION = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': False,
+    'user-apps-admin': True,
+    'user-admin': True,
+    'admin': True,
+    'app': False,
+    'app-people-admin': False,
+    'app-apps-admin': True,
+    'app-admin': True,
+}
+
+CREATE_POLICY = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': False,
+    'user-apps-admin': False,
+    'user-admin': False,
+    'admin': True,
+    'app': False,
+    'app-people-admin': False,
+    'app-apps-admin': False,
+    'app-admin': False,
+}
+
+# test_ldap_update_entries.py
+
+UPDATE_OWN_CN_ATTRIBUTE = {
+    'anonymous': None,
+    'user': False,
+    'user-people-admin': True,
+    'user-apps-admin': False,
+    'user-admin': True,
+    'admin': None,
+    'app': False,
+    'app-people-admin': False,
+    'app-apps-admin': True,
+    'app-admin': True,
+}
+
+UPDATE_USER_CN_ATTRIBUTE = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': True,
+    'user-apps-admin': False,
+    'user-admin': True,
+    'admin': True,
+    'app': False,
+    'app-people-admin': True,
+    'app-apps-admin': False,
+    'app-admin': True,
+}
+
+UPDATE_GROUP_DESCRIPTION_ATTRIBUTE = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': True,
+    'user-apps-admin': False,
+    'user-admin': True,
+    'admin': True,
+    'app': False,
+    'app-people-admin': True,
+    'app-apps-admin': False,
+    'app-admin': True,
+}
+
+UPDATE_GROUP_MEMBER_ATTRIBUTE = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': True,
+    'user-apps-admin': False,
+    'user-admin': True,
+    'admin': True,
+    'app': False,
+    'app-people-admin': True,
+    'app-apps-admin': False,
+    'app-admin': True,
+}
+
+UPDATE_ACCESS_RULE = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': False,
+    'user-apps-admin': False,
+    'user-admin': False,
+    'admin': False,
+    'app': False,
+    'app-people-admin': False,
+    'app-apps-admin': False,
+    'app-admin': False,
+}
+
+UPDATE_APP_CN_ATTRIBUTE = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': False,
+    'user-apps-admin': True,
+    'user-admin': True,
+    'admin': True,
+    'app': False,
+    'app-people-admin': False,
+    'app-apps-admin': True,
+    'app-admin': True,
+}
+
+UPDATE_POLICY = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': False,
+    'user-apps-admin': False,
+    'user-admin': False,
+    'admin': True,
+    'app': False,
+    'app-people-admin': False,
+    'app-apps-admin': False,
+    'app-admin': False,
+}
+
+UPDATE_OWN_PASSWORD = {
+    'anonymous': None,
+    'user': True,
+    'user-people-admin': True,
+    'user-apps-admin': True,
+    'user-admin': True,
+    'admin': None,
+    'app': False,
+    'app-people-admin': False,
+    'app-apps-admin': True,
+    'app-admin': True,
+}
+
+UPDATE_USER_PASSWORD = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': True,
+    'user-apps-admin': False,
+    'user-admin': True,
+    'admin': True,
+    'app': False,
+    'app-people-admin': True,
+    'app-apps-admin': False,
+    'app-admin': True,
+}
+
+UPDATE_ROOT_ADMIN_PASSWORD = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': False,
+    'user-apps-admin': False,
+    'user-admin': False,
+    'admin': False,
+    'app': False,
+    'app-people-admin': False,
+    'app-apps-admin': False,
+    'app-admin': False,
+}
+
+UPDATE_APP_PASSWORD = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': False,
+    'user-apps-admin': True,
+    'user-admin': True,
+    'admin': True,
+    'app': False,
+    'app-people-admin': False,
+    'app-apps-admin': True,
+    'app-admin': True,
+}
+
+# test_ldap_delete_entries.py
+
+REMOVE_APP_ENTRY = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': False,
+    'user-apps-admin': True,
+    'user-admin': True,
+    'admin': True,
+    'app': False,
+    'app-people-admin': False,
+    'app-apps-admin': True,
+    'app-admin': True,
+}
+
+REMOVE_GROUP_ENTRY = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': True,
+    'user-apps-admin': False,
+    'user-admin': True,
+    'admin': True,
+    'app': False,
+    'app-people-admin': True,
+    'app-apps-admin': False,
+    'app-admin': True,
+}
+
+REMOVE_POLICY_ENTRY = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': False,
+    'user-apps-admin': False,
+    'user-admin': False,
+    'admin': True,
+    'app': False,
+    'app-people-admin': False,
+    'app-apps-admin': False,
+    'app-admin': False,
+}
+
+REMOVE_USER_ENTRY = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': True,
+    'user-apps-admin': False,
+    'user-admin': True,
+    'admin': True,
+    'app': False,
+    'app-people-admin': True,
+    'app-apps-admin': False,
+    'app-admin': True,
+}
+
+# test_ldap_rename_entries.py
+
+RENAME_USER_ENTRY = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': True,
+    'user-apps-admin': False,
+    'user-admin': True,
+    'admin': True,
+    'app': False,
+    'app-people-admin': True,
+    'app-apps-admin': False,
+    'app-admin': True,
+}
+
+RENAME_APP_ENTRY = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': False,
+    'user-apps-admin': True,
+    'user-admin': True,
+    'admin': True,
+    'app': False,
+    'app-people-admin': False,
+    'app-apps-admin': True,
+    'app-admin': True,
+}
+
+RENAME_GROUP_ENTRY = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': True,
+    'user-apps-admin': False,
+    'user-admin': True,
+    'admin': True,
+    'app': False,
+    'app-people-admin': True,
+    'app-apps-admin': False,
+    'app-admin': True,
+}
+
+RENAME_POLICY_ENTRY = {
+    'anonymous': False,
+    'user': False,
+    'user-people-admin': False,
+    'user-apps-admin': False,
+    'user-admin': False,
+    'admin': True,
+    'app': False,
+    'app-people-admin': False,
+    'app-apps-admin': False,
+    'app-admin': False,
+}
@@ -0,0 +1,180 @@
+import os
+
+from unittest import TestCase, skipUnless
+
+from . import matrices
+from .acl import AccessControl, ETC_DIR, render_template
+from .features import (
+    get_users, ROOT_DC, APPS_ADMIN_USERS, PEOPLE_ADMIN_USERS
+)
+
+
+PEOPLE = 'ou=people,' + ROOT_DC
+GROUPS = 'ou=groups,' + ROOT_DC
+APPLICATIONS = 'ou=applications,' + ROOT_DC
+POLICIES = 'ou=policies,' + ROOT_DC
+MDB_CONFIG = 'olcDatabase={1}mdb,cn=config'
+
+
+def search_member_of(acl, dn):
+    return bool(acl.search(
+        dn, PEOPLE, ['uid=tuser,' + PEOPLE],
+        filter_attrs=('objectClass', 'memberOf')
+    ))
+
+
+def rename(branch, rdn):
+    return lambda acl, dn: acl.can(
+        dn, 'rename', '%s=old,%s' % (rdn, branch),
+        new_dn='%s=new,%s' % (rdn, branch)
+    )
+
+
+# operation of the live test of each matrix: (acl, requester dn) -> bool
+OPERATIONS = {
+    'SEARCH_ALL_IN_ROOT_DC': lambda acl, dn: acl.can(dn, 'search', ROOT_DC),
+    'SEARCH_ALL_USERS': lambda acl, dn: acl.can(dn, 'search', PEOPLE),
+    'SEARCH_ALL_GROUPS': lambda acl, dn: acl.can(dn, 'search', GROUPS),
+    'SEARCH_ALL_APPLICATIONS': lambda acl, dn: acl.can(
+        dn, 'search', APPLICATIONS
+    ),
+    'SEARCH_ALL_POLICIES': lambda acl, dn: acl.can(dn, 'search', POLICIES),
+    'SEARCH_OWN_ENTRY': lambda acl, dn: acl.can(dn, 'search', dn),
+    'SEARCH_MEMBER_OF': search_member_of,
+    'CREATE_USER': lambda acl, dn: acl.can(
+        dn, 'add', 'uid=new,' + PEOPLE,
+        attrs=['objectClass', 'cn', 'sn', 'mobile', 'givenName', 'o', 'uid']
+    ),
+    'CREATE_GROUP': lambda acl, dn: acl.can(
+        dn, 'add', 'cn=new,' + GROUPS,
+        attrs=['objectClass', 'cn', 'description', 'member']
+    ),
+    'CREATE_APPLICATION': lambda acl, dn: acl.can(
+        dn, 'add', 'uid=new,' + APPLICATIONS,
+        attrs=['objectClass', 'cn', 'sn', 'uid', 'userPassword']
+    ),
+    'CREATE_POLICY': lambda acl, dn: acl.can(
+        dn, 'add', 'cn=new,' + POLICIES,
+        attrs=['objectClass', 'cn', 'sn', 'pwdAttribute']
+    ),
+    'UPDATE_OWN_CN_ATTRIBUTE': lambda acl, dn: acl.can(
+        dn, 'modify', dn, attrs=['cn']
+    ),
+    'UPDATE_USER_CN_ATTRIBUTE': lambda acl, dn: acl.can(
+        dn, 'modify', 'uid=tuser2,' + PEOPLE, attrs=['cn']
+    ),
+    'UPDATE_GROUP_DESCRIPTION_ATTRIBUTE': lambda acl, dn: acl.can(
+        dn, 'modify', 'cn=fakeapp,' + GROUPS, attrs=['description']
+    ),
+    'UPDATE_GROUP_MEMBER_ATTRIBUTE': lambda acl, dn: acl.can(
+        dn, 'modify', 'cn=new,' + GROUPS, attrs=['member']
+    ),
+    'UPDATE_ACCESS_RULE': lambda acl, dn: acl.can(
+        dn, 'modify', MDB_CONFIG, attrs=['olcAccess']
+    ),
+    'UPDATE_APP_CN_ATTRIBUTE': lambda acl, dn: acl.can(
+        dn, 'modify', 'uid=fakeapp,' + APPLICATIONS, attrs=['cn']
+    ),
+    'UPDATE_POLICY': lambda acl, dn: acl.can(
+        dn, 'modify', 'cn=default,' + POLICIES, attrs=['sn']
+    ),
+    'UPDATE_OWN_PASSWORD': lambda acl, dn: acl.can(
+        dn, 'modify', dn, attrs=['userPassword']
+    ),
+    'UPDATE_USER_PASSWORD': lambda acl, dn: acl.can(
+        dn, 'modify', 'uid=tuser2,' + PEOPLE, attrs=['userPassword']
+    ),
+    'UPDATE_ROOT_ADMIN_PASSWORD': lambda acl, dn: acl.can(
+        dn, 'modify', MDB_CONFIG, attrs=['olcRootPW']
+    ),
+    'UPDATE_APP_PASSWORD': lambda acl, dn: acl.can(
+        dn, 'modify', 'uid=fakeapp,' + APPLICATIONS, attrs=['userPassword']
+    ),
+    'REMOVE_APP_ENTRY': lambda acl, dn: acl.can(
+        dn, 'delete', 'uid=old,' + APPLICATIONS
+    ),
+    'REMOVE_GROUP_ENTRY': lambda acl, dn: acl.can(
+        dn, 'delete', 'cn=old,' + GROUPS
+    ),
+    'REMOVE_POLICY_ENTRY': lambda acl, dn: acl.can(
+        dn, 'delete', 'cn=old,' + POLICIES
+    ),
+    'REMOVE_USER_ENTRY': lambda acl, dn: acl.can(
+        dn, 'delete', 'uid=old,' + PEOPLE
+    ),
+    'RENAME_USER_ENTRY': rename(PEOPLE, 'uid'),
+    'RENAME_APP_ENTRY': rename(APPLICATIONS, 'uid'),
+    'RENAME_GROUP_ENTRY': rename(GROUPS, 'cn'),
+    'RENAME_POLICY_ENTRY': rename(POLICIES, 'cn'),
+}
+
+
+@skipUnless(
+    os.path.isfile(os.path.join(ETC_DIR, 'lmdb.ldif.template.sh')),
+    "etc/ templates not available (set LDAP_ETC_DIR)"
+)
+class TestAclEvaluator(TestCase):
+    """Check the access matrices of test_ldap_*_entries.py offline"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.users = get_users()
+        cls.acl = AccessControl.from_ldif(
+            render_template(ROOT_DC),
+            groups={
+                'cn=ldap_people_admin,ou=groups,' + ROOT_DC: [
+                    cls.users[code]['user_dn']
+                    for code in PEOPLE_ADMIN_USERS + ['user-admin']
+                ],
+                'cn=ldap_apps_admin,ou=groups,' + ROOT_DC: [
+                    cls.users[code]['user_dn']
+                    for code in APPS_ADMIN_USERS + ['user-admin']
+                ],
+            }
+        )
+
+    def assertMatrix(self, expected, check):
+        for user_code, allowed in expected.items():
+            if allowed is None:
+                continue
+            infos = self.users[user_code]
+            self.assertEqual(
+                allowed,
+                check(infos['user_dn'], infos),
+                "With user: %s\nUser description: %s" % (
+                    user_code, infos['description']
+                )
+            )
+
+    def test_matrices(self):
+        self.assertEqual(
+            sorted(name for name in dir(matrices) if name.isupper()),
+            sorted(OPERATIONS),
+            "Every matrix of matrices.py needs its operation in OPERATIONS"
+        )
+        for name, operation in sorted(OPERATIONS.items()):
+            with self.subTest(matrix=name):
+                self.assertMatrix(
+                    getattr(matrices, name),
+                    lambda dn, infos: operation(self.acl, dn)
+                )
+
+    def test_update_memberof_attribute(self):
+        self.assertMatrix(
+            {code: code == 'admin' for code in self.users},
+            lambda dn, infos: self.acl.can(
+                dn, 'modify', 'uid=tuser2,ou=people,' + ROOT_DC,
+                attrs=['memberOf']
+            )
+        )
+
+    def test_anonymous_auth(self):
+        self.assertTrue(
+            self.acl.can('', 'auth', 'uid=tuser,ou=people,' + ROOT_DC)
+        )
+        self.assertTrue(
+            self.acl.can('', 'auth', 'uid=fakeapp,ou=applications,' + ROOT_DC)
+        )
+        self.assertFalse(
+            self.acl.can('', 'read', 'uid=tuser,ou=people,' + ROOT_DC)
+        )
@@ -0,0 +1,60 @@
+import json
+
+from io import StringIO
+from unittest import TestCase
+
+from ldaptools.bootprofile import compare, load_profiles, read_events, report
+
+
+def event(name, seconds, boot="b1", version="2.6.6-r1", kind="phase",
+          **extra):
+    extra.update({
+        'event': kind, 'name': name, 'boot': boot, 'version': version,
+        'at': seconds, 'seconds': seconds,
+    })
+    return json.dumps(extra) + "\n"
+
+
+class TestBootProfile(TestCase):
+
+    def test_read_events_skips_other_log_lines(self):
+        events = list(read_events(StringIO(
+            "Génerate slapd.ldif from templates\n" +
+            event("config_render", 0.1) +
+            '{"not": "a boot event"}\n' +
+            "{broken json\n" +
+            event("init/users.ldif", 0.2, kind="import", entries=3, bytes=9)
+        )))
+        self.assertEqual(
+            ["config_render", "init/users.ldif"],
+            [item['name'] for item in events]
+        )
+
+    def test_median_of_starts(self):
+        profiles = load_profiles([StringIO(
+            event("config_update", 0.1, boot="b1") +
+            event("config_update", 0.5, boot="b2") +
+            event("config_update", 0.3, boot="b3")
+        )], ["old.log"])
+        self.assertEqual(3, len(profiles[0].boots))
+        self.assertEqual(0.3, profiles[0].seconds(('phase', 'config_update')))
+
+    def test_compare_versions(self):
+        profiles = load_profiles([StringIO(
+            event("config_import", 0.4) +
+            event("generated --demo", 0.2, kind="import", entries=12) +
+            event("config_import", 0.1, boot="b2", version="2.6.7") +
+            event("slapd_start", 0.3, boot="b2", version="2.6.7")
+        )], ["logs"], by_version=True)
+        self.assertEqual(
+            ["2.6.6-r1", "2.6.7"], [profile.label for profile in profiles]
+        )
+        self.assertEqual([
+            ('phase', 'config_import', [(0.4, None), (0.1, None)]),
+            ('import', 'generated --demo', [(0.2, 12), (None, None)]),
+            ('phase', 'slapd_start', [(None, None), (0.3, None)]),
+        ], list(compare(profiles)))
+        output = StringIO()
+        report(profiles, output)
+        self.assertIn("-0.30", output.getvalue())
+        self.assertIn("(12 entries)", output.getvalue())
@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+
+from unittest import TestCase
+
+from ldap3.core.exceptions import LDAPException
+
+from ldaptools.certwatch import (
+    CertificateWatcher, InvalidCertificate, validate
+)
+
+
+class TestCertificateWatch(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.cert = self.write("ldap.crt", "cert")
+        self.key = self.write("ldap.key", "key")
+        self.reloads = []
+        self.invalid = False
+        self.unavailable = False
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, "w") as file:
+            file.write(content)
+        return path
+
+    def renew(self, content="renewed"):
+        for path in (self.cert, self.key):
+            with open(path, "a") as file:
+                file.write(content)
+
+    def check(self, cert, key, ca):
+        if self.invalid:
+            raise InvalidCertificate("key mismatch")
+
+    def reload(self, cert, key, ca):
+        if self.unavailable:
+            raise LDAPException("slapd not ready")
+        self.reloads.append((cert, key, ca))
+
+    def watcher(self):
+        return CertificateWatcher(
+            self.cert, self.key, reload=self.reload, check=self.check
+        )
+
+    def test_unchanged(self):
+        watcher = self.watcher()
+        self.assertFalse(watcher.poll())
+        self.assertFalse(watcher.poll())
+        self.assertEqual([], self.reloads)
+
+    def test_reload_once_settled(self):
+        watcher = self.watcher()
+        self.renew()
+        self.assertFalse(watcher.poll())
+        self.renew("key")
+        self.assertFalse(watcher.poll())
+        self.assertTrue(watcher.poll())
+        self.assertFalse(watcher.poll())
+        self.assertEqual([(self.cert, self.key, None)], self.reloads)
+
+    def test_invalid_pair_is_not_retried(self):
+        watcher = self.watcher()
+        self.invalid = True
+        self.renew()
+        watcher.poll()
+        self.assertFalse(watcher.poll())
+        self.invalid = False
+        self.assertFalse(watcher.poll())
+        self.assertEqual([], self.reloads)
+        self.renew()
+        watcher.poll()
+        self.assertTrue(watcher.poll())
+
+    def test_reload_retried_while_slapd_unavailable(self):
+        watcher = self.watcher()
+        self.unavailable = True
+        self.renew()
+        watcher.poll()
+        self.assertFalse(watcher.poll())
+        self.unavailable = False
+        self.assertTrue(watcher.poll())
+
+    def test_validate_unreadable_pair(self):
+        with self.assertRaises(InvalidCertificate):
+            validate(self.cert, self.key)
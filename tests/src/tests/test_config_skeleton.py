@@ -0,0 +1,98 @@
+import os
+import shutil
+import tempfile
+import zlib
+
+from unittest import TestCase
+
+from ldaptools.skeleton import patch
+
+CONFIG = """# AUTO-GENERATED FILE - DO NOT EDIT!! Use ldapmodify.
+# CRC32 00000000
+dn: cn=config
+objectClass: olcGlobal
+cn: config
+olcTLSCertificateFile: /ssl/ldap.skeleton.invalid.crt
+olcTLSCertificateKeyFile: /ssl/ldap.skeleton.invalid.key
+olcToolThreads: 8
+olcAuthzRegexp: {0}"gidNumber=0\\+uidNumber=0,cn=peercred,cn=external,cn=
+ auth" "cn=admin,dc=skeleton,dc=invalid"
+structuralObjectClass: olcGlobal
+
+"""
+
+MDB = """# AUTO-GENERATED FILE - DO NOT EDIT!! Use ldapmodify.
+# CRC32 00000000
+dn: olcDatabase={1}mdb
+objectClass: olcDatabaseConfig
+olcDatabase: {1}mdb
+olcSuffix: dc=skeleton,dc=invalid
+olcRootPW:: e1NTSEF9c2tlbGV0b24=
+olcAccess: {0}to dn.one="ou=people,dc=skeleton,dc=invalid" attrs=userPas
+ sword by self write by * none
+
+"""
+
+
+class TestConfigSkeleton(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        os.mkdir(os.path.join(self.directory, "cn=config"))
+        self.write("cn=config.ldif", CONFIG)
+        self.write("cn=config/olcDatabase={1}mdb.ldif", MDB)
+
+    def write(self, name, content):
+        with open(os.path.join(self.directory, name), "w") as file:
+            file.write(content)
+
+    def read(self, name):
+        with open(os.path.join(self.directory, name)) as file:
+            return file.read()
+
+    def patch(self):
+        return patch(
+            self.directory,
+            [("dc=skeleton,dc=invalid", "dc=example,dc=com")],
+            [
+                ("cn=config", "olcTLSCertificateFile", "/ssl/ldap.crt"),
+                ("cn=config", "olcTLSCACertificateFile", "/ssl/ca.crt"),
+                ("cn=config", "olcToolThreads", ""),
+                ("olcDatabase={1}mdb", "olcRootPW", "{SSHA}secret"),
+            ]
+        )
+
+    def test_patch(self):
+        self.assertEqual(2, self.patch())
+        config = self.read("cn=config.ldif")
+        self.assertIn(
+            "olcTLSCertificateFile: /ssl/ldap.crt\n"
+            "olcTLSCertificateKeyFile: /ssl/ldap.skeleton.invalid.key\n",
+            config
+        )
+        self.assertIn("olcTLSCACertificateFile: /ssl/ca.crt\n", config)
+        self.assertNotIn("olcToolThreads", config)
+        self.assertIn('"cn=admin,dc=example,dc=com"\n', config)
+        mdb = self.read("cn=config/olcDatabase={1}mdb.ldif")
+        self.assertIn("olcSuffix: dc=example,dc=com\n", mdb)
+        self.assertIn("olcRootPW: {SSHA}secret\n", mdb)
+        self.assertIn('dn.one="ou=people,dc=example,dc=com"', mdb)
+
+    def test_checksum(self):
+        self.patch()
+        header, crc, content = self.read("cn=config.ldif").split("\n", 2)
+        self.assertEqual(
+            "# CRC32 %08x" % (zlib.crc32(content.encode()) & 0xffffffff),
+            crc
+        )
+
+    def test_deterministic(self):
+        self.patch()
+        patched = self.read("cn=config.ldif")
+        self.assertEqual(0, self.patch())
+        self.assertEqual(patched, self.read("cn=config.ldif"))
+
+    def test_unknown_entry(self):
+        with self.assertRaises(ValueError):
+            patch(self.directory, [], [("cn=missing", "cn", "value")])
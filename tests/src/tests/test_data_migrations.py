@@ -0,0 +1,117 @@
+import os
+import tempfile
+
+from io import StringIO
+from ldap3 import MODIFY_ADD, MODIFY_REPLACE
+from unittest import TestCase
+from unittest.mock import patch
+
+from ldaptools import trees
+from ldaptools.ldif import write_entries
+from ldaptools.migrate import (
+    TemporarySlapd, entry_changes, ledger_entries, read_sources
+)
+
+from .features import ROOT_DC, ORGANIZATION
+
+
+class TestDataMigrations(TestCase):
+
+    def get_stream(self, admin_password="{SSHA}xxx", demo=True):
+        stream = StringIO()
+        stream.write("# source: base\n")
+        write_entries(trees.base(
+            ROOT_DC, "ci.example.com", ORGANIZATION, "admin", admin_password
+        ), stream)
+        if demo:
+            stream.write("# source: demo\n")
+            write_entries(
+                trees.demo(ROOT_DC, "ci.example.com", ORGANIZATION), stream
+            )
+        stream.seek(0)
+        return stream
+
+    def test_read_sources(self):
+        base, demo = read_sources(self.get_stream())
+        self.assertEqual(("base", 10), (base.name, base.count))
+        self.assertEqual(("demo", 12), (demo.name, demo.count))
+        entries = dict(demo.entries())
+        self.assertEqual(
+            ['tuser'], entries["uid=tuser,ou=people," + ROOT_DC]['uid']
+        )
+
+    def test_checksum_ignores_passwords(self):
+        base, _ = read_sources(self.get_stream())
+        base2, _ = read_sources(self.get_stream(admin_password="{SSHA}yyy"))
+        self.assertEqual(base.checksum, base2.checksum)
+        base3, = read_sources(self.get_stream(demo=False))
+        self.assertEqual(base.checksum, base3.checksum)
+
+    def test_ledger_entries(self):
+        sources = read_sources(self.get_stream())
+        entries = dict(ledger_entries(sources, ROOT_DC))
+        self.assertIn("ou=migrations," + ROOT_DC, entries)
+        self.assertIn(
+            ('description', sources[1].checksum),
+            entries["cn=demo,ou=migrations," + ROOT_DC]
+        )
+
+    def test_entry_changes(self):
+        self.assertEqual(
+            {'cn': [(MODIFY_REPLACE, ['New name'])]},
+            entry_changes(
+                {
+                    'objectClass': ['inetOrgPerson', 'person'],
+                    'cn': ['New name'],
+                    'sn': ['User'],
+                    'userPassword': ['{SSHA}xxx'],
+                    'memberOf': ['cn=fakeapp,ou=groups,' + ROOT_DC],
+                },
+                {
+                    'objectclass': ['person', 'InetOrgPerson'],
+                    'cn': ['Old name'],
+                    'sn': ['User'],
+                    'userPassword': [b'{SSHA}changed by user'],
+                }
+            )
+        )
+
+    def test_entry_changes_keep_live_members(self):
+        admin = "uid=admin,ou=people," + ROOT_DC
+        alice = "uid=alice,ou=people," + ROOT_DC
+        bob = "uid=bob,ou=people," + ROOT_DC
+        group = {
+            'objectClass': ['groupOfNames', 'top'],
+            'cn': ['ldap_people_admin'],
+            'member': [admin],
+        }
+        live = {
+            'objectClass': ['top', 'groupOfNames'],
+            'cn': ['ldap_people_admin'],
+            'member': [admin.upper(), alice, bob],
+        }
+        self.assertEqual({}, entry_changes(group, live))
+        group['member'].append("uid=carol,ou=people," + ROOT_DC)
+        group['objectClass'].append('extensibleObject')
+        self.assertEqual(
+            {
+                'member': [
+                    (MODIFY_ADD, ["uid=carol,ou=people," + ROOT_DC])
+                ],
+                'objectClass': [(MODIFY_ADD, ['extensibleObject'])],
+            },
+            entry_changes(group, live)
+        )
+
+    @patch("ldaptools.migrate.subprocess.Popen")
+    def test_temporary_slapd_stale_socket(self, popen):
+        popen.return_value.poll.return_value = 1
+        popen.return_value.returncode = 1
+        directory = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, directory)
+        socket = os.path.join(directory, "ldapi")
+        open(socket, "w").close()
+        with self.assertRaises(RuntimeError):
+            with TemporarySlapd(directory, socket=socket):
+                pass
+        self.assertFalse(os.path.exists(socket))
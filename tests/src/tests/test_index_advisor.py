@@ -0,0 +1,140 @@
+from io import StringIO
+from unittest import TestCase
+
+from ldaptools.indexadvisor import (
+    format_indexes, parse_filter, parse_indexes, unindexed_components,
+    FilterSyntaxError, Workload
+)
+
+from .features import ROOT_DC
+
+STATS_LOG = """\
+652d1c2a.1a2b3c4d 0x7f00 conn=1000 op=1 SRCH base="ou=people,{root_dc}" \
+scope=2 deref=0 filter="(memberOf=cn=fakeapp,ou=groups,{root_dc})"
+652d1c2a.1a2b3c4e 0x7f00 conn=1000 op=1 SRCH attr=uid
+652d1c2a.1a2b3c4f 0x7f00 <= mdb_equality_candidates: (memberOf) not indexed
+652d1c2a.1a2b3c50 0x7f00 conn=1000 op=1 SEARCH RESULT tag=101 err=0 \
+qtime=0.000011 etime=0.250000 nentries=1 text=
+652d1c2a.1a2b3c51 0x7f00 conn=1000 op=2 SRCH base="ou=people,{root_dc}" \
+scope=2 deref=0 filter="(&(objectClass=inetOrgPerson)(uid=tuser))"
+652d1c2a.1a2b3c52 0x7f00 conn=1000 op=2 SEARCH RESULT tag=101 err=0 \
+qtime=0.000011 etime=0.000100 nentries=1 text=
+652d1c2a.1a2b3c53 0x7f00 conn=1001 op=1 SRCH base="ou=people,{root_dc}" \
+scope=2 deref=0 filter="(|(mail=tuser*)(uid=tuser))"
+652d1c2a.1a2b3c54 0x7f00 conn=1001 op=1 SEARCH RESULT tag=101 err=0 \
+qtime=0.000011 etime=0.100000 nentries=1 text=
+""".format(root_dc=ROOT_DC)
+
+
+class TestIndexAdvisor(TestCase):
+
+    def test_parse_filter(self):
+        self.assertEqual(
+            ('&', [
+                ('objectClass', 'eq'),
+                ('|', [('mail', 'sub'), ('cn', 'pres')]),
+                ('!', ('uid', 'eq')),
+                ('createTimestamp', 'eq'),
+            ]),
+            parse_filter(
+                "(&(objectClass=person)(|(mail=*@example.com)(cn;lang-fr=*))"
+                "(!(uid=tuser\\29))(createTimestamp>=20230101000000Z))"
+            )
+        )
+        with self.assertRaises(FilterSyntaxError):
+            parse_filter("(&(uid=tuser)")
+
+    def test_indexes_format(self):
+        indexes = parse_indexes("objectClass eq; uid eq,sub;;cn,sn sub")
+        self.assertEqual(
+            {
+                'objectClass': {'eq'},
+                'uid': {'eq', 'sub'},
+                'cn': {'sub'},
+                'sn': {'sub'},
+            },
+            indexes
+        )
+        self.assertEqual(
+            "objectClass eq;uid eq,sub;cn sub;sn sub", format_indexes(indexes)
+        )
+
+    def test_unindexed_components(self):
+        indexes = parse_indexes("objectClass eq;uid eq,sub")
+        # one indexed component is enough to limit an AND candidates
+        self.assertEqual(
+            (False, []),
+            unindexed_components(
+                parse_filter("(&(mail=tuser*)(uid=tuser))"), indexes
+            )
+        )
+        # every OR component must be indexed
+        self.assertEqual(
+            (True, [('mail', 'sub')]),
+            unindexed_components(
+                parse_filter("(|(mail=tuser*)(uid=tuser))"), indexes
+            )
+        )
+        self.assertEqual(
+            (False, []),
+            unindexed_components(parse_filter("(objectClass=*)"), indexes)
+        )
+
+    def test_recommend_from_stats_log(self):
+        workload = Workload(
+            parse_indexes("objectClass eq;uid eq,sub"), entries=1000
+        )
+        workload.read_stats_log(StringIO(STATS_LOG))
+        self.assertEqual((3, 2), (workload.searches, workload.full_scans))
+        member_of = workload.ranking()[0]
+        self.assertEqual(
+            ('memberOf', 'eq', 1, 1, 0.25),
+            (
+                member_of['attribute'], member_of['index_type'],
+                member_of['scans'], member_of['not_indexed'],
+                member_of['etime'],
+            )
+        )
+        self.assertEqual(
+            "objectClass eq;uid eq,sub;memberOf eq;mail sub",
+            format_indexes(workload.recommend())
+        )
+        self.assertEqual(
+            "objectClass eq;uid eq,sub;memberOf eq",
+            format_indexes(workload.recommend(min_count=2))
+        )
+
+    def test_cost_weighted_by_scope_and_results(self):
+        workload = Workload(parse_indexes("objectClass eq"), entries=1000)
+        for _ in range(5):
+            workload.add_search("(cn=tuser)", scope=0, nentries=1)
+        # a search returning most of its scope does not need an index
+        workload.add_search("(sn=user)", scope=2, nentries=990)
+        workload.add_search("(mail=tuser@example.com)", scope=2, nentries=1)
+        self.assertEqual(
+            [('mail', 999), ('sn', 10), ('cn', 0)],
+            [
+                (component['attribute'], workload.cost(component))
+                for component in workload.ranking()
+            ]
+        )
+        self.assertEqual(
+            "objectClass eq;mail eq;sn eq",
+            format_indexes(workload.recommend())
+        )
+        self.assertEqual(
+            "objectClass eq;mail eq",
+            format_indexes(workload.recommend(min_cost=100))
+        )
+
+    def test_recommend_from_accesslog(self):
+        workload = Workload(parse_indexes("objectClass eq"))
+        workload.read_accesslog(StringIO(
+            "dn: reqStart=20231016100000.000001Z,cn=accesslog\n"
+            "objectClass: auditSearch\n"
+            "reqFilter: (member=uid=tuser,ou=people,%s)\n"
+            "\n" % ROOT_DC
+        ))
+        self.assertEqual(
+            "objectClass eq;member eq", format_indexes(workload.recommend())
+        )
@@ -1,8 +1,11 @@
-from ldap3 import Server, Connection, ALL
-from unittest import TestCase
+from ldap3 import Server, Connection, ALL, BASE
+from unittest import TestCase, skipUnless
 from subprocess import CalledProcessError, check_call
 
-from .features import LDAP_HOST, ROOT_DC, ROOT_LDAP_DN, ROOT_LDAP_SECRET
+from .features import (
+    ldap_connection, LDAP_HOST, LDAP_LDAPI_HOST, ROOT_DC, ROOT_LDAP_DN,
+    ROOT_LDAP_SECRET
+)
 
 
 class TestLdapConnection(TestCase):
@@ -126,3 +129,19 @@ class TestLdapConnection(TestCase):
                 "uid", "givenName"
             ]
         )
+
+    @skipUnless(LDAP_LDAPI_HOST, "LDAP_LDAPI_HOST not set (socket not shared)")
+    def test_ldapi_external_bind(self):
+        with ldap_connection(host=LDAP_LDAPI_HOST) as con:
+            self.assertEqual(
+                "dn:" + ROOT_LDAP_DN.lower(),
+                con.extend.standard.who_am_i().lower()
+            )
+        user_dn = "uid=tuser,ou=people," + ROOT_DC
+        with ldap_connection(
+            dn=user_dn, password="tuserPASS", host=LDAP_LDAPI_HOST
+        ) as con:
+            self.assertTrue(
+                con.search(user_dn, "(objectClass=*)", BASE),
+                "Connection error %r" % con.result
+            )
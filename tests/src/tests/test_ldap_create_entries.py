@@ -1,5 +1,6 @@
 from uuid import uuid4
 
+from . import matrices
 from .features import LdapTestCase, ROOT_DC, ORGANIZATION
 
 
@@ -37,62 +38,20 @@ class TestLdapCreateEntries(LdapTestCase):
                 len(entries) == 0
             )
 
-        test_suite = {
-            'anonymous': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_uid_does_not_exists
-            },
-            'user': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_uid_does_not_exists,
-            },
-            'user-people-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_uid_exists,
-            },
-            'user-apps-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_uid_does_not_exists,
-            },
-            'user-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_uid_exists,
-            },
-            'admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_uid_exists,
-            },
-            'app': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_uid_does_not_exists,
-            },
-            'app-people-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
+        test_suite = self.expect(
+            matrices.CREATE_USER,
+            allowed={
                 'run_after_test': assert_uid_exists,
             },
-            'app-apps-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
+            refused={
                 'run_after_test': assert_uid_does_not_exists,
             },
-            'app-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_uid_exists,
-            },
-        }
+        )
         self.run_case(
             create_ldap_user,
             test_suite,
-            "Test creating new user"
+            "Test creating new user",
+            concurrent=True
         )
 
     def test_create_group(self):
@@ -125,62 +84,20 @@ class TestLdapCreateEntries(LdapTestCase):
                 len(entries) == 0
             )
 
-        test_suite = {
-            'anonymous': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_dn_does_not_exists
-            },
-            'user': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'user-people-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_dn_exists,
-            },
-            'user-apps-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'user-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_dn_exists,
-            },
-            'admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_dn_exists,
-            },
-            'app': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'app-people-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
+        test_suite = self.expect(
+            matrices.CREATE_GROUP,
+            allowed={
                 'run_after_test': assert_dn_exists,
             },
-            'app-apps-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
+            refused={
                 'run_after_test': assert_dn_does_not_exists,
             },
-            'app-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_dn_exists,
-            },
-        }
+        )
         self.run_case(
             create_ldap_group,
             test_suite,
-            "Test creating new group"
+            "Test creating new group",
+            concurrent=True
         )
 
     def test_create_application(self):
@@ -214,62 +131,20 @@ class TestLdapCreateEntries(LdapTestCase):
                 len(entries) == 0
             )
 
-        test_suite = {
-            'anonymous': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_uid_does_not_exists
-            },
-            'user': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_uid_does_not_exists,
-            },
-            'user-people-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_uid_does_not_exists,
-            },
-            'user-apps-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_uid_exists,
-            },
-            'user-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_uid_exists,
-            },
-            'admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
+        test_suite = self.expect(
+            matrices.CREATE_APPLICATION,
+            allowed={
                 'run_after_test': assert_uid_exists,
             },
-            'app': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_uid_does_not_exists,
-            },
-            'app-people-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
+            refused={
                 'run_after_test': assert_uid_does_not_exists,
             },
-            'app-apps-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_uid_exists,
-            },
-            'app-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_uid_exists,
-            },
-        }
+        )
         self.run_case(
             create_ldap_app_user,
             test_suite,
-            "Test creating new application"
+            "Test creating new application",
+            concurrent=True
         )
 
     def test_create_policy(self):
@@ -302,60 +177,18 @@ class TestLdapCreateEntries(LdapTestCase):
                 len(entries) == 0
             )
 
-        test_suite = {
-            'anonymous': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_dn_does_not_exists
-            },
-            'user': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'user-people-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'user-apps-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'user-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
+        test_suite = self.expect(
+            matrices.CREATE_POLICY,
+            allowed={
                 'run_after_test': assert_dn_exists,
             },
-            'app': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'app-people-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'app-apps-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'app-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
+            refused={
                 'run_after_test': assert_dn_does_not_exists,
             },
-        }
+        )
         self.run_case(
             create_policy,
             test_suite,
-            "Test creating new policy"
+            "Test creating new policy",
+            concurrent=True
         )
@@ -1,5 +1,6 @@
 from uuid import uuid4
 
+from . import matrices
 from .features import LdapTestCase, ROOT_DC
 
 
@@ -25,62 +26,22 @@ class TestLdapRemoveEntries(LdapTestCase):
                 len(entries) == 0
             )
 
-        test_suite = {
-            'anonymous': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists
-            },
-            'user': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'user-people-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'user-apps-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'user-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'admin': {
-                'assert': self.assertTrue,
+        test_suite = self.expect(
+            matrices.REMOVE_APP_ENTRY,
+            allowed={
                 'run_before_test': prepare_test,
                 'run_after_test': assert_dn_does_not_exists,
             },
-            'app': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'app-people-admin': {
-                'assert': self.assertFalse,
+            refused={
                 'run_before_test': prepare_test,
                 'run_after_test': assert_dn_exists,
             },
-            'app-apps-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'app-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-        }
+        )
         self.run_case(
             delete_dn_entry,
             test_suite,
-            "Test creating delete user dn"
+            "Test creating delete user dn",
+            concurrent=True
         )
 
     def test_remove_group_entry(self):
@@ -109,62 +70,22 @@ class TestLdapRemoveEntries(LdapTestCase):
                 len(entries) == 0
             )
 
-        test_suite = {
-            'anonymous': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists
-            },
-            'user': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'user-people-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'user-apps-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'user-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'app': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'app-people-admin': {
-                'assert': self.assertTrue,
+        test_suite = self.expect(
+            matrices.REMOVE_GROUP_ENTRY,
+            allowed={
                 'run_before_test': prepare_test,
                 'run_after_test': assert_dn_does_not_exists,
             },
-            'app-apps-admin': {
-                'assert': self.assertFalse,
+            refused={
                 'run_before_test': prepare_test,
                 'run_after_test': assert_dn_exists,
             },
-            'app-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-        }
+        )
         self.run_case(
             delete_dn_entry,
             test_suite,
-            "Test creating delete user dn"
+            "Test creating delete user dn",
+            concurrent=True
         )
 
     def test_remove_policy_entry(self):
@@ -189,62 +110,22 @@ class TestLdapRemoveEntries(LdapTestCase):
                 len(entries) == 0
             )
 
-        test_suite = {
-            'anonymous': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists
-            },
-            'user': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'user-people-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'user-apps-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'user-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'admin': {
-                'assert': self.assertTrue,
+        test_suite = self.expect(
+            matrices.REMOVE_POLICY_ENTRY,
+            allowed={
                 'run_before_test': prepare_test,
                 'run_after_test': assert_dn_does_not_exists,
             },
-            'app': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'app-people-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'app-apps-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'app-admin': {
-                'assert': self.assertFalse,
+            refused={
                 'run_before_test': prepare_test,
                 'run_after_test': assert_dn_exists,
             },
-        }
+        )
         self.run_case(
             delete_dn_entry,
             test_suite,
-            "Test creating delete user dn"
+            "Test creating delete user dn",
+            concurrent=True
         )
 
     def test_remove_user_entry(self):
@@ -268,60 +149,20 @@ class TestLdapRemoveEntries(LdapTestCase):
                 len(entries) == 0
             )
 
-        test_suite = {
-            'anonymous': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists
-            },
-            'user': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'user-people-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'user-apps-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'user-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'app': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'app-people-admin': {
-                'assert': self.assertTrue,
+        test_suite = self.expect(
+            matrices.REMOVE_USER_ENTRY,
+            allowed={
                 'run_before_test': prepare_test,
                 'run_after_test': assert_dn_does_not_exists,
             },
-            'app-apps-admin': {
-                'assert': self.assertFalse,
+            refused={
                 'run_before_test': prepare_test,
                 'run_after_test': assert_dn_exists,
             },
-            'app-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-        }
+        )
         self.run_case(
             delete_dn_entry,
             test_suite,
-            "Test creating delete user dn"
+            "Test creating delete user dn",
+            concurrent=True
         )
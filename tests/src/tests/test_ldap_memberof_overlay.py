@@ -1,7 +1,10 @@
-from ldap3 import MODIFY_ADD, MODIFY_REPLACE, MODIFY_DELETE
+from ldap3 import ASYNC, MODIFY_ADD, MODIFY_REPLACE, MODIFY_DELETE
 from uuid import uuid4
 
-from .features import ldap_connection, LdapTestCase
+from ldaptools.connection import connect
+from ldaptools.membership import sync
+
+from .features import ldap_connection, LdapTestCase, LDAP_HOST
 from .features import ROOT_DC, ROOT_LDAP_SECRET, ROOT_LDAP_DN
 
 
@@ -488,3 +491,58 @@ class TestLdapMemberOfOverlay(LdapTestCase):
             test_suite,
             "testing member integrity while deleting an user entry"
         )
+
+    def test_bulk_membership_sync(self):
+        suffix = uuid4().hex[:8]
+        user_dns = [
+            "uid=bulk-sync-%s-%d,ou=people,%s" % (suffix, index, ROOT_DC)
+            for index in range(20)
+        ]
+        group_dns = [
+            "cn=bulk-sync-%s-%d,ou=groups,%s" % (suffix, index, ROOT_DC)
+            for index in range(3)
+        ]
+        for dn in user_dns:
+            self.create_user(dn.split(',')[0][4:], dn)
+        for dn in group_dns:
+            self.create_group(dn.split(',')[0][3:], dn, [user_dns[0]])
+
+        def clean():
+            with ldap_connection(
+                    dn=ROOT_LDAP_DN, password=ROOT_LDAP_SECRET
+            ) as con:
+                for dn in group_dns + user_dns:
+                    con.delete(dn)
+        self.addCleanup(clean)
+
+        desired = {
+            group_dns[0]: user_dns,
+            group_dns[1]: user_dns[10:],
+            group_dns[2]: user_dns[:1],
+        }
+        con = connect(
+            LDAP_HOST, ROOT_LDAP_DN, ROOT_LDAP_SECRET, client_strategy=ASYNC
+        )
+        self.addCleanup(con.unbind)
+        reports, _ = sync(con, desired, chunk_size=7, window=4)
+        self.assertEqual(
+            [(19, 0, 3), (10, 1, 2), (0, 0, 0)],
+            [
+                (report['added'], report['deleted'], report['modifies'])
+                for report in reports
+            ]
+        )
+        self.assertEqual(
+            ['success'] * 3, [report['result'] for report in reports]
+        )
+        for index, dn in enumerate(user_dns):
+            expected = {group_dns[0]} | (
+                {group_dns[1]} if index >= 10 else set()
+            ) | ({group_dns[2]} if index == 0 else set())
+            entries = self.get_ldap_dn(dn, ['memberOf'])
+            self.assertEqual(
+                {group_dn.lower() for group_dn in expected},
+                {value.lower() for value in entries[0].memberOf.values}, dn
+            )
+        reports, _ = sync(con, desired)
+        self.assertEqual([0, 0, 0], [report['modifies'] for report in reports])
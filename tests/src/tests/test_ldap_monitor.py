@@ -0,0 +1,35 @@
+from .features import LdapTestCase
+
+
+class TestLdapMonitor(LdapTestCase):
+
+    def test_read_monitor_counters(self):
+
+        def read_monitor(con, context, data):
+            return (
+                con.search(
+                    'cn=Operations,cn=Monitor', '(objectclass=*)',
+                    attributes=['monitorOpInitiated', 'monitorOpCompleted']
+                ),
+                con.result
+            )
+
+        test_suite = {
+            'anonymous': {'assert': self.assertFalse, },
+            'user': {'assert': self.assertFalse, },
+            'user-people-admin': {'assert': self.assertFalse, },
+            'user-apps-admin': {'assert': self.assertFalse, },
+            'user-admin': {'assert': self.assertTrue, },
+            'admin': {'assert': self.assertTrue, },
+            'app': {'assert': self.assertFalse, },
+            'app-people-admin': {'assert': self.assertFalse, },
+            'app-apps-admin': {'assert': self.assertFalse, },
+            'app-admin': {'assert': self.assertFalse, },
+        }
+
+        self.run_case(
+            read_monitor,
+            test_suite,
+            "testing to read cn=monitor counters",
+            concurrent=True
+        )
@@ -1,5 +1,6 @@
 from uuid import uuid4
 
+from . import matrices
 from .features import LdapTestCase, ROOT_DC
 
 
@@ -29,62 +30,22 @@ class TestLdapRenameEntries(LdapTestCase):
                 len(entries) == 0
             )
 
-        test_suite = {
-            'anonymous': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists
-            },
-            'user': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'user-people-admin': {
-                'assert': self.assertTrue,
+        test_suite = self.expect(
+            matrices.RENAME_USER_ENTRY,
+            allowed={
                 'run_before_test': prepare_test,
                 'run_after_test': assert_dn_exists,
             },
-            'user-apps-admin': {
-                'assert': self.assertFalse,
+            refused={
                 'run_before_test': prepare_test,
                 'run_after_test': assert_dn_does_not_exists,
             },
-            'user-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'app': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'app-people-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'app-apps-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'app-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-        }
+        )
         self.run_case(
             rename_dn_entry,
             test_suite,
-            "Test creating rename user dn"
+            "Test creating rename user dn",
+            concurrent=True
         )
 
     def test_rename_app_entry(self):
@@ -114,62 +75,22 @@ class TestLdapRenameEntries(LdapTestCase):
                 len(entries) == 0
             )
 
-        test_suite = {
-            'anonymous': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists
-            },
-            'user': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'user-people-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'user-apps-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'user-admin': {
-                'assert': self.assertTrue,
+        test_suite = self.expect(
+            matrices.RENAME_APP_ENTRY,
+            allowed={
                 'run_before_test': prepare_test,
                 'run_after_test': assert_dn_exists,
             },
-            'admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'app': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'app-people-admin': {
-                'assert': self.assertFalse,
+            refused={
                 'run_before_test': prepare_test,
                 'run_after_test': assert_dn_does_not_exists,
             },
-            'app-apps-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'app-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-        }
+        )
         self.run_case(
             rename_dn_entry,
             test_suite,
-            "Test creating rename app dn"
+            "Test creating rename app dn",
+            concurrent=True
         )
 
     def test_rename_group_entry(self):
@@ -200,62 +121,22 @@ class TestLdapRenameEntries(LdapTestCase):
                 len(entries) == 0
             )
 
-        test_suite = {
-            'anonymous': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists
-            },
-            'user': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'user-people-admin': {
-                'assert': self.assertTrue,
+        test_suite = self.expect(
+            matrices.RENAME_GROUP_ENTRY,
+            allowed={
                 'run_before_test': prepare_test,
                 'run_after_test': assert_dn_exists,
             },
-            'user-apps-admin': {
-                'assert': self.assertFalse,
+            refused={
                 'run_before_test': prepare_test,
                 'run_after_test': assert_dn_does_not_exists,
             },
-            'user-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'app': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'app-people-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-            'app-apps-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'app-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_exists,
-            },
-        }
+        )
         self.run_case(
             rename_dn_entry,
             test_suite,
-            "Test creating rename group dn"
+            "Test creating rename group dn",
+            concurrent=True
         )
 
     def test_rename_policy_entry(self):
@@ -284,60 +165,20 @@ class TestLdapRenameEntries(LdapTestCase):
                 len(entries) == 0
             )
 
-        test_suite = {
-            'anonymous': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists
-            },
-            'user': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'user-people-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists
-            },
-            'user-apps-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'user-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists
-            },
-            'admin': {
-                'assert': self.assertTrue,
+        test_suite = self.expect(
+            matrices.RENAME_POLICY_ENTRY,
+            allowed={
                 'run_before_test': prepare_test,
                 'run_after_test': assert_dn_exists,
             },
-            'app': {
-                'assert': self.assertFalse,
+            refused={
                 'run_before_test': prepare_test,
                 'run_after_test': assert_dn_does_not_exists,
             },
-            'app-people-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists
-            },
-            'app-apps-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists,
-            },
-            'app-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare_test,
-                'run_after_test': assert_dn_does_not_exists
-            },
-        }
+        )
         self.run_case(
             rename_dn_entry,
             test_suite,
-            "Test creating rename policy dn"
+            "Test creating rename policy dn",
+            concurrent=True
         )
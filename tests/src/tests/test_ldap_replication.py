@@ -0,0 +1,145 @@
+import os
+import time
+import uuid
+
+from argparse import Namespace
+from ldap3 import BASE, MODIFY_REPLACE
+from unittest import skipUnless
+
+from benchmarks.throughput import run as run_throughput
+
+from .features import (
+    ldap_connection, LdapTestCase, ROOT_DC, ROOT_LDAP_DN, ROOT_LDAP_SECRET
+)
+
+# Space separated consumer (or mirror) urls, set by run_replication_test.sh
+CONSUMER_HOSTS = os.getenv("LDAP_CONSUMER_HOSTS", "").split()
+MIRROR_HOSTS = os.getenv("LDAP_MIRROR_HOSTS", "").split()
+MAX_LAG = float(os.getenv("LDAP_REPLICATION_MAX_LAG", "10"))
+BULK_PEOPLE = int(os.getenv("LDAP_BULK_PEOPLE", "0"))
+THROUGHPUT_DURATION = float(os.getenv("LDAP_THROUGHPUT_DURATION", "10"))
+
+
+class ReplicationTestCase(LdapTestCase):
+
+    def wait_replicated(self, dn, attribute=None, value=None,
+                        hosts=CONSUMER_HOSTS):
+        """Return seconds each of ``hosts`` took to get ``dn`` (and
+        ``attribute`` containing ``value`` if given)
+        """
+        start = time.time()
+        lags = {}
+        pending = list(hosts)
+        while pending and time.time() - start < MAX_LAG:
+            for host in list(pending):
+                with ldap_connection(
+                    dn=ROOT_LDAP_DN, password=ROOT_LDAP_SECRET, host=host
+                ) as con:
+                    found = con.search(
+                        dn, '(objectClass=*)', BASE,
+                        attributes=[attribute] if attribute else None
+                    )
+                    if found and attribute:
+                        found = value.lower() in [
+                            item.lower()
+                            for item in con.entries[0][attribute].values
+                        ]
+                if found:
+                    lags[host] = time.time() - start
+                    pending.remove(host)
+            time.sleep(0.01)
+        self.assertFalse(
+            pending,
+            "%s not replicated after %ss on %s" % (
+                dn, MAX_LAG, ", ".join(pending)
+            )
+        )
+        return lags
+
+    def delete_entries(self, *dns, host=None):
+        with ldap_connection(
+                dn=ROOT_LDAP_DN, password=ROOT_LDAP_SECRET, host=host
+        ) as root_con:
+            for dn in dns:
+                root_con.delete(dn)
+
+
+@skipUnless(CONSUMER_HOSTS, "LDAP_CONSUMER_HOSTS not set (no consumer)")
+class TestLdapReplication(ReplicationTestCase):
+
+    def test_replication_lag(self):
+        uid = "replicated-%s" % uuid.uuid4().hex[:8]
+        user_dn = "uid=%s,ou=people,%s" % (uid, ROOT_DC)
+        group_dn = "cn=%s,ou=groups,%s" % (uid, ROOT_DC)
+        try:
+            self.create_user(uid, user_dn)
+            user_lags = self.wait_replicated(user_dn)
+            self.create_group(uid, group_dn, [user_dn])
+            # memberOf is set by the provider memberof overlay
+            group_lags = self.wait_replicated(user_dn, 'memberOf', group_dn)
+        finally:
+            self.delete_entries(group_dn, user_dn)
+        for host in CONSUMER_HOSTS:
+            print(
+                "Replication lag %s: add %.3fs, group membership %.3fs" % (
+                    host, user_lags[host], group_lags[host]
+                )
+            )
+
+    def test_consumer_refers_writes(self):
+        # do not let ldap3 chase the referral up to the provider
+        with ldap_connection(
+            dn=ROOT_LDAP_DN, password=ROOT_LDAP_SECRET,
+            con_params={'auto_bind': True, 'auto_referrals': False},
+            host=CONSUMER_HOSTS[0]
+        ) as con:
+            self.assertFalse(con.add(
+                "uid=not-replicated,ou=people," + ROOT_DC, 'inetOrgPerson',
+                {'cn': 'Not replicated', 'sn': 'Not replicated'}
+            ))
+            self.assertEqual('referral', con.result['description'])
+
+    @skipUnless(BULK_PEOPLE, "LDAP_BULK_PEOPLE not set (no bulk users)")
+    def test_read_throughput_scaling(self):
+        results = []
+        for count in range(1, len(CONSUMER_HOSTS) + 1):
+            result = run_throughput(Namespace(
+                operation='read', workers=16 * count,
+                hosts=CONSUMER_HOSTS[:count], duration=THROUGHPUT_DURATION,
+                people=BULK_PEOPLE, groups=0, size_limit=0,
+                label="%d consumers" % count,
+            ))
+            print(result)
+            self.assertEqual(0, result['errors'])
+            results.append(result['ops_per_second'])
+        print(
+            "Read throughput scaling: %s" % ", ".join(
+                "%d consumers x%.2f" % (count + 1, ops / results[0])
+                for count, ops in enumerate(results)
+            )
+        )
+
+
+@skipUnless(MIRROR_HOSTS, "LDAP_MIRROR_HOSTS not set (no mirror)")
+class TestLdapMirrorReplication(ReplicationTestCase):
+
+    def test_mirror_writes_converge(self):
+        # only the first mirror imports initial data
+        self.wait_replicated('ou=people,' + ROOT_DC, hosts=MIRROR_HOSTS)
+        dns = []
+        try:
+            for host in MIRROR_HOSTS:
+                uid = "mirrored-%s" % uuid.uuid4().hex[:8]
+                dns.append("uid=%s,ou=people,%s" % (uid, ROOT_DC))
+                self.create_user(uid, dns[-1], host=host)
+            for dn in dns:
+                self.wait_replicated(dn, hosts=MIRROR_HOSTS)
+            with ldap_connection(
+                dn=ROOT_LDAP_DN, password=ROOT_LDAP_SECRET,
+                host=MIRROR_HOSTS[0]
+            ) as con:
+                con.modify(dns[-1], {'cn': [(MODIFY_REPLACE, ['changed'])]})
+            self.wait_replicated(dns[-1], 'cn', 'changed', MIRROR_HOSTS)
+        finally:
+            for host, dn in zip(MIRROR_HOSTS, dns):
+                self.delete_entries(dn, host=host)
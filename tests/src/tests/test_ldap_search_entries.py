@@ -1,3 +1,4 @@
+from . import matrices
 from .features import LdapTestCase, ROOT_DC
 
 
@@ -10,23 +11,13 @@ class TestLdapRemoveEntries(LdapTestCase):
                 con.result
             )
 
-        test_suite = {
-            'anonymous': {'assert': self.assertFalse, },
-            'user': {'assert': self.assertFalse, },
-            'user-people-admin': {'assert': self.assertTrue, },
-            'user-apps-admin': {'assert': self.assertTrue, },
-            'user-admin': {'assert': self.assertTrue, },
-            'admin': {'assert': self.assertTrue, },
-            'app': {'assert': self.assertFalse, },
-            'app-people-admin': {'assert': self.assertTrue, },
-            'app-apps-admin': {'assert': self.assertTrue, },
-            'app-admin': {'assert': self.assertTrue, },
-        }
+        test_suite = self.expect(matrices.SEARCH_ALL_IN_ROOT_DC)
 
         self.run_case(
             search_all_in_root_dc,
             test_suite,
-            "testing to search in root dc"
+            "testing to search in root dc",
+            concurrent=True
         )
 
     def test_search_all_users(self):
@@ -37,23 +28,13 @@ class TestLdapRemoveEntries(LdapTestCase):
                 con.result
             )
 
-        test_suite = {
-            'anonymous': {'assert': self.assertFalse, },
-            'user': {'assert': self.assertFalse, },
-            'user-people-admin': {'assert': self.assertTrue, },
-            'user-apps-admin': {'assert': self.assertFalse, },
-            'user-admin': {'assert': self.assertTrue, },
-            'admin': {'assert': self.assertTrue, },
-            'app': {'assert': self.assertTrue, },
-            'app-people-admin': {'assert': self.assertTrue, },
-            'app-apps-admin': {'assert': self.assertTrue, },
-            'app-admin': {'assert': self.assertTrue, },
-        }
+        test_suite = self.expect(matrices.SEARCH_ALL_USERS)
 
         self.run_case(
             search_all_people,
             test_suite,
-            "testing to search all people"
+            "testing to search all people",
+            concurrent=True
         )
 
     def test_search_all_groups(self):
@@ -64,23 +45,13 @@ class TestLdapRemoveEntries(LdapTestCase):
                 con.result
             )
 
-        test_suite = {
-            'anonymous': {'assert': self.assertFalse, },
-            'user': {'assert': self.assertFalse, },
-            'user-people-admin': {'assert': self.assertTrue, },
-            'user-apps-admin': {'assert': self.assertFalse, },
-            'user-admin': {'assert': self.assertTrue, },
-            'admin': {'assert': self.assertTrue, },
-            'app': {'assert': self.assertTrue, },
-            'app-people-admin': {'assert': self.assertTrue, },
-            'app-apps-admin': {'assert': self.assertTrue, },
-            'app-admin': {'assert': self.assertTrue, },
-        }
+        test_suite = self.expect(matrices.SEARCH_ALL_GROUPS)
 
         self.run_case(
             search_all_groups,
             test_suite,
-            "testing to search all groups"
+            "testing to search all groups",
+            concurrent=True
         )
 
     def test_search_all_applications(self):
@@ -91,23 +62,13 @@ class TestLdapRemoveEntries(LdapTestCase):
                 con.result
             )
 
-        test_suite = {
-            'anonymous': {'assert': self.assertFalse, },
-            'user': {'assert': self.assertFalse, },
-            'user-people-admin': {'assert': self.assertFalse, },
-            'user-apps-admin': {'assert': self.assertTrue, },
-            'user-admin': {'assert': self.assertTrue, },
-            'admin': {'assert': self.assertTrue, },
-            'app': {'assert': self.assertFalse, },
-            'app-people-admin': {'assert': self.assertFalse, },
-            'app-apps-admin': {'assert': self.assertTrue, },
-            'app-admin': {'assert': self.assertTrue, },
-        }
+        test_suite = self.expect(matrices.SEARCH_ALL_APPLICATIONS)
 
         self.run_case(
             search_all_apps,
             test_suite,
-            "testing to search all apps"
+            "testing to search all apps",
+            concurrent=True
         )
 
     def test_search_all_policies(self):
@@ -118,23 +79,13 @@ class TestLdapRemoveEntries(LdapTestCase):
                 con.result
             )
 
-        test_suite = {
-            'anonymous': {'assert': self.assertFalse, },
-            'user': {'assert': self.assertFalse, },
-            'user-people-admin': {'assert': self.assertTrue, },
-            'user-apps-admin': {'assert': self.assertFalse, },
-            'user-admin': {'assert': self.assertTrue, },
-            'admin': {'assert': self.assertTrue, },
-            'app': {'assert': self.assertFalse, },
-            'app-people-admin': {'assert': self.assertTrue, },
-            'app-apps-admin': {'assert': self.assertFalse, },
-            'app-admin': {'assert': self.assertTrue, },
-        }
+        test_suite = self.expect(matrices.SEARCH_ALL_POLICIES)
 
         self.run_case(
             search_all_policies,
             test_suite,
-            "testing to search all policies"
+            "testing to search all policies",
+            concurrent=True
         )
 
     def test_search_own_entry(self):
@@ -145,23 +96,13 @@ class TestLdapRemoveEntries(LdapTestCase):
                 con.result
             )
 
-        test_suite = {
-            'anonymous': None,
-            'user': {'assert': self.assertTrue, },
-            'user-people-admin': {'assert': self.assertTrue, },
-            'user-apps-admin': {'assert': self.assertTrue, },
-            'user-admin': {'assert': self.assertTrue, },
-            'admin': None,
-            'app': {'assert': self.assertTrue, },
-            'app-people-admin': {'assert': self.assertTrue, },
-            'app-apps-admin': {'assert': self.assertTrue, },
-            'app-admin': {'assert': self.assertTrue, },
-        }
+        test_suite = self.expect(matrices.SEARCH_OWN_ENTRY)
 
         self.run_case(
             search_myself,
             test_suite,
-            "testing to search myself"
+            "testing to search myself",
+            concurrent=True
         )
 
     def test_search_member_of(self):
@@ -176,21 +117,11 @@ class TestLdapRemoveEntries(LdapTestCase):
                 con.result
             )
 
-        test_suite = {
-            'anonymous': {'assert': self.assertFalse, },
-            'user': {'assert': self.assertFalse, },
-            'user-people-admin': {'assert': self.assertTrue, },
-            'user-apps-admin': {'assert': self.assertFalse, },
-            'user-admin': {'assert': self.assertTrue, },
-            'admin': {'assert': self.assertTrue, },
-            'app': {'assert': self.assertTrue, },
-            'app-people-admin': {'assert': self.assertTrue, },
-            'app-apps-admin': {'assert': self.assertTrue, },
-            'app-admin': {'assert': self.assertTrue, },
-        }
+        test_suite = self.expect(matrices.SEARCH_MEMBER_OF)
 
         self.run_case(
             search_member_of,
             test_suite,
-            "testing to search people member of fakeapp"
+            "testing to search people member of fakeapp",
+            concurrent=True
         )
@@ -1,6 +1,7 @@
 from ldap3 import MODIFY_REPLACE, MODIFY_ADD, MODIFY_DELETE
 from uuid import uuid4
 from ldap3.core.exceptions import LDAPSessionTerminatedByServerError
+from . import matrices
 from .features import ldap_connection, LdapTestCase
 from .features import ROOT_DC, ROOT_LDAP_SECRET, ROOT_LDAP_DN
 
@@ -48,54 +49,20 @@ class TestLdapUpdateEntries(LdapTestCase):
                     )
                 )
 
-        test_suite = {
-            'anonymous': None,
-            'user': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_name_not_changed
+        test_suite = self.expect(
+            matrices.UPDATE_OWN_CN_ATTRIBUTE,
+            allowed={
+                'run_after_test': assert_name_changed,
             },
-            'user-people-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_name_changed
+            refused={
+                'run_after_test': assert_name_not_changed,
             },
-            'user-apps-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_name_not_changed
-            },
-            'user-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_name_changed
-            },
-            'admin': None,
-            'app': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_name_not_changed
-            },
-            'app-people-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': None,
-                'run_after_test': assert_name_not_changed
-            },
-            'app-apps-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_name_changed
-            },
-            'app-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_name_changed
-            },
-        }
+        )
         self.run_case(
             update_cn_attribute,
             test_suite,
-            "testing to update its own cn attribute"
+            "testing to update its own cn attribute",
+            concurrent=True
         )
 
     def test_update_user_cn_attribute(self):
@@ -156,58 +123,16 @@ class TestLdapUpdateEntries(LdapTestCase):
                     )
                 )
 
-        test_suite = {
-            'anonymous': {
-                'assert': self.assertFalse,
-                'run_before_test': init_old_value,
-                'run_after_test': assert_name_not_changed
-            },
-            'user': {
-                'assert': self.assertFalse,
-                'run_before_test': init_old_value,
-                'run_after_test': assert_name_not_changed
-            },
-            'user-people-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_name_changed
-            },
-            'user-apps-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': init_old_value,
-                'run_after_test': assert_name_not_changed
-            },
-            'user-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_name_changed
-            },
-            'admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_name_changed
-            },
-            'app': {
-                'assert': self.assertFalse,
-                'run_before_test': init_old_value,
-                'run_after_test': assert_name_not_changed
-            },
-            'app-people-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_name_changed
+        test_suite = self.expect(
+            matrices.UPDATE_USER_CN_ATTRIBUTE,
+            allowed={
+                'run_after_test': assert_name_changed,
             },
-            'app-apps-admin': {
-                'assert': self.assertFalse,
+            refused={
                 'run_before_test': init_old_value,
-                'run_after_test': assert_name_not_changed
+                'run_after_test': assert_name_not_changed,
             },
-            'app-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_name_changed
-            },
-        }
+        )
         self.run_case(
             update_cn_attribute,
             test_suite,
@@ -271,58 +196,16 @@ class TestLdapUpdateEntries(LdapTestCase):
                     )
                 )
 
-        test_suite = {
-            'anonymous': {
-                'assert': self.assertFalse,
-                'run_before_test': init_old_value,
-                'run_after_test': assert_description_not_changed
+        test_suite = self.expect(
+            matrices.UPDATE_GROUP_DESCRIPTION_ATTRIBUTE,
+            allowed={
+                'run_after_test': assert_description_changed,
             },
-            'user': {
-                'assert': self.assertFalse,
+            refused={
                 'run_before_test': init_old_value,
-                'run_after_test': assert_description_not_changed
+                'run_after_test': assert_description_not_changed,
             },
-            'user-people-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_description_changed
-            },
-            'user-apps-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': init_old_value,
-                'run_after_test': assert_description_not_changed
-            },
-            'user-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_description_changed
-            },
-            'admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_description_changed
-            },
-            'app': {
-                'assert': self.assertFalse,
-                'run_before_test': init_old_value,
-                'run_after_test': assert_description_not_changed
-            },
-            'app-people-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_description_changed
-            },
-            'app-apps-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': init_old_value,
-                'run_after_test': assert_description_not_changed
-            },
-            'app-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_description_changed
-            },
-        }
+        )
         self.run_case(
             update_description_attribute,
             test_suite,
@@ -365,58 +248,12 @@ class TestLdapUpdateEntries(LdapTestCase):
                 con.result
             )
 
-        test_suite = {
-            'anonymous': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare,
-                'run_after_test': None
-            },
-            'user': {
-                'assert': self.assertFalse,
+        test_suite = self.expect(
+            matrices.UPDATE_GROUP_MEMBER_ATTRIBUTE,
+            data={
                 'run_before_test': prepare,
-                'run_after_test': None
             },
-            'user-people-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare,
-                'run_after_test': None
-            },
-            'user-apps-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare,
-                'run_after_test': None
-            },
-            'user-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare,
-                'run_after_test': None
-            },
-            'admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare,
-                'run_after_test': None
-            },
-            'app': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare,
-                'run_after_test': None
-            },
-            'app-people-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare,
-                'run_after_test': None
-            },
-            'app-apps-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': prepare,
-                'run_after_test': None
-            },
-            'app-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': prepare,
-                'run_after_test': None
-            },
-        }
+        )
         self.run_case(
             define_group_members,
             test_suite,
@@ -433,18 +270,7 @@ class TestLdapUpdateEntries(LdapTestCase):
                 ])]}
             ), con.result
 
-        test_suite = {
-            'anonymous': {'assert': self.assertFalse, },
-            'user': {'assert': self.assertFalse, },
-            'user-people-admin': {'assert': self.assertFalse, },
-            'user-apps-admin': {'assert': self.assertFalse, },
-            'user-admin': {'assert': self.assertFalse, },
-            'admin': {'assert': self.assertFalse, },
-            'app': {'assert': self.assertFalse, },
-            'app-people-admin': {'assert': self.assertFalse, },
-            'app-apps-admin': {'assert': self.assertFalse, },
-            'app-admin': {'assert': self.assertFalse, },
-        }
+        test_suite = self.expect(matrices.UPDATE_ACCESS_RULE)
 
         self.run_case(
             udapte_ldap_access_rule,
@@ -510,58 +336,16 @@ class TestLdapUpdateEntries(LdapTestCase):
                     )
                 )
 
-        test_suite = {
-            'anonymous': {
-                'assert': self.assertFalse,
-                'run_before_test': init_old_value,
-                'run_after_test': assert_name_not_changed
-            },
-            'user': {
-                'assert': self.assertFalse,
-                'run_before_test': init_old_value,
-                'run_after_test': assert_name_not_changed
+        test_suite = self.expect(
+            matrices.UPDATE_APP_CN_ATTRIBUTE,
+            allowed={
+                'run_after_test': assert_name_changed,
             },
-            'user-people-admin': {
-                'assert': self.assertFalse,
+            refused={
                 'run_before_test': init_old_value,
-                'run_after_test': assert_name_not_changed
-            },
-            'user-apps-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_name_changed
-            },
-            'user-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_name_changed
+                'run_after_test': assert_name_not_changed,
             },
-            'admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_name_changed
-            },
-            'app': {
-                'assert': self.assertFalse,
-                'run_before_test': init_old_value,
-                'run_after_test': assert_name_not_changed
-            },
-            'app-people-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': init_old_value,
-                'run_after_test': assert_name_not_changed
-            },
-            'app-apps-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_name_changed
-            },
-            'app-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_name_changed
-            },
-        }
+        )
         self.run_case(
             update_cn_attribute,
             test_suite,
@@ -626,58 +410,16 @@ class TestLdapUpdateEntries(LdapTestCase):
                     )
                 )
 
-        test_suite = {
-            'anonymous': {
-                'assert': self.assertFalse,
-                'run_before_test': init_old_value,
-                'run_after_test': assert_name_not_changed
-            },
-            'user': {
-                'assert': self.assertFalse,
-                'run_before_test': init_old_value,
-                'run_after_test': assert_name_not_changed
-            },
-            'user-people-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': init_old_value,
-                'run_after_test': assert_name_not_changed
-            },
-            'user-apps-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': init_old_value,
-                'run_after_test': assert_name_not_changed
-            },
-            'user-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': init_old_value,
-                'run_after_test': assert_name_not_changed
-            },
-            'admin': {
-                'assert': self.assertTrue,
-                'run_before_test': None,
-                'run_after_test': assert_name_changed
-            },
-            'app': {
-                'assert': self.assertFalse,
-                'run_before_test': init_old_value,
-                'run_after_test': assert_name_not_changed
-            },
-            'app-people-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': init_old_value,
-                'run_after_test': assert_name_not_changed
-            },
-            'app-apps-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': init_old_value,
-                'run_after_test': assert_name_not_changed
+        test_suite = self.expect(
+            matrices.UPDATE_POLICY,
+            allowed={
+                'run_after_test': assert_name_changed,
             },
-            'app-admin': {
-                'assert': self.assertFalse,
+            refused={
                 'run_before_test': init_old_value,
-                'run_after_test': assert_name_not_changed
+                'run_after_test': assert_name_not_changed,
             },
-        }
+        )
         self.run_case(
             update_sn_attribute,
             test_suite,
@@ -716,50 +458,16 @@ class TestLdapUpdateEntries(LdapTestCase):
             ) as new_con:
                 read_own_entry(new_con, context, data)
 
-        test_suite = {
-            'anonymous': None,
-            'user': {
-                'assert': self.assertTrue,
+        test_suite = self.expect(
+            matrices.UPDATE_OWN_PASSWORD,
+            allowed={
                 'run_before_test': init_fake_password,
                 'run_after_test': assert_update_password,
             },
-            'user-people-admin': {
-                'assert': self.assertTrue,
+            refused={
                 'run_before_test': init_fake_password,
-                'run_after_test': assert_update_password,
             },
-            'user-apps-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': init_fake_password,
-                'run_after_test': assert_update_password,
-            },
-            'user-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': init_fake_password,
-                'run_after_test': assert_update_password,
-            },
-            'admin': None,
-            'app': {
-                'assert': self.assertFalse,
-                'run_before_test': init_fake_password,
-                'run_after_test': None,
-            },
-            'app-people-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': init_fake_password,
-                'run_after_test': None
-            },
-            'app-apps-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': init_fake_password,
-                'run_after_test': assert_update_password,
-            },
-            'app-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': init_fake_password,
-                'run_after_test': assert_update_password,
-            },
-        }
+        )
         self.run_case(
             update_my_password,
             test_suite,
@@ -830,58 +538,16 @@ class TestLdapUpdateEntries(LdapTestCase):
                 self.assertTrue(new_con.search(USER_DN, '(objectclass=*)'))
             self.reset_password(USER_DN, 'tuser2PASS')
 
-        test_suite = {
-            'anonymous': {
-                'assert': self.assertFalse,
-                'run_before_test': init_tuser_password,
-                'run_after_test': None,
-            },
-            'user': {
-                'assert': self.assertFalse,
-                'run_before_test': init_tuser_password,
-                'run_after_test': None,
-            },
-            'user-people-admin': {
-                'assert': self.assertTrue,
+        test_suite = self.expect(
+            matrices.UPDATE_USER_PASSWORD,
+            allowed={
                 'run_before_test': init_tuser_password,
                 'run_after_test': assert_updated_password,
             },
-            'user-apps-admin': {
-                'assert': self.assertFalse,
+            refused={
                 'run_before_test': init_tuser_password,
-                'run_after_test': None,
             },
-            'user-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': init_tuser_password,
-                'run_after_test': assert_updated_password
-            },
-            'admin':  {
-                'assert': self.assertTrue,
-                'run_before_test': init_tuser_password,
-                'run_after_test': assert_updated_password
-            },
-            'app': {
-                'assert': self.assertFalse,
-                'run_before_test': init_tuser_password,
-                'run_after_test': None,
-            },
-            'app-people-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': init_tuser_password,
-                'run_after_test': assert_updated_password,
-            },
-            'app-apps-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': init_tuser_password,
-                'run_after_test': None,
-            },
-            'app-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': init_tuser_password,
-                'run_after_test': assert_updated_password,
-            },
-        }
+        )
         self.run_case(
             udapte_password,
             test_suite,
@@ -896,18 +562,7 @@ class TestLdapUpdateEntries(LdapTestCase):
                 {'olcRootPW': [(MODIFY_REPLACE, ['test'])]}
             ), con.result
 
-        test_suite = {
-            'anonymous': {'assert': self.assertFalse, },
-            'user': {'assert': self.assertFalse, },
-            'user-people-admin': {'assert': self.assertFalse, },
-            'user-apps-admin': {'assert': self.assertFalse, },
-            'user-admin': {'assert': self.assertFalse, },
-            'admin': {'assert': self.assertFalse, },
-            'app': {'assert': self.assertFalse, },
-            'app-people-admin': {'assert': self.assertFalse, },
-            'app-apps-admin': {'assert': self.assertFalse, },
-            'app-admin': {'assert': self.assertFalse, },
-        }
+        test_suite = self.expect(matrices.UPDATE_ROOT_ADMIN_PASSWORD)
 
         self.run_case(
             udapte_ldap_admin_password,
@@ -981,58 +636,16 @@ class TestLdapUpdateEntries(LdapTestCase):
                 self.assertTrue(new_con.search(APP_DN, '(objectclass=*)'))
             self.reset_password(APP_DN, APP_PASS)
 
-        test_suite = {
-            'anonymous': {
-                'assert': self.assertFalse,
-                'run_before_test': init_fakeapp_password,
-                'run_after_test': None,
-            },
-            'user': {
-                'assert': self.assertFalse,
-                'run_before_test': init_fakeapp_password,
-                'run_after_test': None,
-            },
-            'user-people-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': init_fakeapp_password,
-                'run_after_test': None,
-            },
-            'user-apps-admin': {
-                'assert': self.assertTrue,
+        test_suite = self.expect(
+            matrices.UPDATE_APP_PASSWORD,
+            allowed={
                 'run_before_test': init_fakeapp_password,
                 'run_after_test': assert_updated_password,
             },
-            'user-admin': {
-                'assert': self.assertTrue,
+            refused={
                 'run_before_test': init_fakeapp_password,
-                'run_after_test': assert_updated_password
             },
-            'admin':  {
-                'assert': self.assertTrue,
-                'run_before_test': init_fakeapp_password,
-                'run_after_test': assert_updated_password
-            },
-            'app': {
-                'assert': self.assertFalse,
-                'run_before_test': init_fakeapp_password,
-                'run_after_test': None,
-            },
-            'app-people-admin': {
-                'assert': self.assertFalse,
-                'run_before_test': init_fakeapp_password,
-                'run_after_test': None,
-            },
-            'app-apps-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': init_fakeapp_password,
-                'run_after_test': assert_updated_password,
-            },
-            'app-admin': {
-                'assert': self.assertTrue,
-                'run_before_test': init_fakeapp_password,
-                'run_after_test': assert_updated_password,
-            },
-        }
+        )
         self.run_case(
             udapte_password,
             test_suite,
@@ -0,0 +1,25 @@
+from ldap3 import EXTERNAL, SASL
+from unittest import TestCase
+
+from ldaptools.connection import connection_params, ldapi_url
+
+
+class TestLdaptoolsConnection(TestCase):
+
+    def test_ldapi_url(self):
+        self.assertEqual(
+            "ldapi://%2Frun%2Fopenldap%2Fldapi",
+            ldapi_url("/run/openldap/ldapi")
+        )
+
+    def test_connection_params(self):
+        url = ldapi_url()
+        self.assertEqual(
+            {'authentication': SASL, 'sasl_mechanism': EXTERNAL},
+            connection_params(url)
+        )
+        self.assertEqual(
+            {'user': 'cn=admin,dc=example,dc=com', 'password': 'secret'},
+            connection_params(url, 'cn=admin,dc=example,dc=com', 'secret')
+        )
+        self.assertEqual({}, connection_params("ldaps://localhost"))
@@ -0,0 +1,210 @@
+from io import StringIO
+from unittest import TestCase
+
+from ldaptools import generate, trees
+from ldaptools.bulkload import DepthSortedStream
+from ldaptools.ldif import (
+    format_entry, format_value, read_records, write_entries
+)
+
+from .features import ROOT_DC, ORGANIZATION
+
+
+class TestLdifGenerator(TestCase):
+
+    def assertParentsFirst(self, entries):
+        known = {ROOT_DC, "ou=people," + ROOT_DC, "ou=groups," + ROOT_DC}
+        for dn, _ in entries:
+            parent = dn.split(',', 1)[1]
+            if dn != ROOT_DC:
+                self.assertIn(parent, known, "%s before its parent" % dn)
+            known.add(dn)
+
+    def test_base_tree(self):
+        entries = list(trees.base(
+            ROOT_DC, "ci.example.com", ORGANIZATION, "admin", "{SSHA}xxx"
+        ))
+        self.assertEqual(ROOT_DC, entries[0][0])
+        self.assertIn(
+            ('userPassword', '{SSHA}xxx'),
+            dict(entries)["uid=admin,ou=people," + ROOT_DC]
+        )
+        self.assertParentsFirst(entries)
+
+    def test_demo_tree(self):
+        entries = dict(trees.demo(ROOT_DC, "ci.example.com", ORGANIZATION))
+        self.assertIn("uid=tuser,ou=people," + ROOT_DC, entries)
+        self.assertIn("uid=fakeapp2,ou=applications," + ROOT_DC, entries)
+        self.assertNotIn(
+            'userPassword',
+            dict(entries["uid=tnopassuser,ou=people," + ROOT_DC])
+        )
+
+    def test_bulk_memberships(self):
+        entries = list(trees.bulk(
+            ROOT_DC, "ci.example.com", ORGANIZATION, "admin",
+            people=10, groups=4
+        ))
+        self.assertEqual(14, len(entries))
+        self.assertParentsFirst(entries)
+        member_of = {
+            (dn, value) for dn, attributes in entries
+            for name, value in attributes if name == 'memberOf'
+        }
+        members = {
+            (value, dn) for dn, attributes in entries
+            for name, value in attributes if name == 'member'
+        }
+        self.assertEqual(member_of, members)
+
+    def test_bulk_empty_group(self):
+        admin_groups = []
+        entries = dict(trees.bulk(
+            ROOT_DC, "ci.example.com", ORGANIZATION, "admin", people=1,
+            groups=2, admin_groups=admin_groups
+        ))
+        self.assertIn(
+            ('member', "uid=admin,ou=people," + ROOT_DC),
+            entries["cn=bulk-group-000001,ou=groups," + ROOT_DC]
+        )
+        self.assertEqual(
+            ["cn=bulk-group-000001,ou=groups," + ROOT_DC], admin_groups
+        )
+
+    def test_admin_changes(self):
+        args = generate.get_parser().parse_args([
+            "-D", ROOT_DC, "-d", "ci.example.com", "-o", ORGANIZATION,
+            "-u", "admin", "--groups", "2",
+        ])
+        admin_groups = []
+        list(generate.entries(args, admin_groups))
+        self.assertEqual(
+            "dn: uid=admin,ou=people,%s\n"
+            "changetype: modify\n"
+            "add: memberOf\n"
+            "memberOf: cn=bulk-group-000000,ou=groups,%s\n"
+            "memberOf: cn=bulk-group-000001,ou=groups,%s\n"
+            "-\n\n" % (ROOT_DC, ROOT_DC, ROOT_DC),
+            generate.admin_changes(args, admin_groups)
+        )
+        self.assertEqual("", generate.admin_changes(args, []))
+
+    def test_zipf_sizes(self):
+        self.assertEqual(
+            [1000, 1000, 466, 298, 217, 170], trees.zipf_sizes(
+                6, 1000, exponent=1.1, large_groups=2
+            )
+        )
+        self.assertEqual(1, trees.zipf_sizes(10000, 100)[-1])
+
+    def test_bulk_zipf(self):
+        params = dict(people=2000, groups=50, applications=20, seed=7,
+                      largest=500)
+        entries = list(trees.bulk_zipf(
+            ROOT_DC, "ci.example.com", ORGANIZATION, "admin", **params
+        ))
+        self.assertEqual(2070, len(entries))
+        self.assertEqual(entries, list(trees.bulk_zipf(
+            ROOT_DC, "ci.example.com", ORGANIZATION, "admin", **params
+        )))
+        params['seed'] = 8
+        self.assertNotEqual(entries, list(trees.bulk_zipf(
+            ROOT_DC, "ci.example.com", ORGANIZATION, "admin", **params
+        )))
+        member_of = {
+            (dn, value) for dn, attributes in entries
+            for name, value in attributes if name == 'memberOf'
+        }
+        members = {
+            (value, dn) for dn, attributes in entries
+            for name, value in attributes if name == 'member'
+        }
+        self.assertEqual(member_of, members)
+        sizes = [
+            len([
+                value for name, value in attributes
+                if name == 'member' and ',ou=people,' in value
+            ]) for dn, attributes in entries if dn.startswith('cn=')
+        ]
+        self.assertEqual([500, 500, 500], sizes[:3])
+        self.assertEqual(sorted(sizes, reverse=True), sizes)
+
+    def test_bulk_zipf_without_people(self):
+        admin_groups = []
+        entries = dict(trees.bulk_zipf(
+            ROOT_DC, "ci.example.com", ORGANIZATION, "admin", groups=2,
+            applications=1, seed=1, admin_groups=admin_groups
+        ))
+        self.assertEqual(1, len(admin_groups))
+        for dn in admin_groups:
+            self.assertIn(
+                ('member', "uid=admin,ou=people," + ROOT_DC), entries[dn]
+            )
+
+    def test_bulk_zipf_applications_only(self):
+        entries = dict(trees.bulk_zipf(
+            ROOT_DC, "ci.example.com", ORGANIZATION, "admin",
+            groups=2, applications=3
+        ))
+        application = "uid=bulk-app-000002,ou=applications," + ROOT_DC
+        self.assertEqual(1, len([
+            value for name, value in entries[application]
+            if name == 'memberOf'
+        ]))
+        entries = dict(trees.bulk_zipf(
+            ROOT_DC, "ci.example.com", ORGANIZATION, "admin", applications=3
+        ))
+        self.assertEqual([application], [
+            dn for dn in entries if dn.startswith("uid=bulk-app-000002")
+        ])
+        self.assertNotIn(
+            'memberOf', [name for name, _ in entries[application]]
+        )
+
+    def test_format_entry(self):
+        self.assertEqual("cn: fakeapp\n", format_value('cn', 'fakeapp'))
+        self.assertEqual("o:: w6l0w6k=\n", format_value('o', 'été'))
+        self.assertEqual("sn:: IGxlYWQ=\n", format_value('sn', ' lead'))
+        self.assertEqual(
+            "dn: cn=test\nobjectClass: top\n\n",
+            format_entry("cn=test", [('objectClass', 'top')])
+        )
+
+    def test_bulk_load_stream(self):
+        ldif = StringIO()
+        write_entries(trees.demo_groups(ROOT_DC), ldif)
+        write_entries(
+            trees.demo_people(ROOT_DC, "ci.example.com", ORGANIZATION), ldif
+        )
+        write_entries(trees.base(
+            ROOT_DC, "ci.example.com", ORGANIZATION, "admin", "{SSHA}xxx"
+        ), ldif)
+        ldif.seek(0)
+        stream = DepthSortedStream()
+        for record in read_records(ldif):
+            stream.add(record)
+        output = StringIO()
+        stream.write(output)
+        output.seek(0)
+        entries = [
+            (record[0][4:], [line.split(': ', 1) for line in record[1:]])
+            for record in read_records(output)
+        ]
+        self.assertEqual(stream.count, len(entries))
+        self.assertParentsFirst(entries)
+        entries = dict(entries)
+        self.assertIn(
+            ['memberOf', 'cn=fakeapp,ou=groups,' + ROOT_DC],
+            entries["uid=tuser,ou=people," + ROOT_DC]
+        )
+        self.assertEqual(
+            [
+                ['memberOf', 'cn=ldap_people_admin,ou=groups,' + ROOT_DC],
+                ['memberOf', 'cn=ldap_apps_admin,ou=groups,' + ROOT_DC],
+                ['memberOf', 'cn=ldap_monitor,ou=groups,' + ROOT_DC],
+            ],
+            [
+                value for value in entries["uid=admin,ou=people," + ROOT_DC]
+                if value[0].lower() == 'memberof'
+            ]
+        )
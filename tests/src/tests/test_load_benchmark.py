@@ -0,0 +1,90 @@
+from argparse import ArgumentTypeError
+from ldap3 import Connection, MOCK_SYNC, Server
+from unittest import TestCase
+
+from benchmarks.load import (
+    OPERATIONS, Worker, account_dn, compare, get_parser, group_dn,
+    parse_mix, report
+)
+
+from .features import ROOT_DC
+
+
+class TestLoadBenchmark(TestCase):
+
+    def test_parse_mix(self):
+        self.assertEqual(
+            {'bind': 1.0, 'subtree': 4.0, 'member': 1.0},
+            parse_mix("bind=1, subtree=4,member")
+        )
+        for value in ["bind=1,delete=2", "bind=x", "bind=-1", "bind=0"]:
+            with self.assertRaises(ArgumentTypeError):
+                parse_mix(value)
+
+    def test_default_arguments(self):
+        args = get_parser().parse_args([])
+        self.assertEqual(
+            ['bind', 'base', 'one', 'subtree', 'password', 'member'],
+            list(args.mix)
+        )
+        self.assertIsNone(args.personas)
+
+    def test_report(self):
+        samples = [
+            ('user', 'base', 0.001, 'ok'),
+            ('user', 'member', 0.002, 'refused'),
+            ('admin', 'member', 0.004, 'ok'),
+            ('admin', 'base', 0.010, 'error'),
+        ]
+        result = report(samples, elapsed=2)
+        self.assertEqual(
+            {'count': 4, 'ok': 2, 'refused': 1, 'errors': 1,
+             'ops_per_second': 2.0, 'p50_ms': 4.0, 'p95_ms': 10.0,
+             'p99_ms': 10.0},
+            result['total']
+        )
+        self.assertEqual(['base', 'member'], list(result['operations']))
+        self.assertEqual(['admin', 'user'], list(result['by_persona']))
+        self.assertEqual(1, result['matrix']['user']['member']['refused'])
+        self.assertEqual(4.0, result['matrix']['admin']['member']['p50_ms'])
+
+    def test_compare(self):
+        baseline = report([('user', 'base', 0.002, 'ok')] * 10, elapsed=1)
+        candidate = report(
+            [('user', 'base', 0.001, 'ok')] * 20 +
+            [('user', 'bind', 0.001, 'ok')], elapsed=1
+        )
+        rows = compare(baseline, candidate)
+        self.assertEqual(['total', 'base'], [row['operation'] for row in rows])
+        self.assertEqual(2.0, rows[1]['ops_ratio'])
+        self.assertEqual(0.5, rows[1]['p99_ratio'])
+
+    def test_operations(self):
+        users = {
+            'user': {
+                'user_dn': "uid=tuser,ou=people," + ROOT_DC,
+                'password': "secret",
+            },
+            'anonymous': {'user_dn': "", 'password': ""},
+        }
+        args = get_parser().parse_args([])
+        worker = Worker(0, 'user', users['user'], args, users)
+        worker.con = Connection(
+            Server("fake"), user=users['user']['user_dn'],
+            password="secret", client_strategy=MOCK_SYNC
+        )
+        for dn, object_class, attributes in [
+            (users['user']['user_dn'], 'inetOrgPerson',
+             {'uid': 'tuser', 'userPassword': 'secret'}),
+            (account_dn(0), 'inetOrgPerson', {'uid': 'bench-load-000'}),
+            (group_dn(0), 'groupOfNames', {'member': [account_dn(0)]}),
+        ]:
+            worker.con.strategy.add_entry(dn, dict(
+                attributes, objectClass=[object_class], cn=[dn]
+            ))
+        worker.con.bind()
+        for operation in OPERATIONS:
+            self.assertIn(getattr(worker, operation)(), (True, False))
+        self.assertTrue(worker.is_member)
+        self.assertTrue(worker.member())
+        self.assertFalse(worker.is_member)
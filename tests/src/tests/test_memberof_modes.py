@@ -0,0 +1,91 @@
+from io import StringIO
+from unittest import TestCase
+
+from ldaptools import memberof, trees
+from ldaptools.bulkload import DepthSortedStream
+from ldaptools.ldif import read_records, write_entries
+
+from .features import ROOT_DC, ORGANIZATION
+
+GROUP_DN = "cn=fakeapp,ou=groups," + ROOT_DC
+USER_DN = "uid=tuser,ou=people," + ROOT_DC
+OTHER_DN = "uid=tuser2,ou=people," + ROOT_DC
+
+
+def dump(entries):
+    ldif = StringIO()
+    write_entries(entries, ldif)
+    ldif.seek(0)
+    return memberof.read_entries(read_records(ldif))
+
+
+def changes(records):
+    return {
+        record[0][4:]: [line.split(': ', 1) for line in record[2:]]
+        for record in read_records(StringIO(''.join(records)))
+    }
+
+
+class TestMemberOfModes(TestCase):
+
+    def test_strip(self):
+        self.assertEqual(
+            {USER_DN: [['delete', 'memberOf'], ['-']]},
+            changes(memberof.strip(dump([
+                (GROUP_DN, [
+                    ('objectClass', 'groupOfNames'), ('member', USER_DN)
+                ]),
+                (USER_DN, [('uid', 'tuser'), ('memberOf', GROUP_DN)]),
+                (OTHER_DN, [('uid', 'tuser2')]),
+            ])))
+        )
+
+    def test_materialize(self):
+        self.assertEqual(
+            {
+                USER_DN: [['replace', 'memberOf'], ['memberOf', GROUP_DN],
+                          ['-']],
+                OTHER_DN: [['delete', 'memberOf'], ['-']],
+            },
+            changes(memberof.materialize(dump([
+                (GROUP_DN, [
+                    ('objectClass', 'groupOfNames'), ('member', USER_DN),
+                    ('member', "uid=gone,ou=people," + ROOT_DC),
+                ]),
+                (USER_DN, [('uid', 'tuser')]),
+                (OTHER_DN, [('uid', 'tuser2'), ('memberOf', GROUP_DN)]),
+            ])))
+        )
+
+    def test_materialize_skips_up_to_date_entries(self):
+        self.assertEqual([], list(memberof.materialize(dump([
+            (GROUP_DN, [
+                ('objectClass', 'groupOfNames'), ('member', USER_DN)
+            ]),
+            (USER_DN, [('uid', 'tuser'), ('memberOf', GROUP_DN.upper())]),
+        ]))))
+
+    def test_materialize_demo_tree_is_up_to_date(self):
+        # generated trees write the memberOf values of the overlay mode
+        self.assertEqual([], list(memberof.materialize(dump(
+            list(trees.base(
+                ROOT_DC, "ci.example.com", ORGANIZATION, "admin", "{SSHA}x"
+            )) +
+            list(trees.demo_people(ROOT_DC, "ci.example.com", ORGANIZATION)) +
+            list(trees.demo_groups(ROOT_DC))
+        ))))
+
+    def test_bulk_load_drops_memberof(self):
+        ldif = StringIO()
+        write_entries(trees.demo_groups(ROOT_DC), ldif)
+        write_entries(
+            trees.demo_people(ROOT_DC, "ci.example.com", ORGANIZATION), ldif
+        )
+        ldif.seek(0)
+        stream = DepthSortedStream(drop_member_of=True)
+        for record in read_records(ldif):
+            stream.add(record)
+        output = StringIO()
+        stream.write(output)
+        self.assertNotIn('memberof:', output.getvalue().lower())
+        self.assertIn('member: ', output.getvalue())
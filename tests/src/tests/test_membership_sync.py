@@ -0,0 +1,118 @@
+from ldap3 import MODIFY_ADD, MODIFY_DELETE
+from types import SimpleNamespace
+from unittest import TestCase
+
+from ldaptools.membership import diff, modifications, pipeline, sync
+
+GROUP = "cn=staff,ou=groups,dc=example,dc=com"
+ALICE = "uid=alice,ou=people,dc=example,dc=com"
+BOB = "uid=bob,ou=people,dc=example,dc=com"
+CAROL = "uid=carol,ou=people,dc=example,dc=com"
+
+
+class FakeAsyncConnection(object):
+    """Record operations, answer them from ``groups`` once asked"""
+
+    def __init__(self, groups):
+        self.groups = groups
+        self.strategy = SimpleNamespace(sync=False)
+        self.sent = []
+        self.outstanding = {}
+        self.max_outstanding = 0
+
+    def _send(self, operation):
+        self.sent.append(operation)
+        message_id = len(self.sent)
+        self.outstanding[message_id] = operation
+        self.max_outstanding = max(
+            self.max_outstanding, len(self.outstanding)
+        )
+        return message_id
+
+    def search(self, dn, ldap_filter, scope, attributes):
+        return self._send(('search', dn))
+
+    def modify(self, dn, changes):
+        return self._send(('modify', dn, changes))
+
+    def get_response(self, message_id):
+        operation = self.outstanding.pop(message_id)
+        dn = operation[1]
+        if dn not in self.groups:
+            return [], {'description': 'noSuchObject'}
+        if operation[0] == 'search':
+            return [{'attributes': {'member': list(self.groups[dn])}}], {
+                'description': 'success'
+            }
+        for change, values in operation[2]['member']:
+            if change == MODIFY_ADD:
+                self.groups[dn].extend(values)
+            else:
+                for value in values:
+                    self.groups[dn].remove(value)
+        return [], {'description': 'success'}
+
+
+class TestMembershipSync(TestCase):
+
+    def test_diff(self):
+        self.assertEqual(
+            ([CAROL], [BOB]),
+            diff([ALICE, BOB], [ALICE.upper().replace(',', ', '), CAROL])
+        )
+        self.assertEqual(([CAROL], []), diff([BOB], [CAROL], remove=False))
+
+    def test_modifications(self):
+        self.assertEqual(
+            [{'member': [(MODIFY_ADD, [ALICE])]}],
+            modifications([ALICE], [])
+        )
+        self.assertEqual(
+            [
+                {'member': [(MODIFY_ADD, [ALICE, BOB])]},
+                {'member': [(MODIFY_ADD, [CAROL]), (MODIFY_DELETE, ["x"])]},
+            ],
+            modifications([ALICE, BOB, CAROL], ["x"], chunk_size=2)
+        )
+        self.assertEqual([], modifications([], []))
+
+    def test_pipeline_window(self):
+        connection = FakeAsyncConnection({GROUP: []})
+        results = list(pipeline(connection, [
+            (index, lambda: connection.search(GROUP, None, None, None))
+            for index in range(10)
+        ], window=3))
+        self.assertEqual(list(range(10)), [key for key, _, _ in results])
+        self.assertEqual(3, connection.max_outstanding)
+
+    def test_sync(self):
+        other = "cn=other,ou=groups,dc=example,dc=com"
+        connection = FakeAsyncConnection({
+            GROUP: [ALICE, BOB], other: [ALICE],
+        })
+        reports, _ = sync(connection, {
+            GROUP: [ALICE, CAROL],
+            other: [],
+            "cn=missing,ou=groups,dc=example,dc=com": [ALICE],
+        }, empty_member=BOB)
+        self.assertEqual([ALICE, CAROL], connection.groups[GROUP])
+        self.assertEqual([BOB], connection.groups[other])
+        self.assertEqual(
+            [(1, 1, 1, 'success'), (1, 1, 1, 'success'),
+             (0, 0, 0, 'noSuchObject')],
+            [
+                (report['added'], report['deleted'], report['modifies'],
+                 report['result']) for report in reports
+            ]
+        )
+        sent = len(connection.sent)
+        reports, _ = sync(connection, {GROUP: [CAROL, ALICE]})
+        self.assertEqual(0, reports[0]['modifies'])
+        # only the read
+        self.assertEqual(sent + 1, len(connection.sent))
+
+    def test_dry_run(self):
+        connection = FakeAsyncConnection({GROUP: [ALICE]})
+        reports, _ = sync(connection, {GROUP: [BOB]}, dry_run=True)
+        self.assertEqual((1, 1), (reports[0]['added'], reports[0]['deleted']))
+        self.assertEqual([ALICE], connection.groups[GROUP])
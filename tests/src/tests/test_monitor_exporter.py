@@ -0,0 +1,79 @@
+from unittest import TestCase
+
+from ldaptools.exporter import collect, format_samples, main, rdn_path
+
+MONITOR_ENTRIES = [
+    ("cn=Monitor", {'monitoredInfo': ['OpenLDAP: slapd 2.6.6']}),
+    ("cn=Total,cn=Connections,cn=Monitor", {'monitorCounter': ['1010']}),
+    ("cn=Current,cn=Connections,cn=Monitor", {'monitorCounter': ['3']}),
+    ("cn=Connection 1001,cn=Connections,cn=Monitor", {}),
+    ("cn=Bind,cn=Operations,cn=Monitor", {
+        'monitorOpInitiated': ['20'], 'monitorOpCompleted': ['19'],
+    }),
+    ("cn=Search,cn=Operations,cn=Monitor", {
+        'monitorOpInitiated': ['120'], 'monitorOpCompleted': ['120'],
+    }),
+    ("cn=Active,cn=Threads,cn=Monitor", {'monitoredInfo': ['2']}),
+    ("cn=State,cn=Threads,cn=Monitor", {'monitoredInfo': ['running']}),
+    ("cn=Uptime,cn=Time,cn=Monitor", {'monitoredInfo': ['3600']}),
+    ("cn=Database 2,cn=Databases,cn=Monitor", {
+        'olmMDBPagesMax': ['262144'], 'olmMDBEntries': ['42'],
+    }),
+]
+
+
+class TestMonitorExporter(TestCase):
+
+    def test_rdn_path(self):
+        self.assertEqual(
+            ('operations', 'bind'),
+            rdn_path("cn=Bind,cn=Operations,cn=Monitor")
+        )
+        self.assertEqual((), rdn_path("cn=Monitor"))
+
+    def test_collect(self):
+        samples = dict(
+            ((name, tuple(sorted(labels.items()))), value)
+            for name, _, _, labels, value in collect(MONITOR_ENTRIES)
+        )
+        self.assertEqual(
+            {
+                ('ldap_connections_total', ()): 1010,
+                ('ldap_connections_current', ()): 3,
+                ('ldap_operations_initiated_total',
+                 (('operation', 'bind'),)): 20,
+                ('ldap_operations_completed_total',
+                 (('operation', 'bind'),)): 19,
+                ('ldap_operations_initiated_total',
+                 (('operation', 'search'),)): 120,
+                ('ldap_operations_completed_total',
+                 (('operation', 'search'),)): 120,
+                ('ldap_threads', (('state', 'active'),)): 2,
+                ('ldap_uptime_seconds', ()): 3600,
+                ('ldap_mdb_pages_max', (('database', 'database 2'),)): 262144,
+                ('ldap_mdb_entries', (('database', 'database 2'),)): 42,
+            },
+            samples
+        )
+
+    def test_format_samples(self):
+        self.assertEqual(
+            "# HELP ldap_operations_completed_total Operations completed\n"
+            "# TYPE ldap_operations_completed_total counter\n"
+            'ldap_operations_completed_total{operation="bind"} 19.0\n'
+            'ldap_operations_completed_total{operation="search"} 120.0\n'
+            "# HELP ldap_up cn=monitor readable\n"
+            "# TYPE ldap_up gauge\n"
+            "ldap_up 1\n",
+            format_samples([
+                ('ldap_operations_completed_total', 'counter',
+                 "Operations completed", {'operation': 'bind'}, 19.0),
+                ('ldap_operations_completed_total', 'counter',
+                 "Operations completed", {'operation': 'search'}, 120.0),
+                ('ldap_up', 'gauge', "cn=monitor readable", {}, 1),
+            ])
+        )
+
+    def test_bind_dn_required_over_tcp(self):
+        with self.assertRaises(SystemExit):
+            main(["-H", "ldaps://localhost", "--port", "0"])
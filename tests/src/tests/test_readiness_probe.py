@@ -0,0 +1,60 @@
+from unittest import TestCase
+
+from ldaptools.probe import check, NotReady, wait_ready
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestReadinessProbe(TestCase):
+
+    def attempts(self, clock, ready_at):
+        def attempt():
+            if clock.now < ready_at:
+                raise NotReady("not yet")
+            return 0.01
+        return attempt
+
+    def test_exponential_backoff(self):
+        clock = FakeClock()
+        self.assertEqual(
+            (0.01, 6),
+            wait_ready(
+                self.attempts(clock, 1.5), timeout=10, initial_delay=0.1,
+                max_delay=0.5, sleep=clock.sleep, clock=clock
+            )
+        )
+        self.assertEqual([0.1, 0.2, 0.4, 0.5, 0.5], clock.sleeps)
+
+    def test_timeout(self):
+        clock = FakeClock()
+        with self.assertRaises(NotReady):
+            wait_ready(
+                self.attempts(clock, 100), timeout=1, initial_delay=0.4,
+                sleep=clock.sleep, clock=clock
+            )
+        # last sleep is cut to the deadline
+        self.assertEqual([0.4, 0.6], clock.sleeps)
+
+    def test_single_attempt(self):
+        clock = FakeClock()
+        with self.assertRaises(NotReady):
+            wait_ready(
+                self.attempts(clock, 1), sleep=clock.sleep, clock=clock
+            )
+        self.assertEqual([], clock.sleeps)
+
+    def test_check_unreachable_server(self):
+        with self.assertRaises(NotReady):
+            check("ldap://127.0.0.1:1", budget=1)